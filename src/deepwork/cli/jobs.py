@@ -1,20 +1,28 @@
 """Jobs CLI commands for DeepWork.
 
-Provides commands for inspecting active workflow sessions,
-primarily used by hooks to restore context after compaction.
+Provides commands for inspecting active workflow sessions (primarily used
+by hooks to restore context after compaction), for reading the workflow
+event stream, and for archiving stale sessions.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
 import click
 
+from deepwork.jobs.cache import job_cache_dir
 from deepwork.jobs.discovery import find_job_dir
+from deepwork.jobs.mcp.archive import archive_stale_sessions
+from deepwork.jobs.mcp.events import events_path, read_events
+from deepwork.jobs.mcp.journal import read_state_file
 from deepwork.jobs.mcp.schemas import WorkflowSession
+from deepwork.jobs.mcp.session_index import index_path, read_index, sessions_root
+from deepwork.jobs.mcp.session_index import rebuild_index as rebuild_active_index
 from deepwork.jobs.parser import ParseError, parse_job_definition
 
 logger = logging.getLogger("deepwork.cli.jobs")
@@ -33,46 +41,175 @@ def jobs() -> None:
     default=".",
     help="Project root directory (default: current directory)",
 )
-def get_stack(path: str) -> None:
+@click.option(
+    "--rebuild-index",
+    is_flag=True,
+    default=False,
+    help="Rebuild the active-session index from a full scan of all sessions first",
+)
+def get_stack(path: str, rebuild_index: bool) -> None:
     """Output active workflow sessions as JSON.
 
-    Reads session state from .deepwork/tmp/sessions/ and enriches each active
-    session with the job's common info and current step instructions.
-    Used by post-compaction hooks to restore workflow context.
+    Finds active sessions through the index in
+    .deepwork/tmp/sessions/active_sessions.json, reads their state, and
+    enriches each one with the job's common info and current step
+    instructions. Used by post-compaction hooks to restore workflow context.
     """
     project_root = Path(path).resolve()
-    result = _get_active_sessions(project_root)
+    result = _get_active_sessions(project_root, rebuild_index=rebuild_index)
     click.echo(json.dumps(result, indent=2))
 
 
-def _list_sessions_sync(sessions_base: Path) -> list[WorkflowSession]:
-    """Read all session state files synchronously."""
+@jobs.command()
+@click.option(
+    "--path",
+    type=click.Path(exists=True),
+    default=".",
+    help="Project root directory (default: current directory)",
+)
+@click.option(
+    "--max-age-days",
+    type=click.FloatRange(min=0),
+    default=7.0,
+    show_default=True,
+    help="Archive sessions with no state changes for this many days",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Report what would be archived without changing anything",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Also archive stale sessions that still have active workflows",
+)
+def gc(path: str, max_age_days: float, dry_run: bool, force: bool) -> None:
+    """Archive stale workflow sessions and report reclaimed space.
+
+    Session directories under .deepwork/tmp/sessions/ that have not changed
+    for --max-age-days are packed into .deepwork/tmp/archive/sessions/ and
+    removed. Sessions with active workflows are kept unless --force is given.
+    """
+    project_root = Path(path).resolve()
+    report = archive_stale_sessions(
+        project_root, max_age_days * 24 * 60 * 60, dry_run=dry_run, force=force
+    )
+    if report.archived and not dry_run:
+        # Drop index entries that point into the removed session directories
+        rebuild_active_index(project_root)
+    for archive in report.archived:
+        click.echo(f"{'Would archive' if dry_run else 'Archived'} {archive.name}")
+    if dry_run:
+        click.echo(
+            f"{len(report.archived)} stale session(s), "
+            f"{_format_size(report.bytes_removed)} before compression"
+        )
+    else:
+        click.echo(
+            f"Archived {len(report.archived)} stale session(s), "
+            f"reclaimed {_format_size(report.bytes_reclaimed)}"
+        )
+
+
+@jobs.command()
+@click.option(
+    "--path",
+    type=click.Path(exists=True),
+    default=".",
+    help="Project root directory (default: current directory)",
+)
+@click.option(
+    "--since",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Only print events with a sequence number greater than this",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Print at most this many events",
+)
+def tail(path: str, since: int, limit: int | None) -> None:
+    """Print workflow events as JSON lines, oldest first.
+
+    Reads .deepwork/tmp/status/v1/events.jsonl (and its rotated files).
+    Pass the last "seq" you have seen as --since to read incrementally.
+    """
+    for event in read_events(events_path(Path(path).resolve()), since, limit=limit):
+        click.echo(json.dumps(event))
+
+
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count for display."""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _list_sessions_sync(
+    sessions_base: Path, state_file_keys: Iterable[str] | None = None
+) -> list[WorkflowSession]:
+    """Read session state files synchronously.
+
+    Args:
+        sessions_base: Directory holding the per-platform session directories
+        state_file_keys: State files to read, relative to ``sessions_base``.
+            If None, every ``*/session-*/state.json`` is read.
+    """
     if not sessions_base.exists():
         return []
 
+    if state_file_keys is None:
+        state_files: Iterable[Path] = sessions_base.glob("*/session-*/state.json")
+    else:
+        state_files = (sessions_base / key for key in state_file_keys)
+
     sessions: list[WorkflowSession] = []
-    for state_file in sessions_base.glob("*/session-*/state.json"):
+    for state_file in state_files:
         try:
-            data = json.loads(state_file.read_text(encoding="utf-8"))
+            # Replays the session's journal, if it has one
+            data = read_state_file(state_file).data
+            if data is None:
+                continue
             stack = data.get("workflow_stack", [])
             for entry in stack:
                 sessions.append(WorkflowSession.from_dict(entry))
-        except (json.JSONDecodeError, ValueError):
+        except (OSError, ValueError):
             continue
 
     return sorted(sessions, key=lambda s: s.started_at, reverse=True)
 
 
-def _get_active_sessions(project_root: Path) -> dict[str, Any]:
-    """Load active sessions and enrich with job context."""
-    sessions_base = project_root / ".deepwork" / "tmp" / "sessions"
-    all_sessions = _list_sessions_sync(sessions_base)
+def _get_active_sessions(project_root: Path, *, rebuild_index: bool = False) -> dict[str, Any]:
+    """Load active sessions and enrich with job context.
+
+    Only the main-stack state files listed in the active-session index are
+    read. A missing or unreadable index is rebuilt from a full scan first.
+    """
+    entries = None if rebuild_index else read_index(index_path(project_root))
+    if entries is None:
+        entries = rebuild_active_index(project_root)
+    state_file_keys = dict.fromkeys(
+        entry["state_file"]
+        for entry in entries
+        if entry.get("agent_id") is None and isinstance(entry.get("state_file"), str)
+    )
+    all_sessions = _list_sessions_sync(sessions_root(project_root), state_file_keys)
 
     active = [s for s in all_sessions if s.status == "active"]
     if not active:
         return {"active_sessions": []}
 
     sessions_out: list[dict[str, Any]] = []
+    cache_dir = job_cache_dir(project_root)
     for session in active:
         # Determine completed steps from step_progress
         completed_steps = [
@@ -94,7 +231,7 @@ def _get_active_sessions(project_root: Path) -> dict[str, Any]:
         job_dir = find_job_dir(project_root, session.job_name)
         if job_dir:
             try:
-                job_def = parse_job_definition(job_dir)
+                job_def = parse_job_definition(job_dir, cache_dir=cache_dir)
 
                 # Get common_job_info from the active workflow
                 wf = job_def.get_workflow(session.workflow_name)
@@ -4,6 +4,9 @@ from pathlib import Path
 
 import click
 
+from deepwork.jobs.mcp.pool import DEFAULT_PROJECT_CONCURRENCY
+from deepwork.jobs.mcp.scheduling import DEFAULT_DRAIN_TIMEOUT
+
 
 class ServeError(Exception):
     """Exception raised for serve errors."""
@@ -28,15 +31,16 @@ class ServeError(Exception):
 )
 @click.option(
     "--transport",
-    type=click.Choice(["stdio", "sse"]),
+    type=click.Choice(["stdio", "sse", "http"]),
     default="stdio",
-    help="MCP transport protocol (default: stdio)",
+    help="MCP transport protocol (default: stdio). 'http' serves many "
+    "concurrent clients over streamable HTTP from one process.",
 )
 @click.option(
     "--port",
     type=int,
     default=8000,
-    help="Port for SSE transport (default: 8000)",
+    help="Port for the http and sse transports (default: 8000)",
 )
 @click.option(
     "--external-runner",
@@ -51,6 +55,29 @@ class ServeError(Exception):
     default=None,
     help="Platform identifier (e.g., 'claude'). Used by the review tool to format output.",
 )
+@click.option(
+    "--state-journal",
+    is_flag=True,
+    default=False,
+    help="Append workflow state changes to a journal instead of rewriting "
+    "the session state file on every change.",
+)
+@click.option(
+    "--roots-ttl",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Cache the client's listRoots result for this many seconds, also for "
+    "clients that never send roots/list_changed (default: cache only for "
+    "clients that do).",
+)
+@click.option(
+    "--project-concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PROJECT_CONCURRENCY,
+    show_default=True,
+    help="Tool calls that may run at once per project; further calls for "
+    "that project wait in line.",
+)
 def serve(
     path: Path | None,
     no_quality_gate: bool,
@@ -58,6 +85,9 @@ def serve(
     port: int,
     external_runner: str | None,
     platform: str | None,
+    state_journal: bool,
+    roots_ttl: float | None,
+    project_concurrency: int,
 ) -> None:
     """Start the DeepWork MCP server.
 
@@ -75,14 +105,27 @@ def serve(
         # Start for a specific project
         deepwork serve --path /path/to/project
 
-        # SSE transport for remote access
+        # Long-running server for many agent sessions and projects at once
+        # (health and metrics at /health, workflow events at /events)
+        deepwork serve --transport http --port 8000
+
+        # Legacy SSE transport (also streams workflow events at /events)
         deepwork serve --transport sse --port 8000
     """
     explicit_path = path is not None
     resolved_path = path if path is not None else Path.cwd()
 
     try:
-        _serve_mcp(resolved_path, transport, port, platform, explicit_path=explicit_path)
+        _serve_mcp(
+            resolved_path,
+            transport,
+            port,
+            platform,
+            explicit_path=explicit_path,
+            state_journal=state_journal,
+            roots_ttl=roots_ttl,
+            project_concurrency=project_concurrency,
+        )
     except ServeError as e:
         click.echo(f"Error: {e}", err=True)
         raise click.Abort() from e
@@ -98,15 +141,21 @@ def _serve_mcp(
     platform: str | None = None,
     *,
     explicit_path: bool = True,
+    state_journal: bool = False,
+    roots_ttl: float | None = None,
+    project_concurrency: int = DEFAULT_PROJECT_CONCURRENCY,
 ) -> None:
     """Start the MCP server.
 
     Args:
         project_path: Path to project directory
-        transport: Transport protocol (stdio or sse)
-        port: Port for SSE transport
+        transport: Transport protocol (stdio, sse or http)
+        port: Port for the http and sse transports
         platform: Platform identifier for the review tool (e.g., "claude").
         explicit_path: Whether --path was explicitly provided by the user.
+        state_journal: Whether to use the journaled session state format.
+        roots_ttl: Maximum age in seconds of a cached listRoots result.
+        project_concurrency: Tool calls that may run at once per project.
 
     Raises:
         ServeError: If server fails to start
@@ -123,15 +172,35 @@ def _serve_mcp(
         )
 
     # Create and run server
+    from starlette.middleware import Middleware
+
+    from deepwork.jobs.mcp.scheduling import CallScheduler, DrainOnSignal
     from deepwork.jobs.mcp.server import create_server
 
+    scheduler = CallScheduler()
     server = create_server(
         project_root=project_path,
         platform=platform,
         explicit_path=explicit_path,
+        state_journal=state_journal,
+        roots_ttl=roots_ttl,
+        project_concurrency=project_concurrency,
+        scheduler=scheduler,
     )
+    # Start draining as soon as uvicorn gets SIGINT/SIGTERM, while clients
+    # are still connected to see refusals and /events streams can end
+    middleware = [Middleware(DrainOnSignal, scheduler=scheduler)]
 
     if transport == "stdio":
         server.run(transport="stdio")
+    elif transport == "http":
+        # On SIGTERM, stop accepting connections and give open requests as
+        # long as the server's own drain of in-flight tool calls
+        server.run(
+            transport="http",
+            port=port,
+            middleware=middleware,
+            uvicorn_config={"timeout_graceful_shutdown": DEFAULT_DRAIN_TIMEOUT},
+        )
     else:
-        server.run(transport="sse", port=port)
+        server.run(transport="sse", port=port, middleware=middleware)
@@ -10,7 +10,8 @@ Each additional directory is scanned for subdirectories containing ``deepschema.
 If the same schema name appears in multiple sources, the first one wins (project-local
 overrides standard, standard overrides env var extras).
 
-Anonymous schemas (``.deepschema.<filename>.yml``) are found by walking the project tree.
+Anonymous schemas (``.deepschema.<filename>.yml``) are found by walking the project tree
+with the shared ``ProjectScanner``.
 """
 
 from __future__ import annotations
@@ -20,26 +21,13 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from deepwork.deepschema.config import DeepSchema, DeepSchemaError, parse_deepschema_file
-
-# Directories to skip during anonymous schema discovery
-_SKIP_DIRS = {
-    ".git",
-    "node_modules",
-    "__pycache__",
-    ".venv",
-    "venv",
-    ".tox",
-    ".mypy_cache",
-    ".pytest_cache",
-    ".ruff_cache",
-    ".eggs",
-}
-
-_SKIP_SUFFIXES = (".egg-info",)
-
-NAMED_SCHEMAS_DIR = ".deepwork/schemas"
-ANONYMOUS_PREFIX = ".deepschema."
-ANONYMOUS_SUFFIX = ".yml"
+from deepwork.utils.scanner import (
+    ANONYMOUS_PREFIX,
+    ANONYMOUS_SUFFIX,
+    NAMED_SCHEMA_MANIFEST,
+    NAMED_SCHEMAS_DIR,
+    ProjectScanner,
+)
 
 # Environment variable for additional schema folders (colon-delimited)
 ENV_ADDITIONAL_SCHEMAS_FOLDERS = "DEEPWORK_ADDITIONAL_SCHEMAS_FOLDERS"
@@ -79,7 +67,7 @@ def get_named_schema_folders(project_root: Path) -> list[Path]:
     return folders
 
 
-def find_named_schemas(project_root: Path) -> list[Path]:
+def find_named_schemas(project_root: Path, scanner: ProjectScanner | None = None) -> list[Path]:
     """Find all named DeepSchema manifest files across all schema folders.
 
     Scans each folder from get_named_schema_folders(). If the same schema
@@ -87,6 +75,9 @@ def find_named_schemas(project_root: Path) -> list[Path]:
 
     Args:
         project_root: Root directory of the project.
+        scanner: Shared scanner for the current run. When given, the
+            project-local folder is served from its traversal instead of
+            being listed again.
 
     Returns:
         List of deepschema.yml paths, deduplicated by schema name.
@@ -95,12 +86,17 @@ def find_named_schemas(project_root: Path) -> list[Path]:
     results: list[Path] = []
 
     for folder in get_named_schema_folders(project_root):
+        if scanner is not None and folder == project_root / NAMED_SCHEMAS_DIR:
+            for manifest in sorted(scanner.scan().named_schema_manifests):
+                results.append(manifest)
+                seen_names.add(manifest.parent.name)
+            continue
         if not folder.is_dir():
             continue
         try:
             for entry in sorted(folder.iterdir()):
                 if entry.is_dir() and entry.name not in seen_names:
-                    manifest = entry / "deepschema.yml"
+                    manifest = entry / NAMED_SCHEMA_MANIFEST
                     if manifest.is_file():
                         results.append(manifest)
                         seen_names.add(entry.name)
@@ -110,48 +106,23 @@ def find_named_schemas(project_root: Path) -> list[Path]:
     return results
 
 
-def find_anonymous_schemas(project_root: Path) -> list[Path]:
+def find_anonymous_schemas(project_root: Path, scanner: ProjectScanner | None = None) -> list[Path]:
     """Find all anonymous DeepSchema files in the project tree.
 
-    Walks the project looking for files matching .deepschema.<filename>.yml.
+    Walks the project looking for files matching .deepschema.<filename>.yml,
+    skipping common non-source directories and anything git ignores.
 
     Args:
         project_root: Root directory to search.
+        scanner: Shared scanner for the current run. A fresh one is used
+            when omitted.
 
     Returns:
         List of anonymous schema file paths, sorted alphabetically.
     """
-    results: list[Path] = []
-    _walk_for_anonymous(project_root, results)
-    results.sort(key=str)
-    return results
-
-
-def _walk_for_anonymous(root: Path, results: list[Path]) -> None:
-    """Walk directory tree looking for .deepschema.*.yml files."""
-    try:
-        entries = sorted(root.iterdir())
-    except PermissionError:
-        return
-
-    for entry in entries:
-        if entry.is_file() and _is_anonymous_schema(entry.name):
-            results.append(entry)
-        elif (
-            entry.is_dir()
-            and entry.name not in _SKIP_DIRS
-            and not entry.name.endswith(_SKIP_SUFFIXES)
-        ):
-            _walk_for_anonymous(entry, results)
-
-
-def _is_anonymous_schema(filename: str) -> bool:
-    """Check if a filename matches the .deepschema.<name>.yml pattern."""
-    return (
-        filename.startswith(ANONYMOUS_PREFIX)
-        and filename.endswith(ANONYMOUS_SUFFIX)
-        and len(filename) > len(ANONYMOUS_PREFIX) + len(ANONYMOUS_SUFFIX)
-    )
+    if scanner is None:
+        scanner = ProjectScanner(project_root)
+    return sorted(scanner.scan().anonymous_schemas, key=str)
 
 
 def anonymous_target_filename(schema_filename: str) -> str:
@@ -163,7 +134,7 @@ def anonymous_target_filename(schema_filename: str) -> str:
 
 
 def discover_all_schemas(
-    project_root: Path,
+    project_root: Path, scanner: ProjectScanner | None = None
 ) -> tuple[list[DeepSchema], list[DiscoveryError]]:
     """Discover all DeepSchemas (named and anonymous) in the project.
 
@@ -173,15 +144,19 @@ def discover_all_schemas(
 
     Args:
         project_root: Root directory to search.
+        scanner: Shared scanner for the current run, so the project tree
+            is walked once for both rules and DeepSchemas.
 
     Returns:
         Tuple of (successfully parsed schemas, list of errors).
     """
+    if scanner is None:
+        scanner = ProjectScanner(project_root)
     schemas: list[DeepSchema] = []
     errors: list[DiscoveryError] = []
 
     # Named schemas (from all sources, deduplicated)
-    for manifest_path in find_named_schemas(project_root):
+    for manifest_path in find_named_schemas(project_root, scanner):
         name = manifest_path.parent.name
         try:
             schema = parse_deepschema_file(manifest_path, "named", name)
@@ -190,7 +165,7 @@ def discover_all_schemas(
             errors.append(DiscoveryError(file_path=manifest_path, error=str(e)))
 
     # Anonymous schemas
-    for schema_path in find_anonymous_schemas(project_root):
+    for schema_path in find_anonymous_schemas(project_root, scanner):
         target = anonymous_target_filename(schema_path.name)
         try:
             schema = parse_deepschema_file(schema_path, "anonymous", target)
@@ -13,20 +13,22 @@ from deepwork.deepschema.config import DeepSchema
 from deepwork.deepschema.discovery import anonymous_target_filename, discover_all_schemas
 from deepwork.deepschema.resolver import resolve_all
 from deepwork.review.config import ReferenceFile, ReviewRule
+from deepwork.utils.scanner import ProjectScanner
 
 
 def generate_review_rules(
-    project_root: Path,
+    project_root: Path, scanner: ProjectScanner | None = None
 ) -> tuple[list[ReviewRule], list[str]]:
     """Discover all DeepSchemas and generate ReviewRules from them.
 
     Args:
         project_root: Project root for schema discovery.
+        scanner: Shared scanner for the current run (see ``discover_all_schemas``).
 
     Returns:
         Tuple of (ReviewRule list, error messages).
     """
-    schemas, discovery_errors = discover_all_schemas(project_root)
+    schemas, discovery_errors = discover_all_schemas(project_root, scanner)
     errors = [f"{e.file_path}: {e.error}" for e in discovery_errors]
 
     resolved, resolve_errors = resolve_all(schemas)
@@ -0,0 +1,95 @@
+"""On-disk cache of validated job definitions for cold processes.
+
+Short-lived processes such as ``deepwork jobs get-stack`` (run from the
+post-compact hook) otherwise pay for YAML parsing and JSON Schema validation
+of every job they touch. After a ``job.yml`` passes validation its parsed
+data is stored as a ``marshal`` blob of plain dicts under
+``.deepwork/tmp/cache/jobs/``, named by a hash of the raw ``job.yml`` bytes,
+the DeepWork version, the Python version and the cache format. A later
+process with identical bytes rebuilds the ``JobDefinition`` from the blob
+without importing ``yaml`` or ``jsonschema``.
+
+Entries are immutable and content-addressed, so they never need
+invalidating: an edited ``job.yml`` simply hashes to a new entry. The cache
+is best-effort; unreadable entries are treated as misses and write failures
+are ignored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+from deepwork import __version__
+from deepwork.utils.fs import atomic_write
+
+logger = logging.getLogger("deepwork.jobs.cache")
+
+CACHE_FORMAT_VERSION = 1
+# Oldest entries beyond this count are pruned when a new entry is written
+MAX_CACHE_ENTRIES = 256
+
+_SUFFIX = ".marshal"
+
+
+def job_cache_dir(project_root: Path) -> Path | None:
+    """Return the job cache directory, or None if the project has no .deepwork dir."""
+    deepwork_dir = project_root / ".deepwork"
+    if not deepwork_dir.is_dir():
+        return None
+    return deepwork_dir / "tmp" / "cache" / "jobs"
+
+
+def cache_key(content: bytes) -> str:
+    """Return the cache key for the raw bytes of a job.yml."""
+    digest = hashlib.sha256(
+        f"{CACHE_FORMAT_VERSION}\0{__version__}\0{sys.version_info[:2]}\0".encode()
+    )
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def read_cached_job(cache_dir: Path, content: bytes) -> dict[str, Any] | None:
+    """Return the cached job data for this job.yml content, or None on a miss."""
+    try:
+        data = marshal.loads((cache_dir / (cache_key(content) + _SUFFIX)).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_cached_job(cache_dir: Path, content: bytes, job_data: dict[str, Any]) -> None:
+    """Store validated job data for this job.yml content."""
+    try:
+        payload = marshal.dumps(job_data)
+    except ValueError:
+        # Not plain data (e.g. YAML timestamps); leave it uncached
+        return
+    try:
+        atomic_write(cache_dir / (cache_key(content) + _SUFFIX), payload)
+        _prune(cache_dir)
+    except OSError as e:
+        logger.debug("Could not write job cache entry in %s: %s", cache_dir, e)
+
+
+def _prune(cache_dir: Path) -> None:
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(_SUFFIX):
+            try:
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+            except FileNotFoundError:
+                continue
+    if len(entries) <= MAX_CACHE_ENTRIES:
+        return
+    entries.sort()
+    for _mtime, path in entries[: len(entries) - MAX_CACHE_ENTRIES]:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -17,6 +17,7 @@ import os
 from dataclasses import dataclass
 from pathlib import Path
 
+from deepwork.jobs.cache import job_cache_dir
 from deepwork.jobs.parser import JobDefinition, ParseError, parse_job_definition
 
 logger = logging.getLogger("deepwork.jobs.discovery")
@@ -70,7 +71,8 @@ def load_all_jobs(
 
     Jobs are discovered from each folder returned by :func:`get_job_folders`.
     If two folders contain a job with the same directory name, the one from the
-    earlier folder wins (project-local overrides standard, etc.).
+    earlier folder wins (project-local overrides standard, etc.). Validated
+    definitions are read from and added to the project's job cache.
 
     Returns:
         Tuple of (successfully parsed jobs, errors for jobs that failed to load).
@@ -78,6 +80,7 @@ def load_all_jobs(
     seen_names: set[str] = set()
     jobs: list[JobDefinition] = []
     errors: list[JobLoadError] = []
+    cache_dir = job_cache_dir(project_root)
 
     for folder in get_job_folders(project_root):
         if not folder.exists() or not folder.is_dir():
@@ -91,7 +94,7 @@ def load_all_jobs(
                 continue
 
             try:
-                job = parse_job_definition(job_dir)
+                job = parse_job_definition(job_dir, cache_dir=cache_dir)
                 jobs.append(job)
                 seen_names.add(job_dir.name)
             except ParseError as e:
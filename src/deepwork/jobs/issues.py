@@ -8,9 +8,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from deepwork.jobs.discovery import load_all_jobs
 
+if TYPE_CHECKING:
+    from deepwork.jobs.registry import JobRegistry
+
 
 @dataclass
 class Issue:
@@ -23,15 +27,23 @@ class Issue:
     suggestion: str
 
 
-def detect_issues(project_root: Path) -> list[Issue]:
+def detect_issues(project_root: Path, registry: JobRegistry | None = None) -> list[Issue]:
     """Detect issues with job definitions.
 
     Currently detects:
     - job.yml files that don't conform to the schema
 
+    Args:
+        project_root: Project root directory
+        registry: Job registry to reuse cached load errors from. When None,
+            all jobs are parsed from disk.
+
     Returns empty list if all is well.
     """
-    _, load_errors = load_all_jobs(project_root)
+    if registry is not None:
+        _, load_errors = registry.load_all(project_root)
+    else:
+        _, load_errors = load_all_jobs(project_root)
     issues: list[Issue] = []
 
     for e in load_errors:
@@ -0,0 +1,261 @@
+"""Compressed archives of finished workflow history.
+
+Two archives keep the hot session state small:
+
+- Per-session archive segments. When a state file would hold more than
+  ``StateManager.hot_completed_limit`` completed/aborted workflows, the oldest
+  are moved into an immutable, gzip-compressed JSONL segment next to it:
+  ``session-<id>/archive/<stem>-<seq>.jsonl.gz``, where ``<stem>`` is
+  ``state`` or ``agent_<id>``. Segments are only ever added, never rewritten.
+- Project-level session archive. ``deepwork jobs gc`` packs session
+  directories that have not been modified for a configurable age (and,
+  unless forced, have no active workflows) into
+  ``.deepwork/tmp/archive/sessions/<platform>/`` and removes them.
+
+A crash between writing a segment and rewriting the state file can leave a
+workflow in both places; readers prefer the state file's copy.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from deepwork.jobs.mcp.session_index import index_path, read_index, scan_entries
+from deepwork.utils.fs import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("deepwork.jobs.mcp.archive")
+
+# Completed/aborted workflows kept in a state file before older ones are archived
+HOT_COMPLETED_LIMIT = 20
+
+ARCHIVE_DIR_NAME = "archive"
+_SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+def segment_dir(state_file: Path) -> Path:
+    """Return the directory holding a state file's archive segments."""
+    return state_file.parent / ARCHIVE_DIR_NAME
+
+
+def list_segments(state_file: Path) -> list[Path]:
+    """List a state file's archive segments, oldest first."""
+    directory = segment_dir(state_file)
+    pattern = re.compile(rf"{re.escape(state_file.stem)}-(\d+){re.escape(_SEGMENT_SUFFIX)}")
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    numbered = [(int(m.group(1)), name) for name in names if (m := pattern.fullmatch(name))]
+    return [directory / name for _, name in sorted(numbered)]
+
+
+def write_segment(state_file: Path, entries: list[dict[str, Any]]) -> Path:
+    """Write serialized workflows as a new archive segment.
+
+    The caller must hold the state file's lock.
+
+    Args:
+        state_file: State file the workflows are archived from
+        entries: Serialized WorkflowSession dicts, oldest first
+
+    Returns:
+        Path of the new segment
+    """
+    existing = list_segments(state_file)
+    seq = 1
+    if existing:
+        seq = int(existing[-1].name[len(state_file.stem) + 1 : -len(_SEGMENT_SUFFIX)]) + 1
+    path = segment_dir(state_file) / f"{state_file.stem}-{seq:06d}{_SEGMENT_SUFFIX}"
+    lines = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+    atomic_write(path, gzip.compress(lines.encode("utf-8")))
+    return path
+
+
+def read_segment(path: Path) -> list[dict[str, Any]]:
+    """Read the serialized workflows in an archive segment.
+
+    Raises:
+        OSError: If the segment cannot be read
+        ValueError: If the segment is not valid gzip-compressed JSONL
+    """
+    try:
+        content = gzip.decompress(path.read_bytes())
+    except (EOFError, gzip.BadGzipFile) as e:
+        raise ValueError(f"Corrupt archive segment {path}: {e}") from e
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+@dataclass
+class GcReport:
+    """Result of rotating stale sessions into the project-level archive.
+
+    Attributes:
+        archived: Archive files written (or that would be written on a dry run)
+        bytes_removed: Size of the session directories removed
+        bytes_archived: Size of the archive files written
+    """
+
+    archived: list[Path] = field(default_factory=list)
+    bytes_removed: int = 0
+    bytes_archived: int = 0
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return self.bytes_removed - self.bytes_archived
+
+
+def _dir_usage(directory: Path, *, include_root: bool = True) -> tuple[int, float]:
+    """Return (total file size, newest mtime) for a directory tree.
+
+    Lock files are skipped: taking a lock creates its file but changes no
+    state. With ``include_root=False`` the mtime of ``directory`` itself is
+    ignored too.
+    """
+    size = 0
+    newest = os.stat(directory).st_mtime if include_root else 0.0
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            if name.endswith(".lock"):
+                continue
+            try:
+                st = os.stat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            size += st.st_size
+            newest = max(newest, st.st_mtime)
+    return size, newest
+
+
+def archive_stale_sessions(
+    project_root: Path,
+    max_age_seconds: float,
+    *,
+    dry_run: bool = False,
+    force: bool = False,
+    now: float | None = None,
+) -> GcReport:
+    """Move session directories untouched for ``max_age_seconds`` into the archive.
+
+    Each stale ``.deepwork/tmp/sessions/<platform>/session-<id>/`` is packed
+    into ``.deepwork/tmp/archive/sessions/<platform>/session-<id>-<time>.tar.gz``
+    (``<time>`` is the session's last modification) and then removed.
+    Sessions the active-session index still lists are kept unless ``force``
+    is set. Each session is packed and removed while holding its state
+    files' locks, and is skipped if it changed while those were awaited.
+
+    Args:
+        project_root: Project root directory
+        max_age_seconds: Minimum time since any file in the session changed
+        dry_run: Report what would be archived without changing anything
+        force: Also archive stale sessions that still have active workflows
+        now: Current time as a Unix timestamp (default: ``time.time()``)
+
+    Returns:
+        What was archived and how much space was reclaimed
+    """
+    tmp_dir = project_root / ".deepwork" / "tmp"
+    sessions_base = tmp_dir / "sessions"
+    archive_base = tmp_dir / "archive" / "sessions"
+    cutoff = (time.time() if now is None else now) - max_age_seconds
+    active = set() if force else _active_session_dirs(project_root)
+    report = GcReport()
+
+    for session_dir in sorted(sessions_base.glob("*/session-*")):
+        if not session_dir.is_dir():
+            continue
+        if f"{session_dir.parent.name}/{session_dir.name}" in active:
+            continue
+        size, newest = _dir_usage(session_dir)
+        if newest > cutoff:
+            continue
+        if dry_run:
+            report.archived.append(_session_archive_path(archive_base, session_dir, newest))
+            report.bytes_removed += size
+            continue
+
+        with _locked_session(session_dir):
+            # Creating lock files touches the directory itself, so only the
+            # files inside count when re-checking the age.
+            size, newest = _dir_usage(session_dir, include_root=False)
+            if newest > cutoff:
+                logger.info("Session %s changed while waiting for its locks", session_dir)
+                continue
+            target = _session_archive_path(archive_base, session_dir, newest)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(target.parent), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f, tarfile.open(fileobj=f, mode="w:gz") as tar:
+                    tar.add(session_dir, arcname=session_dir.name)
+                os.replace(tmp_path, target)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            shutil.rmtree(session_dir)
+        report.archived.append(target)
+        report.bytes_removed += size
+        report.bytes_archived += target.stat().st_size
+        logger.info("Archived stale session %s to %s", session_dir, target)
+
+    return report
+
+
+def _session_archive_path(archive_base: Path, session_dir: Path, newest: float) -> Path:
+    """Return the archive file for a session last modified at ``newest``."""
+    stamp = datetime.fromtimestamp(newest, UTC).strftime("%Y%m%dT%H%M%SZ")
+    return archive_base / session_dir.parent.name / f"{session_dir.name}-{stamp}.tar.gz"
+
+
+def _active_session_dirs(project_root: Path) -> set[str]:
+    """Return ``<platform>/session-<id>`` for every session with an active workflow."""
+    entries = read_index(index_path(project_root))
+    if entries is None:
+        entries = scan_entries(project_root)
+    return {
+        PurePosixPath(entry["state_file"]).parent.as_posix()
+        for entry in entries
+        if isinstance(entry.get("state_file"), str)
+    }
+
+
+@contextmanager
+def _locked_session(session_dir: Path) -> Iterator[None]:
+    """Hold the cross-process lock of every state file in a session (blocking).
+
+    These are the ``<state file>.lock`` files ``StateManager`` locks around
+    each write. Sorted names put ``agent_*.json`` before ``state.json``,
+    the same order ``StateManager.transaction`` takes them in.
+    """
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+    with ExitStack() as stack:
+        for state_file in sorted(session_dir.glob("*.json")):
+            if state_file.name != "state.json" and not state_file.name.startswith("agent_"):
+                continue
+            lock_path = state_file.with_name(state_file.name + ".lock")
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            stack.callback(os.close, fd)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
@@ -0,0 +1,140 @@
+"""Keeping the MCP server's event loop responsive.
+
+Every tool handler shares one event loop, so synchronous work inside a
+handler (git subprocesses in the quality gate, YAML parsing, schema
+validation, status file writes) stalls every other agent's calls for its
+duration. ``BlockingExecutor`` runs such work on a dedicated, bounded thread
+pool; it is separate from the loop's default executor so a burst of slow
+reviews cannot starve the state writes ``StateManager`` sends to
+``asyncio.to_thread``.
+
+``LoopLagMonitor`` is the matching instrumentation: a probe task that sleeps
+for a fixed interval and, whenever it wakes up later than the threshold
+(i.e. something blocked the loop), logs a warning naming the tool calls that
+ran during that interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import itertools
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+logger = logging.getLogger("deepwork.jobs.mcp.blocking")
+
+T = TypeVar("T")
+
+# Threads for blocking tool work
+DEFAULT_BLOCKING_WORKERS = 8
+# Probe period and the lateness that counts as a blocked loop, in seconds
+DEFAULT_LAG_INTERVAL = 0.05
+DEFAULT_LAG_THRESHOLD = 0.1
+
+
+class BlockingExecutor:
+    """Bounded thread pool for synchronous work done by MCP tool handlers."""
+
+    def __init__(self, max_workers: int = DEFAULT_BLOCKING_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` on the pool and await its result.
+
+        Like ``asyncio.to_thread``, the call runs in a copy of the caller's
+        context, so context variables (e.g. ``StateManager.track_stats``
+        scopes) are visible to it.
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="deepwork-blocking"
+            )
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._pool, call)
+
+    def shutdown(self) -> None:
+        """Stop the pool's threads once queued work has finished."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+class LoopLagMonitor:
+    """Logs event-loop stalls together with the tool calls that ran meanwhile.
+
+    The probe only runs while tool calls are in flight: it is started by the
+    first ``track()`` and exits after the first tick with no calls left, so
+    an idle server does not wake up periodically.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_LAG_THRESHOLD,
+        interval: float = DEFAULT_LAG_INTERVAL,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = 0
+        self.max_lag = 0.0
+        self._active: dict[int, str] = {}
+        # Tools that ran since the last probe tick, including finished ones
+        self._seen: Counter[str] = Counter()
+        self._ids = itertools.count()
+        self._task: asyncio.Task[None] | None = None
+
+    @contextlib.contextmanager
+    def track(self, tool_name: str) -> Iterator[None]:
+        """Mark a tool call as in flight for the duration of the block."""
+        call_id = next(self._ids)
+        self._active[call_id] = tool_name
+        self._seen[tool_name] += 1
+        self._ensure_started()
+        try:
+            yield
+        finally:
+            del self._active[call_id]
+
+    def _ensure_started(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        # The first deadline is fixed now, so that a tool blocking the loop
+        # before the probe task first runs is still measured
+        self._task = loop.create_task(
+            self._probe(time.monotonic() + self.interval), name="deepwork-loop-lag-probe"
+        )
+
+    async def _probe(self, expected: float) -> None:
+        while True:
+            await asyncio.sleep(max(0.0, expected - time.monotonic()))
+            now = time.monotonic()
+            lag = now - expected
+            expected = now + self.interval
+            if lag >= self.threshold:
+                self.record_stall(lag, self._seen)
+            self._seen = Counter(self._active.values())
+            if not self._active:
+                return
+
+    def record_stall(self, lag: float, tools: Counter[str]) -> None:
+        """Count and log one stall of ``lag`` seconds during ``tools``' calls."""
+        self.stalls += 1
+        self.max_lag = max(self.max_lag, lag)
+        names = [name if n == 1 else f"{name} x{n}" for name, n in sorted(tools.items())]
+        logger.warning(
+            "Event loop blocked for %.0f ms during tool calls: %s",
+            lag * 1000,
+            ", ".join(names) or "none",
+        )
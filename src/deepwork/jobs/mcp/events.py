@@ -0,0 +1,290 @@
+"""Append-only stream of workflow progress events for external consumers.
+
+``.deepwork/tmp/status/v1/events.jsonl`` sits next to the status snapshots
+(see ``deepwork.jobs.mcp.status``) and gets one JSON line per change:
+
+    {"seq": 42, "time": "2026-10-16T09:30:00.123456+00:00",
+     "event": "step_finished", "session_id": "...", "agent_id": null,
+     "workflow_instance_id": "...", "job_name": "...",
+     "workflow_name": "...", "step_id": "..."}
+
+Event types are ``workflow_started`` (with ``goal``), ``step_started``,
+``step_finished``, ``quality_attempt`` (with ``attempt``),
+``workflow_completed`` and ``workflow_aborted`` (with ``reason``).
+
+``seq`` grows by one per event across the whole project, including across
+server processes, so a consumer remembers the last ``seq`` it has seen and
+reads only newer events: ``read_events``, ``deepwork jobs tail --since``, or
+the ``/events`` SSE endpoint of ``deepwork serve --transport sse``. Once the
+file would grow past ``max_bytes`` it is rotated to ``events.jsonl.1``
+(older files shift up to ``.<backups>``). Sequence numbers continue across
+rotations, so a gap tells a consumer it fell behind the retained history.
+
+``StateManager`` appends the events of each committed transaction while
+holding the log's file lock (``events.jsonl.lock``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections.abc import AsyncIterator, Callable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+EVENTS_FILE_NAME = "events.jsonl"
+# Rotate the live file before it grows past this many bytes
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Rotated files kept (events.jsonl.1 ... events.jsonl.<backups>)
+DEFAULT_BACKUPS = 3
+
+EVENT_TYPES = (
+    "workflow_started",
+    "step_started",
+    "step_finished",
+    "quality_attempt",
+    "workflow_completed",
+    "workflow_aborted",
+)
+
+# Bytes read from the end of a file to find its last sequence number
+_TAIL_BYTES = 64 * 1024
+
+# (mtime_ns, size, inode)
+_Signature = tuple[int, int, int]
+
+
+def events_path(project_root: Path) -> Path:
+    """Return the path of the project's live event log."""
+    return project_root / ".deepwork" / "tmp" / "status" / "v1" / EVENTS_FILE_NAME
+
+
+def _signature(path: Path) -> _Signature | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def log_files(path: Path) -> list[Path]:
+    """Return the live log and its rotated files that exist, oldest first."""
+    rotated: list[tuple[int, Path]] = []
+    for candidate in path.parent.glob(path.name + ".*"):
+        suffix = candidate.name[len(path.name) + 1 :]
+        if suffix.isdigit():
+            rotated.append((int(suffix), candidate))
+    files = [p for _n, p in sorted(rotated, reverse=True)]
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def _parse_lines(data: bytes) -> Iterator[dict[str, Any]]:
+    """Decode complete JSON lines, skipping a torn last line and junk."""
+    lines = data.split(b"\n")
+    for line in lines[:-1]:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict) and isinstance(event.get("seq"), int):
+            yield event
+
+
+def _first_seq(path: Path) -> int | None:
+    try:
+        with open(path, "rb") as f:
+            line = f.readline()
+    except FileNotFoundError:
+        return None
+    return next((e["seq"] for e in _parse_lines(line)), None)
+
+
+def _last_seq_in(path: Path) -> int | None:
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - _TAIL_BYTES))
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    seqs = [e["seq"] for e in _parse_lines(data)]
+    return seqs[-1] if seqs else None
+
+
+def last_seq(path: Path) -> int:
+    """Return the highest sequence number in the log, or 0 if it has no events."""
+    for candidate in reversed(log_files(path)):
+        seq = _last_seq_in(candidate)
+        if seq is not None:
+            return seq
+    return 0
+
+
+def read_events(path: Path, since: int = 0, limit: int | None = None) -> list[dict[str, Any]]:
+    """Read events with a sequence number greater than ``since``, oldest first.
+
+    Rotated files that only hold older events are not read.
+
+    Args:
+        path: Path of the live event log
+        since: Last sequence number the caller has already seen
+        limit: Maximum number of events to return
+    """
+    files = log_files(path)
+    start = 0
+    for i in range(len(files) - 1, -1, -1):
+        first = _first_seq(files[i])
+        if first is not None and first <= since + 1:
+            start = i
+            break
+
+    events: list[dict[str, Any]] = []
+    last = since
+    for file in files[start:]:
+        try:
+            data = file.read_bytes()
+        except FileNotFoundError:
+            # Rotated away while reading; its events are in the next file
+            continue
+        for event in _parse_lines(data):
+            # Dedupes events seen twice when a rotation races the read
+            if event["seq"] <= last:
+                continue
+            events.append(event)
+            last = event["seq"]
+            if limit is not None and len(events) >= limit:
+                return events
+    return events
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    """Encode an event as one Server-Sent Events message."""
+    return f"id: {event['seq']}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def stream_events(
+    path: Path,
+    since: int = 0,
+    *,
+    poll_interval: float = 0.5,
+    keepalive: float = 15.0,
+    stop: Callable[[], bool] | None = None,
+) -> AsyncIterator[str]:
+    """Yield SSE messages for new events until ``stop()`` returns true.
+
+    The log is re-read only when its stat signature changes. A comment line
+    is sent after ``keepalive`` seconds without events so proxies keep the
+    connection open. ``stop`` is checked every poll; without it the stream
+    never ends.
+    """
+    signature: _Signature | None = None
+    idle = 0.0
+    while stop is None or not stop():
+        current = _signature(path)
+        if current != signature:
+            signature = current
+            for event in await asyncio.to_thread(read_events, path, since):
+                since = event["seq"]
+                idle = 0.0
+                yield format_sse(event)
+        if idle >= keepalive:
+            idle = 0.0
+            yield ": keepalive\n\n"
+        await asyncio.sleep(poll_interval)
+        idle += poll_interval
+
+
+def _truncate_torn_tail(path: Path) -> bool:
+    """Cut a partial last line off the file so the next append starts a line.
+
+    Returns:
+        Whether the file was truncated
+    """
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - _TAIL_BYTES)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos == end:
+            return False
+        f.truncate(pos)
+        return True
+
+
+class EventLog:
+    """Appends events to the project's event log, numbering and rotating it."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+    ) -> None:
+        """Initialize the log.
+
+        Args:
+            path: Path of the live event log (see ``events_path``)
+            max_bytes: Size past which the live file is rotated
+            backups: Number of rotated files to keep
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = max(backups, 1)
+        # Last sequence number written, valid while the file's signature matches
+        self._seq = 0
+        self._signature: _Signature | None = None
+
+    def append(self, events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Number, timestamp and append events.
+
+        The caller must hold the log's file lock (``path`` + ``.lock``), which
+        keeps sequence numbers unique across processes.
+
+        Returns:
+            The records as written
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        signature = _signature(self.path)
+        if signature is None or signature != self._signature:
+            # Another process appended or rotated since our last write, or a
+            # writer died mid-line; our own appends always end in a newline
+            if signature is not None and _truncate_torn_tail(self.path):
+                signature = _signature(self.path)
+            self._seq = last_seq(self.path)
+
+        now = datetime.now(UTC).isoformat()
+        records = []
+        for event in events:
+            self._seq += 1
+            records.append({"seq": self._seq, "time": now, **event})
+        payload = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode()
+
+        if (
+            signature is not None
+            and 0 < signature[1]
+            and signature[1] + len(payload) > self.max_bytes
+        ):
+            self._rotate()
+        with open(self.path, "ab") as f:
+            f.write(payload)
+        self._signature = _signature(self.path)
+        return records
+
+    def _rotate(self) -> None:
+        for n in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{n}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{n + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
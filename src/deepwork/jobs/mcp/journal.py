@@ -0,0 +1,196 @@
+"""Append-only journal for workflow session state files.
+
+In journaled mode a state file (``state.json`` / ``agent_<id>.json``) is a
+snapshot, and later mutations are appended to a sibling ``.journal`` file as
+one compact JSON record per line instead of rewriting the whole snapshot:
+
+    {"gen": "<generation>", "keep": 2, "push": [<session>], "completed": [<session>]}
+
+Replaying a record truncates the workflow stack to its first ``keep``
+entries, appends ``push``, and appends ``completed`` (when present) to
+``completed_workflows``. Usually only the top-of-stack session changed, so
+a record carries that one session and nothing from the completed list.
+
+Each snapshot written in journaled mode carries a random
+``journal_generation``, and records are only replayed when their ``gen``
+matches it. Compaction writes a new snapshot (new generation) and then
+removes the journal, so a crash between the two steps leaves records that
+are ignored rather than applied twice. Readers stop at the first record
+that is incomplete (no trailing newline), unparseable, or from another
+generation. The next append truncates the journal back to that point, so a
+torn tail from a crash mid-append is discarded.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Compact once the journal holds this many records ...
+JOURNAL_MAX_RECORDS = 200
+# ... or grows past the snapshot size (but never below this many bytes)
+JOURNAL_MIN_COMPACT_BYTES = 64 * 1024
+
+
+@dataclass
+class JournaledState:
+    """A state snapshot with its journal replayed on top.
+
+    Attributes:
+        data: Decoded state (``workflow_stack`` / ``completed_workflows``),
+            or None if the snapshot is not a valid JSON object
+        generation: Snapshot's ``journal_generation``, or None if it was
+            written without journaling
+        snapshot_size: Size of the snapshot in bytes
+        journal_size: Byte offset just past the last valid journal record
+        journal_records: Number of valid journal records replayed
+    """
+
+    data: dict[str, Any] | None
+    generation: str | None
+    snapshot_size: int
+    journal_size: int = 0
+    journal_records: int = 0
+
+
+def journal_path(state_file: Path) -> Path:
+    """Return the journal file that belongs to a state snapshot."""
+    return state_file.with_suffix(".journal")
+
+
+def new_generation() -> str:
+    """Return a fresh snapshot generation token."""
+    return uuid.uuid4().hex
+
+
+def read_state_file(state_file: Path) -> JournaledState:
+    """Read a state snapshot and replay its journal, if any.
+
+    Args:
+        state_file: Path to the snapshot (``state.json`` or ``agent_<id>.json``)
+
+    Returns:
+        The materialized state
+
+    Raises:
+        FileNotFoundError: If the snapshot does not exist
+    """
+    content = state_file.read_bytes()
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        data = None
+    if not isinstance(data, dict):
+        return JournaledState(data=None, generation=None, snapshot_size=len(content))
+
+    generation = data.get("journal_generation")
+    state = JournaledState(data=data, generation=generation, snapshot_size=len(content))
+    if not isinstance(generation, str):
+        state.generation = None
+        return state
+
+    try:
+        journal = journal_path(state_file).read_bytes()
+    except FileNotFoundError:
+        return state
+
+    stack: list[dict[str, Any]] = list(data.get("workflow_stack", []))
+    completed: list[dict[str, Any]] | None = data.get("completed_workflows")
+    offset = 0
+    while True:
+        end = journal.find(b"\n", offset)
+        if end == -1:
+            break
+        try:
+            record = json.loads(journal[offset:end])
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            break
+        if (
+            not isinstance(record, dict)
+            or record.get("gen") != generation
+            or not isinstance(record.get("keep"), int)
+            or not isinstance(record.get("push"), list)
+        ):
+            break
+        stack = stack[: record["keep"]] + record["push"]
+        if "completed" in record:
+            completed = (completed or []) + record["completed"]
+        offset = end + 1
+        state.journal_records += 1
+
+    state.journal_size = offset
+    if state.journal_records:
+        state.data = {**data, "workflow_stack": stack, "completed_workflows": completed}
+    return state
+
+
+def build_record(
+    generation: str,
+    old_stack: list[dict[str, Any]],
+    new_stack: list[dict[str, Any]],
+    old_completed: list[dict[str, Any]] | None,
+    new_completed: list[dict[str, Any]] | None,
+) -> dict[str, Any] | None:
+    """Describe the change from old to new state as one journal record.
+
+    Returns:
+        The record, or None if the change cannot be expressed as a journal
+        record (completed workflows removed or rewritten) and a full
+        snapshot is needed instead.
+    """
+    keep = 0
+    limit = min(len(old_stack), len(new_stack))
+    while keep < limit and old_stack[keep] == new_stack[keep]:
+        keep += 1
+    record: dict[str, Any] = {"gen": generation, "keep": keep, "push": new_stack[keep:]}
+
+    if new_completed is not old_completed:
+        if new_completed is None:
+            return None
+        old = old_completed or []
+        if len(new_completed) < len(old) or new_completed[: len(old)] != old:
+            return None
+        if old_completed is None or len(new_completed) > len(old):
+            record["completed"] = new_completed[len(old) :]
+    return record
+
+
+def should_compact(state: JournaledState, record_size: int) -> bool:
+    """Whether appending a record of ``record_size`` bytes should compact instead."""
+    if state.journal_records >= JOURNAL_MAX_RECORDS:
+        return True
+    limit = max(state.snapshot_size, JOURNAL_MIN_COMPACT_BYTES)
+    return state.journal_size + record_size > limit
+
+
+def encode_record(record: dict[str, Any]) -> bytes:
+    """Serialize a record as one compact, newline-terminated JSON line."""
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def append_record(state_file: Path, line: bytes, valid_size: int) -> os.stat_result:
+    """Append an encoded record to a state file's journal.
+
+    Anything past ``valid_size`` (a torn tail or records from an older
+    generation) is truncated first. The caller must hold the state file's
+    lock.
+
+    Returns:
+        The journal's stat after the append
+    """
+    fd = os.open(journal_path(state_file), os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size != valid_size:
+            os.ftruncate(fd, valid_size)
+        os.lseek(fd, valid_size, os.SEEK_SET)
+        view = memoryview(line)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        return os.fstat(fd)
+    finally:
+        os.close(fd)
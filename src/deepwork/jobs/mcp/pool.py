@@ -0,0 +1,238 @@
+"""Per-root component bundles for serving several worktrees from one server.
+
+Without ``--path`` each tool call resolves its project root from the
+client's listRoots (see ``deepwork.jobs.mcp.roots``), so one server can
+serve agents working in different git worktrees at the same time. Every
+root gets its own ``RootBundle``: a ``StateManager`` whose sessions live
+under that root, a ``StatusWriter`` and event log for that root's status
+directory, a ``JobRegistry`` and the ``WorkflowTools`` bound to all of
+them. Caches inside the bundle therefore never mix entries from two
+worktrees, and a handler that resolved its bundle once uses the same root
+for the whole call even if another call switches roots meanwhile.
+
+``RootPool`` creates bundles on first use and keeps the most recently used
+ones. Building a bundle parses and validates every job of its root, so
+leases build it on the blocking thread pool; concurrent first calls for a
+root share one build. A bundle is evicted when the pool grows past ``max_size`` or when it
+has been idle for ``idle_timeout`` seconds, but never while a call holds it
+(``lease``). An evicted bundle's pending status writes are flushed in the
+background before it is dropped. At most ``max_concurrent`` calls hold a
+bundle at a time; further calls for that project wait for a free slot, so
+one busy project cannot take every worker thread of a shared server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from deepwork.jobs.issues import Issue
+    from deepwork.jobs.mcp.blocking import BlockingExecutor
+    from deepwork.jobs.mcp.state import StateManager
+    from deepwork.jobs.mcp.status import StatusWriter
+    from deepwork.jobs.mcp.tools import WorkflowTools
+    from deepwork.jobs.registry import JobRegistry
+
+logger = logging.getLogger("deepwork.jobs.mcp")
+
+# Bundles kept for distinct project roots
+DEFAULT_POOL_SIZE = 8
+# Seconds after which an unused bundle is evicted
+DEFAULT_IDLE_TIMEOUT = 600.0
+# Tool calls running at once per project root
+DEFAULT_PROJECT_CONCURRENCY = 8
+
+
+@dataclass
+class RootBundle:
+    """The components that serve one project root."""
+
+    root: Path
+    state_manager: StateManager
+    status_writer: StatusWriter
+    job_registry: JobRegistry
+    tools: WorkflowTools
+    # Problems found in the root's job definitions when the bundle was built
+    issues: list[Issue] = field(default_factory=list)
+    last_used: float = field(default_factory=time.monotonic)
+    # Calls currently holding or waiting for the bundle; only idle bundles
+    # are evicted
+    in_use: int = 0
+    # Bounds the calls running at once for this root (set by RootPool)
+    slots: asyncio.Semaphore = field(init=False, repr=False)
+
+
+@dataclass
+class PoolStats:
+    """Counters for RootPool.
+
+    Attributes:
+        leases: Bundles handed to tool calls
+        created: Bundles built (first use of a root, or reuse after eviction)
+        evicted: Bundles dropped for size or idleness
+        throttled: Leases that waited for a free slot of their project
+    """
+
+    leases: int = 0
+    created: int = 0
+    evicted: int = 0
+    throttled: int = 0
+
+
+class RootPool:
+    """LRU pool of ``RootBundle`` objects keyed by project root."""
+
+    def __init__(
+        self,
+        factory: Callable[[Path], RootBundle],
+        *,
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+        pinned: Path | None = None,
+        max_concurrent: int = DEFAULT_PROJECT_CONCURRENCY,
+        blocking: BlockingExecutor | None = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            factory: Builds the bundle for a root
+            max_size: Number of bundles kept before the least recently used
+                idle one is evicted
+            idle_timeout: Seconds after which an idle bundle is evicted.
+                None keeps bundles until the pool is full.
+            pinned: Root whose bundle is never evicted (the startup root)
+            max_concurrent: Leases of one bundle that may be held at once
+            blocking: Thread pool that leases build bundles on.
+                ``asyncio.to_thread`` is used when None.
+        """
+        self.factory = factory
+        self.max_size = max(max_size, 1)
+        self.idle_timeout = idle_timeout
+        self.pinned = pinned
+        self.max_concurrent = max(max_concurrent, 1)
+        self.blocking = blocking
+        self.stats = PoolStats()
+        self._bundles: OrderedDict[Path, RootBundle] = OrderedDict()
+        # Bundles being built by a lease, shared by concurrent first calls
+        self._building: dict[Path, asyncio.Task[RootBundle]] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._bundles)
+
+    def __contains__(self, root: object) -> bool:
+        return root in self._bundles
+
+    def bundles(self) -> list[RootBundle]:
+        """Return the pooled bundles, least recently used first."""
+        return list(self._bundles.values())
+
+    def get(self, root: Path) -> RootBundle:
+        """Return the bundle for ``root``, building it on this thread on first use.
+
+        For callers outside the event loop (server startup); tool calls use
+        ``lease``, which builds off the loop.
+        """
+        bundle = self._bundles.get(root)
+        if bundle is None:
+            bundle = self._add(root, self.factory(root))
+        return self._touch(root, bundle)
+
+    async def _get(self, root: Path) -> RootBundle:
+        # Loops in case another root's first call evicted the new bundle
+        # before this waiter resumed
+        while (bundle := self._bundles.get(root)) is None:
+            task = self._building.get(root)
+            if task is None:
+                task = asyncio.get_running_loop().create_task(self._build(root))
+                self._building[root] = task
+            # A cancelled waiter does not abandon the build for the others
+            await asyncio.shield(task)
+        return self._touch(root, bundle)
+
+    async def _build(self, root: Path) -> RootBundle:
+        try:
+            if self.blocking is not None:
+                bundle = await self.blocking.run(self.factory, root)
+            else:
+                bundle = await asyncio.to_thread(self.factory, root)
+        finally:
+            del self._building[root]
+        return self._add(root, bundle)
+
+    def _add(self, root: Path, bundle: RootBundle) -> RootBundle:
+        existing = self._bundles.get(root)
+        if existing is not None:
+            # get() built one while the lease's build was running
+            return existing
+        bundle.slots = asyncio.Semaphore(self.max_concurrent)
+        self._bundles[root] = bundle
+        self.stats.created += 1
+        logger.debug("Created components for project root %s", root)
+        return bundle
+
+    def _touch(self, root: Path, bundle: RootBundle) -> RootBundle:
+        self._bundles.move_to_end(root)
+        bundle.last_used = time.monotonic()
+        self._evict(keep=root)
+        return bundle
+
+    @contextlib.asynccontextmanager
+    async def lease(self, root: Path) -> AsyncIterator[RootBundle]:
+        """Hold the bundle for ``root`` for the duration of a tool call.
+
+        Builds the bundle on the blocking pool on first use, and waits while
+        ``max_concurrent`` calls already hold it.
+        """
+        bundle = await self._get(root)
+        self.stats.leases += 1
+        bundle.in_use += 1
+        try:
+            if bundle.slots.locked():
+                self.stats.throttled += 1
+            async with bundle.slots:
+                yield bundle
+        finally:
+            bundle.in_use -= 1
+            bundle.last_used = time.monotonic()
+
+    def _evict(self, keep: Path) -> None:
+        now = time.monotonic()
+        for root, bundle in list(self._bundles.items()):
+            if bundle.in_use or root in (keep, self.pinned):
+                continue
+            over_size = len(self._bundles) > self.max_size
+            idle = self.idle_timeout is not None and now - bundle.last_used >= self.idle_timeout
+            if not (over_size or idle):
+                continue
+            del self._bundles[root]
+            self.stats.evicted += 1
+            logger.debug("Evicted components for project root %s", root)
+            self._close_later(bundle)
+
+    def _close_later(self, bundle: RootBundle) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop, so nothing can be waiting in the debounce window
+            return
+        task = loop.create_task(bundle.status_writer.flush())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        """Flush every bundle's pending status writes, including evicted ones."""
+        if self._building:
+            await asyncio.gather(*self._building.values(), return_exceptions=True)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        for bundle in list(self._bundles.values()):
+            await bundle.status_writer.flush()
@@ -27,6 +27,7 @@ from deepwork.review.instructions import (
     write_instruction_files,
 )
 from deepwork.review.matcher import get_changed_files, match_files_to_rules
+from deepwork.utils.scanner import ProjectScanner
 from deepwork.utils.validation import ValidationError, validate_against_schema
 
 logger = logging.getLogger("deepwork.jobs.mcp.quality_gate")
@@ -415,11 +416,13 @@ def run_quality_gate(
         platform=platform,
     )
 
-    # 3. Load .deepreview rules
-    deepreview_rules, _errors = load_all_rules(project_root)
+    # 3. Load .deepreview rules (the scanner walks the project tree once
+    # for both .deepreview files and DeepSchemas)
+    scanner = ProjectScanner(project_root)
+    deepreview_rules, _errors = load_all_rules(project_root, scanner)
 
     # 3b. Load DeepSchema-generated review rules
-    schema_rules, _schema_errors = gen_schema_rules(project_root)
+    schema_rules, _schema_errors = gen_schema_rules(project_root, scanner)
     deepreview_rules.extend(schema_rules)
 
     # 4. Collect output file paths
@@ -453,7 +456,7 @@ def run_quality_gate(
     if not all_tasks:
         return None
 
-    # 8. Write instruction files (honors .passed markers)
+    # 8. Write instruction files (skips reviews passed in the review ledger)
     task_files = write_instruction_files(all_tasks, project_root)
 
     if not task_files:
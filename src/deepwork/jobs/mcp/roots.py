@@ -3,15 +3,25 @@
 Resolves the project root dynamically by asking the MCP client for its
 filesystem roots.  When ``--path`` is explicitly passed on the CLI the
 resolver always returns that path.  Otherwise it calls ``ctx.list_roots()``
-on every tool invocation so it tracks workspace changes (e.g. git worktree
-switches) without caching stale values.
+to track workspace changes (e.g. git worktree switches).
+
+The resolved root is cached per client session when it can be kept fresh:
+either the client declared the ``roots.listChanged`` capability, in which
+case the entry lives until the client sends
+``notifications/roots/list_changed``, or a TTL is configured as a fallback
+for clients that never notify.  Without either, every tool call asks the
+client, so a stale root is never returned.
 """
 
 from __future__ import annotations
 
 import logging
+import time
+import weakref
+from collections.abc import Iterable
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from urllib.parse import unquote, urlparse
 
 if TYPE_CHECKING:
@@ -19,6 +29,21 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("deepwork.jobs.mcp")
 
+ROOTS_LIST_CHANGED = "notifications/roots/list_changed"
+
+
+def _first_file_root(roots: Iterable[Any], fallback: Path) -> Path:
+    for root in roots:
+        uri = str(root.uri)
+        parsed = urlparse(uri)
+        if parsed.scheme == "file":
+            path = Path(unquote(parsed.path)).resolve()
+            logger.debug("Resolved project root from listRoots: %s", path)
+            return path
+
+    logger.debug("No file:// root found, using fallback %s", fallback)
+    return fallback
+
 
 async def resolve_project_root(ctx: Context, fallback: Path) -> Path:
     """Ask the MCP client for its filesystem root.
@@ -32,17 +57,49 @@ async def resolve_project_root(ctx: Context, fallback: Path) -> Path:
     except Exception:
         logger.debug("list_roots unavailable, using fallback %s", fallback)
         return fallback
+    return _first_file_root(roots, fallback)
 
-    for root in roots:
-        uri = str(root.uri)
-        parsed = urlparse(uri)
-        if parsed.scheme == "file":
-            path = Path(unquote(parsed.path)).resolve()
-            logger.debug("Resolved project root from listRoots: %s", path)
-            return path
 
-    logger.debug("No file:// root found, using fallback %s", fallback)
-    return fallback
+def session_key(ctx: Context) -> Any | None:
+    """Return the client session of a request context, or None outside a request."""
+    try:
+        return ctx.session
+    except Exception:
+        return None
+
+
+def _notifies_root_changes(ctx: Context) -> bool:
+    """Whether the client declared that it sends roots/list_changed."""
+    try:
+        params = ctx.session.client_params
+    except Exception:
+        return False
+    roots = params.capabilities.roots if params is not None else None
+    # The field is ``listChanged`` in mcp 1.x and ``list_changed`` from 2.0
+    return any(getattr(roots, name, None) is True for name in ("list_changed", "listChanged"))
+
+
+@dataclass
+class RootStats:
+    """Counters for RootResolver's per-session root cache.
+
+    Attributes:
+        lookups: Dynamic root lookups (one per tool call without ``--path``)
+        cache_hits: Lookups served from the cache (listRoots round-trips saved)
+        list_roots_calls: listRoots round-trips made to the client
+        invalidations: Cache invalidations from roots/list_changed
+    """
+
+    lookups: int = 0
+    cache_hits: int = 0
+    list_roots_calls: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _CachedRoot:
+    root: Path
+    resolved_at: float
 
 
 class RootResolver:
@@ -57,25 +114,68 @@ class RootResolver:
         When ``True`` the *fallback_root* was explicitly provided via
         ``--path`` and MUST be used unconditionally.  ``list_roots`` is
         never consulted.
+    ttl:
+        Maximum age in seconds of a cached root.  When set, roots are also
+        cached for clients that do not declare ``roots.listChanged``.
     """
 
-    def __init__(self, fallback_root: Path, *, explicit: bool) -> None:
+    def __init__(self, fallback_root: Path, *, explicit: bool, ttl: float | None = None) -> None:
         self._fallback = fallback_root
         self._explicit = explicit
+        self.ttl = ttl
+        self.stats = RootStats()
+        # Entries disappear with the client session they belong to
+        self._cache: weakref.WeakKeyDictionary[Any, _CachedRoot] = weakref.WeakKeyDictionary()
+        # Bumped by invalidate() so a listRoots reply that was in flight
+        # during an invalidation is not cached
+        self._generation = 0
 
     @property
     def startup_root(self) -> Path:
         """Return the root for startup code that runs before a client connects."""
         return self._fallback
 
+    def invalidate(self, session: Any | None = None) -> None:
+        """Forget the cached root of one client session (or of every session)."""
+        self.stats.invalidations += 1
+        self._generation += 1
+        if session is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(session, None)
+
     async def get_root(self, ctx: Context) -> Path:
         """Return the project root for the current tool invocation.
 
         When ``--path`` was explicitly set, returns *fallback_root* without
-        consulting the client.  Otherwise calls ``list_roots()`` every time
-        so workspace changes (e.g. worktree switches) are picked up
-        immediately.
+        consulting the client.  Otherwise returns the client session's cached
+        root while it is valid, and calls ``list_roots()`` when there is
+        none, so workspace changes (e.g. worktree switches) are picked up on
+        the first call after the client reports them.
         """
         if self._explicit:
             return self._fallback
-        return await resolve_project_root(ctx, self._fallback)
+
+        self.stats.lookups += 1
+        session = session_key(ctx)
+        cacheable = session is not None and (self.ttl is not None or _notifies_root_changes(ctx))
+        if cacheable:
+            cached = self._cache.get(session)
+            if cached is not None and (
+                self.ttl is None or time.monotonic() - cached.resolved_at < self.ttl
+            ):
+                self.stats.cache_hits += 1
+                return cached.root
+
+        generation = self._generation
+        self.stats.list_roots_calls += 1
+        try:
+            roots = await ctx.list_roots()
+        except Exception:
+            # Not cached: the next call asks again
+            logger.debug("list_roots unavailable, using fallback %s", self._fallback)
+            return self._fallback
+        root = _first_file_root(roots, self._fallback)
+        if cacheable and generation == self._generation:
+            self._cache[session] = _CachedRoot(root, time.monotonic())
+        return root
@@ -0,0 +1,167 @@
+"""Ordering and accounting of concurrent tool calls.
+
+One server process can serve many agent sessions at once (``deepwork serve
+--transport http``), and clients may send several requests without waiting
+for the replies. ``CallScheduler`` runs the calls of one workflow session
+(one ``session_id``/``agent_id`` pair) one at a time in arrival order, so
+e.g. a ``finished_step`` is never overtaken by the ``go_to_step`` sent after
+it. Calls of different sessions, and calls without a ``session_id``, run
+concurrently; how many run per project is bounded by ``RootPool``.
+
+The scheduler also counts calls for the ``/health`` endpoint and drives
+graceful shutdown: once ``draining`` is set, new calls are refused and
+``drain()`` waits for the calls in flight. ``DrainOnSignal`` sets it as soon
+as uvicorn receives SIGINT/SIGTERM, while connections are still open.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import signal
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Hashable
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Seconds shutdown waits for in-flight tool calls
+DEFAULT_DRAIN_TIMEOUT = 30.0
+
+
+class ServerDrainingError(Exception):
+    """Raised for tool calls that arrive after shutdown has started."""
+
+    pass
+
+
+@dataclass
+class _SessionQueue:
+    lock: asyncio.Lock
+    # Calls running or waiting; the queue is dropped when this reaches 0
+    calls: int = 0
+
+
+def session_call_key(arguments: dict[str, Any] | None) -> Hashable | None:
+    """Return the key whose calls must run in order, or None for unordered calls."""
+    session_id = (arguments or {}).get("session_id")
+    if not session_id:
+        return None
+    return (session_id, (arguments or {}).get("agent_id"))
+
+
+class CallScheduler:
+    """Runs each workflow session's tool calls in order and counts all calls."""
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.draining = False
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        # Calls that had to wait for an earlier call of their session
+        self.queued = 0
+        self._queues: dict[Hashable, _SessionQueue] = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, key: Hashable | None) -> AsyncIterator[None]:
+        """Hold the call's turn for the duration of the block.
+
+        Raises:
+            ServerDrainingError: If shutdown has started
+        """
+        if self.draining:
+            self.rejected += 1
+            raise ServerDrainingError("DeepWork server is shutting down; retry the call")
+        self.in_flight += 1
+        queue = None
+        if key is not None:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = _SessionQueue(asyncio.Lock())
+            queue.calls += 1
+        try:
+            if queue is None:
+                yield
+            else:
+                if queue.lock.locked():
+                    self.queued += 1
+                # asyncio.Lock wakes waiters first-in first-out
+                async with queue.lock:
+                    yield
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+        finally:
+            self.in_flight -= 1
+            if queue is not None:
+                queue.calls -= 1
+                if queue.calls == 0:
+                    del self._queues[key]
+
+    async def drain(self, timeout: float = DEFAULT_DRAIN_TIMEOUT) -> bool:
+        """Refuse new calls and wait for the ones in flight.
+
+        Returns:
+            True if every call finished within ``timeout`` seconds
+        """
+        self.draining = True
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return self.in_flight == 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the call counters for the health endpoint."""
+        return {
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queued": self.queued,
+            "active_sessions": len(self._queues),
+        }
+
+
+class DrainOnSignal:
+    """ASGI middleware that starts draining when the server is told to stop.
+
+    On SIGINT/SIGTERM uvicorn closes its listeners and waits up to
+    ``timeout_graceful_shutdown`` for open connections before it runs the
+    lifespan shutdown, where ``CallScheduler.drain`` runs. Chaining onto
+    uvicorn's signal handlers (installed before the lifespan starts) marks
+    the scheduler as draining right away instead: ``/health`` reports 503,
+    new tool calls are refused and ``/events`` streams end, so connections
+    close within the timeout. uvicorn restores its own handlers on exit.
+    """
+
+    def __init__(self, app: ASGIApp, scheduler: CallScheduler) -> None:
+        self.app = app
+        self.scheduler = scheduler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            self._chain_signal_handlers()
+        await self.app(scope, receive, send)
+
+    def _chain_signal_handlers(self) -> None:
+        # Handlers can only be changed from the main thread
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(sig)
+            if callable(previous):
+                signal.signal(sig, functools.partial(self._handle, previous))
+
+    def _handle(
+        self, previous: Callable[[int, FrameType | None], Any], sig: int, frame: FrameType | None
+    ) -> None:
+        self.scheduler.draining = True
+        previous(sig, frame)
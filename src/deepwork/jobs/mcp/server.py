@@ -15,14 +15,37 @@ from __future__ import annotations
 
 import logging
 import shutil
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any
 
 from fastmcp import Context, FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 
+from deepwork.jobs.cache import job_cache_dir
 from deepwork.jobs.discovery import load_all_jobs
 from deepwork.jobs.issues import Issue, detect_issues, format_issues_for_agent
-from deepwork.jobs.mcp.roots import RootResolver
+from deepwork.jobs.mcp.blocking import (
+    DEFAULT_BLOCKING_WORKERS,
+    DEFAULT_LAG_THRESHOLD,
+    BlockingExecutor,
+    LoopLagMonitor,
+)
+from deepwork.jobs.mcp.events import EventLog, events_path, stream_events
+from deepwork.jobs.mcp.pool import DEFAULT_PROJECT_CONCURRENCY, RootBundle, RootPool
+from deepwork.jobs.mcp.roots import ROOTS_LIST_CHANGED, RootResolver, session_key
+from deepwork.jobs.mcp.scheduling import (
+    DEFAULT_DRAIN_TIMEOUT,
+    CallScheduler,
+    ServerDrainingError,
+    session_call_key,
+)
 from deepwork.jobs.mcp.schemas import (
     AbortWorkflowInput,
     ArgumentValue,
@@ -32,9 +55,10 @@ from deepwork.jobs.mcp.schemas import (
     RegisterSessionJobInput,
     StartWorkflowInput,
 )
-from deepwork.jobs.mcp.state import StateManager
+from deepwork.jobs.mcp.state import StateManager, StateStats
 from deepwork.jobs.mcp.status import StatusWriter
 from deepwork.jobs.mcp.tools import WorkflowTools
+from deepwork.jobs.registry import JobRegistry
 
 # Configure logging
 logger = logging.getLogger("deepwork.jobs.mcp")
@@ -60,6 +84,13 @@ def create_server(
     platform: str | None = None,
     *,
     explicit_path: bool = True,
+    state_journal: bool = False,
+    blocking_workers: int = DEFAULT_BLOCKING_WORKERS,
+    loop_lag_threshold: float | None = DEFAULT_LAG_THRESHOLD,
+    roots_ttl: float | None = None,
+    project_concurrency: int = DEFAULT_PROJECT_CONCURRENCY,
+    drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+    scheduler: CallScheduler | None = None,
     **_kwargs: Any,
 ) -> FastMCP:
     """Create and configure the MCP server.
@@ -71,6 +102,24 @@ def create_server(
         explicit_path: Whether project_root was explicitly provided via --path.
             When False, tool handlers resolve the root dynamically via MCP
             listRoots on each call. (default: True)
+        state_journal: Append workflow state changes to a per-session journal
+            that is periodically compacted, instead of rewriting the state
+            file on every change. (default: False)
+        blocking_workers: Size of the thread pool that tool handlers use for
+            blocking work (file I/O, parsing, git, the quality gate).
+        loop_lag_threshold: Log a warning, naming the tool calls involved,
+            whenever the event loop is blocked for at least this many
+            seconds. None disables the probe.
+        roots_ttl: Maximum age in seconds of a client's cached listRoots
+            result. When set, roots are also cached for clients that never
+            send roots/list_changed. (default: None)
+        project_concurrency: Tool calls that may run at once per project
+            root; further calls for that root wait for a free slot.
+        drain_timeout: Seconds shutdown waits for in-flight tool calls
+            before flushing status files. New calls are refused meanwhile.
+        scheduler: Scheduler for tool calls. Pass one to share it with
+            ``DrainOnSignal`` so draining starts on SIGINT/SIGTERM.
+            (default: a new CallScheduler)
         **_kwargs: Accepted for backwards compatibility (enable_quality_gate,
             quality_gate_timeout, quality_gate_max_attempts, external_runner).
             These are no longer used — quality reviews now go through the
@@ -80,60 +129,127 @@ def create_server(
         Configured FastMCP server instance
     """
     project_path = Path(project_root).resolve()
-    root_resolver = RootResolver(fallback_root=project_path, explicit=explicit_path)
+    root_resolver = RootResolver(fallback_root=project_path, explicit=explicit_path, ttl=roots_ttl)
 
     # Copy the job schema to a stable location so agents can always reference it
     _ensure_schema_available(project_path)
 
-    # Initialize components
-    state_manager = StateManager(project_root=project_path, platform=platform or "claude")
-    status_writer = StatusWriter(project_path)
-
-    tools = WorkflowTools(
-        project_root=project_path,
-        state_manager=state_manager,
-        status_writer=status_writer,
+    # Initialize components. Each project root gets its own StateManager,
+    # StatusWriter, JobRegistry and WorkflowTools, so calls for different
+    # worktrees never share caches or state directories.
+    blocking = BlockingExecutor(blocking_workers)
+
+    def _build_bundle(root: Path) -> RootBundle:
+        state_manager = StateManager(
+            project_root=root,
+            platform=platform or "claude",
+            journal=state_journal,
+            events=EventLog(events_path(root)),
+        )
+        status_writer = StatusWriter(root, blocking=blocking)
+        job_registry = JobRegistry(cache_dir=job_cache_dir(root))
+        tools = WorkflowTools(
+            project_root=root,
+            state_manager=state_manager,
+            status_writer=status_writer,
+            job_registry=job_registry,
+            blocking=blocking,
+        )
+        # Each root reports the problems of its own job definitions
+        issues = detect_issues(root, job_registry)
+        return RootBundle(root, state_manager, status_writer, job_registry, tools, issues)
+
+    pool = RootPool(
+        _build_bundle,
+        pinned=project_path,
+        max_concurrent=project_concurrency,
+        blocking=blocking,
     )
+    if scheduler is None:
+        scheduler = CallScheduler()
+    startup = pool.get(project_path)
 
     # Write initial manifest at startup
     try:
-        tools._write_manifest()
+        startup.tools._write_manifest()
     except Exception:
         logger.warning("Failed to write initial job manifest", exc_info=True)
 
-    # Detect issues at startup (used for instructions and tool response warnings)
-    startup_issues = detect_issues(project_path)
-    instructions = _build_startup_instructions(project_path, startup_issues)
+    # Issues of the startup root go into the instructions; tool responses
+    # carry the issues of the root each call resolved to
+    instructions = _build_startup_instructions(project_path, startup.issues, startup.job_registry)
+
+    @asynccontextmanager
+    async def _lifespan(_server: FastMCP) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            if not await scheduler.drain(drain_timeout):
+                logger.warning(
+                    "Shutting down with %d tool calls still running after %.0f s",
+                    scheduler.in_flight,
+                    drain_timeout,
+                )
+            # Don't lose session status still waiting out the debounce window
+            await pool.close()
+            stats = root_resolver.stats
+            if stats.lookups:
+                logger.info(
+                    "MCP roots: %d of %d lookups served from cache "
+                    "(%d listRoots round-trips, %d invalidations)",
+                    stats.cache_hits,
+                    stats.lookups,
+                    stats.list_roots_calls,
+                    stats.invalidations,
+                )
+            if pool.stats.created > 1:
+                logger.info(
+                    "Project roots: %d bundles created, %d evicted, %d tool calls served",
+                    pool.stats.created,
+                    pool.stats.evicted,
+                    pool.stats.leases,
+                )
 
     # Create MCP server
     mcp = FastMCP(
         name="deepwork",
         instructions=instructions,
+        lifespan=_lifespan,
     )
+    mcp.add_middleware(_SchedulingMiddleware(scheduler))
+    lag_monitor = None
+    if loop_lag_threshold is not None:
+        lag_monitor = LoopLagMonitor(threshold=loop_lag_threshold)
+        mcp.add_middleware(_LoopLagMiddleware(lag_monitor))
+    if not explicit_path:
+        mcp.add_middleware(_RootsChangedMiddleware(root_resolver))
 
     # =========================================================================
     # Issue detection — append to tool responses when issues exist
     # =========================================================================
 
-    _issue_warning: str | None = None
-    if startup_issues:
-        _issue_warning = (
-            "\n\n---\n**IMPORTANT: ISSUE DETECTED.** "
-            "Suggest repairing this immediately to the user.\n\n"
-            + format_issues_for_agent(startup_issues)
-        )
-
-    def _append_issues(result: dict[str, Any]) -> dict[str, Any]:
-        """Append issue warning to a dict tool response if issues exist."""
-        if _issue_warning:
-            result["issue_detected"] = _issue_warning
+    def _append_issues(bundle: RootBundle, result: dict[str, Any]) -> dict[str, Any]:
+        """Append the root's issue warning to a dict tool response if issues exist."""
+        if bundle.issues:
+            result["issue_detected"] = (
+                "\n\n---\n**IMPORTANT: ISSUE DETECTED.** "
+                "Suggest repairing this immediately to the user.\n\n"
+                + format_issues_for_agent(bundle.issues)
+            )
         return result
 
     # =========================================================================
     # MCP Tool Registrations
     # =========================================================================
 
-    def _log_tool_call(
+    @asynccontextmanager
+    async def _lease(ctx: Context) -> AsyncIterator[RootBundle]:
+        """Resolve the call's project root once and hold its components."""
+        async with pool.lease(await root_resolver.get_root(ctx)) as bundle:
+            yield bundle
+
+    async def _log_tool_call(
+        bundle: RootBundle,
         tool_name: str,
         params: dict[str, Any] | None = None,
         session_id: str | None = None,
@@ -142,13 +258,27 @@ def create_server(
         """Log a tool call with stack information."""
         log_data: dict[str, Any] = {"tool": tool_name}
         if session_id:
-            stack = [entry.model_dump() for entry in state_manager.get_stack(session_id, agent_id)]
+            entries = await blocking.run(bundle.state_manager.get_stack, session_id, agent_id)
+            stack = [entry.model_dump() for entry in entries]
             log_data["stack"] = stack
             log_data["stack_depth"] = len(stack)
         if params:
             log_data["params"] = params
         logger.info("MCP tool call: %s", log_data)
 
+    def _log_stats(tool_name: str, stats: StateStats) -> None:
+        """Log a tool call's state cache hits and state lock wait time."""
+        logger.info(
+            "MCP tool %s state: %d disk reads avoided, %d disk reads, %d writes, "
+            "%d locks acquired (%.1f ms waiting)",
+            tool_name,
+            stats.hits,
+            stats.misses,
+            stats.writes,
+            stats.lock_acquisitions,
+            stats.lock_wait_seconds * 1000,
+        )
+
     @mcp.tool(
         description=(
             "List all available DeepWork workflows. "
@@ -158,10 +288,10 @@ def create_server(
     )
     async def get_workflows(ctx: Context) -> dict[str, Any]:
         """Get all available workflows."""
-        _log_tool_call("get_workflows")
-        tools.project_root = await root_resolver.get_root(ctx)
-        response = tools.get_workflows()
-        return _append_issues(response.model_dump())
+        async with _lease(ctx) as bundle:
+            await _log_tool_call(bundle, "get_workflows")
+            response = await blocking.run(bundle.tools.get_workflows)
+        return _append_issues(bundle, response.model_dump())
 
     @mcp.tool(
         description=(
@@ -186,29 +316,32 @@ def create_server(
         agent_id: str | None = None,
     ) -> dict[str, Any]:
         """Start a workflow and get first step instructions."""
-        _log_tool_call(
-            "start_workflow",
-            {
-                "goal": goal,
-                "job_name": job_name,
-                "workflow_name": workflow_name,
-                "inputs": inputs,
-                "agent_id": agent_id,
-            },
-            session_id=session_id,
-            agent_id=agent_id,
-        )
-        tools.project_root = await root_resolver.get_root(ctx)
-        input_data = StartWorkflowInput(
-            goal=goal,
-            job_name=job_name,
-            workflow_name=workflow_name,
-            inputs=inputs,
-            session_id=session_id,
-            agent_id=agent_id,
-        )
-        response = await tools.start_workflow(input_data)
-        return _append_issues(response.model_dump())
+        async with _lease(ctx) as bundle:
+            with bundle.state_manager.track_stats() as stats:
+                await _log_tool_call(
+                    bundle,
+                    "start_workflow",
+                    {
+                        "goal": goal,
+                        "job_name": job_name,
+                        "workflow_name": workflow_name,
+                        "inputs": inputs,
+                        "agent_id": agent_id,
+                    },
+                    session_id=session_id,
+                    agent_id=agent_id,
+                )
+                input_data = StartWorkflowInput(
+                    goal=goal,
+                    job_name=job_name,
+                    workflow_name=workflow_name,
+                    inputs=inputs,
+                    session_id=session_id,
+                    agent_id=agent_id,
+                )
+                response = await bundle.tools.start_workflow(input_data)
+        _log_stats("start_workflow", stats)
+        return _append_issues(bundle, response.model_dump())
 
     @mcp.tool(
         description=(
@@ -242,27 +375,30 @@ def create_server(
             return {
                 "error": "session_id is required. Pass CLAUDE_CODE_SESSION_ID on Claude Code, or the session_id returned by start_workflow on other platforms."
             }
-        _log_tool_call(
-            "finished_step",
-            {
-                "outputs": outputs,
-                "work_summary": work_summary,
-                "quality_review_override_reason": quality_review_override_reason,
-                "agent_id": agent_id,
-            },
-            session_id=session_id,
-            agent_id=agent_id,
-        )
-        tools.project_root = await root_resolver.get_root(ctx)
-        input_data = FinishedStepInput(
-            outputs=outputs,
-            work_summary=work_summary,
-            quality_review_override_reason=quality_review_override_reason,
-            session_id=session_id,
-            agent_id=agent_id,
-        )
-        response = await tools.finished_step(input_data)
-        return _append_issues(response.model_dump())
+        async with _lease(ctx) as bundle:
+            with bundle.state_manager.track_stats() as stats:
+                await _log_tool_call(
+                    bundle,
+                    "finished_step",
+                    {
+                        "outputs": outputs,
+                        "work_summary": work_summary,
+                        "quality_review_override_reason": quality_review_override_reason,
+                        "agent_id": agent_id,
+                    },
+                    session_id=session_id,
+                    agent_id=agent_id,
+                )
+                input_data = FinishedStepInput(
+                    outputs=outputs,
+                    work_summary=work_summary,
+                    quality_review_override_reason=quality_review_override_reason,
+                    session_id=session_id,
+                    agent_id=agent_id,
+                )
+                response = await bundle.tools.finished_step(input_data)
+        _log_stats("finished_step", stats)
+        return _append_issues(bundle, response.model_dump())
 
     @mcp.tool(
         description=(
@@ -285,18 +421,21 @@ def create_server(
             return {
                 "error": "session_id is required. Pass CLAUDE_CODE_SESSION_ID on Claude Code, or the session_id returned by start_workflow on other platforms."
             }
-        _log_tool_call(
-            "abort_workflow",
-            {"explanation": explanation, "agent_id": agent_id},
-            session_id=session_id,
-            agent_id=agent_id,
-        )
-        tools.project_root = await root_resolver.get_root(ctx)
-        input_data = AbortWorkflowInput(
-            explanation=explanation, session_id=session_id, agent_id=agent_id
-        )
-        response = await tools.abort_workflow(input_data)
-        return _append_issues(response.model_dump())
+        async with _lease(ctx) as bundle:
+            with bundle.state_manager.track_stats() as stats:
+                await _log_tool_call(
+                    bundle,
+                    "abort_workflow",
+                    {"explanation": explanation, "agent_id": agent_id},
+                    session_id=session_id,
+                    agent_id=agent_id,
+                )
+                input_data = AbortWorkflowInput(
+                    explanation=explanation, session_id=session_id, agent_id=agent_id
+                )
+                response = await bundle.tools.abort_workflow(input_data)
+        _log_stats("abort_workflow", stats)
+        return _append_issues(bundle, response.model_dump())
 
     @mcp.tool(
         description=(
@@ -321,16 +460,21 @@ def create_server(
             return {
                 "error": "session_id is required. Pass CLAUDE_CODE_SESSION_ID on Claude Code, or the session_id returned by start_workflow on other platforms."
             }
-        _log_tool_call(
-            "go_to_step",
-            {"step_id": step_id, "agent_id": agent_id},
-            session_id=session_id,
-            agent_id=agent_id,
-        )
-        tools.project_root = await root_resolver.get_root(ctx)
-        input_data = GoToStepInput(step_id=step_id, session_id=session_id, agent_id=agent_id)
-        response = await tools.go_to_step(input_data)
-        return _append_issues(response.model_dump())
+        async with _lease(ctx) as bundle:
+            with bundle.state_manager.track_stats() as stats:
+                await _log_tool_call(
+                    bundle,
+                    "go_to_step",
+                    {"step_id": step_id, "agent_id": agent_id},
+                    session_id=session_id,
+                    agent_id=agent_id,
+                )
+                input_data = GoToStepInput(
+                    step_id=step_id, session_id=session_id, agent_id=agent_id
+                )
+                response = await bundle.tools.go_to_step(input_data)
+        _log_stats("go_to_step", stats)
+        return _append_issues(bundle, response.model_dump())
 
     # ---- Session Job tools ----
 
@@ -354,22 +498,23 @@ def create_server(
         """Register a session-scoped job definition."""
         if not session_id:
             return {"error": "session_id is required. Pass CLAUDE_CODE_SESSION_ID on Claude Code."}
-        _log_tool_call(
-            "register_session_job",
-            {"job_name": job_name},
-            session_id=session_id,
-        )
-        tools.project_root = await root_resolver.get_root(ctx)
         input_data = RegisterSessionJobInput(
             job_name=job_name,
             job_definition_yaml=job_definition_yaml,
             session_id=session_id,
         )
-        try:
-            result = await tools.register_session_job(input_data)
-        except Exception as e:
-            return _append_issues({"error": str(e)})
-        return _append_issues(result)
+        async with _lease(ctx) as bundle:
+            await _log_tool_call(
+                bundle,
+                "register_session_job",
+                {"job_name": job_name},
+                session_id=session_id,
+            )
+            try:
+                result = await bundle.tools.register_session_job(input_data)
+            except Exception as e:
+                return _append_issues(bundle, {"error": str(e)})
+        return _append_issues(bundle, result)
 
     @mcp.tool(
         description=(
@@ -386,21 +531,22 @@ def create_server(
         """Get a session-scoped job definition."""
         if not session_id:
             return {"error": "session_id is required. Pass CLAUDE_CODE_SESSION_ID on Claude Code."}
-        _log_tool_call(
-            "get_session_job",
-            {"job_name": job_name},
-            session_id=session_id,
-        )
-        tools.project_root = await root_resolver.get_root(ctx)
         input_data = GetSessionJobInput(
             job_name=job_name,
             session_id=session_id,
         )
-        try:
-            result = await tools.get_session_job(input_data)
-        except Exception as e:
-            return _append_issues({"error": str(e)})
-        return _append_issues(result)
+        async with _lease(ctx) as bundle:
+            await _log_tool_call(
+                bundle,
+                "get_session_job",
+                {"job_name": job_name},
+                session_id=session_id,
+            )
+            try:
+                result = await bundle.tools.get_session_job(input_data)
+            except Exception as e:
+                return _append_issues(bundle, {"error": str(e)})
+        return _append_issues(bundle, result)
 
     # ---- DeepSchema tools ----
 
@@ -414,35 +560,39 @@ def create_server(
     )
     async def get_named_schemas(ctx: Context) -> list[dict[str, Any]]:
         """List all named DeepSchemas with basic info."""
-        _log_tool_call("get_named_schemas")
         from deepwork.deepschema.config import DeepSchemaError, parse_deepschema_file
         from deepwork.deepschema.discovery import find_named_schemas
 
-        root = await root_resolver.get_root(ctx)
-        results: list[dict[str, Any]] = []
-        for manifest_path in find_named_schemas(root):
-            name = manifest_path.parent.name
-            try:
-                schema = parse_deepschema_file(manifest_path, "named", name)
-                results.append(
-                    {
-                        "name": schema.name,
-                        "summary": schema.summary or "",
-                        "matchers": schema.matchers,
-                    }
-                )
-            except DeepSchemaError:
-                results.append(
-                    {
-                        "name": name,
-                        "summary": f"(failed to parse {manifest_path})",
-                        "matchers": [],
-                    }
-                )
-        return results
+        def _list_named_schemas(root: Path) -> list[dict[str, Any]]:
+            results: list[dict[str, Any]] = []
+            for manifest_path in find_named_schemas(root):
+                name = manifest_path.parent.name
+                try:
+                    schema = parse_deepschema_file(manifest_path, "named", name)
+                    results.append(
+                        {
+                            "name": schema.name,
+                            "summary": schema.summary or "",
+                            "matchers": schema.matchers,
+                        }
+                    )
+                except DeepSchemaError:
+                    results.append(
+                        {
+                            "name": name,
+                            "summary": f"(failed to parse {manifest_path})",
+                            "matchers": [],
+                        }
+                    )
+            return results
+
+        async with _lease(ctx) as bundle:
+            await _log_tool_call(bundle, "get_named_schemas")
+            return await blocking.run(_list_named_schemas, bundle.root)
 
     # ---- Review tool (outside the workflow lifecycle) ----
 
+    from deepwork.review.ledger import LedgerError
     from deepwork.review.mcp import ReviewToolError, run_review
     from deepwork.review.mcp import get_configured_reviews as get_configured_reviews_fn
     from deepwork.review.mcp import mark_passed as mark_passed_fn
@@ -460,12 +610,12 @@ def create_server(
     )
     async def get_review_instructions(ctx: Context, files: list[str] | None = None) -> str:
         """Run review pipeline on changed files."""
-        _log_tool_call("get_review_instructions", {"files": files})
-        root = await root_resolver.get_root(ctx)
-        try:
-            return run_review(root, review_platform, files)
-        except ReviewToolError as e:
-            return f"Review error: {e}"
+        async with _lease(ctx) as bundle:
+            await _log_tool_call(bundle, "get_review_instructions", {"files": files})
+            try:
+                return await blocking.run(run_review, bundle.root, review_platform, files)
+            except ReviewToolError as e:
+                return f"Review error: {e}"
 
     @mcp.tool(
         description=(
@@ -480,12 +630,15 @@ def create_server(
         only_rules_matching_files: list[str] | None = None,
     ) -> list[dict[str, str]]:
         """List configured review rules, optionally filtered by file paths."""
-        _log_tool_call(
-            "get_configured_reviews",
-            {"only_rules_matching_files": only_rules_matching_files},
-        )
-        root = await root_resolver.get_root(ctx)
-        return get_configured_reviews_fn(root, only_rules_matching_files)
+        async with _lease(ctx) as bundle:
+            await _log_tool_call(
+                bundle,
+                "get_configured_reviews",
+                {"only_rules_matching_files": only_rules_matching_files},
+            )
+            return await blocking.run(
+                get_configured_reviews_fn, bundle.root, only_rules_matching_files
+            )
 
     @mcp.tool(
         description=(
@@ -497,17 +650,125 @@ def create_server(
         )
     )
     async def mark_review_as_passed(review_id: str, ctx: Context) -> str:
-        """Mark a review as passed by creating a .passed marker file."""
-        _log_tool_call("mark_review_as_passed", {"review_id": review_id})
-        root = await root_resolver.get_root(ctx)
+        """Mark a review as passed by recording it in the review ledger."""
+        async with _lease(ctx) as bundle:
+            await _log_tool_call(bundle, "mark_review_as_passed", {"review_id": review_id})
+            try:
+                return await blocking.run(mark_passed_fn, bundle.root, review_id)
+            except ValueError as e:
+                return f"Validation error: {e}"
+            except LedgerError as e:
+                return f"Error: {e}"
+
+    # =========================================================================
+    # HTTP routes — served only by HTTP transports (deepwork serve --transport http|sse)
+    # =========================================================================
+
+    @mcp.custom_route("/health", methods=["GET"])
+    async def health(_request: Request) -> Response:
+        """Report liveness and call, pool and cache counters as JSON."""
+        now = time.monotonic()
+        body: dict[str, Any] = {
+            "status": "draining" if scheduler.draining else "ok",
+            "uptime_seconds": round(now - scheduler.started_at, 1),
+            "calls": scheduler.snapshot(),
+            "roots": [
+                {
+                    "root": str(bundle.root),
+                    "in_use": bundle.in_use,
+                    "idle_seconds": round(now - bundle.last_used, 1),
+                }
+                for bundle in pool.bundles()
+            ],
+            "pool": asdict(pool.stats),
+            "root_cache": asdict(root_resolver.stats),
+        }
+        if lag_monitor is not None:
+            body["event_loop"] = {
+                "stalls": lag_monitor.stalls,
+                "max_lag_ms": round(lag_monitor.max_lag * 1000, 1),
+            }
+        # Load balancers stop routing to a draining server
+        return JSONResponse(body, status_code=503 if scheduler.draining else 200)
+
+    @mcp.custom_route("/events", methods=["GET"])
+    async def events(request: Request) -> Response:
+        """Stream workflow events after ?since=<seq> (or Last-Event-ID) as SSE.
+
+        ``?root=<path>`` selects the project root whose events are streamed
+        (default: the startup root). Only roots the server currently serves
+        are accepted, so the route cannot be used to read arbitrary paths.
+        Streams end once the server starts draining.
+        """
+        if scheduler.draining:
+            return PlainTextResponse("server is shutting down", status_code=503)
+        raw = request.query_params.get("since") or request.headers.get("last-event-id") or "0"
         try:
-            return mark_passed_fn(root, review_id)
-        except ValueError as e:
-            return f"Validation error: {e}"
+            since = int(raw)
+        except ValueError:
+            return PlainTextResponse("since must be an integer sequence number", status_code=400)
+        root = project_path
+        if requested := request.query_params.get("root"):
+            root = Path(requested).resolve()
+            if root not in pool:
+                return PlainTextResponse(
+                    f"{requested} is not a project root served by this server", status_code=404
+                )
+        return StreamingResponse(
+            stream_events(events_path(root), since, stop=lambda: scheduler.draining),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
 
     return mcp
 
 
+class _SchedulingMiddleware(Middleware):
+    """Runs tool calls through a CallScheduler (per-session order, draining)."""
+
+    def __init__(self, scheduler: CallScheduler) -> None:
+        self.scheduler = scheduler
+
+    async def on_call_tool(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        try:
+            slot = self.scheduler.slot(session_call_key(context.message.arguments))
+            async with slot:
+                return await call_next(context)
+        except ServerDrainingError as e:
+            raise ToolError(str(e)) from e
+
+
+class _LoopLagMiddleware(Middleware):
+    """Reports every tool call to a LoopLagMonitor while it is in flight."""
+
+    def __init__(self, monitor: LoopLagMonitor) -> None:
+        self.monitor = monitor
+
+    async def on_call_tool(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        with self.monitor.track(context.message.name):
+            return await call_next(context)
+
+
+class _RootsChangedMiddleware(Middleware):
+    """Drops a client's cached root when it sends roots/list_changed."""
+
+    def __init__(self, resolver: RootResolver) -> None:
+        self.resolver = resolver
+
+    async def on_notification(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        if context.method == ROOTS_LIST_CHANGED:
+            ctx = context.fastmcp_context
+            # Without the sending session, forget every session's root
+            self.resolver.invalidate(session_key(ctx) if ctx is not None else None)
+        return await call_next(context)
+
+
 _STATIC_INSTRUCTIONS = """\
 # DeepWork Workflow Server
 
@@ -544,6 +805,7 @@ _MAX_INSTRUCTIONS_SIZE = 2048
 def _build_startup_instructions(
     project_root: Path,
     issues: list[Issue],
+    job_registry: JobRegistry | None = None,
 ) -> str:
     """Build MCP server instructions with dynamic content first (survives truncation).
 
@@ -559,7 +821,10 @@ def _build_startup_instructions(
         )
 
     # No issues — list available workflows
-    jobs, _ = load_all_jobs(project_root)
+    if job_registry is not None:
+        jobs, _ = job_registry.load_all(project_root)
+    else:
+        jobs, _ = load_all_jobs(project_root)
     if not jobs:
         return _STATIC_INSTRUCTIONS
 
@@ -0,0 +1,196 @@
+"""Index of active workflow sessions across all platforms.
+
+``.deepwork/tmp/sessions/active_sessions.json`` lists every workflow on
+every session's stack, so ``deepwork jobs get-stack`` can find active
+sessions without scanning (and parsing) every historical state file:
+
+    {
+      "version": 1,
+      "sessions": [
+        {"session_id": "...", "agent_id": null, "platform": "claude",
+         "job_name": "...", "workflow_name": "...", "current_step_id": "...",
+         "workflow_instance_id": "...", "started_at": "...",
+         "state_file": "claude/session-<id>/state.json"},
+        ...
+      ]
+    }
+
+``StateManager`` keeps the entries for a state file in sync whenever a write
+changes which workflows are on its stack or their current step. The index
+is only a pointer: readers re-read the referenced state files, which remain
+the source of truth. If the index is missing or unreadable it is rebuilt
+from a full scan (``rebuild_index``), which is also the repair path after a
+crash between a state write and the matching index update.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from deepwork.jobs.mcp.journal import read_state_file
+from deepwork.utils.fs import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None  # type: ignore[assignment]
+
+INDEX_FILE_NAME = "active_sessions.json"
+INDEX_VERSION = 1
+
+_ENTRY_FIELDS = (
+    "job_name",
+    "workflow_name",
+    "current_step_id",
+    "workflow_instance_id",
+    "started_at",
+)
+
+
+def sessions_root(project_root: Path) -> Path:
+    """Return the directory holding every platform's session state."""
+    return project_root / ".deepwork" / "tmp" / "sessions"
+
+
+def index_path(project_root: Path) -> Path:
+    """Return the path of the active-session index."""
+    return sessions_root(project_root) / INDEX_FILE_NAME
+
+
+def state_file_key(project_root: Path, state_file: Path) -> str:
+    """Return the index key (path relative to the sessions root) for a state file."""
+    return state_file.relative_to(sessions_root(project_root)).as_posix()
+
+
+def build_entries(
+    key: str,
+    session_id: str,
+    agent_id: str | None,
+    platform: str,
+    workflow_stack: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Build index entries for the active workflows on one serialized stack."""
+    entries = []
+    for session in workflow_stack:
+        if session.get("status", "active") != "active":
+            continue
+        entry: dict[str, Any] = {
+            "session_id": session_id,
+            "agent_id": agent_id,
+            "platform": platform,
+        }
+        entry.update({name: session.get(name) for name in _ENTRY_FIELDS})
+        entry["state_file"] = key
+        entries.append(entry)
+    return entries
+
+
+def read_index(path: Path) -> list[dict[str, Any]] | None:
+    """Read the index entries.
+
+    Returns:
+        The entries, or None if the index is missing, unreadable, or from
+        another index version
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return None
+    sessions = data.get("sessions")
+    if not isinstance(sessions, list):
+        return None
+    return [entry for entry in sessions if isinstance(entry, dict)]
+
+
+def write_index(path: Path, entries: list[dict[str, Any]]) -> None:
+    """Atomically replace the index."""
+    atomic_write(path, json.dumps({"version": INDEX_VERSION, "sessions": entries}, indent=2))
+
+
+def replace_entries(project_root: Path, key: str, entries: list[dict[str, Any]]) -> None:
+    """Replace one state file's entries in the index.
+
+    The caller must hold the index lock and must already have written the
+    state file. A missing or unreadable index is rebuilt from a full scan
+    instead, which picks up the new state as well.
+    """
+    path = index_path(project_root)
+    current = read_index(path)
+    if current is None:
+        write_index(path, scan_entries(project_root))
+        return
+    kept = [entry for entry in current if entry.get("state_file") != key]
+    write_index(path, kept + entries)
+
+
+@contextmanager
+def locked_index(project_root: Path) -> Iterator[None]:
+    """Hold the cross-process index lock (blocking; for synchronous callers)."""
+    lock_path = index_path(project_root).with_name(INDEX_FILE_NAME + ".lock")
+    if fcntl is None:
+        yield
+        return
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def scan_entries(project_root: Path) -> list[dict[str, Any]]:
+    """Build index entries by reading every session state file."""
+    entries: list[dict[str, Any]] = []
+    root = sessions_root(project_root)
+    if not root.exists():
+        return entries
+    for session_dir in sorted(root.glob("*/session-*")):
+        session_id = session_dir.name[len("session-") :]
+        platform = session_dir.parent.name
+        for state_file in sorted(session_dir.glob("*.json")):
+            if state_file.name == "state.json":
+                agent_id = None
+            elif state_file.name.startswith("agent_"):
+                agent_id = state_file.name[len("agent_") : -len(".json")]
+            else:
+                continue
+            try:
+                data = read_state_file(state_file).data
+            except OSError:
+                continue
+            if data is None:
+                continue
+            stack = data.get("workflow_stack", [])
+            if not isinstance(stack, list):
+                continue
+            key = state_file_key(project_root, state_file)
+            entries.extend(
+                build_entries(
+                    key,
+                    session_id,
+                    agent_id,
+                    platform,
+                    [s for s in stack if isinstance(s, dict)],
+                )
+            )
+    return entries
+
+
+def rebuild_index(project_root: Path) -> list[dict[str, Any]]:
+    """Rebuild the index from a full scan of the sessions tree.
+
+    Returns:
+        The new index entries
+    """
+    with locked_index(project_root):
+        entries = scan_entries(project_root)
+        write_index(index_path(project_root), entries)
+    return entries
@@ -11,20 +11,68 @@ Sub-agents get their own isolated workflow stacks stored in
 `agent_<agent_id>.json` alongside the main `state.json`. A sub-agent's
 `get_stack` returns the main stack plus its own, giving it visibility into
 the parent context without polluting it.
+
+Decoded state files are cached in memory and written through on every save.
+Each access re-validates the cache entry with one ``os.stat`` of the file, so
+writes from other processes (or another StateManager) are still picked up.
+
+Optionally (``journal=True``), mutations are appended as small records to a
+sibling ``.journal`` file and periodically compacted into the snapshot; see
+``deepwork.jobs.mcp.journal``. Readers that replay the journal (this module,
+``deepwork jobs get-stack``) see the same state either way.
+
+Only the most recent ``hot_completed_limit`` completed/aborted workflows stay
+in a state file; older ones are moved to compressed archive segments (see
+``deepwork.jobs.mcp.archive``) so the hot file stays proportional to active
+work.
+
+Mutations lock only the state file they touch: an ``asyncio.Lock`` per file
+within the process, plus an advisory ``fcntl.flock`` on a sibling ``.lock``
+file so several ``deepwork serve`` processes sharing the same sessions tree
+cannot lose each other's read-modify-write updates.
+
+With an ``EventLog`` configured, each committed transaction also appends
+its workflow events (workflow started, step started/finished, ...) to the
+project's event stream; see ``deepwork.jobs.mcp.events``.
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import os
 import tempfile
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 import aiofiles
 
+from deepwork.jobs.mcp.archive import (
+    HOT_COMPLETED_LIMIT,
+    list_segments,
+    read_segment,
+    write_segment,
+)
+from deepwork.jobs.mcp.events import EventLog
+from deepwork.jobs.mcp.journal import (
+    JournaledState,
+    append_record,
+    build_record,
+    encode_record,
+    journal_path,
+    new_generation,
+    read_state_file,
+    should_compact,
+)
 from deepwork.jobs.mcp.schemas import (
     ArgumentValue,
     StackEntry,
@@ -32,6 +80,26 @@ from deepwork.jobs.mcp.schemas import (
     StepProgress,
     WorkflowSession,
 )
+from deepwork.jobs.mcp.session_index import (
+    build_entries,
+    index_path,
+    replace_entries,
+    state_file_key,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl; fall back to in-process locks
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("deepwork.jobs.mcp.state")
+
+# Upper bound on state files held in the decoded-state cache
+_MAX_CACHED_FILES = 256
+
+# Polling interval bounds while waiting for another process's file lock
+_FILE_LOCK_POLL_MIN_SECONDS = 0.002
+_FILE_LOCK_POLL_MAX_SECONDS = 0.05
 
 
 class StateError(Exception):
@@ -40,6 +108,314 @@ class StateError(Exception):
     pass
 
 
+@dataclass
+class StateStats:
+    """Counters for StateManager's decoded-state cache and state file locks.
+
+    Attributes:
+        hits: Reads served from memory (disk reads avoided)
+        misses: Reads that had to load and decode the file from disk
+        writes: State files written (and written through to the cache)
+        lock_acquisitions: State file locks acquired
+        lock_wait_seconds: Total time spent waiting for state file locks
+    """
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    lock_acquisitions: int = 0
+    lock_wait_seconds: float = 0.0
+
+
+# (mtime_ns, size, inode) of the snapshot, and of the journal if one exists
+_StatKey = tuple[int, int, int]
+_Signature = tuple[_StatKey, _StatKey | None]
+
+
+def _stat_key(st: os.stat_result) -> _StatKey:
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+@dataclass
+class _CachedState:
+    """Decoded contents of one state file and the stat signature they match."""
+
+    signature: _Signature
+    workflow_stack: list[dict[str, Any]]
+    completed_workflows: list[dict[str, Any]] | None
+    valid: bool = True
+    # Journal bookkeeping (see deepwork.jobs.mcp.journal.JournaledState)
+    journal: JournaledState | None = None
+
+
+# Per-call counters, set by StateManager.track_stats()
+_call_stats: ContextVar[StateStats | None] = ContextVar("deepwork_state_stats", default=None)
+
+
+@asynccontextmanager
+async def _file_lock(lock_path: Path) -> AsyncIterator[None]:
+    """Hold an exclusive advisory lock on ``lock_path`` for the block.
+
+    The state file itself cannot be locked because writes replace it by
+    rename, so a stable sibling lock file is used. The lock is polled
+    without blocking so the event loop keeps running while another
+    process holds it. Without ``fcntl`` (Windows) this is a no-op.
+    """
+    if fcntl is None:  # pragma: no cover - Windows
+        yield
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        delay = _FILE_LOCK_POLL_MIN_SECONDS
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _FILE_LOCK_POLL_MAX_SECONDS)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _record_sub_workflow(parent: WorkflowSession, instance_id: str) -> None:
+    """Record a sub-workflow's instance ID on the parent's current step."""
+    parent_step_id = parent.current_step_id
+    if parent_step_id in parent.step_progress:
+        parent.step_progress[parent_step_id].sub_workflow_instance_ids.append(instance_id)
+    if parent.step_history and parent.step_history[-1].step_id == parent_step_id:
+        parent.step_history[-1].sub_workflow_instance_ids.append(instance_id)
+
+
+class StateTransaction:
+    """Pending mutations to one workflow stack, obtained from StateManager.transaction().
+
+    Methods mirror the StateManager mutators but only change the in-memory
+    stack; the manager writes it once when the transaction block exits.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        agent_id: str | None,
+        stack: list[WorkflowSession],
+        completed_data: list[dict[str, Any]] | None = None,
+    ):
+        """Initialize a transaction over a loaded stack.
+
+        Args:
+            session_id: Claude Code session ID
+            agent_id: Optional agent ID for sub-agent scoped state
+            stack: Workflow stack read at the start of the transaction
+            completed_data: Serialized completed/aborted workflows read with the
+                stack. Only decoded if a workflow is completed or aborted.
+        """
+        self.session_id = session_id
+        self.agent_id = agent_id
+        self.stack = stack
+        self.dirty = False
+        # Decoded on first _retire(); None means completed_workflows is untouched
+        self.completed_workflows: list[WorkflowSession] | None = None
+        self._completed_data = completed_data or []
+        # Sub-workflows started on an empty agent stack, to record on the main stack
+        self.parent_sub_workflow_ids: list[str] = []
+        # Progress events, appended to the event log once the write commits
+        self.events: list[dict[str, Any]] = []
+
+    def _emit(self, event: str, session: WorkflowSession, **fields: Any) -> None:
+        """Queue a progress event about ``session``."""
+        self.events.append(
+            {
+                "event": event,
+                "session_id": self.session_id,
+                "agent_id": self.agent_id,
+                "workflow_instance_id": session.workflow_instance_id,
+                "job_name": session.job_name,
+                "workflow_name": session.workflow_name,
+                **fields,
+            }
+        )
+
+    def _active(self) -> WorkflowSession:
+        """Return the top-of-stack session, marking the transaction dirty."""
+        if not self.stack:
+            raise StateError("No active workflow session. Use start_workflow to begin a workflow.")
+        self.dirty = True
+        return self.stack[-1]
+
+    def create_session(
+        self, job_name: str, workflow_name: str, goal: str, first_step_id: str
+    ) -> WorkflowSession:
+        """Create a new workflow session and push it onto the stack."""
+        session = WorkflowSession(
+            session_id=self.session_id,
+            job_name=job_name,
+            workflow_name=workflow_name,
+            goal=goal,
+            current_step_id=first_step_id,
+            current_step_index=0,
+            step_progress={},
+            started_at=datetime.now(UTC).isoformat(),
+            status="active",
+        )
+
+        # If there's a parent workflow on the stack, record this sub-workflow's
+        # instance ID on the parent's current step
+        if self.stack:
+            _record_sub_workflow(self.stack[-1], session.workflow_instance_id)
+        elif self.agent_id:
+            self.parent_sub_workflow_ids.append(session.workflow_instance_id)
+
+        self.stack.append(session)
+        self.dirty = True
+        self._emit("workflow_started", session, step_id=first_step_id, goal=goal)
+        return session
+
+    def start_step(
+        self, step_id: str, input_values: dict[str, ArgumentValue] | None = None
+    ) -> None:
+        """Mark a step as started, optionally storing input values."""
+        session = self._active()
+        now = datetime.now(UTC).isoformat()
+
+        if step_id not in session.step_progress:
+            session.step_progress[step_id] = StepProgress(
+                step_id=step_id,
+                started_at=now,
+                input_values=input_values or {},
+            )
+        else:
+            session.step_progress[step_id].started_at = now
+            if input_values:
+                session.step_progress[step_id].input_values = input_values
+
+        # Append to step history
+        session.step_history.append(StepHistoryEntry(step_id=step_id, started_at=now))
+
+        session.current_step_id = step_id
+        self._emit("step_started", session, step_id=step_id)
+
+    def complete_step(
+        self,
+        step_id: str,
+        outputs: dict[str, ArgumentValue],
+        work_summary: str | None = None,
+    ) -> None:
+        """Mark a step as completed."""
+        session = self._active()
+        now = datetime.now(UTC).isoformat()
+
+        if step_id not in session.step_progress:
+            session.step_progress[step_id] = StepProgress(
+                step_id=step_id,
+                started_at=now,
+            )
+
+        progress = session.step_progress[step_id]
+        progress.completed_at = now
+        progress.outputs = outputs
+        progress.work_summary = work_summary
+
+        # Update the last step_history entry's finished_at
+        if session.step_history and session.step_history[-1].step_id == step_id:
+            session.step_history[-1].finished_at = now
+        self._emit("step_finished", session, step_id=step_id)
+
+    def record_quality_attempt(self, step_id: str) -> int:
+        """Record a quality gate attempt for a step.
+
+        Returns:
+            Total number of attempts for this step
+        """
+        session = self._active()
+
+        if step_id not in session.step_progress:
+            session.step_progress[step_id] = StepProgress(step_id=step_id)
+
+        session.step_progress[step_id].quality_attempts += 1
+        attempt = session.step_progress[step_id].quality_attempts
+        self._emit("quality_attempt", session, step_id=step_id, attempt=attempt)
+        return attempt
+
+    def advance_to_step(self, step_id: str, step_index: int) -> None:
+        """Advance the session to a new step."""
+        session = self._active()
+        session.current_step_id = step_id
+        session.current_step_index = step_index
+
+    def go_to_step(self, step_id: str, step_index: int, invalidate_step_ids: list[str]) -> None:
+        """Navigate back to a prior step, clearing progress for invalidated steps."""
+        session = self._active()
+
+        # Clear progress for all invalidated steps
+        for sid in invalidate_step_ids:
+            if sid in session.step_progress:
+                del session.step_progress[sid]
+
+        # Update position
+        session.current_step_id = step_id
+        session.current_step_index = step_index
+
+    def complete_workflow(self) -> WorkflowSession | None:
+        """Mark the workflow as complete and move it to completed_workflows.
+
+        Returns:
+            The new active session after removal, or None if stack is empty
+        """
+        session = self._active()
+        session.completed_at = datetime.now(UTC).isoformat()
+        session.status = "completed"
+        self._retire(session)
+        self._emit("workflow_completed", session, step_id=session.current_step_id)
+        return self.stack[-1] if self.stack else None
+
+    def abort_workflow(self, explanation: str) -> tuple[WorkflowSession, WorkflowSession | None]:
+        """Abort the workflow and move it to completed_workflows.
+
+        Returns:
+            Tuple of (aborted session, new active session or None)
+        """
+        session = self._active()
+        session.completed_at = datetime.now(UTC).isoformat()
+        session.status = "aborted"
+        session.abort_reason = explanation
+        self._retire(session)
+        self._emit("workflow_aborted", session, step_id=session.current_step_id, reason=explanation)
+        return session, self.stack[-1] if self.stack else None
+
+    def _retire(self, session: WorkflowSession) -> None:
+        """Pop the top session and append it to completed_workflows."""
+        if self.completed_workflows is None:
+            self.completed_workflows = [
+                WorkflowSession.from_dict(entry) for entry in self._completed_data
+            ]
+        self.completed_workflows.append(session)
+        self.stack.pop()
+
+    def get_all_outputs(self) -> dict[str, ArgumentValue]:
+        """Get all outputs from all completed steps of the top-of-stack session."""
+        if not self.stack:
+            raise StateError("No active workflow session. Use start_workflow to begin a workflow.")
+        all_outputs: dict[str, ArgumentValue] = {}
+        for progress in self.stack[-1].step_progress.values():
+            all_outputs.update(progress.outputs)
+        return all_outputs
+
+    def get_step_outputs(self) -> dict[str, dict[str, ArgumentValue]]:
+        """Get the outputs of each completed step of the top-of-stack session, by step ID."""
+        if not self.stack:
+            raise StateError("No active workflow session. Use start_workflow to begin a workflow.")
+        return {
+            step_id: progress.outputs for step_id, progress in self.stack[-1].step_progress.items()
+        }
+
+
 class StateManager:
     """Manages workflow session state with stack-based nesting support.
 
@@ -48,24 +424,55 @@ class StateManager:
     - state.json: main workflow stack (top-level agent)
     - agent_<agent_id>.json: per-agent workflow stack (sub-agents)
 
-    No in-memory caching — every operation reads from and writes to disk.
-    This ensures state survives MCP server restarts.
-
-    This implementation is async-safe and uses a lock to prevent
-    concurrent access issues.
+    Every write goes to disk (so state survives MCP server restarts) and
+    through to an in-memory cache of decoded files. Reads come from the
+    cache while the file's (mtime_ns, size, inode) is unchanged, and from
+    disk otherwise. Cache counters are kept in ``stats`` and can be
+    scoped per tool call with ``track_stats()``.
+
+    Each state file has its own lock, so operations on unrelated sessions
+    or agents never wait on each other. Within the process the lock is an
+    ``asyncio.Lock``; across processes it is an advisory file lock. Reads
+    also run on ``BlockingExecutor`` threads, so the caches and counters
+    are guarded by a ``threading.Lock``.
     """
 
-    def __init__(self, project_root: Path, platform: str):
+    def __init__(
+        self,
+        project_root: Path,
+        platform: str,
+        *,
+        journal: bool = False,
+        hot_completed_limit: int = HOT_COMPLETED_LIMIT,
+        events: EventLog | None = None,
+    ):
         """Initialize state manager.
 
         Args:
             project_root: Path to the project root directory
             platform: Platform identifier (e.g., 'claude', 'gemini')
+            journal: Append mutations to a journal instead of rewriting the
+                whole state file on every write (default: False)
+            hot_completed_limit: Completed/aborted workflows kept in a state
+                file before older ones are moved to archive segments
+                (default: HOT_COMPLETED_LIMIT)
+            events: Event log that receives the progress events of every
+                committed transaction (default: no events)
         """
         self.project_root = project_root
         self.platform = platform
+        self.journal = journal
+        self.hot_completed_limit = max(hot_completed_limit, 0)
+        self.events = events
         self.sessions_dir = project_root / ".deepwork" / "tmp" / "sessions" / platform
-        self._lock = asyncio.Lock()
+        # Lock striping: one asyncio.Lock per state file, dropped once unused
+        self._locks: weakref.WeakValueDictionary[Path, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._cache: dict[Path, _CachedState] = {}
+        # Archive segments are immutable, so their decoded entries never go stale
+        self._segment_cache: dict[Path, list[dict[str, Any]]] = {}
+        self.stats = StateStats()
+        # Guards the caches and counters above against concurrent pool threads
+        self._mutex = threading.Lock()
 
     def _state_file(self, session_id: str, agent_id: str | None = None) -> Path:
         """Get the path to a state file."""
@@ -74,29 +481,129 @@ class StateManager:
             return session_dir / f"agent_{agent_id}.json"
         return session_dir / "state.json"
 
-    async def _read_stack(
-        self, session_id: str, agent_id: str | None = None
-    ) -> list[WorkflowSession]:
-        """Read the workflow stack from disk."""
-        state_file = self._state_file(session_id, agent_id)
-        if not state_file.exists():
-            return []
+    def _record(self, counter: str, amount: float = 1) -> None:
+        """Increment a counter on the totals and the active per-call scope."""
+        call_stats = _call_stats.get()
+        with self._mutex:
+            setattr(self.stats, counter, getattr(self.stats, counter) + amount)
+            if call_stats is not None:
+                setattr(call_stats, counter, getattr(call_stats, counter) + amount)
+
+    def _state_lock(self, state_file: Path) -> asyncio.Lock:
+        """Get the in-process lock for a state file, creating it on first use."""
+        lock = self._locks.get(state_file)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[state_file] = lock
+        return lock
+
+    @asynccontextmanager
+    async def _locked(self, state_file: Path) -> AsyncIterator[None]:
+        """Hold the in-process and cross-process locks for one state file.
+
+        Lock order is always agent file before main file (see transaction()),
+        so nested acquisition cannot deadlock.
+        """
+        started = time.perf_counter()
+        async with self._state_lock(state_file):
+            async with _file_lock(state_file.with_name(state_file.name + ".lock")):
+                self._record("lock_acquisitions")
+                self._record("lock_wait_seconds", time.perf_counter() - started)
+                yield
+
+    @contextmanager
+    def track_stats(self) -> Iterator[StateStats]:
+        """Collect cache counters for the operations run inside this block.
+
+        The scope is held in a context variable, so concurrent tool calls
+        (each running in its own asyncio task) count independently.
+
+        Yields:
+            StateStats filled in as state is read and written
+        """
+        stats = StateStats()
+        token = _call_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _call_stats.reset(token)
+
+    def _store(self, state_file: Path, entry: _CachedState) -> _CachedState:
+        """Remember decoded state for a file, evicting the oldest entry when full."""
+        with self._mutex:
+            self._cache.pop(state_file, None)
+            if len(self._cache) >= _MAX_CACHED_FILES:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[state_file] = entry
+        return entry
+
+    def _forget(self, state_file: Path) -> None:
+        """Drop a file's decoded state from the cache."""
+        with self._mutex:
+            self._cache.pop(state_file, None)
+
+    def _load_state(self, state_file: Path) -> _CachedState | None:
+        """Load decoded state for a file, from memory when the file is unchanged.
+
+        The (mtime_ns, size, inode) of the file and of its journal are
+        compared against the cached entry on every call. Snapshot writes
+        always replace the file via rename and journal appends always grow
+        the journal, so a write by any process invalidates the entry.
+
+        Returns:
+            The decoded state, or None if the file does not exist. Invalid
+            JSON decodes to an empty stack with no completed workflows.
+        """
+        try:
+            st = os.stat(state_file)
+        except FileNotFoundError:
+            self._forget(state_file)
+            return None
+        try:
+            journal_key: _StatKey | None = _stat_key(os.stat(journal_path(state_file)))
+        except FileNotFoundError:
+            journal_key = None
 
-        async with aiofiles.open(state_file, encoding="utf-8") as f:
-            content = await f.read()
+        signature: _Signature = (_stat_key(st), journal_key)
+        cached = self._cache.get(state_file)
+        if cached is not None and cached.signature == signature:
+            self._record("hits")
+            return cached
 
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            return []
+            journaled = read_state_file(state_file)
+        except FileNotFoundError:
+            self._forget(state_file)
+            return None
+        self._record("misses")
+
+        data = journaled.data if journaled.data is not None else {}
+        # Signature was taken before the read, so a concurrent write can
+        # only make this entry look stale, never fresh.
+        return self._store(
+            state_file,
+            _CachedState(
+                signature,
+                data.get("workflow_stack", []),
+                data.get("completed_workflows"),
+                valid=journaled.data is not None,
+                journal=journaled,
+            ),
+        )
 
-        stack_data = data.get("workflow_stack", [])
-        return [WorkflowSession.from_dict(entry) for entry in stack_data]
+    async def _read_stack(
+        self, session_id: str, agent_id: str | None = None
+    ) -> list[WorkflowSession]:
+        """Read the workflow stack (from the cache when the file is unchanged)."""
+        state = self._load_state(self._state_file(session_id, agent_id))
+        if state is None:
+            return []
+        return [WorkflowSession.from_dict(entry) for entry in state.workflow_stack]
 
     async def _read_completed_workflows(
         self, session_id: str, agent_id: str | None = None
     ) -> list[WorkflowSession]:
-        """Read completed/aborted workflows from disk.
+        """Read completed/aborted workflows (from the cache when the file is unchanged).
 
         Args:
             session_id: Claude Code session ID
@@ -105,20 +612,10 @@ class StateManager:
         Returns:
             List of completed/aborted WorkflowSession objects
         """
-        state_file = self._state_file(session_id, agent_id)
-        if not state_file.exists():
+        state = self._load_state(self._state_file(session_id, agent_id))
+        if state is None or not state.completed_workflows:
             return []
-
-        async with aiofiles.open(state_file, encoding="utf-8") as f:
-            content = await f.read()
-
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            return []
-
-        completed_data = data.get("completed_workflows", [])
-        return [WorkflowSession.from_dict(entry) for entry in completed_data]
+        return [WorkflowSession.from_dict(entry) for entry in state.completed_workflows]
 
     async def _write_stack(
         self,
@@ -127,7 +624,7 @@ class StateManager:
         agent_id: str | None = None,
         completed_workflows: list[WorkflowSession] | None = None,
     ) -> None:
-        """Write the workflow stack to disk.
+        """Write the workflow stack to disk and through to the cache.
 
         Args:
             session_id: Claude Code session ID
@@ -139,20 +636,40 @@ class StateManager:
         state_file = self._state_file(session_id, agent_id)
         state_file.parent.mkdir(parents=True, exist_ok=True)
 
+        try:
+            existing = self._load_state(state_file)
+        except OSError:
+            existing = None
+
         data: dict[str, Any] = {"workflow_stack": [s.to_dict() for s in stack]}
 
         if completed_workflows is not None:
             data["completed_workflows"] = [s.to_dict() for s in completed_workflows]
-        else:
+        elif existing is not None and existing.completed_workflows is not None:
             # Preserve existing completed_workflows if present
-            if state_file.exists():
-                try:
-                    existing = json.loads(state_file.read_text(encoding="utf-8"))
-                    if "completed_workflows" in existing:
-                        data["completed_workflows"] = existing["completed_workflows"]
-                except (json.JSONDecodeError, OSError):
-                    pass
-
+            data["completed_workflows"] = existing.completed_workflows
+
+        if not (
+            self.journal
+            and existing is not None
+            and self._append_journal(state_file, existing, data)
+        ):
+            await self._write_snapshot(state_file, existing, data)
+
+        await self._update_index(
+            state_file,
+            session_id,
+            agent_id,
+            existing.workflow_stack if existing is not None else [],
+            data["workflow_stack"],
+        )
+
+    async def _write_snapshot(
+        self, state_file: Path, existing: _CachedState | None, data: dict[str, Any]
+    ) -> None:
+        """Atomically replace a state file with a full snapshot of ``data``."""
+        if self.journal:
+            data["journal_generation"] = new_generation()
         content = json.dumps(data, indent=2)
 
         # Write to a temp file then atomically rename to avoid partial reads
@@ -160,6 +677,9 @@ class StateManager:
         try:
             async with aiofiles.open(fd, "w", encoding="utf-8", closefd=True) as f:
                 await f.write(content)
+            # Rename keeps inode, size and mtime, so the temp file's stat is
+            # the signature the state file will have once replaced.
+            st = os.stat(tmp_path)
             os.replace(tmp_path, state_file)
         except BaseException:
             # Clean up temp file on failure
@@ -169,6 +689,171 @@ class StateManager:
                 pass
             raise
 
+        # The new snapshot supersedes the journal (its records carry the old
+        # generation, so they are ignored even if this unlink never happens)
+        if existing is not None and existing.signature[1] is not None:
+            try:
+                os.unlink(journal_path(state_file))
+            except FileNotFoundError:
+                pass
+
+        self._record("writes")
+        self._store(
+            state_file,
+            _CachedState(
+                (_stat_key(st), None),
+                data["workflow_stack"],
+                data.get("completed_workflows"),
+                journal=JournaledState(
+                    data=data,
+                    generation=data.get("journal_generation"),
+                    snapshot_size=st.st_size,
+                ),
+            ),
+        )
+
+    async def _update_index(
+        self,
+        state_file: Path,
+        session_id: str,
+        agent_id: str | None,
+        old_stack: list[dict[str, Any]],
+        new_stack: list[dict[str, Any]],
+    ) -> None:
+        """Sync a state file's entries in the active-session index.
+
+        Most writes (step progress, outputs, quality attempts) leave the
+        stack's workflows and current steps unchanged, and skip the index.
+        """
+        key = state_file_key(self.project_root, state_file)
+        entries = build_entries(key, session_id, agent_id, self.platform, new_stack)
+        if entries == build_entries(key, session_id, agent_id, self.platform, old_stack):
+            return
+        # Lock order: state file, then index (the index lock is never held
+        # while waiting for a state file)
+        async with self._locked(index_path(self.project_root)):
+            await asyncio.to_thread(replace_entries, self.project_root, key, entries)
+
+    def _append_journal(
+        self, state_file: Path, existing: _CachedState, data: dict[str, Any]
+    ) -> bool:
+        """Persist a write as one journal record instead of a new snapshot.
+
+        Returns:
+            True if the record was appended; False if a full snapshot is
+            needed (no journaled snapshot yet, a change the journal cannot
+            express, or the journal is due for compaction).
+        """
+        journaled = existing.journal
+        if journaled is None or journaled.generation is None:
+            return False
+        record = build_record(
+            journaled.generation,
+            existing.workflow_stack,
+            data["workflow_stack"],
+            existing.completed_workflows,
+            data.get("completed_workflows"),
+        )
+        if record is None:
+            return False
+        line = encode_record(record)
+        if should_compact(journaled, len(line)):
+            return False
+
+        journal_st = append_record(state_file, line, journaled.journal_size)
+        self._record("writes")
+        self._store(
+            state_file,
+            _CachedState(
+                (existing.signature[0], _stat_key(journal_st)),
+                data["workflow_stack"],
+                data.get("completed_workflows"),
+                journal=JournaledState(
+                    data=data,
+                    generation=journaled.generation,
+                    snapshot_size=journaled.snapshot_size,
+                    journal_size=journaled.journal_size + len(line),
+                    journal_records=journaled.journal_records + 1,
+                ),
+            ),
+        )
+        return True
+
+    @asynccontextmanager
+    async def transaction(
+        self, session_id: str, agent_id: str | None = None
+    ) -> AsyncIterator[StateTransaction]:
+        """Apply a batch of mutations to one workflow stack with a single write.
+
+        The state file's lock (in-process and cross-process) is held for the
+        whole block. The stack is read once on entry and, if any mutation was
+        applied, written once (atomically) on exit. If the block raises,
+        nothing is written.
+
+        Args:
+            session_id: Claude Code session ID
+            agent_id: Optional agent ID for sub-agent scoped state
+
+        Yields:
+            StateTransaction operating on the loaded stack
+        """
+        state_file = self._state_file(session_id, agent_id)
+        async with self._locked(state_file):
+            state = self._load_state(state_file)
+            txn = StateTransaction(
+                session_id,
+                agent_id,
+                stack=(
+                    [WorkflowSession.from_dict(entry) for entry in state.workflow_stack]
+                    if state is not None
+                    else []
+                ),
+                completed_data=state.completed_workflows if state is not None else None,
+            )
+            yield txn
+
+            if txn.parent_sub_workflow_ids:
+                # Cross-agent sub-workflow: record it on the main stack's parent
+                async with self._locked(self._state_file(session_id, agent_id=None)):
+                    main_stack = await self._read_stack(session_id, agent_id=None)
+                    if main_stack:
+                        for instance_id in txn.parent_sub_workflow_ids:
+                            _record_sub_workflow(main_stack[-1], instance_id)
+                        await self._write_stack(session_id, main_stack, agent_id=None)
+
+            if txn.dirty:
+                completed = txn.completed_workflows
+                overflow = len(completed) - self.hot_completed_limit if completed else 0
+                if completed and overflow > 0:
+                    # Archive first: a crash before the rewrite below only
+                    # leaves duplicates, which readers drop
+                    await asyncio.to_thread(
+                        write_segment, state_file, [s.to_dict() for s in completed[:overflow]]
+                    )
+                    completed = completed[overflow:]
+                await self._write_stack(
+                    session_id,
+                    txn.stack,
+                    agent_id,
+                    completed_workflows=completed,
+                )
+                if txn.events:
+                    await self._append_events(txn.events)
+
+    async def _append_events(self, events: list[dict[str, Any]]) -> None:
+        """Append a committed transaction's events to the event log, if any.
+
+        The state is already written, so failures are logged, not raised.
+        """
+        if self.events is None:
+            return
+        try:
+            # Lock order: state file, then event log
+            async with self._locked(self.events.path):
+                await asyncio.to_thread(self.events.append, events)
+        except OSError:
+            logger.warning("Failed to append workflow events", exc_info=True)
+
     async def create_session(
         self,
         session_id: str,
@@ -179,76 +864,16 @@ class StateManager:
         agent_id: str | None = None,
     ) -> WorkflowSession:
         """Create a new workflow session and push onto the stack."""
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            now = datetime.now(UTC).isoformat()
-
-            session = WorkflowSession(
-                session_id=session_id,
-                job_name=job_name,
-                workflow_name=workflow_name,
-                goal=goal,
-                current_step_id=first_step_id,
-                current_step_index=0,
-                step_progress={},
-                started_at=now,
-                status="active",
-            )
-
-            # If there's a parent workflow on the stack, record this sub-workflow's
-            # instance ID on the parent's current step
-            if stack:
-                parent = stack[-1]
-                parent_step_id = parent.current_step_id
-                # Update step_progress
-                if parent_step_id in parent.step_progress:
-                    parent.step_progress[parent_step_id].sub_workflow_instance_ids.append(
-                        session.workflow_instance_id
-                    )
-                # Update last step_history entry if it matches
-                if parent.step_history and parent.step_history[-1].step_id == parent_step_id:
-                    parent.step_history[-1].sub_workflow_instance_ids.append(
-                        session.workflow_instance_id
-                    )
-            elif agent_id:
-                # Cross-agent sub-workflow: also update main stack's parent
-                main_stack = await self._read_stack(session_id, agent_id=None)
-                if main_stack:
-                    parent = main_stack[-1]
-                    parent_step_id = parent.current_step_id
-                    if parent_step_id in parent.step_progress:
-                        parent.step_progress[parent_step_id].sub_workflow_instance_ids.append(
-                            session.workflow_instance_id
-                        )
-                    if parent.step_history and parent.step_history[-1].step_id == parent_step_id:
-                        parent.step_history[-1].sub_workflow_instance_ids.append(
-                            session.workflow_instance_id
-                        )
-                    await self._write_stack(session_id, main_stack, agent_id=None)
-
-            stack.append(session)
-            await self._write_stack(session_id, stack, agent_id)
-            return session
+        async with self.transaction(session_id, agent_id) as txn:
+            return txn.create_session(job_name, workflow_name, goal, first_step_id)
 
     def resolve_session(self, session_id: str, agent_id: str | None = None) -> WorkflowSession:
         """Resolve the active session (top of stack) synchronously."""
-        state_file = self._state_file(session_id, agent_id)
-        if not state_file.exists():
-            raise StateError("No active workflow session. Use start_workflow to begin a workflow.")
-
-        content = state_file.read_text(encoding="utf-8")
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError as exc:
-            raise StateError(
-                "No active workflow session. Use start_workflow to begin a workflow."
-            ) from exc
-
-        stack_data = data.get("workflow_stack", [])
-        if not stack_data:
+        state = self._load_state(self._state_file(session_id, agent_id))
+        if state is None or not state.workflow_stack:
             raise StateError("No active workflow session. Use start_workflow to begin a workflow.")
 
-        return WorkflowSession.from_dict(stack_data[-1])
+        return WorkflowSession.from_dict(state.workflow_stack[-1])
 
     async def start_step(
         self,
@@ -258,32 +883,8 @@ class StateManager:
         agent_id: str | None = None,
     ) -> None:
         """Mark a step as started, optionally storing input values."""
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            if not stack:
-                raise StateError(
-                    "No active workflow session. Use start_workflow to begin a workflow."
-                )
-
-            session = stack[-1]
-            now = datetime.now(UTC).isoformat()
-
-            if step_id not in session.step_progress:
-                session.step_progress[step_id] = StepProgress(
-                    step_id=step_id,
-                    started_at=now,
-                    input_values=input_values or {},
-                )
-            else:
-                session.step_progress[step_id].started_at = now
-                if input_values:
-                    session.step_progress[step_id].input_values = input_values
-
-            # Append to step history
-            session.step_history.append(StepHistoryEntry(step_id=step_id, started_at=now))
-
-            session.current_step_id = step_id
-            await self._write_stack(session_id, stack, agent_id)
+        async with self.transaction(session_id, agent_id) as txn:
+            txn.start_step(step_id, input_values)
 
     async def complete_step(
         self,
@@ -294,32 +895,8 @@ class StateManager:
         agent_id: str | None = None,
     ) -> None:
         """Mark a step as completed."""
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            if not stack:
-                raise StateError(
-                    "No active workflow session. Use start_workflow to begin a workflow."
-                )
-
-            session = stack[-1]
-            now = datetime.now(UTC).isoformat()
-
-            if step_id not in session.step_progress:
-                session.step_progress[step_id] = StepProgress(
-                    step_id=step_id,
-                    started_at=now,
-                )
-
-            progress = session.step_progress[step_id]
-            progress.completed_at = now
-            progress.outputs = outputs
-            progress.work_summary = work_summary
-
-            # Update the last step_history entry's finished_at
-            if session.step_history and session.step_history[-1].step_id == step_id:
-                session.step_history[-1].finished_at = now
-
-            await self._write_stack(session_id, stack, agent_id)
+        async with self.transaction(session_id, agent_id) as txn:
+            txn.complete_step(step_id, outputs, work_summary)
 
     async def record_quality_attempt(
         self, session_id: str, step_id: str, agent_id: str | None = None
@@ -329,22 +906,8 @@ class StateManager:
         Returns:
             Total number of attempts for this step
         """
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            if not stack:
-                raise StateError(
-                    "No active workflow session. Use start_workflow to begin a workflow."
-                )
-
-            session = stack[-1]
-
-            if step_id not in session.step_progress:
-                session.step_progress[step_id] = StepProgress(step_id=step_id)
-
-            session.step_progress[step_id].quality_attempts += 1
-            await self._write_stack(session_id, stack, agent_id)
-
-            return session.step_progress[step_id].quality_attempts
+        async with self.transaction(session_id, agent_id) as txn:
+            return txn.record_quality_attempt(step_id)
 
     async def advance_to_step(
         self,
@@ -354,17 +917,8 @@ class StateManager:
         agent_id: str | None = None,
     ) -> None:
         """Advance the session to a new step."""
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            if not stack:
-                raise StateError(
-                    "No active workflow session. Use start_workflow to begin a workflow."
-                )
-
-            session = stack[-1]
-            session.current_step_id = step_id
-            session.current_step_index = step_index
-            await self._write_stack(session_id, stack, agent_id)
+        async with self.transaction(session_id, agent_id) as txn:
+            txn.advance_to_step(step_id, step_index)
 
     async def go_to_step(
         self,
@@ -389,25 +943,8 @@ class StateManager:
         Raises:
             StateError: If no active session
         """
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            if not stack:
-                raise StateError(
-                    "No active workflow session. Use start_workflow to begin a workflow."
-                )
-
-            session = stack[-1]
-
-            # Clear progress for all invalidated steps
-            for sid in invalidate_step_ids:
-                if sid in session.step_progress:
-                    del session.step_progress[sid]
-
-            # Update position
-            session.current_step_id = step_id
-            session.current_step_index = step_index
-
-            await self._write_stack(session_id, stack, agent_id)
+        async with self.transaction(session_id, agent_id) as txn:
+            txn.go_to_step(step_id, step_index, invalidate_step_ids)
 
     async def complete_workflow(
         self, session_id: str, agent_id: str | None = None
@@ -427,25 +964,8 @@ class StateManager:
         Raises:
             StateError: If no active session
         """
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            if not stack:
-                raise StateError(
-                    "No active workflow session. Use start_workflow to begin a workflow."
-                )
-
-            session = stack[-1]
-            now = datetime.now(UTC).isoformat()
-            session.completed_at = now
-            session.status = "completed"
-
-            # Move from stack to completed_workflows
-            completed = await self._read_completed_workflows(session_id, agent_id)
-            completed.append(session)
-            stack.pop()
-            await self._write_stack(session_id, stack, agent_id, completed_workflows=completed)
-
-            return stack[-1] if stack else None
+        async with self.transaction(session_id, agent_id) as txn:
+            return txn.complete_workflow()
 
     async def abort_workflow(
         self, session_id: str, explanation: str, agent_id: str | None = None
@@ -466,27 +986,8 @@ class StateManager:
         Raises:
             StateError: If no active session
         """
-        async with self._lock:
-            stack = await self._read_stack(session_id, agent_id)
-            if not stack:
-                raise StateError(
-                    "No active workflow session. Use start_workflow to begin a workflow."
-                )
-
-            session = stack[-1]
-            now = datetime.now(UTC).isoformat()
-            session.completed_at = now
-            session.status = "aborted"
-            session.abort_reason = explanation
-
-            # Move from stack to completed_workflows
-            completed = await self._read_completed_workflows(session_id, agent_id)
-            completed.append(session)
-            stack.pop()
-            await self._write_stack(session_id, stack, agent_id, completed_workflows=completed)
-
-            new_active = stack[-1] if stack else None
-            return session, new_active
+        async with self.transaction(session_id, agent_id) as txn:
+            return txn.abort_workflow(explanation)
 
     def get_all_outputs(
         self, session_id: str, agent_id: str | None = None
@@ -509,46 +1010,56 @@ class StateManager:
 
     def get_stack(self, session_id: str, agent_id: str | None = None) -> list[StackEntry]:
         """Get the current workflow stack as StackEntry objects."""
-        main_file = self._state_file(session_id, agent_id=None)
-        main_stack: list[WorkflowSession] = []
-        if main_file.exists():
-            content = main_file.read_text(encoding="utf-8")
-            try:
-                data = json.loads(content)
-                main_stack = [
-                    WorkflowSession.from_dict(entry) for entry in data.get("workflow_stack", [])
-                ]
-            except json.JSONDecodeError:
-                pass
+        combined: list[dict[str, Any]] = []
+        main_state = self._load_state(self._state_file(session_id, agent_id=None))
+        if main_state is not None:
+            combined.extend(main_state.workflow_stack)
 
-        agent_stack: list[WorkflowSession] = []
         if agent_id:
-            agent_file = self._state_file(session_id, agent_id)
-            if agent_file.exists():
-                content = agent_file.read_text(encoding="utf-8")
-                try:
-                    data = json.loads(content)
-                    agent_stack = [
-                        WorkflowSession.from_dict(entry) for entry in data.get("workflow_stack", [])
-                    ]
-                except json.JSONDecodeError:
-                    pass
-
-        combined = main_stack + agent_stack
+            agent_state = self._load_state(self._state_file(session_id, agent_id))
+            if agent_state is not None:
+                combined.extend(agent_state.workflow_stack)
+
+        sessions = [WorkflowSession.from_dict(entry) for entry in combined]
         return [
             StackEntry(
                 workflow=f"{s.job_name}/{s.workflow_name}",
                 step=s.current_step_id,
             )
-            for s in combined
+            for s in sessions
         ]
 
     def get_stack_depth(self, session_id: str, agent_id: str | None = None) -> int:
         """Get the current stack depth."""
         return len(self.get_stack(session_id, agent_id))
 
+    def _archived_entries(self, state_file: Path) -> list[dict[str, Any]]:
+        """Return serialized workflows from a state file's archive segments."""
+        entries: list[dict[str, Any]] = []
+        for segment in list_segments(state_file):
+            cached = self._segment_cache.get(segment)
+            if cached is None:
+                try:
+                    cached = read_segment(segment)
+                except (OSError, ValueError) as e:
+                    logger.warning("Skipping unreadable archive segment: %s", e)
+                    continue
+                with self._mutex:
+                    if len(self._segment_cache) >= _MAX_CACHED_FILES:
+                        self._segment_cache.pop(next(iter(self._segment_cache)), None)
+                    self._segment_cache[segment] = cached
+            entries.extend(cached)
+        return entries
+
+    def get_archived_workflows(
+        self, session_id: str, agent_id: str | None = None
+    ) -> list[WorkflowSession]:
+        """Return completed/aborted workflows moved out of a state file, oldest first."""
+        state_file = self._state_file(session_id, agent_id)
+        return [WorkflowSession.from_dict(e) for e in self._archived_entries(state_file)]
+
     def get_all_session_data(
-        self, session_id: str
+        self, session_id: str, *, include_archived: bool = False
     ) -> dict[str | None, tuple[list[WorkflowSession], list[WorkflowSession]]]:
         """Return all stacks and completed workflows for a session.
 
@@ -556,6 +1067,9 @@ class StateManager:
 
         Args:
             session_id: Claude Code session ID
+            include_archived: Also return completed workflows that were moved
+                to archive segments, ahead of those still in the state file
+                (default: False)
 
         Returns:
             Dict mapping agent_id (None for main) to
@@ -568,19 +1082,6 @@ class StateManager:
             return result
 
         for state_file in sorted(session_dir.iterdir()):
-            if not state_file.suffix == ".json":
-                continue
-
-            try:
-                data = json.loads(state_file.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
-                continue
-
-            stack = [WorkflowSession.from_dict(entry) for entry in data.get("workflow_stack", [])]
-            completed = [
-                WorkflowSession.from_dict(entry) for entry in data.get("completed_workflows", [])
-            ]
-
             if state_file.name == "state.json":
                 agent_id = None
             elif state_file.name.startswith("agent_") and state_file.name.endswith(".json"):
@@ -588,6 +1089,24 @@ class StateManager:
             else:
                 continue
 
+            try:
+                state = self._load_state(state_file)
+            except OSError:
+                continue
+            if state is None or not state.valid:
+                continue
+
+            stack = [WorkflowSession.from_dict(entry) for entry in state.workflow_stack]
+            completed_data = state.completed_workflows or []
+            if include_archived:
+                hot_ids = {entry.get("workflow_instance_id") for entry in completed_data}
+                archived = [
+                    entry
+                    for entry in self._archived_entries(state_file)
+                    if entry.get("workflow_instance_id") not in hot_ids
+                ]
+                completed_data = archived + completed_data
+            completed = [WorkflowSession.from_dict(entry) for entry in completed_data]
             result[agent_id] = (stack, completed)
 
         return result
@@ -9,24 +9,51 @@ structure of job_manifest.yml or sessions/<session_id>.yml require careful
 consideration of backward compatibility.
 
 Status writing is fire-and-forget — failures are logged as warnings and
-never fail a tool call.
+never fail a tool call. Tool calls only mark a session as dirty
+(``schedule_session_status``); a background task writes every dirty session
+once per debounce window, so a burst of calls costs one write per session.
+Files are replaced atomically and skipped entirely when their content (other
+than ``last_updated_at``) has not changed since the last write.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import hashlib
+import json
 import logging
+from collections.abc import Callable
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from deepwork.utils.yaml_utils import save_yaml
+import yaml
+
+from deepwork.utils.fs import atomic_write
 
 if TYPE_CHECKING:
+    from deepwork.jobs.discovery import JobLoadError
+    from deepwork.jobs.mcp.blocking import BlockingExecutor
     from deepwork.jobs.mcp.state import StateManager
     from deepwork.jobs.parser import JobDefinition
 
+    JobLoader = Callable[[], tuple[list[JobDefinition], list[JobLoadError]]]
+
 logger = logging.getLogger("deepwork.jobs.mcp.status")
 
+T = TypeVar("T")
+
+# Seconds to coalesce session status updates before writing
+DEFAULT_DEBOUNCE = 0.25
+
+# The C emitter produces the same YAML as the pure-Python SafeDumper, faster
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _digest(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
 
 def _derive_display_name(api_name: str) -> str:
     """Derive a human-readable display name from an API name.
@@ -50,18 +77,55 @@ class StatusWriter:
     - sessions/<session_id>.yml: per-session workflow execution status
     """
 
-    def __init__(self, project_root: Path):
+    def __init__(
+        self,
+        project_root: Path,
+        *,
+        debounce: float = DEFAULT_DEBOUNCE,
+        blocking: BlockingExecutor | None = None,
+    ):
+        """Initialize the status writer.
+
+        Args:
+            project_root: Path to the project root
+            debounce: Seconds to coalesce scheduled session status updates
+            blocking: Thread pool for background writes. ``asyncio.to_thread``
+                is used when None.
+        """
         self.status_dir = project_root / ".deepwork" / "tmp" / "status" / "v1"
         self.manifest_path = self.status_dir / "job_manifest.yml"
         self.sessions_dir = self.status_dir / "sessions"
-
-    def write_manifest(self, jobs: list[JobDefinition]) -> None:
+        self.debounce = debounce
+        self.blocking = blocking
+        # Number of status files actually written (unchanged content is skipped)
+        self.writes = 0
+        self._digests: dict[Path, str] = {}
+        self._dirty: dict[str, tuple[StateManager, JobLoader]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._wake: asyncio.Event | None = None
+
+    def _write_yaml(self, path: Path, data: dict[str, Any], digest: str) -> bool:
+        """Atomically write ``data`` unless the last write had the same digest."""
+        if self._digests.get(path) == digest and path.exists():
+            return False
+        atomic_write(
+            path, yaml.dump(data, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+        )
+        self._digests[path] = digest
+        self.writes += 1
+        return True
+
+    def write_manifest(self, jobs: list[JobDefinition]) -> bool:
         """Write job_manifest.yml with all available jobs, workflows, and steps.
 
         Jobs are sorted by name, workflows within each job are sorted by name.
+        The file is only rewritten when the manifest content changed.
 
         Args:
             jobs: List of parsed job definitions
+
+        Returns:
+            True if the file was written
         """
         sorted_jobs = sorted(jobs, key=lambda j: j.name)
         manifest_jobs: list[dict[str, Any]] = []
@@ -96,25 +160,27 @@ class StatusWriter:
                 }
             )
 
-        save_yaml(self.manifest_path, {"jobs": manifest_jobs})
+        manifest = {"jobs": manifest_jobs}
+        return self._write_yaml(self.manifest_path, manifest, _digest(manifest))
 
     def write_session_status(
         self,
         session_id: str,
         state_manager: StateManager,
-        job_loader: Any,
+        job_loader: JobLoader,
     ) -> None:
         """Write sessions/<session_id>.yml from current state.
 
         Reads all stacks (main + agent) for the session, loads job definitions
-        to include workflow metadata, and writes a unified status file.
+        to include workflow metadata, and writes a unified status file. The
+        write is skipped when nothing but ``last_updated_at`` would change.
 
         Args:
             session_id: The session ID
             state_manager: StateManager instance to read state from
             job_loader: Callable that returns (list[JobDefinition], list[errors])
         """
-        all_data = state_manager.get_all_session_data(session_id)
+        all_data = state_manager.get_all_session_data(session_id, include_archived=True)
         if not all_data:
             return
 
@@ -142,6 +208,7 @@ class StatusWriter:
                 wf_data = self._build_workflow_entry(session, agent_id, job_map)
                 workflows_output.append(wf_data)
 
+        digest = _digest([session_id, active_instance_id, workflows_output])
         now = datetime.now(UTC).isoformat()
         status_data: dict[str, Any] = {
             "session_id": session_id,
@@ -151,7 +218,67 @@ class StatusWriter:
         }
 
         session_file = self.sessions_dir / f"{session_id}.yml"
-        save_yaml(session_file, status_data)
+        self._write_yaml(session_file, status_data, digest)
+
+    def schedule_session_status(
+        self,
+        session_id: str,
+        state_manager: StateManager,
+        job_loader: JobLoader,
+    ) -> None:
+        """Mark a session's status dirty and write it in the background.
+
+        All sessions marked within the debounce window are written together by
+        one background task. Without a running event loop the status is
+        written immediately.
+
+        Args:
+            session_id: The session ID
+            state_manager: StateManager instance to read state from
+            job_loader: Callable that returns (list[JobDefinition], list[errors])
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.write_session_status(session_id, state_manager, job_loader)
+            return
+        self._dirty[session_id] = (state_manager, job_loader)
+        if self._flush_task is None or self._flush_task.done():
+            self._wake = asyncio.Event()
+            self._flush_task = loop.create_task(
+                self._flush_later(self._wake), name="deepwork-status-flush"
+            )
+
+    async def flush(self) -> None:
+        """Write all pending session status now and wait for the writes."""
+        task = self._flush_task
+        if task is not None and not task.done():
+            assert self._wake is not None
+            self._wake.set()
+            await task
+        await self._write_dirty()
+
+    async def _flush_later(self, wake: asyncio.Event) -> None:
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(wake.wait(), self.debounce)
+        await self._write_dirty()
+
+    async def _write_dirty(self) -> None:
+        # Sessions marked dirty while writing are picked up by the next pass
+        while self._dirty:
+            dirty, self._dirty = self._dirty, {}
+            for session_id, (state_manager, job_loader) in dirty.items():
+                try:
+                    await self._run(
+                        self.write_session_status, session_id, state_manager, job_loader
+                    )
+                except Exception:
+                    logger.warning("Failed to write session status", exc_info=True)
+
+    async def _run(self, func: Callable[..., T], /, *args: Any) -> T:
+        if self.blocking is not None:
+            return await self.blocking.run(func, *args)
+        return await asyncio.to_thread(func, *args)
 
     def _build_workflow_entry(
         self,
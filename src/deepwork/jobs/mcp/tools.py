@@ -19,7 +19,8 @@ from uuid import uuid4
 
 import aiofiles
 
-from deepwork.jobs.discovery import JobLoadError, find_job_dir, load_all_jobs
+from deepwork.jobs.discovery import JobLoadError, find_job_dir
+from deepwork.jobs.mcp.blocking import BlockingExecutor
 from deepwork.jobs.mcp.quality_gate import run_quality_gate
 from deepwork.jobs.mcp.schemas import (
     AbortWorkflowInput,
@@ -46,10 +47,11 @@ from deepwork.jobs.mcp.state import StateError, StateManager
 from deepwork.jobs.parser import (
     JobDefinition,
     ParseError,
+    StepPlan,
     Workflow,
     WorkflowStep,
-    parse_job_definition,
 )
+from deepwork.jobs.registry import JobRegistry
 
 logger = logging.getLogger("deepwork.jobs.mcp")
 
@@ -71,6 +73,8 @@ class WorkflowTools:
         project_root: Path,
         state_manager: StateManager,
         status_writer: StatusWriter | None = None,
+        job_registry: JobRegistry | None = None,
+        blocking: BlockingExecutor | None = None,
     ):
         """Initialize workflow tools.
 
@@ -78,10 +82,16 @@ class WorkflowTools:
             project_root: Path to project root
             state_manager: State manager instance
             status_writer: Optional status writer for external status files.
+            job_registry: Cache of parsed job definitions. A new one is
+                created when None.
+            blocking: Thread pool that the async tools use for file I/O,
+                parsing and the quality gate. A new one is created when None.
         """
         self.project_root = project_root
         self.state_manager = state_manager
         self.status_writer = status_writer
+        self.job_registry = job_registry or JobRegistry()
+        self.blocking = blocking or BlockingExecutor()
 
     @property
     def platform(self) -> str:
@@ -112,6 +122,19 @@ class WorkflowTools:
             except Exception:
                 logger.warning("Failed to write session status", exc_info=True)
 
+    def _schedule_session_status(self, session_id: str) -> None:
+        """Queue a debounced background write of the session status file.
+
+        Fire-and-forget: the tool response does not wait for the write.
+        """
+        if self.status_writer:
+            try:
+                self.status_writer.schedule_session_status(
+                    session_id, self.state_manager, self._load_all_jobs
+                )
+            except Exception:
+                logger.warning("Failed to schedule session status", exc_info=True)
+
     def _write_manifest(self, jobs: list[JobDefinition] | None = None) -> None:
         """Write job manifest file if status_writer is configured.
 
@@ -130,7 +153,7 @@ class WorkflowTools:
 
     def _load_all_jobs(self) -> tuple[list[JobDefinition], list[JobLoadError]]:
         """Load all job definitions from all configured job folders."""
-        return load_all_jobs(self.project_root)
+        return self.job_registry.load_all(self.project_root)
 
     def _job_to_info(self, job: JobDefinition) -> JobInfo:
         """Convert a JobDefinition to JobInfo for response."""
@@ -175,7 +198,7 @@ class WorkflowTools:
             session_job_dir = self._session_jobs_dir(session_id) / job_name
             if session_job_dir.is_dir() and (session_job_dir / "job.yml").exists():
                 try:
-                    return parse_job_definition(session_job_dir)
+                    return self.job_registry.parse(session_job_dir)
                 except ParseError as e:
                     raise ToolError(f"Failed to parse session job '{job_name}': {e}") from e
 
@@ -184,7 +207,7 @@ class WorkflowTools:
             raise ToolError(f"Job not found: {job_name}")
 
         try:
-            return parse_job_definition(job_dir)
+            return self.job_registry.parse(job_dir)
         except ParseError as e:
             raise ToolError(f"Failed to parse job '{job_name}': {e}") from e
 
@@ -209,29 +232,28 @@ class WorkflowTools:
 
     def _resolve_input_values(
         self,
-        step: WorkflowStep,
-        job: JobDefinition,
-        workflow: Workflow,
-        session_id: str,
-        agent_id: str | None,
+        plan: StepPlan,
+        step_outputs: dict[str, dict[str, ArgumentValue]],
         provided_inputs: dict[str, ArgumentValue] | None = None,
     ) -> dict[str, ArgumentValue]:
-        """Resolve input values for a step from previous outputs or provided inputs."""
-        values: dict[str, ArgumentValue] = {}
+        """Resolve input values for a step from provided inputs or its source steps.
 
-        # Collect all previous step outputs from the session
-        try:
-            all_outputs = self.state_manager.get_all_outputs(session_id, agent_id)
-        except StateError:
-            all_outputs = {}
+        Args:
+            plan: Compiled plan of the step whose inputs are being resolved
+            step_outputs: Outputs of the session's completed steps, by step ID
+            provided_inputs: Explicit inputs passed to start_workflow
+        """
+        values: dict[str, ArgumentValue] = {}
 
-        for input_name, _input_ref in step.inputs.items():
+        for input_plan in plan.inputs:
             # Check provided inputs first (from start_workflow)
-            if provided_inputs and input_name in provided_inputs:
-                values[input_name] = provided_inputs[input_name]
-            # Then check previous step outputs
-            elif input_name in all_outputs:
-                values[input_name] = all_outputs[input_name]
+            if provided_inputs and input_plan.name in provided_inputs:
+                values[input_plan.name] = provided_inputs[input_plan.name]
+            # Then the output of the latest earlier step producing it
+            elif input_plan.source_step is not None:
+                outputs = step_outputs.get(input_plan.source_step, {})
+                if input_plan.name in outputs:
+                    values[input_plan.name] = outputs[input_plan.name]
 
         return values
 
@@ -298,127 +320,92 @@ class WorkflowTools:
                         f"got {type(value).__name__}"
                     )
 
-    def _build_expected_outputs(
-        self, step: WorkflowStep, job: JobDefinition
-    ) -> list[ExpectedOutput]:
+    def _build_expected_outputs(self, plan: StepPlan) -> list[ExpectedOutput]:
         """Build ExpectedOutput list from step's output refs."""
-        results = []
-        for output_name, output_ref in step.outputs.items():
-            arg = job.get_argument(output_name)
-            if not arg:
-                continue
-
-            if arg.type == "file_path":
-                syntax = "filepath or list of filepaths"
-            else:
-                syntax = "string value"
-
-            results.append(
-                ExpectedOutput(
-                    name=output_name,
-                    type=arg.type,
-                    description=arg.description,
-                    required=output_ref.required,
-                    syntax_for_finished_step_tool=syntax,
-                )
+        return [
+            ExpectedOutput(
+                name=output.name,
+                type=output.argument.type,
+                description=output.argument.description,
+                required=output.required,
+                syntax_for_finished_step_tool=output.syntax,
             )
-        return results
+            for output in plan.outputs
+        ]
 
     def _build_step_inputs_info(
         self,
-        step: WorkflowStep,
-        job: JobDefinition,
+        plan: StepPlan,
         input_values: dict[str, ArgumentValue],
     ) -> list[StepInputInfo]:
         """Build StepInputInfo list with resolved values."""
-        results = []
-        for input_name, input_ref in step.inputs.items():
-            arg = job.get_argument(input_name)
-            if not arg:
-                continue
-
-            value = input_values.get(input_name)
-            results.append(
-                StepInputInfo(
-                    name=input_name,
-                    type=arg.type,
-                    description=arg.description,
-                    value=value,
-                    required=input_ref.required,
-                )
+        return [
+            StepInputInfo(
+                name=inp.name,
+                type=inp.argument.type,
+                description=inp.argument.description,
+                value=input_values.get(inp.name),
+                required=inp.required,
             )
-        return results
+            for inp in plan.inputs
+        ]
 
     def _build_step_instructions(
         self,
-        step: WorkflowStep,
-        job: JobDefinition,
-        workflow: Workflow,
+        plan: StepPlan,
         input_values: dict[str, ArgumentValue],
     ) -> str:
         """Build complete step instructions with inputs prepended."""
         parts: list[str] = []
 
         # Prepend input descriptions and values
-        if step.inputs:
+        if plan.step.inputs:
             parts.append("## Inputs\n")
-            for input_name, input_ref in step.inputs.items():
-                arg = job.get_argument(input_name)
-                if not arg:
-                    continue
-
-                value = input_values.get(input_name)
-                required_str = " (required)" if input_ref.required else " (optional)"
-
+            for inp in plan.inputs:
+                value = input_values.get(inp.name)
                 if value is None:
-                    parts.append(
-                        f"- **{input_name}**{required_str}: {arg.description} — *not yet available*"
-                    )
-                elif arg.type == "file_path":
+                    parts.append(inp.unavailable_line)
+                elif inp.argument.type == "file_path":
                     if isinstance(value, list):
                         paths_str = ", ".join(f"`{p}`" for p in value)
-                        parts.append(f"- **{input_name}**{required_str}: {paths_str}")
+                        parts.append(f"{inp.heading}: {paths_str}")
                     else:
-                        parts.append(f"- **{input_name}**{required_str}: `{value}`")
+                        parts.append(f"{inp.heading}: `{value}`")
                 else:
-                    parts.append(f"- **{input_name}**{required_str}: {value}")
+                    parts.append(f"{inp.heading}: {value}")
             parts.append("")
 
-        # For sub_workflow steps, generate delegation instructions
-        if step.sub_workflow:
-            sw = step.sub_workflow
-            job_ref = sw.workflow_job or job.name
-            parts.append(
-                f"This step delegates to a sub-workflow. Call `start_workflow` with "
-                f'job_name="{job_ref}" and workflow_name="{sw.workflow_name}", '
-                f"then follow the instructions it returns until the sub-workflow completes."
-            )
-        elif step.instructions:
-            parts.append(step.instructions)
+        if plan.body:
+            parts.append(plan.body)
 
         return "\n".join(parts)
 
+    def _get_step_plan(
+        self, job: JobDefinition, workflow: Workflow, step: WorkflowStep
+    ) -> StepPlan:
+        """Return a step's compiled plan."""
+        plan = job.get_step_plan(workflow, step.name)
+        if plan is None:
+            raise ToolError(f"Step '{step.name}' not found in workflow '{workflow.name}'")
+        return plan
+
     def _build_active_step_info(
         self,
         session_id: str,
-        step: WorkflowStep,
+        plan: StepPlan,
         job: JobDefinition,
         workflow: Workflow,
         input_values: dict[str, ArgumentValue],
     ) -> ActiveStepInfo:
-        """Build an ActiveStepInfo from a step definition and its context."""
-        instructions = self._build_step_instructions(step, job, workflow, input_values)
-        step_outputs = self._build_expected_outputs(step, job)
-        step_inputs = self._build_step_inputs_info(step, job, input_values)
-
+        """Build an ActiveStepInfo from a step plan and its context."""
         return ActiveStepInfo(
             session_id=session_id,
-            step_id=step.name,
+            step_id=plan.step.name,
             project_root=str(self.project_root),
             job_dir=str(job.job_dir),
-            step_expected_outputs=step_outputs,
-            step_inputs=step_inputs,
-            step_instructions=instructions,
+            step_expected_outputs=self._build_expected_outputs(plan),
+            step_inputs=self._build_step_inputs_info(plan, input_values),
+            step_instructions=self._build_step_instructions(plan, input_values),
             common_job_info=workflow.common_job_info or "",
         )
 
@@ -433,7 +420,7 @@ class WorkflowTools:
         jobs, _ = self._load_all_jobs()
         job_infos = [self._job_to_info(job) for job in jobs]
 
-        issues = detect_issues(self.project_root)
+        issues = detect_issues(self.project_root, self.job_registry)
         error_infos = [
             JobLoadErrorInfo(
                 job_name=issue.job_name,
@@ -451,49 +438,43 @@ class WorkflowTools:
     async def start_workflow(self, input_data: StartWorkflowInput) -> StartWorkflowResponse:
         """Start a new workflow session."""
         # Load job and workflow (check session jobs first)
-        job = self._get_job(input_data.job_name, session_id=input_data.session_id)
+        job = await self.blocking.run(
+            self._get_job, input_data.job_name, session_id=input_data.session_id
+        )
         workflow = self._get_workflow(job, input_data.workflow_name)
 
         if not workflow.steps:
             raise ToolError(f"Workflow '{workflow.name}' has no steps")
 
         first_step = workflow.steps[0]
+        plan = self._get_step_plan(job, workflow, first_step)
 
         sid = self._resolve_session_id(input_data.session_id)
         aid = input_data.agent_id
 
-        # Create session (use resolved workflow name in case it was auto-selected)
-        session = await self.state_manager.create_session(
-            session_id=sid,
-            job_name=input_data.job_name,
-            workflow_name=workflow.name,
-            goal=input_data.goal,
-            first_step_id=first_step.name,
-            agent_id=aid,
-        )
-
-        # Resolve input values for first step
+        # A new session has no step outputs yet, so only provided inputs apply
         input_values = self._resolve_input_values(
-            first_step,
-            job,
-            workflow,
-            sid,
-            aid,
-            provided_inputs=input_data.inputs,
+            plan, step_outputs={}, provided_inputs=input_data.inputs
         )
 
-        # Mark first step as started with input values
-        await self.state_manager.start_step(
-            sid, first_step.name, input_values=input_values, agent_id=aid
-        )
+        async with self.state_manager.transaction(sid, aid) as txn:
+            # Create session (use resolved workflow name in case it was auto-selected)
+            session = txn.create_session(
+                job_name=input_data.job_name,
+                workflow_name=workflow.name,
+                goal=input_data.goal,
+                first_step_id=first_step.name,
+            )
+            # Mark first step as started with input values
+            txn.start_step(first_step.name, input_values=input_values)
 
         response = StartWorkflowResponse(
             begin_step=self._build_active_step_info(
-                session.session_id, first_step, job, workflow, input_values
+                session.session_id, plan, job, workflow, input_values
             ),
             stack=self.state_manager.get_stack(sid, aid),
         )
-        self._write_session_status(sid)
+        self._schedule_session_status(sid)
         return response
 
     async def finished_step(self, input_data: FinishedStepInput) -> FinishedStepResponse:
@@ -501,7 +482,7 @@ class WorkflowTools:
         sid = input_data.session_id
         aid = input_data.agent_id
         try:
-            session = self.state_manager.resolve_session(sid, aid)
+            session = await self.blocking.run(self.state_manager.resolve_session, sid, aid)
         except StateError as err:
             raise ToolError(
                 "No active workflow session. "
@@ -512,7 +493,7 @@ class WorkflowTools:
         current_step_name = session.current_step_id
 
         # Load job and workflow (check session jobs first)
-        job = self._get_job(session.job_name, session_id=sid)
+        job = await self.blocking.run(self._get_job, session.job_name, session_id=sid)
         workflow = self._get_workflow(job, session.workflow_name)
         current_step = workflow.get_step(current_step_name)
 
@@ -520,14 +501,15 @@ class WorkflowTools:
             raise ToolError(f"Current step not found: {current_step_name}")
 
         # Validate outputs against step's declared output refs
-        self._validate_outputs(input_data.outputs, current_step, job)
+        await self.blocking.run(self._validate_outputs, input_data.outputs, current_step, job)
 
         # Get input values from state
         input_values = self.state_manager.get_step_input_values(sid, current_step_name, aid)
 
-        # Run quality gate if not overridden
+        # Run quality gate if not overridden (git subprocesses and file I/O)
         if not input_data.quality_review_override_reason:
-            review_feedback = run_quality_gate(
+            review_feedback = await self.blocking.run(
+                run_quality_gate,
                 step=current_step,
                 job=job,
                 workflow=workflow,
@@ -549,23 +531,16 @@ class WorkflowTools:
                     stack=self.state_manager.get_stack(sid, aid),
                 )
 
-        # Mark step as completed
-        await self.state_manager.complete_step(
-            session_id=sid,
-            step_id=current_step_name,
-            outputs=input_data.outputs,
-            work_summary=input_data.work_summary,
-            agent_id=aid,
-        )
-
         # Find next step
         current_step_index = session.current_step_index
         next_step_index = current_step_index + 1
 
         if next_step_index >= len(workflow.steps):
-            # Workflow complete - get outputs before completing (which removes from stack)
-            all_outputs = self.state_manager.get_all_outputs(sid, aid)
-            await self.state_manager.complete_workflow(sid, aid)
+            async with self.state_manager.transaction(sid, aid) as txn:
+                txn.complete_step(current_step_name, input_data.outputs, input_data.work_summary)
+                # Get outputs before completing (which removes from stack)
+                all_outputs = txn.get_all_outputs()
+                txn.complete_workflow()
 
             response = FinishedStepResponse(
                 status=StepStatus.WORKFLOW_COMPLETE,
@@ -574,31 +549,28 @@ class WorkflowTools:
                 post_workflow_instructions=workflow.post_workflow_instructions,
                 stack=self.state_manager.get_stack(sid, aid),
             )
-            self._write_session_status(sid)
+            self._schedule_session_status(sid)
             return response
 
         # Get next step
         next_step = workflow.steps[next_step_index]
+        next_plan = self._get_step_plan(job, workflow, next_step)
 
-        # Advance session
-        await self.state_manager.advance_to_step(sid, next_step.name, next_step_index, agent_id=aid)
-
-        # Resolve input values for next step
-        next_input_values = self._resolve_input_values(next_step, job, workflow, sid, aid)
-
-        # Mark next step as started with input values
-        await self.state_manager.start_step(
-            sid, next_step.name, input_values=next_input_values, agent_id=aid
-        )
+        # Complete, advance and start the next step with one state write
+        async with self.state_manager.transaction(sid, aid) as txn:
+            txn.complete_step(current_step_name, input_data.outputs, input_data.work_summary)
+            txn.advance_to_step(next_step.name, next_step_index)
+            next_input_values = self._resolve_input_values(next_plan, txn.get_step_outputs())
+            txn.start_step(next_step.name, input_values=next_input_values)
 
         response = FinishedStepResponse(
             status=StepStatus.NEXT_STEP,
             begin_step=self._build_active_step_info(
-                sid, next_step, job, workflow, next_input_values
+                sid, next_plan, job, workflow, next_input_values
             ),
             stack=self.state_manager.get_stack(sid, aid),
         )
-        self._write_session_status(sid)
+        self._schedule_session_status(sid)
         return response
 
     async def abort_workflow(self, input_data: AbortWorkflowInput) -> AbortWorkflowResponse:
@@ -619,17 +591,17 @@ class WorkflowTools:
             ),
             resumed_step=new_active.current_step_id if new_active else None,
         )
-        self._write_session_status(sid)
+        self._schedule_session_status(sid)
         return response
 
     async def go_to_step(self, input_data: GoToStepInput) -> GoToStepResponse:
         """Navigate back to a prior step, clearing progress from that step onward."""
         sid = input_data.session_id
         aid = input_data.agent_id
-        session = self.state_manager.resolve_session(sid, aid)
+        session = await self.blocking.run(self.state_manager.resolve_session, sid, aid)
 
         # Load job and workflow (check session jobs first)
-        job = self._get_job(session.job_name, session_id=sid)
+        job = await self.blocking.run(self._get_job, session.job_name, session_id=sid)
         workflow = self._get_workflow(job, session.workflow_name)
 
         # Validate target step exists in workflow
@@ -651,33 +623,24 @@ class WorkflowTools:
 
         # Validate step definition exists
         target_step = workflow.steps[target_index]
+        target_plan = self._get_step_plan(job, workflow, target_step)
 
         # Collect all step names from target index through end of workflow
         invalidate_step_names: list[str] = [s.name for s in workflow.steps[target_index:]]
 
-        # Clear progress and update position
-        await self.state_manager.go_to_step(
-            session_id=sid,
-            step_id=target_step.name,
-            step_index=target_index,
-            invalidate_step_ids=invalidate_step_names,
-            agent_id=aid,
-        )
-
-        # Resolve input values for target step
-        input_values = self._resolve_input_values(target_step, job, workflow, sid, aid)
-
-        # Mark target step as started
-        await self.state_manager.start_step(
-            sid, target_step.name, input_values=input_values, agent_id=aid
-        )
+        async with self.state_manager.transaction(sid, aid) as txn:
+            # Clear progress and update position
+            txn.go_to_step(target_step.name, target_index, invalidate_step_names)
+            # Resolve input values for target step and mark it as started
+            input_values = self._resolve_input_values(target_plan, txn.get_step_outputs())
+            txn.start_step(target_step.name, input_values=input_values)
 
         response = GoToStepResponse(
-            begin_step=self._build_active_step_info(sid, target_step, job, workflow, input_values),
+            begin_step=self._build_active_step_info(sid, target_plan, job, workflow, input_values),
             invalidated_steps=invalidate_step_names,
             stack=self.state_manager.get_stack(sid, aid),
         )
-        self._write_session_status(sid)
+        self._schedule_session_status(sid)
         return response
 
     # =========================================================================
@@ -712,7 +675,7 @@ class WorkflowTools:
 
         # Validate YAML syntax first
         try:
-            yaml.safe_load(input_data.job_definition_yaml)
+            await self.blocking.run(yaml.safe_load, input_data.job_definition_yaml)
         except yaml.YAMLError as e:
             raise ToolError(f"Invalid YAML syntax: {e}") from e
 
@@ -720,9 +683,11 @@ class WorkflowTools:
         async with aiofiles.open(job_file, "w") as f:
             await f.write(input_data.job_definition_yaml)
 
-        # Validate against job schema by parsing
+        # Validate against job schema by parsing (the rewrite may not change
+        # job.yml's stat signature, so drop any cached parse first)
+        self.job_registry.invalidate(job_dir)
         try:
-            parse_job_definition(job_dir)
+            await self.blocking.run(self.job_registry.parse, job_dir)
         except ParseError as e:
             # Keep the file so the agent can see what went wrong, but report errors
             raise ToolError(
@@ -5,9 +5,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from deepwork.jobs.schema import JOB_SCHEMA
-from deepwork.utils.validation import ValidationError, validate_against_schema
-from deepwork.utils.yaml_utils import YAMLError, load_yaml
+from deepwork.jobs.cache import read_cached_job, write_cached_job
 
 logger = logging.getLogger("deepwork.parser")
 
@@ -155,6 +153,13 @@ class Workflow:
     common_job_info: str | None = None
     post_workflow_instructions: str | None = None
 
+    _step_index: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._step_index = {}
+        for i, step in enumerate(self.steps):
+            self._step_index.setdefault(step.name, i)
+
     @property
     def step_names(self) -> list[str]:
         """Get list of step names in order."""
@@ -162,17 +167,12 @@ class Workflow:
 
     def get_step(self, step_name: str) -> WorkflowStep | None:
         """Get step by name."""
-        for step in self.steps:
-            if step.name == step_name:
-                return step
-        return None
+        index = self._step_index.get(step_name)
+        return None if index is None else self.steps[index]
 
     def get_step_index(self, step_name: str) -> int | None:
         """Get index of step by name."""
-        for i, step in enumerate(self.steps):
-            if step.name == step_name:
-                return i
-        return None
+        return self._step_index.get(step_name)
 
     @classmethod
     def from_dict(cls, name: str, data: dict[str, Any]) -> "Workflow":
@@ -187,6 +187,41 @@ class Workflow:
         )
 
 
+@dataclass(frozen=True)
+class StepInputPlan:
+    """Precomputed lookup and rendering data for one step input."""
+
+    name: str
+    argument: StepArgument
+    required: bool
+    # Latest earlier step declaring this argument as an output; None when it
+    # can only be supplied to start_workflow
+    source_step: str | None
+    heading: str  # "- **name** (required)"
+    unavailable_line: str
+
+
+@dataclass(frozen=True)
+class StepOutputPlan:
+    """Precomputed lookup and rendering data for one step output."""
+
+    name: str
+    argument: StepArgument
+    required: bool
+    syntax: str  # How to pass the value to finished_step
+
+
+@dataclass(frozen=True)
+class StepPlan:
+    """Compiled view of a workflow step with its arguments already resolved."""
+
+    step: WorkflowStep
+    index: int
+    inputs: list[StepInputPlan]
+    outputs: list[StepOutputPlan]
+    body: str  # Step instructions, or sub-workflow delegation instructions
+
+
 @dataclass
 class JobDefinition:
     """A complete job definition."""
@@ -196,13 +231,93 @@ class JobDefinition:
     step_arguments: list[StepArgument]
     workflows: dict[str, Workflow]
     job_dir: Path
+    _arguments: dict[str, StepArgument] = field(init=False, repr=False, compare=False)
+    _plans: dict[tuple[str, str], StepPlan] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._arguments = {}
+        for arg in self.step_arguments:
+            self._arguments.setdefault(arg.name, arg)
 
     def get_argument(self, name: str) -> StepArgument | None:
         """Get step argument by name."""
-        for arg in self.step_arguments:
-            if arg.name == name:
-                return arg
-        return None
+        return self._arguments.get(name)
+
+    def get_step_plan(self, workflow: Workflow, step_name: str) -> StepPlan | None:
+        """Get the compiled plan for a workflow step, compiling on first use."""
+        if self._plans is None:
+            self.compile()
+            assert self._plans is not None
+        return self._plans.get((workflow.name, step_name))
+
+    def compile(self) -> None:
+        """Build the execution plan of every workflow step.
+
+        Job definitions are treated as immutable once compiled; the plans are
+        not rebuilt if steps or arguments are mutated afterwards.
+        """
+        plans: dict[tuple[str, str], StepPlan] = {}
+        for workflow in self.workflows.values():
+            # Latest earlier step producing each argument
+            produced: dict[str, str] = {}
+            for index, step in enumerate(workflow.steps):
+                plans[(workflow.name, step.name)] = self._compile_step(step, index, produced)
+                for output_name in step.outputs:
+                    produced[output_name] = step.name
+        self._plans = plans
+
+    def _compile_step(self, step: WorkflowStep, index: int, produced: dict[str, str]) -> StepPlan:
+        inputs = []
+        for input_name, input_ref in step.inputs.items():
+            arg = self.get_argument(input_name)
+            if not arg:
+                continue
+            heading = f"- **{input_name}**" + (
+                " (required)" if input_ref.required else " (optional)"
+            )
+            inputs.append(
+                StepInputPlan(
+                    name=input_name,
+                    argument=arg,
+                    required=input_ref.required,
+                    source_step=produced.get(input_name),
+                    heading=heading,
+                    unavailable_line=f"{heading}: {arg.description} — *not yet available*",
+                )
+            )
+
+        outputs = []
+        for output_name, output_ref in step.outputs.items():
+            arg = self.get_argument(output_name)
+            if not arg:
+                continue
+            outputs.append(
+                StepOutputPlan(
+                    name=output_name,
+                    argument=arg,
+                    required=output_ref.required,
+                    syntax=(
+                        "filepath or list of filepaths"
+                        if arg.type == "file_path"
+                        else "string value"
+                    ),
+                )
+            )
+
+        if step.sub_workflow:
+            sw = step.sub_workflow
+            body = (
+                f"This step delegates to a sub-workflow. Call `start_workflow` with "
+                f'job_name="{sw.workflow_job or self.name}" and '
+                f'workflow_name="{sw.workflow_name}", '
+                f"then follow the instructions it returns until the sub-workflow completes."
+            )
+        else:
+            body = step.instructions or ""
+
+        return StepPlan(step=step, index=index, inputs=inputs, outputs=outputs, body=body)
 
     def get_workflow(self, name: str) -> Workflow | None:
         """Get workflow by name."""
@@ -301,11 +416,15 @@ class JobDefinition:
         )
 
 
-def parse_job_definition(job_dir: Path | str) -> JobDefinition:
+def parse_job_definition(job_dir: Path | str, *, cache_dir: Path | None = None) -> JobDefinition:
     """Parse job definition from directory.
 
     Args:
         job_dir: Directory containing job.yml
+        cache_dir: Job cache directory (see :mod:`deepwork.jobs.cache`). When
+            given, a job.yml whose exact bytes were validated before is
+            rebuilt from the cache without YAML parsing or schema validation,
+            and newly validated jobs are added to it.
 
     Returns:
         Parsed JobDefinition
@@ -325,9 +444,32 @@ def parse_job_definition(job_dir: Path | str) -> JobDefinition:
     if not job_file.exists():
         raise ParseError(f"job.yml not found in {job_dir_path}")
 
+    try:
+        content = job_file.read_bytes()
+    except OSError as e:
+        raise ParseError(f"Failed to load job.yml: Failed to read YAML file {job_file}: {e}") from e
+
+    if cache_dir is not None:
+        cached = read_cached_job(cache_dir, content)
+        if cached is not None:
+            try:
+                job_def = JobDefinition.from_dict(cached, job_dir_path)
+            except (KeyError, TypeError, AttributeError):
+                logger.debug("Ignoring malformed job cache entry for %s", job_file)
+            else:
+                job_def.compile()
+                return job_def
+
+    # Imported here so that cache hits skip loading yaml and jsonschema
+    from deepwork.jobs.schema import get_job_schema
+    from deepwork.utils.validation import ValidationError, validate_against_schema
+    from deepwork.utils.yaml_utils import YAMLError, parse_yaml
+
     # Load YAML
     try:
-        job_data = load_yaml(job_file)
+        job_data = parse_yaml(content.decode("utf-8"), job_file)
+    except UnicodeDecodeError as e:
+        raise ParseError(f"Failed to load job.yml: Failed to read YAML file {job_file}: {e}") from e
     except YAMLError as e:
         raise ParseError(f"Failed to load job.yml: {e}") from e
 
@@ -336,7 +478,7 @@ def parse_job_definition(job_dir: Path | str) -> JobDefinition:
 
     # Validate against schema
     try:
-        validate_against_schema(job_data, JOB_SCHEMA)
+        validate_against_schema(job_data, get_job_schema())
     except ValidationError as e:
         raise ParseError(f"Job definition validation failed: {e}") from e
 
@@ -348,5 +490,9 @@ def parse_job_definition(job_dir: Path | str) -> JobDefinition:
     job_def.validate_argument_refs()
     job_def.validate_sub_workflows()
     job_def.validate_step_exclusivity()
+    job_def.compile()
+
+    if cache_dir is not None:
+        write_cached_job(cache_dir, content, job_data)
 
     return job_def
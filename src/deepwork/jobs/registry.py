@@ -0,0 +1,151 @@
+"""Long-lived cache of parsed job definitions.
+
+``load_all_jobs`` and ``parse_job_definition`` read, schema-validate and
+build every job from scratch on each call. A :class:`JobRegistry` keeps the
+results (including load errors) and re-parses a job only when the stat
+signature of its ``job.yml`` changes. Job folder listings are likewise
+reused while the folder's own stat signature is unchanged, so a warm lookup
+costs one ``stat`` per folder and two per job.
+
+Discovery semantics are exactly those of :mod:`deepwork.jobs.discovery`:
+folders come from :func:`get_job_folders` on every call (so
+``DEEPWORK_ADDITIONAL_JOBS_FOLDERS`` changes are picked up), and the first
+folder holding a valid job with a given name wins.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from deepwork.jobs import discovery
+from deepwork.jobs.discovery import JobLoadError
+from deepwork.jobs.parser import JobDefinition, ParseError, parse_job_definition
+
+logger = logging.getLogger("deepwork.jobs.registry")
+
+# (mtime_ns, ctime_ns, size, inode)
+_Signature = tuple[int, int, int, int]
+
+
+def _signature(path: Path) -> _Signature | None:
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+
+@dataclass
+class _CachedJob:
+    signature: _Signature | None
+    job: JobDefinition | None
+    error: ParseError | None
+
+
+@dataclass
+class _CachedFolder:
+    signature: _Signature
+    job_dirs: list[Path]
+
+
+class JobRegistry:
+    """Parsed job definitions, re-validated against file stats on every lookup.
+
+    Returned ``JobDefinition`` objects are shared between callers and must
+    not be mutated.
+    """
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            cache_dir: On-disk job cache used for first-time parses (see
+                :mod:`deepwork.jobs.cache`)
+        """
+        self.cache_dir = cache_dir
+        self._jobs: dict[Path, _CachedJob] = {}
+        self._folders: dict[Path, _CachedFolder] = {}
+        self.parses = 0
+
+    def invalidate(self, job_dir: Path | None = None) -> None:
+        """Forget one cached job (or everything when ``job_dir`` is None)."""
+        if job_dir is None:
+            self._jobs.clear()
+            self._folders.clear()
+        else:
+            self._jobs.pop(Path(job_dir), None)
+
+    def parse(self, job_dir: Path) -> JobDefinition:
+        """Parse a job directory, reusing the cached result while job.yml is unchanged.
+
+        Raises:
+            ParseError: If the job fails to parse (the error is cached too)
+        """
+        job_dir = Path(job_dir)
+        signature = _signature(job_dir / "job.yml")
+        cached = self._jobs.get(job_dir)
+        if signature is None or cached is None or cached.signature != signature:
+            cached = self._load(job_dir, signature)
+        if cached.error is not None:
+            raise cached.error
+        assert cached.job is not None
+        return cached.job
+
+    def _load(self, job_dir: Path, signature: _Signature | None) -> _CachedJob:
+        self.parses += 1
+        try:
+            entry = _CachedJob(
+                signature, parse_job_definition(job_dir, cache_dir=self.cache_dir), None
+            )
+        except ParseError as e:
+            logger.warning("Invalid job '%s': %s", job_dir.name, e)
+            entry = _CachedJob(signature, None, e)
+        if signature is None:
+            # job.yml is missing: never cache, so it is picked up once created
+            self._jobs.pop(job_dir, None)
+        else:
+            self._jobs[job_dir] = entry
+        return entry
+
+    def _job_dirs(self, folder: Path) -> list[Path]:
+        """List the subdirectories of a job folder that contain a job.yml."""
+        signature = _signature(folder)
+        if signature is None:
+            self._folders.pop(folder, None)
+            return []
+        cached = self._folders.get(folder)
+        if cached is None or cached.signature != signature:
+            try:
+                entries = sorted(os.scandir(folder), key=lambda e: e.name)
+            except (NotADirectoryError, FileNotFoundError):
+                return []
+            cached = _CachedFolder(signature, [Path(e.path) for e in entries if e.is_dir()])
+            self._folders[folder] = cached
+        # job.yml can appear or vanish without touching the folder itself
+        return [d for d in cached.job_dirs if (d / "job.yml").exists()]
+
+    def load_all(self, project_root: Path) -> tuple[list[JobDefinition], list[JobLoadError]]:
+        """Load all jobs from all configured job folders.
+
+        Same result as :func:`deepwork.jobs.discovery.load_all_jobs`.
+        """
+        seen_names: set[str] = set()
+        jobs: list[JobDefinition] = []
+        errors: list[JobLoadError] = []
+
+        for folder in discovery.get_job_folders(project_root):
+            for job_dir in self._job_dirs(folder):
+                if job_dir.name in seen_names:
+                    continue
+                try:
+                    jobs.append(self.parse(job_dir))
+                    seen_names.add(job_dir.name)
+                except ParseError as e:
+                    errors.append(
+                        JobLoadError(job_name=job_dir.name, job_dir=str(job_dir), error=str(e))
+                    )
+
+        return jobs, errors
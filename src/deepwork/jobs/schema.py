@@ -1,9 +1,11 @@
 """JSON Schema loader for job definitions.
 
 This module loads the job.schema.json file and provides it as a Python dict
-for use with jsonschema validation.
+(``JOB_SCHEMA`` or ``get_job_schema()``) for use with jsonschema validation.
+The file is read on first access rather than at import time.
 """
 
+import functools
 import json
 from pathlib import Path
 from typing import Any
@@ -19,8 +21,22 @@ def _load_schema() -> dict[str, Any]:
         return result
 
 
-# Load the schema at module import time
-JOB_SCHEMA: dict[str, Any] = _load_schema()
+@functools.cache
+def get_job_schema() -> dict[str, Any]:
+    """Get the job JSON schema, loading it on first use.
+
+    Returns:
+        The parsed job.schema.json
+    """
+    return _load_schema()
+
+
+def __getattr__(name: str) -> Any:
+    # JOB_SCHEMA is loaded lazily so that processes served from the job cache
+    # never read the schema file
+    if name == "JOB_SCHEMA":
+        return get_job_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_schema_path() -> Path:
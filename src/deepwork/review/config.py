@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from deepwork.review.packing import task_budget
 from deepwork.review.schema import DEEPREVIEW_SCHEMA
 from deepwork.utils.validation import ValidationError, validate_against_schema
 from deepwork.utils.yaml_utils import YAMLError, load_yaml
@@ -49,6 +50,9 @@ class ReviewRule:
     source_file: Path  # Path to the .deepreview file
     source_line: int  # Line number of the rule name in the .deepreview file
     reference_files: list[ReferenceFile] = field(default_factory=list)
+    precompute_timeout_seconds: int | None = None  # None = default timeout
+    precompute_cache_ttl_seconds: int | None = None  # None = default TTL, 0 = no caching
+    task_budget_bytes: int | None = None  # Pack files into tasks of at most this size
 
 
 @dataclass
@@ -65,6 +69,9 @@ class ReviewTask:
     precomputed_info_bash_command: str | None = None  # Resolved command to run
     inline_content: str | None = None  # Inline string value for type: string outputs
     reference_files: list[ReferenceFile] = field(default_factory=list)
+    precompute_timeout_seconds: int | None = None
+    precompute_cache_ttl_seconds: int | None = None
+    shard_label: str | None = None  # e.g. "part 2 of 3" when a file set was split
 
 
 def parse_deepreview_file(filepath: Path) -> list[ReviewRule]:
@@ -76,6 +83,28 @@ def parse_deepreview_file(filepath: Path) -> list[ReviewRule]:
     Returns:
         List of ReviewRule objects parsed from the file.
 
+    Raises:
+        ConfigError: If the file cannot be parsed or fails validation.
+    """
+    rules, _instruction_files = parse_deepreview_file_with_dependencies(filepath)
+    return rules
+
+
+def parse_deepreview_file_with_dependencies(
+    filepath: Path,
+) -> tuple[list[ReviewRule], list[Path]]:
+    """Parse a .deepreview file and report the instruction files it read.
+
+    Same as ``parse_deepreview_file``, but also returns the paths of every
+    ``instructions: {file: ...}`` reference that was loaded, so callers
+    caching the parsed rules know which files invalidate them.
+
+    Args:
+        filepath: Path to the .deepreview file.
+
+    Returns:
+        Tuple of (parsed rules, referenced instruction file paths).
+
     Raises:
         ConfigError: If the file cannot be parsed or fails validation.
     """
@@ -88,7 +117,7 @@ def parse_deepreview_file(filepath: Path) -> list[ReviewRule]:
         raise ConfigError(f"File not found: {filepath}")
 
     if not data:
-        return []
+        return [], []
 
     try:
         validate_against_schema(data, DEEPREVIEW_SCHEMA)
@@ -99,12 +128,17 @@ def parse_deepreview_file(filepath: Path) -> list[ReviewRule]:
     line_numbers = _find_rule_line_numbers(filepath)
     rules: list[ReviewRule] = []
 
+    instruction_files: list[Path] = []
+
     for rule_name, rule_data in data.items():
         line = line_numbers.get(rule_name, 1)
         rule = _parse_rule(rule_name, rule_data, source_dir, filepath, line)
         rules.append(rule)
+        instructions = rule_data["review"]["instructions"]
+        if isinstance(instructions, dict):
+            instruction_files.append(source_dir / instructions["file"])
 
-    return rules
+    return rules, instruction_files
 
 
 def _parse_rule(
@@ -165,6 +199,11 @@ def _parse_rule(
         source_file=source_file,
         source_line=source_line,
         reference_files=reference_files,
+        precompute_timeout_seconds=review_data.get("precomputed_info_timeout_seconds"),
+        precompute_cache_ttl_seconds=review_data.get("precomputed_info_cache_ttl_seconds"),
+        task_budget_bytes=task_budget(
+            review_data.get("task_budget_bytes"), review_data.get("task_budget_tokens")
+        ),
     )
 
 
@@ -0,0 +1,216 @@
+"""Per-file content digests for review IDs.
+
+A review ID's content hash is built from one digest per reviewed file.
+Digests are git blob IDs (SHA-1 of ``"blob <size>\\0" + content``), which
+lets clean tracked files reuse the object IDs git already stores in its
+index instead of re-reading their content. Every other file is hashed in
+streaming chunks.
+
+Digests are memoized in memory, so each file is hashed at most once per
+run however many tasks reference it, and persisted under
+``.deepwork/tmp/cache/`` keyed by the file's stat signature (size,
+mtime_ns, inode) so unchanged files are not re-read by the next run.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from deepwork.review.rule_cache import CACHE_DIR, ensure_cache_dir
+from deepwork.utils.fs import atomic_write
+
+DIGEST_CACHE_FILENAME = "file_digests.json"
+
+# Digest of a file that cannot be read.
+MISSING = "MISSING"
+
+# Bump when the digest scheme changes.
+_CACHE_FORMAT = 1
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Files modified this recently are not persisted: a later write within the
+# filesystem's timestamp granularity could leave size and mtime unchanged
+# (the same "racy" window git guards against for its index).
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Persisted entries beyond this are dropped, keeping only this run's files.
+_MAX_CACHE_ENTRIES = 50_000
+
+# Index modes of regular files; symlinks and submodules are hashed on disk.
+_REGULAR_FILE_MODES = ("100644", "100755")
+
+
+class FileDigests:
+    """Content digests of project files, shared by every task in a run."""
+
+    def __init__(self, project_root: Path) -> None:
+        self.project_root = project_root
+        self.path = project_root / CACHE_DIR / DIGEST_CACHE_FILENAME
+        self._digests: dict[str, str] = {}
+        self._stats: dict[str, os.stat_result] = {}
+        self._persisted: dict[str, list[Any]] | None = None
+        self._index: dict[str, str] | None = None
+        self._dirty = False
+        self.hashed = 0
+        self.from_cache = 0
+        self.from_index = 0
+
+    def digest(self, filepath: str) -> str:
+        """Return the digest of a file, or ``MISSING`` if it cannot be read.
+
+        Args:
+            filepath: Path relative to the project root.
+
+        Returns:
+            40-char hex git blob ID, or ``MISSING``.
+        """
+        cached = self._digests.get(filepath)
+        if cached is not None:
+            return cached
+        self.prime([filepath])
+        return self._digests[filepath]
+
+    def prime(self, filepaths: Iterable[str]) -> None:
+        """Compute digests for many files at once.
+
+        Files missing from the persistent cache are looked up in the git
+        index with a single pair of git calls before any are read.
+
+        Args:
+            filepaths: Paths relative to the project root.
+        """
+        persisted = self._load()
+        misses: list[str] = []
+        for filepath in dict.fromkeys(filepaths):
+            if filepath in self._digests:
+                continue
+            try:
+                st = os.stat(self.project_root / filepath)
+            except OSError:
+                self._digests[filepath] = MISSING
+                continue
+            self._stats[filepath] = st
+            entry = persisted.get(filepath)
+            if entry is not None and entry[:3] == [st.st_size, st.st_mtime_ns, st.st_ino]:
+                self._digests[filepath] = entry[3]
+                self.from_cache += 1
+            else:
+                misses.append(filepath)
+
+        if not misses:
+            return
+        index = self._load_index()
+        for filepath in misses:
+            digest = index.get(filepath)
+            if digest is not None:
+                self.from_index += 1
+            else:
+                digest = _hash_file(self.project_root / filepath)
+                if digest == MISSING:
+                    self._digests[filepath] = MISSING
+                    continue
+                self.hashed += 1
+            self._digests[filepath] = digest
+            self._remember(filepath, digest)
+
+    def save(self) -> None:
+        """Persist digests. Failures are ignored — the cache is optional."""
+        if not self._dirty or self._persisted is None:
+            return
+        entries = self._persisted
+        if len(entries) > _MAX_CACHE_ENTRIES:
+            entries = {p: entries[p] for p in self._digests if p in entries}
+        payload = {"format": _CACHE_FORMAT, "entries": entries}
+        try:
+            ensure_cache_dir(self.path.parent)
+            atomic_write(self.path, json.dumps(payload, separators=(",", ":")))
+        except OSError:
+            return
+        self._dirty = False
+
+    def _remember(self, filepath: str, digest: str) -> None:
+        """Record a freshly computed digest for persistence."""
+        st = self._stats[filepath]
+        if time.time_ns() - st.st_mtime_ns < _RACY_WINDOW_NS:
+            return
+        self._load()[filepath] = [st.st_size, st.st_mtime_ns, st.st_ino, digest]
+        self._dirty = True
+
+    def _load(self) -> dict[str, list[Any]]:
+        """Read the persisted cache once, discarding it if unreadable or stale."""
+        if self._persisted is None:
+            self._persisted = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return self._persisted
+            if (
+                isinstance(data, dict)
+                and data.get("format") == _CACHE_FORMAT
+                and isinstance(data.get("entries"), dict)
+            ):
+                self._persisted = data["entries"]
+        return self._persisted
+
+    def _load_index(self) -> dict[str, str]:
+        """Map clean tracked files to their blob IDs from the git index.
+
+        ``git ls-files --stage`` lists every index entry with its blob ID;
+        ``git diff-files`` lists the entries whose working-tree content
+        differs from the index (git uses its own stat cache to answer this
+        without reading unchanged files). Only the remainder is reused.
+        Returns an empty mapping outside a git repository.
+        """
+        if self._index is None:
+            self._index = {}
+            try:
+                staged = _git(self.project_root, "ls-files", "--stage", "-z")
+                dirty = _git(self.project_root, "diff-files", "--name-only", "-z", "--relative")
+            except (subprocess.CalledProcessError, OSError):
+                return self._index
+            dirty_paths = set(dirty.split("\0"))
+            for record in staged.split("\0"):
+                meta, _, path = record.partition("\t")
+                fields = meta.split(" ")
+                # Skip conflicted entries (stage != 0) and SHA-256 repositories,
+                # whose object IDs would not match the SHA-1 fallback digest.
+                if (
+                    len(fields) == 3
+                    and fields[0] in _REGULAR_FILE_MODES
+                    and fields[2] == "0"
+                    and len(fields[1]) == 40
+                    and path not in dirty_paths
+                ):
+                    self._index[path] = fields[1]
+        return self._index
+
+
+def _git(project_root: Path, *args: str) -> str:
+    """Run a read-only git command in ``project_root`` and return stdout."""
+    result = subprocess.run(
+        ["git", "--no-optional-locks", *args],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def _hash_file(path: Path) -> str:
+    """Return the git blob ID of a file, reading it in chunks."""
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            h = hashlib.sha1(f"blob {size}\0".encode(), usedforsecurity=False)
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                h.update(chunk)
+    except OSError:
+        return MISSING
+    return h.hexdigest()
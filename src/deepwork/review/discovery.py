@@ -7,26 +7,9 @@ them into ReviewRule objects.
 from dataclasses import dataclass
 from pathlib import Path
 
-from deepwork.review.config import ConfigError, ReviewRule, parse_deepreview_file
-
-# Directories to skip during discovery
-_SKIP_DIRS = {
-    ".git",
-    "node_modules",
-    "__pycache__",
-    ".venv",
-    "venv",
-    ".tox",
-    ".mypy_cache",
-    ".pytest_cache",
-    ".ruff_cache",
-    ".eggs",
-}
-
-# Suffix patterns that can't be matched via set membership
-_SKIP_SUFFIXES = (".egg-info",)
-
-DEEPREVIEW_FILENAME = ".deepreview"
+from deepwork.review.config import ConfigError, ReviewRule
+from deepwork.review.rule_cache import RuleCache
+from deepwork.utils.scanner import ProjectScanner
 
 
 @dataclass
@@ -37,23 +20,24 @@ class DiscoveryError:
     error: str
 
 
-def find_deepreview_files(project_root: Path) -> list[Path]:
+def find_deepreview_files(project_root: Path, scanner: ProjectScanner | None = None) -> list[Path]:
     """Find all .deepreview files in the project directory tree.
 
-    Walks project_root and its subdirectories recursively, skipping
-    common non-source directories (.git, node_modules, etc.).
+    Walks project_root and its subdirectories, skipping common non-source
+    directories (.git, node_modules, etc.) and anything git ignores.
 
     Args:
         project_root: Root directory to search.
+        scanner: Shared scanner for the current run. A fresh one is used
+            when omitted.
 
     Returns:
         List of .deepreview file paths, sorted by depth (deepest first),
         then alphabetically within the same depth.
     """
-    results: list[Path] = []
-
-    for path in _walk_for_file(project_root, DEEPREVIEW_FILENAME):
-        results.append(path)
+    if scanner is None:
+        scanner = ProjectScanner(project_root)
+    results = list(scanner.scan().deepreview_files)
 
     # Sort by depth (deepest first), then alphabetically
     root_depth = len(project_root.parts)
@@ -62,58 +46,34 @@ def find_deepreview_files(project_root: Path) -> list[Path]:
     return results
 
 
-def _walk_for_file(root: Path, filename: str) -> list[Path]:
-    """Walk directory tree looking for files with the given name.
-
-    Skips directories in _SKIP_DIRS.
-
-    Args:
-        root: Root directory to walk.
-        filename: Exact filename to look for.
-
-    Returns:
-        List of matching file paths.
-    """
-    results: list[Path] = []
-
-    try:
-        entries = sorted(root.iterdir())
-    except PermissionError:
-        return results
-
-    for entry in entries:
-        if entry.is_file() and entry.name == filename:
-            results.append(entry)
-        elif (
-            entry.is_dir()
-            and entry.name not in _SKIP_DIRS
-            and not entry.name.endswith(_SKIP_SUFFIXES)
-        ):
-            results.extend(_walk_for_file(entry, filename))
-
-    return results
-
-
 def load_all_rules(
-    project_root: Path,
+    project_root: Path, scanner: ProjectScanner | None = None
 ) -> tuple[list[ReviewRule], list[DiscoveryError]]:
     """Discover all .deepreview files and parse them into rules.
 
+    Unchanged files are served from the persistent ``RuleCache``; only
+    new or modified files (or files whose instruction files changed) are
+    re-parsed and re-validated.
+
     Args:
         project_root: Root directory to search.
+        scanner: Shared scanner for the current run, so the project tree
+            is walked once for both rules and DeepSchemas.
 
     Returns:
         Tuple of (successfully parsed rules, list of errors).
     """
-    files = find_deepreview_files(project_root)
+    files = find_deepreview_files(project_root, scanner)
     all_rules: list[ReviewRule] = []
     errors: list[DiscoveryError] = []
+    cache = RuleCache(project_root)
 
     for filepath in files:
         try:
-            rules = parse_deepreview_file(filepath)
+            rules = cache.load_rules(filepath)
             all_rules.extend(rules)
         except ConfigError as e:
             errors.append(DiscoveryError(file_path=filepath, error=str(e)))
 
+    cache.save()
     return all_rules, errors
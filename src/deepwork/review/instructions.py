@@ -6,14 +6,20 @@ additional context. Written to .deepwork/tmp/review_instructions/.
 """
 
 import hashlib
+import logging
 import re
-import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
 from deepwork.review.config import ReferenceFile, ReviewTask
+from deepwork.review.digests import FileDigests
+from deepwork.review.ledger import IssuedReview, LedgerError, ReviewLedger
+from deepwork.review.precompute import resolve_precomputed_info
+from deepwork.review.shared_sections import SHARED_DIR, ReferenceReader, SharedSections
 from deepwork.utils.fs import safe_write
 
+logger = logging.getLogger("deepwork.review.instructions")
+
 INSTRUCTIONS_DIR = ".deepwork/tmp/review_instructions"
 
 # Caps on inlined reference file content to keep review prompts tractable.
@@ -33,7 +39,9 @@ _FENCE_LANG_BY_EXT = {
 _SANITIZE_RE = re.compile(r"[^a-zA-Z0-9\-_.]")
 
 
-def compute_review_id(task: ReviewTask, project_root: Path) -> str:
+def compute_review_id(
+    task: ReviewTask, project_root: Path, digests: FileDigests | None = None
+) -> str:
     """Build a deterministic review ID encoding rule, paths, and content hash.
 
     Format: ``{sanitized_rule}--{sanitized_paths}--{content_hash_12}``.
@@ -45,13 +53,17 @@ def compute_review_id(task: ReviewTask, project_root: Path) -> str:
     Args:
         task: The ReviewTask to compute an ID for.
         project_root: Absolute path to the project root.
+        digests: Per-run file digest cache. Pass the same instance for
+            every task in a run so shared files are hashed once.
 
     Returns:
         A deterministic, human-readable review ID string.
     """
+    if digests is None:
+        digests = FileDigests(project_root)
     rule_part = _sanitize_for_id(task.rule_name)
     paths_part = _paths_component(task.files_to_review)
-    hash_part = _content_hash(task.files_to_review, project_root, task.inline_content)
+    hash_part = _content_hash(task.files_to_review, digests, task.inline_content)
     return f"{rule_part}--{paths_part}--{hash_part}"
 
 
@@ -77,14 +89,14 @@ def _paths_component(files: list[str]) -> str:
     return joined
 
 
-def _content_hash(files: list[str], project_root: Path, inline_content: str | None = None) -> str:
+def _content_hash(files: list[str], digests: FileDigests, inline_content: str | None = None) -> str:
     """SHA-256 content hash (first 12 hex chars) of the task content.
 
-    Files are sorted alphabetically before concatenation.  Files that
-    cannot be read contribute the placeholder ``MISSING``.  When
-    ``inline_content`` is provided, it is mixed into the hash (via a
-    sentinel marker) so that each distinct string value produces a
-    distinct review ID.
+    Hashes the per-file digest (git blob ID) of each file, with files
+    sorted alphabetically.  Files that cannot be read contribute the
+    placeholder ``MISSING``.  When ``inline_content`` is provided, it is
+    mixed into the hash (via a sentinel marker) so that each distinct
+    string value produces a distinct review ID.
 
     ``files`` entries are expected to be repo-root-relative paths sourced
     from trusted ``.deepreview`` config files.  Absolute paths or ``..``
@@ -93,94 +105,27 @@ def _content_hash(files: list[str], project_root: Path, inline_content: str | No
     """
     h = hashlib.sha256()
     for filepath in sorted(files):
-        try:
-            content = (project_root / filepath).read_text(encoding="utf-8")
-        except (OSError, UnicodeDecodeError):
-            content = "MISSING"
-        h.update(content.encode("utf-8"))
+        h.update(digests.digest(filepath).encode("ascii"))
+        h.update(b"\n")
     if inline_content is not None:
         h.update(b"\x00INLINE\x00")
         h.update(inline_content.encode("utf-8"))
     return h.hexdigest()[:12]
 
 
-PRECOMPUTE_TIMEOUT_SECONDS = 60
-
-
-def _run_precompute_command(command: str, project_root: Path) -> str:
-    """Run a single precompute bash command and return its stdout.
-
-    Precompute commands are fully trusted input sourced from the repo's own
-    ``.deepreview`` files; they run via ``shell=True`` and MUST NOT be fed
-    any untrusted external data (e.g., user-supplied strings interpolated
-    into the command).
-
-    Args:
-        command: Shell command string to execute. The first path component
-            has been resolved to an absolute path by the caller; the rest
-            of the command is passed through to the shell verbatim.
-        project_root: Working directory for command execution.
-
-    Returns:
-        Command stdout on success, or an error message on failure.
-    """
-    try:
-        result = subprocess.run(
-            command,
-            shell=True,
-            cwd=project_root,
-            capture_output=True,
-            text=True,
-            timeout=PRECOMPUTE_TIMEOUT_SECONDS,
-        )
-        if result.returncode != 0:
-            return (
-                f"**Precompute command failed** (exit code {result.returncode}):\n"
-                f"```\n{result.stderr.strip()}\n```"
-            )
-        return result.stdout
-    except subprocess.TimeoutExpired:
-        return f"**Precompute command timed out** after {PRECOMPUTE_TIMEOUT_SECONDS}s:\n`{command}`"
-    except OSError as e:
-        return f"**Precompute command error**: {e}"
-
-
-def _run_precompute_commands(commands: set[str], project_root: Path) -> dict[str, str]:
-    """Run multiple precompute commands in parallel.
-
-    Args:
-        commands: Set of unique command strings to execute.
-        project_root: Working directory for command execution.
-
-    Returns:
-        Dict mapping command string to its stdout or error message.
-    """
-    if not commands:
-        return {}
-
-    # Cap concurrent precompute shells so a repo with many rules does not
-    # briefly fork dozens of subprocesses at once on CI runners.
-    results: dict[str, str] = {}
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = {
-            executor.submit(_run_precompute_command, cmd, project_root): cmd for cmd in commands
-        }
-        for future in as_completed(futures):
-            cmd = futures[future]
-            results[cmd] = future.result()
-
-    return results
-
-
 def write_instruction_files(
     tasks: list[ReviewTask],
     project_root: Path,
 ) -> list[tuple[ReviewTask, Path]]:
     """Write instruction files for all review tasks.
 
-    Clears any existing ``.md`` instruction files (preserving ``.passed``
-    marker files), then generates a new file for each task that does not
-    already have a ``.passed`` marker.
+    Clears any existing ``.md`` instruction files whose review has not
+    passed, then generates a new file for each task whose review ID is not
+    recorded as passed in the review ledger. Precompute commands run (or
+    come from cache) only for those emitted tasks. Context sections that
+    would repeat across files are written once under ``shared/`` (see
+    ``SharedSections``). Written reviews are recorded in the ledger, and
+    entries past its retention limits are pruned.
 
     Args:
         tasks: List of ReviewTask objects to generate files for.
@@ -192,47 +137,66 @@ def write_instruction_files(
     """
     instructions_dir = project_root / INSTRUCTIONS_DIR
 
-    # Clear stale .md instruction files (preserve .passed markers and their .md files)
-    if instructions_dir.exists():
-        for child in instructions_dir.iterdir():
-            if child.suffix == ".md":
-                passed_marker = child.with_suffix(".passed")
-                if not passed_marker.exists():
+    with ReviewLedger(instructions_dir) as ledger:
+        # Clear stale .md instruction files (preserve those of passed reviews)
+        if instructions_dir.exists():
+            md_files = [child for child in instructions_dir.iterdir() if child.suffix == ".md"]
+            passed = ledger.passed_ids(child.stem for child in md_files)
+            for child in md_files:
+                if child.stem not in passed:
                     child.unlink()
-    instructions_dir.mkdir(parents=True, exist_ok=True)
-
-    # Run all precompute commands in parallel before building files
-    unique_commands = {
-        task.precomputed_info_bash_command
-        for task in tasks
-        if task.precomputed_info_bash_command is not None
-    }
-    precompute_results = _run_precompute_commands(unique_commands, project_root)
-
-    results: list[tuple[ReviewTask, Path]] = []
-
-    for task in tasks:
-        review_id = compute_review_id(task, project_root)
-
-        # Skip if a .passed marker exists for this exact review_id
-        passed_marker = instructions_dir / f"{review_id}.passed"
-        if passed_marker.exists():
-            continue
-
-        # Direct key access (not .get()): the invariant below enforces that
-        # every non-None command produced unique_commands above MUST have a
-        # result in precompute_results — a missing key indicates drift.
-        precomputed_info = (
-            precompute_results[task.precomputed_info_bash_command]
-            if task.precomputed_info_bash_command is not None
-            else None
-        )
-        content = build_instruction_file(task, review_id, precomputed_info, project_root)
-        file_path = instructions_dir / f"{review_id}.md"
+        instructions_dir.mkdir(parents=True, exist_ok=True)
+
+        results: list[tuple[ReviewTask, Path]] = []
+        issued: list[IssuedReview] = []
+        digests = FileDigests(project_root)
+        digests.prime(f for task in tasks for f in task.files_to_review)
+        review_ids = [compute_review_id(task, project_root, digests) for task in tasks]
+        passed = ledger.passed_ids(review_ids)
+
+        # Skip reviews already marked as passed for this exact review_id, and
+        # only then run precompute commands — for the emitted tasks alone.
+        emitted = [
+            (task, review_id)
+            for task, review_id in zip(tasks, review_ids, strict=True)
+            if review_id not in passed
+        ]
+        precomputed = resolve_precomputed_info([task for task, _ in emitted], project_root, digests)
+
+        # Count identical context sections first, so those repeated across
+        # instruction files are written once and referenced by path.
+        sections = SharedSections(project_root, instructions_dir / SHARED_DIR)
+        for task, _ in emitted:
+            sections.count(_render_reference_files(task, sections.reader)[1])
+            sections.count(_changed_files_listing(task))
+
+        for (task, review_id), precomputed_info in zip(emitted, precomputed, strict=True):
+            content = build_instruction_file(
+                task, review_id, precomputed_info, project_root, sections
+            )
+            file_path = instructions_dir / f"{review_id}.md"
+
+            safe_write(file_path, content)
+            results.append((task, file_path))
+            issued.append(
+                IssuedReview(
+                    review_id=review_id,
+                    rule_name=task.rule_name,
+                    file_digests={f: digests.digest(f) for f in task.files_to_review},
+                    instruction_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                )
+            )
 
-        safe_write(file_path, content)
-        results.append((task, file_path))
+        # The ledger's issue records are bookkeeping only; failing to write
+        # them must not lose the instruction files just generated.
+        try:
+            ledger.record_issued(issued)
+            ledger.prune()
+        except LedgerError as e:
+            logger.warning("%s", e)
 
+    sections.prune()
+    digests.save()
     return results
 
 
@@ -241,6 +205,7 @@ def build_instruction_file(
     review_id: str = "",
     precomputed_info: str | None = None,
     project_root: Path | None = None,
+    sections: SharedSections | None = None,
 ) -> str:
     """Build the markdown content for a single review instruction file.
 
@@ -255,6 +220,9 @@ def build_instruction_file(
             directive so the reviewer agent reads files from the correct
             working tree even when its cwd differs (e.g., in a git
             worktree dispatched from the main checkout).
+        sections: Shared sections of the current run. Reference contents
+            and changed-file lists that are shared are replaced by a
+            pointer to the shared file; without it everything is inlined.
 
     Returns:
         Markdown string containing the complete review instructions.
@@ -287,8 +255,19 @@ def build_instruction_file(
 
     # Relevant file contents — inlined for reviewer context (subject to caps)
     if task.reference_files:
+        reader = sections.reader if sections is not None else ReferenceReader()
+        own, common = _render_reference_files(task, reader)
+        pointer = sections.pointer("references", common) if sections is not None else None
         parts.append("## Relevant File Contents\n")
-        parts.append(_build_reference_files_section(task.reference_files))
+        if pointer is None:
+            parts.append(own + common)
+        else:
+            if own:
+                parts.append(own)
+            parts.append(
+                f"\nThe remaining reference file contents are shared with other reviews "
+                f"in this run. You MUST read `{pointer}` before starting the review.\n"
+            )
         parts.append("")
 
     # Files to review (omitted for inline-content tasks with no files).
@@ -322,13 +301,21 @@ def build_instruction_file(
 
     # Additional context: all changed filenames
     if task.all_changed_filenames:
+        listing = _changed_files_listing(task)
+        pointer = sections.pointer("changed-files", listing) if sections is not None else None
         parts.append("## All Changed Files\n")
-        parts.append(
-            "The following files were changed in this changeset "
-            "(listed for context, not all are subject to this review).\n"
-        )
-        for filepath in task.all_changed_filenames:
-            parts.append(f"- {filepath}")
+        if pointer is None:
+            parts.append(
+                "The following files were changed in this changeset "
+                "(listed for context, not all are subject to this review).\n"
+            )
+            parts.append(listing)
+        else:
+            parts.append(
+                f"The {len(task.all_changed_filenames)} files changed in this changeset "
+                f"are listed in `{pointer}` (for context, not all are subject to "
+                "this review).\n"
+            )
         parts.append("")
 
     # Precomputed context (at the end, after all file sections)
@@ -356,7 +343,42 @@ def build_instruction_file(
     return "\n".join(parts)
 
 
-def _build_reference_files_section(reference_files: list[ReferenceFile]) -> str:
+@dataclass
+class _InlineBudget:
+    """Running totals against the reference-file inlining caps."""
+
+    total_bytes: int = 0
+    inlined_count: int = 0
+
+
+def _render_reference_files(task: ReviewTask, reader: ReferenceReader) -> tuple[str, str]:
+    """Render a task's reference files as (task-specific, common) markdown.
+
+    Reference files that are also under review (e.g. the file of an
+    ``individual`` task) come first; the rule's other reference files,
+    usually identical across the rule's tasks, follow and can be shared.
+    Both parts draw on one inlining budget.
+    """
+    under_review = set(task.files_to_review)
+    own = [ref for ref in task.reference_files if ref.relative_label in under_review]
+    common = [ref for ref in task.reference_files if ref.relative_label not in under_review]
+    budget = _InlineBudget()
+    return (
+        _build_reference_files_section(own, reader, budget),
+        _build_reference_files_section(common, reader, budget),
+    )
+
+
+def _changed_files_listing(task: ReviewTask) -> str:
+    """Render the "All Changed Files" list of a task (empty if it has none)."""
+    return "\n".join(f"- {filepath}" for filepath in task.all_changed_filenames or [])
+
+
+def _build_reference_files_section(
+    reference_files: list[ReferenceFile],
+    reader: ReferenceReader,
+    budget: _InlineBudget,
+) -> str:
     """Build a markdown section inlining reference file contents.
 
     Reads each file in order and emits a `### {label}` subsection with an
@@ -366,14 +388,18 @@ def _build_reference_files_section(reference_files: list[ReferenceFile]) -> str:
 
     Files that cannot be read produce a graceful marker but do not abort the
     section (and their would-be bytes do not count toward the budget).
+
+    Args:
+        reference_files: Files to inline, in order.
+        reader: Per-run reader that reads each file at most once.
+        budget: Caps already consumed by an earlier part of the same
+            instruction file; updated in place.
     """
     parts: list[str] = []
-    total_bytes = 0
-    inlined_count = 0
     omitted: list[str] = []
 
     for ref in reference_files:
-        if inlined_count >= MAX_INLINE_FILES or total_bytes >= MAX_INLINE_TOTAL_BYTES:
+        if budget.inlined_count >= MAX_INLINE_FILES or budget.total_bytes >= MAX_INLINE_TOTAL_BYTES:
             omitted.append(ref.relative_label)
             continue
 
@@ -382,14 +408,14 @@ def _build_reference_files_section(reference_files: list[ReferenceFile]) -> str:
             header += f"\n\n{ref.description.strip()}"
 
         try:
-            content = ref.path.read_text(encoding="utf-8")
+            content = reader.read(ref.path)
         except (OSError, UnicodeDecodeError) as e:
             parts.append(header)
             parts.append(f"\n\n(could not inline {ref.relative_label}: {e})\n")
             continue
 
         lang = _FENCE_LANG_BY_EXT.get(ref.path.suffix.lower(), "text")
-        remaining = MAX_INLINE_TOTAL_BYTES - total_bytes
+        remaining = MAX_INLINE_TOTAL_BYTES - budget.total_bytes
         truncated_marker = ""
         content_bytes = content.encode("utf-8")
         original_byte_len = len(content_bytes)
@@ -405,8 +431,8 @@ def _build_reference_files_section(reference_files: list[ReferenceFile]) -> str:
 
         parts.append(header)
         parts.append(f"\n\n```{lang}\n{content}{truncated_marker}\n```\n")
-        total_bytes += consumed
-        inlined_count += 1
+        budget.total_bytes += consumed
+        budget.inlined_count += 1
 
     if omitted:
         omitted_list = ", ".join(omitted)
@@ -430,5 +456,9 @@ def _describe_scope(task: ReviewTask) -> str:
     if not task.files_to_review and task.inline_content is not None:
         return "inline content"
     if len(task.files_to_review) == 1:
-        return task.files_to_review[0]
-    return f"{len(task.files_to_review)} files"
+        scope = task.files_to_review[0]
+    else:
+        scope = f"{len(task.files_to_review)} files"
+    if task.shard_label is not None:
+        scope = f"{scope} ({task.shard_label})"
+    return scope
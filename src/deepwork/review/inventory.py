@@ -0,0 +1,131 @@
+"""Per-run inventory of the files in a project.
+
+Builds a single sorted snapshot of every file in the working tree so that
+rules needing the full file list (``unchanged_matching_files``) can be
+resolved with in-memory lookups instead of one filesystem walk per rule.
+"""
+
+import bisect
+import os
+import subprocess
+from collections.abc import Iterable
+from pathlib import Path
+
+
+class FileInventory:
+    """Sorted snapshot of project file paths, indexed by directory.
+
+    Paths are POSIX-style and relative to ``project_root``. Because the
+    array is sorted, every directory's descendants form one contiguous
+    slice that is located with two binary searches; slice bounds are
+    memoized per directory.
+    """
+
+    def __init__(self, project_root: Path, paths: Iterable[str]) -> None:
+        self.project_root = project_root
+        self.paths: list[str] = sorted(set(paths))
+        self._ranges: dict[str, tuple[int, int]] = {}
+
+    @classmethod
+    def load(cls, project_root: Path) -> "FileInventory":
+        """Build the inventory for a project.
+
+        Uses ``git ls-files -z --cached --others --exclude-standard`` so
+        ignored build output (node_modules, dist, ...) is never visited.
+        Falls back to walking the filesystem when ``project_root`` is not
+        inside a git repository. Symlinks to directories are followed, so
+        symlinked source trees are part of the inventory (git lists such a
+        link as one entry; its target's files are listed below it).
+
+        Args:
+            project_root: Absolute path to the project root.
+
+        Returns:
+            The populated FileInventory.
+        """
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=project_root,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (subprocess.CalledProcessError, OSError):
+            return cls(project_root, _walk_files(project_root))
+        return cls(
+            project_root,
+            _expand_dir_links(project_root, (p for p in result.stdout.split("\0") if p)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def under(self, dir_rel: str) -> list[str]:
+        """Return all inventory paths under a directory.
+
+        Args:
+            dir_rel: Directory relative to the project root; ``""`` or
+                ``"."`` for the root itself.
+
+        Returns:
+            Sorted paths (relative to the project root) below ``dir_rel``.
+        """
+        if dir_rel in ("", "."):
+            return self.paths
+        bounds = self._ranges.get(dir_rel)
+        if bounds is None:
+            prefix = dir_rel.rstrip("/") + "/"
+            start = bisect.bisect_left(self.paths, prefix)
+            # "0" sorts immediately after "/", so this bounds every path
+            # that starts with the prefix.
+            end = bisect.bisect_left(self.paths, prefix[:-1] + "0", lo=start)
+            bounds = (start, end)
+            self._ranges[dir_rel] = bounds
+        return self.paths[bounds[0] : bounds[1]]
+
+    def is_file(self, path: str) -> bool:
+        """Return True if ``path`` still exists as a regular file on disk.
+
+        The git index can list tracked files that were deleted from the
+        working tree, so callers confirm the (few) final matches here
+        rather than stat-ing every inventory entry.
+        """
+        return (self.project_root / path).is_file()
+
+
+def _expand_dir_links(project_root: Path, paths: Iterable[str]) -> list[str]:
+    """Replace entries that are symlinks to directories with the files below them."""
+    files: list[str] = []
+    for path in paths:
+        full = project_root / path
+        if full.is_symlink() and full.is_dir():
+            files.extend(path + "/" + rel for rel in _walk_files(full))
+        else:
+            files.append(path)
+    return files
+
+
+def _walk_files(top: Path) -> list[str]:
+    """List every file under ``top``, following directory symlinks.
+
+    Used outside git repositories and for symlinked directories. Links that
+    point at one of their own ancestors are skipped, so link cycles end.
+    """
+    files: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(top, followlinks=True):
+        real = os.path.realpath(dirpath)
+        dirnames[:] = [
+            d for d in dirnames if not _links_to_ancestor(os.path.join(dirpath, d), real)
+        ]
+        rel_dir = Path(dirpath).relative_to(top).as_posix()
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        files.extend(prefix + name for name in filenames)
+    return files
+
+
+def _links_to_ancestor(path: str, real_parent: str) -> bool:
+    if not os.path.islink(path):
+        return False
+    target = os.path.realpath(path)
+    return real_parent == target or real_parent.startswith(target + os.sep)
@@ -0,0 +1,315 @@
+"""Ledger of issued and passed reviews.
+
+A single SQLite database (WAL mode) in the review instructions directory
+records every review ID handed out by ``write_instruction_files`` together
+with its rule name, per-file digests and instruction-file hash, and the
+time ``mark_review_as_passed`` was called for it. Passed lookups are
+primary-key reads and batches of IDs are answered with one query, instead
+of one ``exists`` call per ``<review_id>.passed`` marker file.
+
+Old entries are pruned by age and count. Legacy ``.passed`` marker files
+found in the instructions directory are imported (and removed) the first
+time the ledger is opened.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger("deepwork.review.ledger")
+
+LEDGER_FILENAME = "ledger.sqlite3"
+PASSED_MARKER_SUFFIX = ".passed"
+
+# Retention: entries older than this are dropped, and at most this many
+# passed (and, separately, issued-but-unpassed) reviews are kept.
+RETENTION_DAYS = 90
+MAX_REVIEWS = 10_000
+
+# How long a writer waits for another process's transaction to finish.
+_BUSY_TIMEOUT_SECONDS = 10.0
+
+# SQLite's default limit on bound parameters is 999 on older builds.
+_QUERY_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id TEXT PRIMARY KEY,
+    rule_name TEXT NOT NULL,
+    file_digests TEXT,
+    instruction_hash TEXT,
+    issued_at REAL NOT NULL,
+    passed_at REAL
+);
+CREATE INDEX IF NOT EXISTS reviews_passed_at ON reviews (passed_at);
+CREATE INDEX IF NOT EXISTS reviews_issued_at ON reviews (issued_at);
+"""
+
+
+class LedgerError(Exception):
+    """Exception raised when the review ledger cannot be updated."""
+
+    pass
+
+
+@dataclass
+class IssuedReview:
+    """A review handed out in an instruction file."""
+
+    review_id: str
+    rule_name: str
+    file_digests: dict[str, str]
+    instruction_hash: str
+
+
+class ReviewLedger:
+    """Persistent record of issued and passed reviews.
+
+    Safe for concurrent use by several processes: SQLite serializes
+    writers, WAL mode lets readers proceed during writes, and every write
+    is a single short ``BEGIN IMMEDIATE`` transaction.
+    """
+
+    def __init__(self, instructions_dir: Path) -> None:
+        self.instructions_dir = instructions_dir
+        self.path = instructions_dir / LEDGER_FILENAME
+        self._conn: sqlite3.Connection | None = None
+
+    def __enter__(self) -> "ReviewLedger":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def passed_ids(self, review_ids: Iterable[str]) -> set[str]:
+        """Return the subset of ``review_ids`` that have been marked as passed.
+
+        Read failures are logged and treated as "not passed", so a damaged
+        ledger makes reviews run again rather than blocking them.
+
+        Args:
+            review_ids: Review IDs to look up.
+
+        Returns:
+            Set of the given IDs that are recorded as passed.
+        """
+        ids = list(dict.fromkeys(review_ids))
+        if not ids:
+            return set()
+        try:
+            if not self._exists():
+                return set()
+            conn = self._open()
+            passed: set[str] = set()
+            for start in range(0, len(ids), _QUERY_BATCH):
+                batch = ids[start : start + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT review_id FROM reviews "
+                    f"WHERE passed_at IS NOT NULL AND review_id IN ({placeholders})",
+                    batch,
+                )
+                passed.update(row[0] for row in rows)
+            return passed
+        except sqlite3.Error as e:
+            logger.warning("Could not read review ledger %s: %s", self.path, e)
+            return set()
+
+    def is_passed(self, review_id: str) -> bool:
+        """Return True if ``review_id`` has been marked as passed."""
+        return review_id in self.passed_ids([review_id])
+
+    def record_issued(self, reviews: Iterable[IssuedReview]) -> None:
+        """Record reviews written to instruction files.
+
+        Re-issuing a review refreshes its metadata and keeps any pass time.
+
+        Raises:
+            LedgerError: If the ledger cannot be written.
+        """
+        now = time.time()
+        rows = [
+            (r.review_id, r.rule_name, json.dumps(r.file_digests), r.instruction_hash, now)
+            for r in reviews
+        ]
+        if not rows:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO reviews "
+                "(review_id, rule_name, file_digests, instruction_hash, issued_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (review_id) DO UPDATE SET "
+                "rule_name = excluded.rule_name, "
+                "file_digests = excluded.file_digests, "
+                "instruction_hash = excluded.instruction_hash, "
+                "issued_at = excluded.issued_at",
+                rows,
+            )
+
+    def record_pass(self, review_id: str) -> None:
+        """Mark a review as passed.
+
+        Reviews that were never issued through this ledger are recorded
+        with the rule name taken from the review ID.
+
+        Raises:
+            LedgerError: If the ledger cannot be written.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO reviews (review_id, rule_name, issued_at, passed_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (review_id) DO UPDATE SET passed_at = excluded.passed_at",
+                (review_id, _rule_from_review_id(review_id), now, now),
+            )
+
+    def prune(
+        self,
+        retention_days: float = RETENTION_DAYS,
+        max_reviews: int = MAX_REVIEWS,
+    ) -> int:
+        """Drop entries past the age or count limits.
+
+        Args:
+            retention_days: Entries whose last activity (pass time, or
+                issue time for unpassed reviews) is older than this are
+                removed.
+            max_reviews: Maximum number of passed reviews, and separately
+                of unpassed reviews, to keep; the most recent are kept.
+
+        Returns:
+            Number of entries removed.
+
+        Raises:
+            LedgerError: If the ledger cannot be written.
+        """
+        cutoff = time.time() - retention_days * 86400
+        with self._transaction() as conn:
+            removed = conn.execute(
+                "DELETE FROM reviews WHERE COALESCE(passed_at, issued_at) < ?", (cutoff,)
+            ).rowcount
+            removed += conn.execute(
+                "DELETE FROM reviews WHERE passed_at IS NOT NULL AND review_id NOT IN "
+                "(SELECT review_id FROM reviews WHERE passed_at IS NOT NULL "
+                "ORDER BY passed_at DESC LIMIT ?)",
+                (max_reviews,),
+            ).rowcount
+            removed += conn.execute(
+                "DELETE FROM reviews WHERE passed_at IS NULL AND review_id NOT IN "
+                "(SELECT review_id FROM reviews WHERE passed_at IS NULL "
+                "ORDER BY issued_at DESC LIMIT ?)",
+                (max_reviews,),
+            ).rowcount
+        return removed
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a write transaction, converting SQLite errors to LedgerError."""
+        try:
+            conn = self._open()
+            with _immediate(conn):
+                yield conn
+        except sqlite3.Error as e:
+            raise LedgerError(f"Could not update review ledger {self.path}: {e}") from e
+
+    def _exists(self) -> bool:
+        """Return True if there is a ledger (or legacy markers) to read."""
+        return (
+            self._conn is not None
+            or self.path.exists()
+            or bool(_find_markers(self.instructions_dir))
+        )
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the database, creating it and importing legacy markers."""
+        if self._conn is not None:
+            return self._conn
+        self.instructions_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            _import_markers(conn, _find_markers(self.instructions_dir))
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._conn = conn
+        return conn
+
+
+@contextmanager
+def _immediate(conn: sqlite3.Connection) -> Iterator[None]:
+    """Run a block in a ``BEGIN IMMEDIATE`` transaction on an autocommit connection.
+
+    Taking the write lock up front avoids the deadlock-prone upgrade from a
+    read to a write lock when two processes update the ledger at once.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _import_markers(conn: sqlite3.Connection, markers: list[Path]) -> None:
+    """Move legacy ``<review_id>.passed`` markers into the ledger.
+
+    Markers are deleted only after the transaction commits, and the upsert
+    keeps an existing pass time, so concurrent importers are harmless.
+    """
+    rows = []
+    for marker in markers:
+        try:
+            mtime = marker.stat().st_mtime
+        except OSError:
+            continue
+        review_id = marker.name[: -len(PASSED_MARKER_SUFFIX)]
+        rows.append((review_id, _rule_from_review_id(review_id), mtime, mtime))
+    if not rows:
+        return
+    with _immediate(conn):
+        conn.executemany(
+            "INSERT INTO reviews (review_id, rule_name, issued_at, passed_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (review_id) DO UPDATE SET "
+            "passed_at = COALESCE(reviews.passed_at, excluded.passed_at)",
+            rows,
+        )
+    for marker in markers:
+        marker.unlink(missing_ok=True)
+    logger.info("Imported %d .passed marker(s) into the review ledger", len(rows))
+
+
+def _find_markers(instructions_dir: Path) -> list[Path]:
+    """List legacy ``.passed`` marker files in the instructions directory."""
+    try:
+        with os.scandir(instructions_dir) as it:
+            return [
+                Path(entry.path)
+                for entry in it
+                if entry.name.endswith(PASSED_MARKER_SUFFIX) and entry.is_file()
+            ]
+    except OSError:
+        return []
+
+
+def _rule_from_review_id(review_id: str) -> str:
+    """Return the sanitized rule-name component of a review ID."""
+    return review_id.split("--", 1)[0]
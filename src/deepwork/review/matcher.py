@@ -7,9 +7,14 @@ rule's review strategy.
 
 import re
 import subprocess
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
 from deepwork.review.config import ReferenceFile, ReviewRule, ReviewTask
+from deepwork.review.instructions import MAX_INLINE_FILES, MAX_INLINE_TOTAL_BYTES
+from deepwork.review.inventory import FileInventory
+from deepwork.review.packing import batch_files, file_sizes, shard_files, shard_label
 
 
 class GitDiffError(Exception):
@@ -40,12 +45,68 @@ def _run_git(project_root: Path, *args: str) -> subprocess.CompletedProcess[str]
     )
 
 
+@dataclass
+class ChangedFile:
+    """A single changed path reported by git."""
+
+    path: str  # Relative to the repository root
+    status: str  # Git status letter: A, C, M, R, or "?" for untracked
+    orig_path: str | None = None  # Source path for renames/copies
+
+
+@dataclass
+class ChangeSet:
+    """All reviewable changes in a working tree relative to a base ref.
+
+    Combines committed changes on the branch (since the merge-base with
+    ``base_ref``), staged and unstaged modifications to tracked files, and
+    untracked files not excluded by ``.gitignore``. Deleted files are not
+    included since they cannot be reviewed.
+    """
+
+    base_ref: str
+    merge_base: str
+    head: str | None  # HEAD commit ID, or None in a repo with no commits
+    files: list[ChangedFile] = field(default_factory=list)
+
+    @property
+    def paths(self) -> list[str]:
+        """Sorted list of changed file paths relative to the repo root."""
+        return sorted(f.path for f in self.files)
+
+    @property
+    def renames(self) -> list[tuple[str, str]]:
+        """``(old_path, new_path)`` pairs for renamed files."""
+        return [(f.orig_path, f.path) for f in self.files if f.status == "R" and f.orig_path]
+
+
+# Status letters that identify a reviewable change (Added, Copied,
+# Modified, Renamed). Deletions, type changes and unmerged paths are dropped.
+_REVIEWABLE_STATUSES = frozenset("ACMR")
+
+# Candidate base refs checked after refs/remotes/origin/HEAD, in order.
+# Remote tracking refs are preferred over local branches because local
+# branches go stale when the user never checks them out and pulls.
+_FALLBACK_BASE_REFS = (
+    "refs/remotes/origin/main",
+    "refs/remotes/origin/master",
+    "refs/heads/main",
+    "refs/heads/master",
+)
+_ORIGIN_HEAD_REF = "refs/remotes/origin/HEAD"
+
+# Merge-base results keyed by (project_root, HEAD commit, base commit). A
+# merge-base is immutable for a given pair of commits, so entries never go
+# stale; the bound only caps memory in long-lived servers.
+_MERGE_BASE_CACHE: dict[tuple[str, str, str], str] = {}
+_MERGE_BASE_CACHE_MAX = 256
+
+
 def get_changed_files(project_root: Path, base_ref: str | None = None) -> list[str]:
     """Get list of changed files relative to the repository root.
 
-    Uses git diff to detect Added, Copied, Modified, and Renamed files.
-    Combines unstaged changes, staged changes, and untracked files into
-    a deduplicated list.
+    Thin wrapper around ``get_change_set`` for callers that only need the
+    paths.
 
     Args:
         project_root: Path to the project (must be in a git repo).
@@ -58,33 +119,177 @@ def get_changed_files(project_root: Path, base_ref: str | None = None) -> list[s
     Raises:
         GitDiffError: If git operations fail.
     """
+    return get_change_set(project_root, base_ref).paths
+
+
+def get_change_set(project_root: Path, base_ref: str | None = None) -> ChangeSet:
+    """Collect tracked, staged and untracked changes with as few git calls as possible.
+
+    Runs one ``git status --porcelain=v2 -z`` for the working tree and index,
+    one ref lookup to resolve the base, and at most one NUL-delimited
+    ``git diff`` against the merge-base for changes already committed on the
+    branch. The merge-base itself is cached per (HEAD, base) commit pair.
+
+    Args:
+        project_root: Path to the project (must be in a git repo).
+        base_ref: Git ref to diff against. If None, auto-detects the
+            remote's default branch (see ``_detect_base_ref``).
+
+    Returns:
+        The ChangeSet for the working tree.
+
+    Raises:
+        GitDiffError: If git operations fail.
+    """
+    head, status_files = _git_status(project_root)
+
     if base_ref is None:
-        base_ref = _detect_base_ref(project_root)
+        base_ref, base_oid = _detect_base_ref(project_root)
+    elif base_ref == "HEAD":
+        base_oid = head
+    else:
+        base_oid = _resolve_commit(project_root, base_ref)
+
+    files: dict[str, ChangedFile] = {}
+    merge_base = "HEAD"
+    if base_ref != "HEAD" and head is not None and base_oid is not None:
+        merge_base = _cached_merge_base(project_root, head, base_oid, base_ref)
+        if merge_base != head:
+            # Committed-on-branch changes take precedence: their status is
+            # relative to the merge-base rather than to HEAD.
+            for changed in _git_diff_name_status(project_root, merge_base):
+                files[changed.path] = changed
+
+    for changed in status_files:
+        files.setdefault(changed.path, changed)
+
+    return ChangeSet(
+        base_ref=base_ref,
+        merge_base=merge_base,
+        head=head,
+        files=list(files.values()),
+    )
 
-    # Get the merge-base to avoid including changes from the target branch
-    merge_base = _get_merge_base(project_root, base_ref)
 
-    # Get changed files (unstaged + committed on branch)
-    diff_files = _git_diff_name_only(project_root, merge_base)
+def _git_status(project_root: Path) -> tuple[str | None, list[ChangedFile]]:
+    """Read HEAD and all staged, unstaged and untracked changes in one call.
+
+    Uses ``git status --porcelain=v2 -z --branch --untracked-files=all`` so
+    paths containing newlines or other special characters survive intact.
+
+    Args:
+        project_root: Path to the project root.
+
+    Returns:
+        Tuple of (HEAD commit ID or None if there are no commits yet,
+        reviewable changed files).
 
-    # Also get staged changes (not yet committed)
-    staged_files = _git_diff_name_only(project_root, None, staged=True)
+    Raises:
+        GitDiffError: If the git command fails.
+    """
+    try:
+        result = _run_git(
+            project_root,
+            "--no-optional-locks",
+            "status",
+            "--porcelain=v2",
+            "-z",
+            "--branch",
+            "--untracked-files=all",
+        )
+    except subprocess.CalledProcessError as e:
+        raise GitDiffError(f"git status failed: {e.stderr.strip()}") from e
+    return _parse_porcelain_v2(result.stdout)
 
-    # Also get untracked files (new files not yet added to git)
-    untracked_files = _git_untracked_files(project_root)
 
-    return sorted(set(diff_files + staged_files + untracked_files))
+def _parse_porcelain_v2(output: str) -> tuple[str | None, list[ChangedFile]]:
+    """Parse NUL-delimited ``git status --porcelain=v2 --branch`` output.
 
+    Args:
+        output: Raw stdout of the status command.
 
-def _detect_base_ref(project_root: Path) -> str:
+    Returns:
+        Tuple of (HEAD commit ID or None, reviewable changed files). A path
+        is reviewable if either its staged (X) or unstaged (Y) status is one
+        of Added, Copied, Modified or Renamed.
+    """
+    head: str | None = None
+    files: list[ChangedFile] = []
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == "#":
+            if record.startswith("# branch.oid "):
+                oid = record.removeprefix("# branch.oid ")
+                head = None if oid == "(initial)" else oid
+        elif kind == "?":
+            files.append(ChangedFile(path=record[2:], status="?"))
+        elif kind in ("1", "2"):
+            # 1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+            # 2 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <X><score> <path>\0<origPath>
+            fields = record.split(" ", 9 if kind == "2" else 8)
+            xy = fields[1]
+            path = fields[-1]
+            orig_path = None
+            if kind == "2":
+                orig_path = records[i]
+                i += 1
+            code = next((c for c in xy if c in _REVIEWABLE_STATUSES), None)
+            if code is not None:
+                files.append(ChangedFile(path=path, status=code, orig_path=orig_path))
+        # "u" (unmerged) and "!" (ignored) records are not reviewable.
+    return head, files
+
+
+def _git_diff_name_status(project_root: Path, ref: str) -> list[ChangedFile]:
+    """Run a NUL-delimited ``git diff --name-status`` of the working tree against ``ref``.
+
+    Args:
+        project_root: Path to the project root.
+        ref: Commit to diff the working tree against.
+
+    Returns:
+        Reviewable changed files with their status letters.
+
+    Raises:
+        GitDiffError: If the git command fails.
+    """
+    try:
+        result = _run_git(
+            project_root, "diff", "--name-status", "-z", "-M", "--diff-filter=ACMR", ref
+        )
+    except subprocess.CalledProcessError as e:
+        raise GitDiffError(f"git diff failed: {e.stderr.strip()}") from e
+
+    files: list[ChangedFile] = []
+    tokens = result.stdout.split("\0")
+    i = 0
+    while i < len(tokens) and tokens[i]:
+        code = tokens[i][0]
+        if code in ("R", "C"):
+            files.append(ChangedFile(path=tokens[i + 2], status=code, orig_path=tokens[i + 1]))
+            i += 3
+        else:
+            files.append(ChangedFile(path=tokens[i + 1], status=code))
+            i += 2
+    return files
+
+
+def _detect_base_ref(project_root: Path) -> tuple[str, str | None]:
     """Auto-detect the base branch to diff against.
 
-    Queries ``git symbolic-ref refs/remotes/origin/HEAD`` to discover the
-    remote's default branch. This works regardless of whether the default
-    branch is called main, master, develop, trunk, etc.
+    Reads ``refs/remotes/origin/HEAD`` to discover the remote's default
+    branch. This works regardless of whether the default branch is called
+    main, master, develop, trunk, etc.
 
     Falls back to a hardcoded list (origin/main, origin/master, then local
     main/master) when the symbolic ref is not set, and finally to HEAD.
+    All candidates are resolved in a single ``git for-each-ref`` call.
 
     Known limitation: this always resolves to the repository's default
     branch. It does not handle the case where the current branch is based
@@ -96,100 +301,260 @@ def _detect_base_ref(project_root: Path) -> str:
         project_root: Path to the project root.
 
     Returns:
-        Git ref string to use as base ref.
+        Tuple of (git ref string to use as base ref, its commit ID). The
+        commit ID is None when falling back to HEAD.
     """
-    # Try the remote HEAD symbolic ref first — this is the most reliable
-    # way to find the default branch without hardcoding names.
     try:
-        result = _run_git(project_root, "symbolic-ref", "refs/remotes/origin/HEAD")
-        # Returns e.g. "refs/remotes/origin/main" — strip to "origin/main"
-        full_ref = result.stdout.strip()
-        short_ref = full_ref.removeprefix("refs/remotes/")
-        # Verify the ref actually resolves to a commit
-        _run_git(project_root, "rev-parse", "--verify", short_ref)
-        return short_ref
+        result = _run_git(
+            project_root,
+            "for-each-ref",
+            "--format=%(refname)%00%(objectname)%00%(symref)",
+            _ORIGIN_HEAD_REF,
+            *_FALLBACK_BASE_REFS,
+        )
     except subprocess.CalledProcessError:
-        pass
-
-    # Fallback: try well-known branch names
-    for ref in ("origin/main", "origin/master", "main", "master"):
-        try:
-            _run_git(project_root, "rev-parse", "--verify", ref)
-            return ref
-        except subprocess.CalledProcessError:
-            continue
-    return "HEAD"
+        return "HEAD", None
 
+    refs: dict[str, tuple[str, str]] = {}
+    for line in result.stdout.splitlines():
+        refname, _, rest = line.partition("\0")
+        objectname, _, symref = rest.partition("\0")
+        refs[refname] = (objectname, symref)
 
-def _get_merge_base(project_root: Path, ref: str) -> str:
-    """Get the merge-base between HEAD and the given ref.
+    # Prefer the remote HEAD symbolic ref — the most reliable way to find
+    # the default branch without hardcoding names. for-each-ref omits
+    # dangling symrefs, so presence here means the target resolves.
+    origin_head = refs.get(_ORIGIN_HEAD_REF)
+    if origin_head is not None and origin_head[1]:
+        return _short_ref(origin_head[1]), origin_head[0]
 
-    If ref is HEAD, returns HEAD directly.
+    for ref in _FALLBACK_BASE_REFS:
+        if ref in refs:
+            return _short_ref(ref), refs[ref][0]
+    return "HEAD", None
+
+
+def _short_ref(full_ref: str) -> str:
+    """Strip ``refs/remotes/`` or ``refs/heads/`` (e.g. to ``origin/main``)."""
+    return full_ref.removeprefix("refs/remotes/").removeprefix("refs/heads/")
+
+
+def _resolve_commit(project_root: Path, ref: str) -> str:
+    """Resolve an explicit base ref to a commit ID.
 
     Args:
         project_root: Path to the project root.
-        ref: Git ref to find merge-base with.
+        ref: Any git revision (branch, tag, SHA, ``HEAD~3``...).
 
     Returns:
-        The merge-base commit SHA, or the ref itself for HEAD.
+        The commit ID.
 
     Raises:
-        GitDiffError: If the git command fails.
+        GitDiffError: If the ref does not resolve to a commit.
     """
-    if ref == "HEAD":
-        return "HEAD"
-
     try:
-        result = _run_git(project_root, "merge-base", "HEAD", ref)
+        result = _run_git(project_root, "rev-parse", "--verify", f"{ref}^{{commit}}")
         return result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        raise GitDiffError(f"Failed to find merge-base with '{ref}': {e.stderr.strip()}") from e
+        raise GitDiffError(f"Failed to resolve base ref '{ref}': {e.stderr.strip()}") from e
 
 
-def _git_diff_name_only(project_root: Path, ref: str | None, *, staged: bool = False) -> list[str]:
-    """Run git diff --name-only and return the list of files.
+def _cached_merge_base(project_root: Path, head: str, base_oid: str, base_ref: str) -> str:
+    """Return the merge-base of two commits, memoized per commit pair.
 
     Args:
         project_root: Path to the project root.
-        ref: Git ref to diff against. If None and staged=True, diffs staged changes.
-        staged: If True, include --cached flag for staged changes.
+        head: HEAD commit ID.
+        base_oid: Base ref commit ID.
+        base_ref: Human-readable base ref, used in error messages.
 
     Returns:
-        List of changed file paths.
+        The merge-base commit ID.
 
     Raises:
         GitDiffError: If the git command fails.
     """
-    args = ["diff", "--name-only", "--diff-filter=ACMR"]
-    if staged:
-        args.append("--cached")
-    if ref is not None:
-        args.append(ref)
+    key = (str(project_root), head, base_oid)
+    cached = _MERGE_BASE_CACHE.get(key)
+    if cached is not None:
+        return cached
 
-    try:
-        result = _run_git(project_root, *args)
-        return [f for f in result.stdout.strip().split("\n") if f]
-    except subprocess.CalledProcessError as e:
-        raise GitDiffError(f"git diff failed: {e.stderr.strip()}") from e
+    merge_base = _get_merge_base(project_root, base_oid, display_ref=base_ref)
+    if len(_MERGE_BASE_CACHE) >= _MERGE_BASE_CACHE_MAX:
+        _MERGE_BASE_CACHE.pop(next(iter(_MERGE_BASE_CACHE)))
+    _MERGE_BASE_CACHE[key] = merge_base
+    return merge_base
 
 
-def _git_untracked_files(project_root: Path) -> list[str]:
-    """Get untracked files (respecting .gitignore).
+def _get_merge_base(project_root: Path, ref: str, display_ref: str | None = None) -> str:
+    """Get the merge-base between HEAD and the given ref.
+
+    If ref is HEAD, returns HEAD directly.
 
     Args:
         project_root: Path to the project root.
+        ref: Git ref to find merge-base with.
+        display_ref: Name to show in error messages (defaults to ``ref``).
 
     Returns:
-        List of untracked file paths relative to the repo root.
+        The merge-base commit SHA, or the ref itself for HEAD.
 
     Raises:
         GitDiffError: If the git command fails.
     """
+    if ref == "HEAD":
+        return "HEAD"
+
     try:
-        result = _run_git(project_root, "ls-files", "--others", "--exclude-standard")
-        return [f for f in result.stdout.strip().split("\n") if f]
+        result = _run_git(project_root, "merge-base", "HEAD", ref)
+        return result.stdout.strip()
     except subprocess.CalledProcessError as e:
-        raise GitDiffError(f"git ls-files failed: {e.stderr.strip()}") from e
+        raise GitDiffError(
+            f"Failed to find merge-base with '{display_ref or ref}': {e.stderr.strip()}"
+        ) from e
+
+
+@dataclass
+class CompiledRule:
+    """A ReviewRule with its include/exclude patterns precompiled.
+
+    Each pattern list is folded into a single alternation regex so a file
+    is tested once per rule instead of once per pattern.
+    """
+
+    rule: ReviewRule
+    source_rel: str  # source_dir relative to project root ("" for the root itself)
+    include: re.Pattern[str] | None
+    exclude: re.Pattern[str] | None
+
+    def matches(self, rel_to_source: str) -> bool:
+        """Return True if a path relative to ``source_dir`` matches this rule."""
+        if self.include is None or not self.include.match(rel_to_source):
+            return False
+        return self.exclude is None or not self.exclude.match(rel_to_source)
+
+
+@dataclass
+class _RuleTrieNode:
+    """A directory node in the RuleSet trie."""
+
+    children: dict[str, "_RuleTrieNode"] = field(default_factory=dict)
+    rule_indexes: list[int] = field(default_factory=list)
+
+
+class RuleSet:
+    """Compiled collection of review rules bucketed by source directory.
+
+    Every include/exclude pattern is compiled exactly once. Rules are stored
+    in a trie keyed by the path components of their ``source_dir`` (relative
+    to the project root), so each changed file is only tested against the
+    rules whose source directory actually contains it — the cost per file is
+    proportional to its depth plus the number of applicable rules, not to
+    the total number of rules.
+
+    Rules whose ``source_dir`` is outside ``project_root`` never match,
+    mirroring ``match_rule``.
+    """
+
+    def __init__(self, rules: list[ReviewRule], project_root: Path) -> None:
+        self.rules = list(rules)
+        self.project_root = project_root
+        self._compiled: dict[int, CompiledRule] = {}
+        self._root = _RuleTrieNode()
+
+        for index, rule in enumerate(self.rules):
+            compiled = compile_rule(rule, project_root)
+            if compiled is None:
+                continue
+            self._compiled[index] = compiled
+            node = self._root
+            if compiled.source_rel:
+                for part in compiled.source_rel.split("/"):
+                    node = node.children.setdefault(part, _RuleTrieNode())
+            node.rule_indexes.append(index)
+
+    def candidates(self, filepath: str) -> list[tuple[int, str]]:
+        """Return the rules whose source directory contains ``filepath``.
+
+        Args:
+            filepath: File path relative to the project root.
+
+        Returns:
+            List of ``(rule_index, path_relative_to_source_dir)`` tuples,
+            ordered from the shallowest source directory to the deepest.
+        """
+        result = [(index, filepath) for index in self._root.rule_indexes]
+        node = self._root
+        offset = 0
+        parts = filepath.split("/")
+        # Only directory components are walked — the final component is the
+        # file name and can never be a rule's source directory.
+        for part in parts[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            offset += len(part) + 1
+            if node.rule_indexes:
+                rel = filepath[offset:]
+                result.extend((index, rel) for index in node.rule_indexes)
+        return result
+
+    def match(self, changed_files: list[str]) -> list[list[str]]:
+        """Match changed files against every rule in one pass.
+
+        Args:
+            changed_files: List of changed file paths relative to repo root.
+
+        Returns:
+            One list of matched file paths per rule, in rule order. Each
+            list preserves the order of ``changed_files``.
+        """
+        matched: list[list[str]] = [[] for _ in self.rules]
+        for filepath in changed_files:
+            for index, rel_to_source in self.candidates(filepath):
+                if self._compiled[index].matches(rel_to_source):
+                    matched[index].append(filepath)
+        return matched
+
+
+def compile_rule(rule: ReviewRule, project_root: Path) -> CompiledRule | None:
+    """Compile a rule's patterns for repeated matching.
+
+    Args:
+        rule: The ReviewRule to compile.
+        project_root: Absolute path to the project root.
+
+    Returns:
+        The CompiledRule, or None if the rule's source_dir is not under
+        project_root (such rules never match).
+    """
+    try:
+        source_rel = rule.source_dir.relative_to(project_root)
+    except ValueError:
+        return None
+
+    source_str = source_rel.as_posix()
+    if source_str == ".":
+        source_str = ""
+
+    return CompiledRule(
+        rule=rule,
+        source_rel=source_str,
+        include=_compile_pattern_list(rule.include_patterns),
+        exclude=_compile_pattern_list(rule.exclude_patterns),
+    )
+
+
+def _compile_pattern_list(patterns: list[str]) -> re.Pattern[str] | None:
+    """Fold a list of glob patterns into one compiled alternation regex.
+
+    Returns None for an empty list so callers can distinguish "matches
+    nothing" from a pattern that happens to match the empty string.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{_glob_to_regex(p)})" for p in patterns))
 
 
 def match_files_to_rules(
@@ -201,7 +566,10 @@ def match_files_to_rules(
     """Match changed files against rules and produce ReviewTask objects.
 
     Each rule is processed independently. A file can match multiple rules
-    and appear in multiple tasks.
+    and appear in multiple tasks. Rules with a task budget have their files
+    packed into batches or shards by size (see ``deepwork.review.packing``).
+    Matching goes through a compiled ``RuleSet`` so each file is only tested
+    against the rules whose source directory contains it.
 
     Args:
         changed_files: List of changed file paths relative to repo root.
@@ -213,9 +581,11 @@ def match_files_to_rules(
         List of ReviewTask objects.
     """
     tasks: list[ReviewTask] = []
+    rule_set = RuleSet(rules, project_root)
+    # Built lazily, at most once per call, for rules with unchanged_matching_files
+    inventory: FileInventory | None = None
 
-    for rule in rules:
-        matched = match_rule(changed_files, rule, project_root)
+    for rule, matched in zip(rule_set.rules, rule_set.match(changed_files), strict=True):
         if not matched:
             continue
 
@@ -226,25 +596,32 @@ def match_files_to_rules(
         precompute_cmd = rule.precomputed_info_bash_command
 
         if rule.strategy == "individual":
-            for filepath in matched:
-                # Include the file under review as a reference so its
+            # Without a task budget every batch is a single file.
+            budget, max_files = _batch_limits(rule, project_root)
+            for batch in batch_files(matched, project_root, budget, max_files):
+                # Include the files under review as references so their
                 # content is inlined in "Relevant File Contents" — the
                 # @filepath in "Files to Review" is NOT auto-expanded.
-                file_ref = ReferenceFile(
-                    path=(project_root / filepath).resolve(),
-                    relative_label=filepath,
-                    description="File under review",
-                )
-                task_refs = [file_ref] + list(rule.reference_files)
+                file_refs = [
+                    ReferenceFile(
+                        path=(project_root / filepath).resolve(),
+                        relative_label=filepath,
+                        description="File under review",
+                    )
+                    for filepath in batch
+                ]
+                task_refs = file_refs + list(rule.reference_files)
                 tasks.append(
                     ReviewTask(
                         rule_name=rule.name,
-                        files_to_review=[filepath],
+                        files_to_review=batch,
                         instructions=rule.instructions,
                         agent_name=agent_name,
                         source_location=source_location,
                         all_changed_filenames=all_filenames,
                         precomputed_info_bash_command=precompute_cmd,
+                        precompute_timeout_seconds=rule.precompute_timeout_seconds,
+                        precompute_cache_ttl_seconds=rule.precompute_cache_ttl_seconds,
                         reference_files=task_refs,
                     )
                 )
@@ -252,38 +629,67 @@ def match_files_to_rules(
         elif rule.strategy == "matches_together":
             additional = []
             if rule.unchanged_matching_files:
-                additional = _find_unchanged_matching_files(changed_files, rule, project_root)
-            tasks.append(
-                ReviewTask(
-                    rule_name=rule.name,
-                    files_to_review=matched,
-                    instructions=rule.instructions,
-                    agent_name=agent_name,
-                    source_location=source_location,
-                    additional_files=additional,
-                    all_changed_filenames=all_filenames,
-                    precomputed_info_bash_command=precompute_cmd,
-                    reference_files=rule.reference_files,
+                if inventory is None:
+                    inventory = FileInventory.load(project_root)
+                additional = _find_unchanged_matching_files(
+                    changed_files, rule, project_root, inventory
+                )
+            shards = shard_files(matched, project_root, rule.task_budget_bytes)
+            for i, shard in enumerate(shards, start=1):
+                tasks.append(
+                    ReviewTask(
+                        rule_name=rule.name,
+                        files_to_review=shard,
+                        instructions=rule.instructions,
+                        agent_name=agent_name,
+                        source_location=source_location,
+                        additional_files=additional,
+                        all_changed_filenames=all_filenames,
+                        precomputed_info_bash_command=precompute_cmd,
+                        precompute_timeout_seconds=rule.precompute_timeout_seconds,
+                        precompute_cache_ttl_seconds=rule.precompute_cache_ttl_seconds,
+                        reference_files=rule.reference_files,
+                        shard_label=shard_label(i, len(shards)),
+                    )
                 )
-            )
 
         elif rule.strategy == "all_changed_files":
-            tasks.append(
-                ReviewTask(
-                    rule_name=rule.name,
-                    files_to_review=list(changed_files),
-                    instructions=rule.instructions,
-                    agent_name=agent_name,
-                    source_location=source_location,
-                    all_changed_filenames=all_filenames,
-                    precomputed_info_bash_command=precompute_cmd,
-                    reference_files=rule.reference_files,
+            shards = shard_files(list(changed_files), project_root, rule.task_budget_bytes)
+            for i, shard in enumerate(shards, start=1):
+                tasks.append(
+                    ReviewTask(
+                        rule_name=rule.name,
+                        files_to_review=shard,
+                        instructions=rule.instructions,
+                        agent_name=agent_name,
+                        source_location=source_location,
+                        all_changed_filenames=all_filenames,
+                        precomputed_info_bash_command=precompute_cmd,
+                        precompute_timeout_seconds=rule.precompute_timeout_seconds,
+                        precompute_cache_ttl_seconds=rule.precompute_cache_ttl_seconds,
+                        reference_files=rule.reference_files,
+                        shard_label=shard_label(i, len(shards)),
+                    )
                 )
-            )
 
     return tasks
 
 
+def _batch_limits(rule: ReviewRule, project_root: Path) -> tuple[int | None, int | None]:
+    """Return the byte budget and file cap for an ``individual`` rule's batches.
+
+    Every file of a batch is inlined into its instruction file together with
+    the rule's reference files, so batches leave room for the references
+    within ``MAX_INLINE_FILES`` and ``MAX_INLINE_TOTAL_BYTES``.
+    """
+    if rule.task_budget_bytes is None:
+        return None, None
+    # Reference paths are absolute, so joining them to the root is a no-op
+    ref_sizes = file_sizes([str(ref.path) for ref in rule.reference_files], project_root)
+    budget = min(rule.task_budget_bytes, MAX_INLINE_TOTAL_BYTES - sum(ref_sizes.values()))
+    return max(budget, 1), max(MAX_INLINE_FILES - len(rule.reference_files), 1)
+
+
 def match_rule(changed_files: list[str], rule: ReviewRule, project_root: Path) -> list[str]:
     """Find changed files that match a rule's include/exclude patterns.
 
@@ -297,31 +703,19 @@ def match_rule(changed_files: list[str], rule: ReviewRule, project_root: Path) -
     Returns:
         List of matched file paths (relative to repo root).
     """
-    matched: list[str] = []
-    source_dir = rule.source_dir
-
-    # Compute source_dir relative to project_root for path comparison
-    try:
-        source_rel = source_dir.relative_to(project_root)
-    except ValueError:
+    compiled = compile_rule(rule, project_root)
+    if compiled is None:
         # source_dir is not under project_root — skip this rule
         return []
 
+    matched: list[str] = []
     for filepath in changed_files:
         # Check if file is under the rule's source directory
-        rel_to_source = _relative_to_dir(filepath, str(source_rel))
+        rel_to_source = _relative_to_dir(filepath, compiled.source_rel)
         if rel_to_source is None:
             continue
-
-        # Check include patterns
-        if not any(_glob_match(rel_to_source, pattern) for pattern in rule.include_patterns):
-            continue
-
-        # Check exclude patterns
-        if any(_glob_match(rel_to_source, pattern) for pattern in rule.exclude_patterns):
-            continue
-
-        matched.append(filepath)
+        if compiled.matches(rel_to_source):
+            matched.append(filepath)
 
     return matched
 
@@ -362,8 +756,13 @@ def _glob_match(filepath: str, pattern: str) -> bool:
     Returns:
         True if the filepath matches the pattern.
     """
-    regex = _glob_to_regex(pattern)
-    return bool(re.match(regex, filepath))
+    return bool(_compile_glob(pattern).match(filepath))
+
+
+@lru_cache(maxsize=1024)
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a single glob pattern, memoized across calls."""
+    return re.compile(_glob_to_regex(pattern))
 
 
 def _glob_to_regex(pattern: str) -> str:
@@ -441,57 +840,37 @@ def _find_unchanged_matching_files(
     changed_files: list[str],
     rule: ReviewRule,
     project_root: Path,
+    inventory: FileInventory | None = None,
 ) -> list[str]:
     """Find files that match the rule's patterns but were not changed.
 
-    Scans the filesystem under the rule's source_dir for files matching
-    the include patterns (minus exclude patterns), then removes any that
-    appear in the changed files list.
+    Resolves the rule's include patterns (minus exclude patterns) against
+    the project's file inventory, restricted to the rule's source_dir, then
+    removes any that appear in the changed files list.
 
     Args:
         changed_files: List of changed file paths relative to repo root.
         rule: The ReviewRule with include/exclude patterns.
         project_root: Absolute path to the project root.
+        inventory: Shared file inventory for this run. Built on demand
+            when not provided.
 
     Returns:
         List of unchanged matching file paths (relative to repo root).
     """
-    source_dir = rule.source_dir
-    changed_set = set(changed_files)
-    unchanged: list[str] = []
-
-    try:
-        source_rel = source_dir.relative_to(project_root)
-    except ValueError:
+    compiled = compile_rule(rule, project_root)
+    if compiled is None:
         return []
 
-    # Walk the source directory for matching files.
-    # We intentionally follow symlinks here so that symlinked source trees
-    # are included in the unchanged-file search.
-    for include_pattern in rule.include_patterns:
-        for match_path in source_dir.glob(include_pattern):
-            if not match_path.is_file():
-                continue
+    if inventory is None:
+        inventory = FileInventory.load(project_root)
 
-            # Get path relative to project root
-            try:
-                rel_path = str(match_path.relative_to(project_root))
-            except ValueError:
-                continue
-
-            # Skip if it's a changed file
-            if rel_path in changed_set:
-                continue
-
-            # Get path relative to source dir for exclude check
-            rel_to_source = _relative_to_dir(rel_path, str(source_rel))
-            if rel_to_source is None:
-                continue
-
-            # Check exclude patterns
-            if any(_glob_match(rel_to_source, pattern) for pattern in rule.exclude_patterns):
-                continue
-
-            unchanged.append(rel_path)
-
-    return sorted(set(unchanged))
+    changed_set = set(changed_files)
+    offset = len(compiled.source_rel) + 1 if compiled.source_rel else 0
+    return [
+        rel_path
+        for rel_path in inventory.under(compiled.source_rel)
+        if rel_path not in changed_set
+        and compiled.matches(rel_path[offset:])
+        and inventory.is_file(rel_path)
+    ]
@@ -8,6 +8,7 @@ from pathlib import Path
 
 from deepwork.deepschema.review_bridge import generate_review_rules as gen_schema_rules
 from deepwork.review.config import ReviewRule
+from deepwork.review.digests import FileDigests
 from deepwork.review.discovery import DiscoveryError, load_all_rules
 from deepwork.review.formatter import format_for_claude
 from deepwork.review.instructions import (
@@ -15,6 +16,7 @@ from deepwork.review.instructions import (
     compute_review_id,
     write_instruction_files,
 )
+from deepwork.review.ledger import ReviewLedger
 from deepwork.review.matcher import (
     GitDiffError,
     format_source_location,
@@ -22,6 +24,7 @@ from deepwork.review.matcher import (
     match_files_to_rules,
     match_rule,
 )
+from deepwork.utils.scanner import ProjectScanner
 
 FORMATTERS = {
     "claude": format_for_claude,
@@ -88,11 +91,13 @@ def run_review(
             f"Supported platforms: {', '.join(sorted(SUPPORTED_PLATFORMS))}"
         )
 
-    # Step 1: Discover .deepreview files and parse rules
-    rules, discovery_errors = load_all_rules(project_root)
+    # Step 1: Discover .deepreview files and parse rules. The scanner is
+    # shared with Step 1b so the project tree is walked only once.
+    scanner = ProjectScanner(project_root)
+    rules, discovery_errors = load_all_rules(project_root, scanner)
 
     # Step 1b: Discover DeepSchemas and generate synthetic rules
-    schema_rules, schema_errors = gen_schema_rules(project_root)
+    schema_rules, schema_errors = gen_schema_rules(project_root, scanner)
     rules.extend(schema_rules)
     for err in schema_errors:
         discovery_errors.append(DiscoveryError(file_path=Path("deepschema"), error=err))
@@ -157,10 +162,11 @@ def get_configured_reviews(
     Returns:
         List of dicts with ``name``, ``description``, and ``defining_file``.
     """
-    rules, errors = load_all_rules(project_root)
+    scanner = ProjectScanner(project_root)
+    rules, errors = load_all_rules(project_root, scanner)
 
     # Also include DeepSchema-generated rules
-    schema_rules, _schema_errors = gen_schema_rules(project_root)
+    schema_rules, _schema_errors = gen_schema_rules(project_root, scanner)
     rules.extend(schema_rules)
 
     if only_rules_matching_files is not None:
@@ -197,7 +203,7 @@ def get_configured_reviews(
 
 
 def mark_passed(project_root: Path, review_id: str) -> str:
-    """Create a ``.passed`` marker for a review so it is skipped on re-runs.
+    """Record a review as passed in the review ledger so it is skipped on re-runs.
 
     Args:
         project_root: Absolute path to the project root.
@@ -208,17 +214,15 @@ def mark_passed(project_root: Path, review_id: str) -> str:
 
     Raises:
         ValueError: If ``review_id`` is empty or contains path traversal.
+        LedgerError: If the ledger cannot be written.
     """
     if not review_id or not review_id.strip():
         raise ValueError("review_id must not be empty.")
     if ".." in review_id or review_id.startswith("/"):
         raise ValueError("review_id must not contain path traversal sequences.")
 
-    instructions_dir = project_root / INSTRUCTIONS_DIR
-    instructions_dir.mkdir(parents=True, exist_ok=True)
-
-    passed_file = instructions_dir / f"{review_id}.passed"
-    passed_file.write_bytes(b"")
+    with ReviewLedger(project_root / INSTRUCTIONS_DIR) as ledger:
+        ledger.record_pass(review_id)
 
     return f"Review '{review_id}' marked as passed."
 
@@ -228,7 +232,7 @@ def all_reviews_passed_for_files(
     files: list[str],
 ) -> bool:
     """Return True iff every non-catch-all review rule that matches ``files``
-    has a ``.passed`` marker for its computed review_id.
+    is recorded as passed in the review ledger for its computed review_id.
 
     Vacuously True when no rules match (or ``files`` is empty).
 
@@ -236,17 +240,22 @@ def all_reviews_passed_for_files(
     excluded — matches the scoping used by ``get_configured_reviews`` and
     ``run_review`` when files are specified explicitly.
     """
-    rules, _ = load_all_rules(project_root)
-    schema_rules, _ = gen_schema_rules(project_root)
+    scanner = ProjectScanner(project_root)
+    rules, _ = load_all_rules(project_root, scanner)
+    schema_rules, _ = gen_schema_rules(project_root, scanner)
     rules.extend(schema_rules)
 
     rules = [r for r in rules if not _rule_is_catch_all(r)]
 
     tasks = match_files_to_rules(files, rules, project_root)
 
-    instructions_dir = project_root / INSTRUCTIONS_DIR
-    for task in tasks:
-        review_id = compute_review_id(task, project_root)
-        if not (instructions_dir / f"{review_id}.passed").exists():
-            return False
-    return True
+    if not tasks:
+        return True
+
+    digests = FileDigests(project_root)
+    digests.prime(f for task in tasks for f in task.files_to_review)
+    review_ids = {compute_review_id(task, project_root, digests) for task in tasks}
+    digests.save()
+
+    with ReviewLedger(project_root / INSTRUCTIONS_DIR) as ledger:
+        return ledger.passed_ids(review_ids) == review_ids
@@ -0,0 +1,132 @@
+"""Size-budgeted packing of review files into tasks.
+
+Rules that set a task budget (``task_budget_bytes`` or
+``task_budget_tokens`` in ``.deepreview``) have their matched files packed
+by on-disk size: the ``individual`` strategy merges small files into
+batches, and ``matches_together`` / ``all_changed_files`` split an
+oversized file set into shards. Both use the same packing so results are
+directory-coherent: files are taken in path order, whole directories are
+kept together when they fit, and only a directory that alone exceeds the
+budget is split across tasks. Batches of the ``individual`` strategy are
+also capped so that every file of a batch, and the rule's own reference
+files, can be inlined into the instruction file.
+
+Packing depends only on paths and sizes, so each batch or shard gets a
+stable review ID while its files are unchanged.
+"""
+
+import os
+import posixpath
+from itertools import groupby
+from pathlib import Path
+
+# Rough size of a token in source text, used to convert token budgets.
+BYTES_PER_TOKEN = 4
+
+
+def task_budget(budget_bytes: int | None, budget_tokens: int | None) -> int | None:
+    """Combine a rule's byte and token budgets into one byte budget.
+
+    Args:
+        budget_bytes: ``task_budget_bytes`` from the rule, if set.
+        budget_tokens: ``task_budget_tokens`` from the rule, if set.
+
+    Returns:
+        The stricter of the two budgets in bytes, or None if neither is set.
+    """
+    budgets: list[int] = []
+    if budget_bytes is not None:
+        budgets.append(budget_bytes)
+    if budget_tokens is not None:
+        budgets.append(budget_tokens * BYTES_PER_TOKEN)
+    return min(budgets) if budgets else None
+
+
+def file_sizes(files: list[str], project_root: Path) -> dict[str, int]:
+    """Return the on-disk size of each file; unreadable files count as 0."""
+    sizes: dict[str, int] = {}
+    for filepath in files:
+        try:
+            sizes[filepath] = os.stat(project_root / filepath).st_size
+        except OSError:
+            sizes[filepath] = 0
+    return sizes
+
+
+def pack_files(
+    files: list[str], sizes: dict[str, int], budget: int, max_files: int | None = None
+) -> list[list[str]]:
+    """Pack files into groups whose total size stays within ``budget``.
+
+    A file larger than the budget gets a group of its own.
+
+    Args:
+        files: Paths relative to the project root.
+        sizes: Size in bytes of every path in ``files``.
+        budget: Maximum total size of a group, in bytes.
+        max_files: Maximum number of files in a group, or None for no limit.
+
+    Returns:
+        Groups of paths, in path order.
+    """
+    limit = max_files if max_files is not None else len(files)
+    groups: list[list[str]] = []
+    current: list[str] = []
+    current_size = 0
+
+    def flush() -> None:
+        nonlocal current, current_size
+        if current:
+            groups.append(current)
+        current, current_size = [], 0
+
+    for _, dir_files in groupby(sorted(files), key=posixpath.dirname):
+        members = list(dir_files)
+        dir_size = sum(sizes[f] for f in members)
+        if current_size + dir_size <= budget and len(current) + len(members) <= limit:
+            current.extend(members)
+            current_size += dir_size
+            continue
+        flush()
+        if dir_size <= budget and len(members) <= limit:
+            current, current_size = members, dir_size
+            continue
+        # The directory alone is over budget: split it file by file.
+        for filepath in members:
+            if current and (current_size + sizes[filepath] > budget or len(current) >= limit):
+                flush()
+            current.append(filepath)
+            current_size += sizes[filepath]
+    flush()
+    return groups
+
+
+def batch_files(
+    files: list[str], project_root: Path, budget: int | None, max_files: int | None = None
+) -> list[list[str]]:
+    """Group ``individual``-strategy files into batches within ``budget``.
+
+    Returns one single-file batch per file when no budget is set.
+    """
+    if budget is None:
+        return [[filepath] for filepath in files]
+    return pack_files(files, file_sizes(files, project_root), budget, max_files)
+
+
+def shard_files(files: list[str], project_root: Path, budget: int | None) -> list[list[str]]:
+    """Split a file set into shards within ``budget``.
+
+    Returns the file set unchanged, as a single shard, when no budget is
+    set or the whole set fits.
+    """
+    if budget is None:
+        return [files]
+    sizes = file_sizes(files, project_root)
+    if sum(sizes.values()) <= budget:
+        return [files]
+    return pack_files(files, sizes, budget)
+
+
+def shard_label(index: int, count: int) -> str | None:
+    """Describe shard ``index`` (1-based) of ``count``, or None if unsharded."""
+    return f"part {index} of {count}" if count > 1 else None
@@ -0,0 +1,284 @@
+"""Execution and caching of ``precomputed_info_for_reviewer_bash_command``.
+
+Commands run only for tasks that will actually be written to instruction
+files. Each unique command runs at most once per review run, on an
+asyncio subprocess pool with a per-rule timeout and a process-wide limit
+on concurrent commands.
+
+Successful output is cached under ``.deepwork/tmp/cache/`` keyed by the
+command plus the digests of the files the task covers, and reused until
+the rule's TTL expires. Repeated reviews during an edit loop therefore
+re-run a command only when a file it was run for changes.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import signal
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from deepwork.review.config import ReviewTask
+from deepwork.review.digests import FileDigests
+from deepwork.review.rule_cache import CACHE_DIR, ensure_cache_dir
+from deepwork.utils.fs import atomic_write
+
+PRECOMPUTE_CACHE_FILENAME = "precompute.json"
+
+PRECOMPUTE_TIMEOUT_SECONDS = 60
+PRECOMPUTE_CACHE_TTL_SECONDS = 300
+
+# Cap concurrent precompute shells so a repo with many rules does not
+# briefly fork dozens of subprocesses at once on CI runners. Shared by
+# every review run in the process (e.g. concurrent MCP tool calls).
+MAX_CONCURRENT_PRECOMPUTES = 8
+_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_PRECOMPUTES)
+# Review runs inside an event loop use a private loop per run, so the slots
+# are a thread semaphore polled without blocking (see ``_acquire_slot``).
+_SLOT_POLL_SECONDS = 0.02
+
+# Bump when the cache layout or key scheme changes.
+_CACHE_FORMAT = 1
+
+# Entries beyond this are dropped, oldest first.
+_MAX_CACHE_ENTRIES = 500
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one precompute command."""
+
+    output: str  # Stdout on success, otherwise a markdown error message
+    succeeded: bool
+
+
+def resolve_precomputed_info(
+    tasks: list[ReviewTask],
+    project_root: Path,
+    digests: FileDigests,
+) -> list[str | None]:
+    """Return the precomputed info for each task, running uncached commands.
+
+    Args:
+        tasks: Tasks that will be written to instruction files.
+        project_root: Working directory for command execution.
+        digests: Per-file digests for the run, used for cache keys.
+
+    Returns:
+        One entry per task (in order): the command output or error
+        message, or None for tasks without a precompute command.
+    """
+    cache = PrecomputeCache(project_root)
+    outputs: list[str | None] = [None] * len(tasks)
+    misses: list[tuple[int, str, str]] = []  # (task index, command, cache key)
+    pending: dict[str, float] = {}
+
+    for i, task in enumerate(tasks):
+        command = task.precomputed_info_bash_command
+        if command is None:
+            continue
+        key = cache_key(command, task.files_to_review, digests)
+        outputs[i] = cache.get(key, _ttl(task))
+        if outputs[i] is None:
+            misses.append((i, command, key))
+            # The same command shared by several rules runs once, with the
+            # most generous of their timeouts.
+            timeout = task.precompute_timeout_seconds or PRECOMPUTE_TIMEOUT_SECONDS
+            pending[command] = max(pending.get(command, 0), timeout)
+
+    results = run_precompute_commands(pending, project_root)
+    for i, command, key in misses:
+        result = results[command]
+        outputs[i] = result.output
+        if result.succeeded:
+            cache.put(key, result.output, _ttl(tasks[i]))
+
+    cache.save()
+    return outputs
+
+
+def run_precompute_commands(
+    commands: Mapping[str, float], project_root: Path
+) -> dict[str, CommandResult]:
+    """Run precompute commands concurrently and wait for all of them.
+
+    Safe to call from inside a running event loop (e.g. an MCP tool
+    handler): the commands then run on a private loop in a worker thread.
+
+    Args:
+        commands: Mapping of command string to its timeout in seconds.
+        project_root: Working directory for command execution.
+
+    Returns:
+        Dict mapping each command to its result.
+    """
+    if not commands:
+        return {}
+
+    async def run_all() -> dict[str, CommandResult]:
+        results = await asyncio.gather(
+            *(_run_command(cmd, project_root, timeout) for cmd, timeout in commands.items())
+        )
+        return dict(zip(commands, results, strict=True))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_all())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, run_all()).result()
+
+
+async def _run_command(command: str, project_root: Path, timeout: float) -> CommandResult:
+    """Run a single precompute bash command and capture its stdout.
+
+    Precompute commands are fully trusted input sourced from the repo's own
+    ``.deepreview`` files; they run through the shell and MUST NOT be fed
+    any untrusted external data (e.g., user-supplied strings interpolated
+    into the command).
+
+    Args:
+        command: Shell command string to execute. The first path component
+            has been resolved to an absolute path by the caller; the rest
+            of the command is passed through to the shell verbatim.
+        project_root: Working directory for command execution.
+        timeout: Seconds before the command's process group is killed.
+
+    Returns:
+        The command's stdout on success, or an error message on failure.
+    """
+    await _acquire_slot()
+    try:
+        try:
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                cwd=project_root,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+        except OSError as e:
+            return CommandResult(f"**Precompute command error**: {e}", False)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except TimeoutError:
+            _kill_process_group(proc)
+            await proc.wait()
+            return CommandResult(
+                f"**Precompute command timed out** after {timeout:g}s:\n`{command}`", False
+            )
+    finally:
+        _SLOTS.release()
+
+    if proc.returncode != 0:
+        return CommandResult(
+            f"**Precompute command failed** (exit code {proc.returncode}):\n"
+            f"```\n{stderr.decode('utf-8', errors='replace').strip()}\n```",
+            False,
+        )
+    return CommandResult(stdout.decode("utf-8", errors="replace"), True)
+
+
+async def _acquire_slot() -> None:
+    """Wait for a free command slot.
+
+    The non-blocking acquire runs on the event loop, so a call cancelled
+    while waiting never ends up holding a slot it cannot release.
+    """
+    while not _SLOTS.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_POLL_SECONDS)
+
+
+def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    """Kill a timed-out command and any children still holding its pipes."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    except (OSError, AttributeError):
+        proc.kill()
+
+
+def cache_key(command: str, files: list[str], digests: FileDigests) -> str:
+    """Return the cache key for running ``command`` over ``files``."""
+    h = hashlib.sha256(command.encode("utf-8"))
+    for filepath in sorted(files):
+        h.update(f"\0{filepath}\0{digests.digest(filepath)}".encode())
+    return h.hexdigest()
+
+
+def _ttl(task: ReviewTask) -> int:
+    """Return the cache TTL for a task's precompute command."""
+    if task.precompute_cache_ttl_seconds is None:
+        return PRECOMPUTE_CACHE_TTL_SECONDS
+    return task.precompute_cache_ttl_seconds
+
+
+class PrecomputeCache:
+    """Persisted precompute outputs, each with its creation time and TTL."""
+
+    def __init__(self, project_root: Path) -> None:
+        self.path = project_root / CACHE_DIR / PRECOMPUTE_CACHE_FILENAME
+        self._entries: dict[str, list[Any]] | None = None
+        self._dirty = False
+        self.hits = 0
+
+    def get(self, key: str, ttl: int) -> str | None:
+        """Return a cached output younger than ``ttl`` seconds, or None."""
+        if ttl <= 0:
+            return None
+        entry = self._load().get(key)
+        if entry is None or time.time() - entry[0] >= ttl:
+            return None
+        self.hits += 1
+        output: str = entry[2]
+        return output
+
+    def put(self, key: str, output: str, ttl: int) -> None:
+        """Cache a successful output. A TTL of 0 disables caching."""
+        if ttl <= 0:
+            return
+        self._load()[key] = [time.time(), ttl, output]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache, dropping expired entries.
+
+        Failures are ignored — the cache is optional.
+        """
+        if not self._dirty or self._entries is None:
+            return
+        now = time.time()
+        live = sorted(
+            ((k, e) for k, e in self._entries.items() if now - e[0] < e[1]),
+            key=lambda item: item[1][0],
+        )[-_MAX_CACHE_ENTRIES:]
+        payload = {"format": _CACHE_FORMAT, "entries": dict(live)}
+        try:
+            ensure_cache_dir(self.path.parent)
+            atomic_write(self.path, json.dumps(payload, separators=(",", ":")))
+        except OSError:
+            return
+        self._dirty = False
+
+    def _load(self) -> dict[str, list[Any]]:
+        """Read the persisted cache once, discarding it if unreadable or stale."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return self._entries
+            if (
+                isinstance(data, dict)
+                and data.get("format") == _CACHE_FORMAT
+                and isinstance(data.get("entries"), dict)
+            ):
+                self._entries = data["entries"]
+        return self._entries
@@ -0,0 +1,194 @@
+"""Persistent cache of parsed .deepreview rules.
+
+Parsing a .deepreview file means loading YAML, validating it against the
+JSON schema, scanning it again for rule line numbers, and reading every
+referenced instruction file. This module stores the parsed result on disk
+under ``.deepwork/tmp/cache/`` so unchanged files are loaded from a compact
+JSON form without any of that work.
+
+Each entry is keyed by the file's absolute path and validated against a
+stat signature (size, mtime_ns, inode) of the .deepreview file plus the
+signatures of the instruction files it references. Because keys are
+absolute paths and every entry is self-validating, a cache file shared by
+several worktrees of the same repository can never serve one worktree's
+rules to another. The cache file is replaced atomically, so concurrent
+writers can only lose each other's new entries (which are re-parsed on the
+next run), never corrupt the file.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from deepwork import __version__
+from deepwork.review.config import (
+    ReferenceFile,
+    ReviewRule,
+    parse_deepreview_file_with_dependencies,
+)
+from deepwork.utils.fs import atomic_write
+
+CACHE_DIR = ".deepwork/tmp/cache"
+RULE_CACHE_FILENAME = "deepreview_rules.json"
+
+# Bump when the serialized ReviewRule layout changes.
+_CACHE_FORMAT = 3
+
+# A file's stat signature: (size, mtime_ns, inode), or None if missing.
+_Signature = list[int] | None
+
+
+class RuleCache:
+    """On-disk cache of parsed rules, keyed by .deepreview file signature."""
+
+    def __init__(self, project_root: Path) -> None:
+        self.path = project_root / CACHE_DIR / RULE_CACHE_FILENAME
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def load_rules(self, filepath: Path) -> list[ReviewRule]:
+        """Return the parsed rules for a .deepreview file.
+
+        Served from the cache when the file and its instruction files are
+        unchanged; otherwise parsed and stored.
+
+        Args:
+            filepath: Path to the .deepreview file.
+
+        Returns:
+            List of ReviewRule objects.
+
+        Raises:
+            ConfigError: If the file cannot be parsed or fails validation.
+                Errors are not cached, so fixing a missing instruction file
+                takes effect without touching the .deepreview file.
+        """
+        entries = self._load()
+        key = str(filepath)
+        signature = _stat_signature(filepath)
+
+        entry = entries.get(key)
+        if (
+            entry is not None
+            and signature is not None
+            and entry["signature"] == signature
+            and all(_stat_signature(Path(p)) == sig for p, sig in entry["dependencies"])
+        ):
+            self.hits += 1
+            return [_rule_from_dict(r) for r in entry["rules"]]
+
+        self.misses += 1
+        rules, instruction_files = parse_deepreview_file_with_dependencies(filepath)
+        if signature is not None:
+            entries[key] = {
+                "signature": signature,
+                "dependencies": [[str(p), _stat_signature(p)] for p in instruction_files],
+                "rules": [_rule_to_dict(r) for r in rules],
+            }
+            self._dirty = True
+        return rules
+
+    def save(self) -> None:
+        """Persist new entries. Failures are ignored — the cache is optional."""
+        if not self._dirty or self._entries is None:
+            return
+        payload = {"format": _CACHE_FORMAT, "version": __version__, "entries": self._entries}
+        try:
+            ensure_cache_dir(self.path.parent)
+            atomic_write(self.path, json.dumps(payload, separators=(",", ":")))
+        except OSError:
+            return
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Read the cache file once, discarding it if unreadable or stale."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return self._entries
+            if (
+                isinstance(data, dict)
+                and data.get("format") == _CACHE_FORMAT
+                and data.get("version") == __version__
+                and isinstance(data.get("entries"), dict)
+            ):
+                self._entries = data["entries"]
+        return self._entries
+
+
+def ensure_cache_dir(cache_dir: Path) -> None:
+    """Create the cache directory with a catch-all .gitignore.
+
+    ``.deepwork/tmp`` is normally ignored already (``deepwork serve`` writes
+    its .gitignore), but ``deepwork review`` can run without the server, and
+    cache files must never show up as untracked changes under review.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    gitignore = cache_dir / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("*\n", encoding="utf-8")
+
+
+def _stat_signature(path: Path) -> _Signature:
+    """Return ``[size, mtime_ns, inode]`` for a file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _rule_to_dict(rule: ReviewRule) -> dict[str, Any]:
+    """Serialize a ReviewRule to plain JSON types."""
+    return {
+        "name": rule.name,
+        "description": rule.description,
+        "include": rule.include_patterns,
+        "exclude": rule.exclude_patterns,
+        "strategy": rule.strategy,
+        "instructions": rule.instructions,
+        "agent": rule.agent,
+        "all_changed_filenames": rule.all_changed_filenames,
+        "unchanged_matching_files": rule.unchanged_matching_files,
+        "precompute": rule.precomputed_info_bash_command,
+        "precompute_timeout": rule.precompute_timeout_seconds,
+        "precompute_ttl": rule.precompute_cache_ttl_seconds,
+        "task_budget": rule.task_budget_bytes,
+        "source_dir": str(rule.source_dir),
+        "source_file": str(rule.source_file),
+        "source_line": rule.source_line,
+        "reference_files": [
+            [str(ref.path), ref.relative_label, ref.description] for ref in rule.reference_files
+        ],
+    }
+
+
+def _rule_from_dict(data: dict[str, Any]) -> ReviewRule:
+    """Rebuild a ReviewRule from ``_rule_to_dict`` output."""
+    return ReviewRule(
+        name=data["name"],
+        description=data["description"],
+        include_patterns=data["include"],
+        exclude_patterns=data["exclude"],
+        strategy=data["strategy"],
+        instructions=data["instructions"],
+        agent=data["agent"],
+        all_changed_filenames=data["all_changed_filenames"],
+        unchanged_matching_files=data["unchanged_matching_files"],
+        precomputed_info_bash_command=data["precompute"],
+        source_dir=Path(data["source_dir"]),
+        source_file=Path(data["source_file"]),
+        source_line=data["source_line"],
+        reference_files=[
+            ReferenceFile(path=Path(path), relative_label=label, description=description)
+            for path, label, description in data["reference_files"]
+        ],
+        precompute_timeout_seconds=data["precompute_timeout"],
+        precompute_cache_ttl_seconds=data["precompute_ttl"],
+        task_budget_bytes=data["task_budget"],
+    )
@@ -0,0 +1,124 @@
+"""Content-addressed sections shared between review instruction files.
+
+Tasks from the same rule often carry identical context: the rule's
+reference files and, with ``all_changed_filenames``, the full changed-file
+list. Rather than inlining that context into every instruction file, a
+review run writes each such section once, to
+``<instructions dir>/shared/<kind>-<hash>.md``, and the instruction files
+point at it. Reference files themselves are read at most once per run.
+"""
+
+import hashlib
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+from deepwork.utils.fs import atomic_write
+
+SHARED_DIR = "shared"
+
+# Sections smaller than this stay inline: pointing at them would cost the
+# reviewer a file read for little saving.
+MIN_SHARED_BYTES = 1024
+
+# Shared files not used by the current run are removed after this long.
+# Preserved instruction files of passed reviews may still point at them.
+SHARED_RETENTION_SECONDS = 7 * 86400
+
+
+class ReferenceReader:
+    """Reads each reference file at most once, remembering failures too."""
+
+    def __init__(self) -> None:
+        self._cache: dict[Path, str | OSError | UnicodeDecodeError] = {}
+        self.reads = 0
+
+    def read(self, path: Path) -> str:
+        """Return a file's text.
+
+        Raises:
+            OSError: If the file cannot be read.
+            UnicodeDecodeError: If the file is not valid UTF-8.
+        """
+        cached = self._cache.get(path)
+        if cached is None:
+            self.reads += 1
+            try:
+                cached = path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                cached = e
+            self._cache[path] = cached
+        if isinstance(cached, str):
+            return cached
+        raise cached
+
+
+class SharedSections:
+    """Sections written once per review run and referenced by path.
+
+    A section is shared only when at least two instruction files in the run
+    would contain it, as recorded by ``count`` before any file is built.
+    """
+
+    def __init__(self, project_root: Path, directory: Path) -> None:
+        self.project_root = project_root
+        self.directory = directory
+        self.reader = ReferenceReader()
+        self._uses: Counter[str] = Counter()
+        self._used_paths: set[Path] = set()
+        self.written = 0
+
+    def count(self, content: str) -> None:
+        """Record that one instruction file in this run contains ``content``."""
+        if content:
+            self._uses[_digest(content)] += 1
+
+    def pointer(self, kind: str, content: str) -> str | None:
+        """Return the project-relative path of the shared copy of ``content``.
+
+        Writes the shared file on first use (and only if no earlier run
+        already wrote the same content). Returns None when the section
+        should stay inline, including when the file cannot be written.
+
+        Args:
+            kind: Short file-name prefix describing the section.
+            content: The section's markdown.
+        """
+        digest = _digest(content)
+        if len(content.encode("utf-8")) < MIN_SHARED_BYTES or self._uses[digest] < 2:
+            return None
+        path = self.directory / f"{kind}-{digest[:16]}.md"
+        if path not in self._used_paths:
+            try:
+                # Refresh the mtime so pruning keeps files still in use
+                os.utime(path)
+            except OSError:
+                try:
+                    atomic_write(path, content)
+                except OSError:
+                    return None
+                self.written += 1
+            self._used_paths.add(path)
+        return path.relative_to(self.project_root).as_posix()
+
+    def prune(self) -> None:
+        """Remove old shared files that this run did not use."""
+        cutoff = time.time() - SHARED_RETENTION_SECONDS
+        try:
+            children = list(self.directory.iterdir())
+        except OSError:
+            return
+        for child in children:
+            if child in self._used_paths:
+                continue
+            try:
+                if child.stat().st_mtime < cutoff:
+                    child.unlink()
+            except OSError:
+                continue
+
+
+def _digest(content: str) -> str:
+    """Return the SHA-256 hex digest of a section."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
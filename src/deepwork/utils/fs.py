@@ -1,7 +1,9 @@
 """Filesystem utilities for safe file operations."""
 
+import os
 import shutil
 import stat
+import tempfile
 from pathlib import Path
 
 
@@ -69,6 +71,37 @@ def safe_write(path: Path | str, content: str) -> None:
     path_obj.write_text(content, encoding="utf-8")
 
 
+def atomic_write(path: Path | str, content: str | bytes) -> None:
+    """
+    Write content to file atomically, creating parent directories if needed.
+
+    Content is written to a temp file in the same directory and then moved
+    into place with ``os.replace``, so concurrent readers see either the
+    old file or the new one — never a partial write.
+
+    Args:
+        path: File path to write to
+        content: Content to write (str is encoded as UTF-8)
+
+    Raises:
+        OSError: If write operation fails
+    """
+    path_obj = Path(path)
+    ensure_dir(path_obj.parent)
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    fd, tmp_path = tempfile.mkstemp(dir=str(path_obj.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path_obj)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def safe_read(path: Path | str) -> str | None:
     """
     Read content from file, return None if file doesn't exist.
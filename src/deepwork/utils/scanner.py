@@ -0,0 +1,162 @@
+"""Single-pass scan of a project tree for DeepWork configuration files.
+
+``.deepreview`` files, anonymous DeepSchemas (``.deepschema.<filename>.yml``)
+and project-local named schema manifests (``.deepwork/schemas/*/deepschema.yml``)
+are all collected in one ``os.scandir`` traversal. The traversal skips the
+standard non-source directories and anything git ignores, and its result is
+memoized on the scanner so one review run walks the tree at most once.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+# Directories never descended into
+SKIP_DIRS = frozenset(
+    {
+        ".git",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".eggs",
+    }
+)
+
+# Suffix patterns that can't be matched via set membership
+SKIP_SUFFIXES = (".egg-info",)
+
+DEEPREVIEW_FILENAME = ".deepreview"
+ANONYMOUS_PREFIX = ".deepschema."
+ANONYMOUS_SUFFIX = ".yml"
+NAMED_SCHEMAS_DIR = ".deepwork/schemas"
+NAMED_SCHEMA_MANIFEST = "deepschema.yml"
+
+
+@dataclass
+class ScanResult:
+    """Configuration files found in a project, as absolute paths."""
+
+    deepreview_files: list[Path]
+    anonymous_schemas: list[Path]
+    named_schema_manifests: list[Path]
+
+
+class ProjectScanner:
+    """Scans a project tree once and serves the result to every consumer.
+
+    Create one scanner per run and pass it to ``load_all_rules`` and
+    ``discover_all_schemas``; the first call performs the traversal and
+    later calls reuse it.
+    """
+
+    def __init__(self, project_root: Path) -> None:
+        self.project_root = project_root
+        self._result: ScanResult | None = None
+
+    def scan(self) -> ScanResult:
+        """Return the scan result, walking the tree on first use.
+
+        Returns:
+            The memoized ScanResult. Lists are in traversal order; callers
+            apply their own ordering.
+        """
+        if self._result is None:
+            self._result = self._scan()
+        return self._result
+
+    def _scan(self) -> ScanResult:
+        result = ScanResult(deepreview_files=[], anonymous_schemas=[], named_schema_manifests=[])
+        ignored = _git_ignored_paths(self.project_root)
+        # Stack of (absolute dir, dir path relative to the root, git-ignored).
+        stack: list[tuple[str, str, bool]] = [(str(self.project_root), "", False)]
+
+        while stack:
+            dir_path, dir_rel, dir_ignored = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            # Schema folders may be symlinked into .deepwork/schemas, so that
+            # one level follows symlinks; everywhere else they are not followed.
+            follow_symlinks = dir_rel == NAMED_SCHEMAS_DIR
+            in_named_folder = os.path.dirname(dir_rel) == NAMED_SCHEMAS_DIR
+            for entry in entries:
+                name = entry.name
+                rel = f"{dir_rel}/{name}" if dir_rel else name
+                is_ignored = (dir_ignored or rel in ignored) and not _is_schema_path(rel)
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if name in SKIP_DIRS or name.endswith(SKIP_SUFFIXES):
+                            continue
+                        if is_ignored and rel != ".deepwork":
+                            continue
+                        stack.append((entry.path, rel, is_ignored))
+                    elif is_ignored or not entry.is_file():
+                        continue
+                    elif name == DEEPREVIEW_FILENAME:
+                        result.deepreview_files.append(Path(entry.path))
+                    elif is_anonymous_schema_name(name):
+                        result.anonymous_schemas.append(Path(entry.path))
+                    elif in_named_folder and name == NAMED_SCHEMA_MANIFEST:
+                        result.named_schema_manifests.append(Path(entry.path))
+                except OSError:
+                    continue
+
+        return result
+
+
+def is_anonymous_schema_name(filename: str) -> bool:
+    """Check if a filename matches the .deepschema.<name>.yml pattern."""
+    return (
+        filename.startswith(ANONYMOUS_PREFIX)
+        and filename.endswith(ANONYMOUS_SUFFIX)
+        and len(filename) > len(ANONYMOUS_PREFIX) + len(ANONYMOUS_SUFFIX)
+    )
+
+
+def _is_schema_path(rel: str) -> bool:
+    """Return True for paths inside the project's named schema folder.
+
+    Schema definitions are configuration, not build output, so they are
+    scanned even when git ignores ``.deepwork/``.
+    """
+    return rel == NAMED_SCHEMAS_DIR or rel.startswith(NAMED_SCHEMAS_DIR + "/")
+
+
+def _git_ignored_paths(project_root: Path) -> frozenset[str]:
+    """Return the untracked paths git ignores under ``project_root``.
+
+    ``--directory`` collapses wholly-ignored directories into a single
+    entry, so large ignored trees (build output, caches) cost one line and
+    are pruned from the walk without being listed. Files that are tracked
+    despite matching an ignore pattern are not reported. Outside a git
+    repository nothing is ignored.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "git",
+                "ls-files",
+                "-z",
+                "--others",
+                "--ignored",
+                "--exclude-standard",
+                "--directory",
+            ],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (subprocess.CalledProcessError, OSError):
+        return frozenset()
+    paths = (p.rstrip("/") for p in result.stdout.split("\0"))
+    return frozenset(p for p in paths if p and p != ".")
@@ -32,18 +32,37 @@ def load_yaml(path: Path | str) -> dict[str, Any] | None:
 
     try:
         with open(path_obj, encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-            if data is None:
-                return {}
-            if not isinstance(data, dict):
-                raise YAMLError(f"YAML file must contain a dictionary, got {type(data).__name__}")
-            return data
-    except yaml.YAMLError as e:
-        raise YAMLError(f"Failed to parse YAML file {path_obj}: {e}") from e
+            text = f.read()
     except UnicodeDecodeError as e:
         raise YAMLError(f"Failed to read YAML file {path_obj}: {e}") from e
     except OSError as e:
         raise YAMLError(f"Failed to read YAML file {path_obj}: {e}") from e
+    return parse_yaml(text, path_obj)
+
+
+def parse_yaml(text: str, path: Path | str) -> dict[str, Any]:
+    """
+    Parse YAML text that was read from a file.
+
+    Args:
+        text: YAML content
+        path: File the content came from (used in error messages)
+
+    Returns:
+        Parsed YAML data as dictionary (empty for an empty document)
+
+    Raises:
+        YAMLError: If YAML parsing fails or the document is not a mapping
+    """
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise YAMLError(f"Failed to parse YAML file {path}: {e}") from e
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise YAMLError(f"YAML file must contain a dictionary, got {type(data).__name__}")
+    return data
 
 
 def save_yaml(path: Path | str, data: dict[str, Any]) -> None:
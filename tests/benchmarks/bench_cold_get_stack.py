@@ -0,0 +1,92 @@
+"""Benchmark for cold ``deepwork jobs get-stack`` latency (deepwork.jobs.cache).
+
+Builds a project with 50 jobs and one active session per job, then runs
+``deepwork jobs get-stack`` in a fresh interpreter, as ``post_compact.sh``
+does. Each run either starts with an empty job cache (every job.yml is
+YAML-parsed and schema-validated) or with a warm cache left by a previous
+run. The report shows the median wall-clock latency of each.
+
+Not collected by pytest. Run manually:
+
+    uv run python tests/benchmarks/bench_cold_get_stack.py
+"""
+
+import asyncio
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from deepwork.jobs.cache import job_cache_dir
+from deepwork.jobs.mcp.state import StateManager
+
+JOB_COUNT = 50
+STEPS_PER_JOB = 20
+RUNS = 7
+
+
+def _job_yml(name: str) -> str:
+    lines = [f"name: {name}", f"summary: Benchmark job {name}", "step_arguments:"]
+    for i in range(STEPS_PER_JOB):
+        lines += [
+            f"  - name: artifact_{i}",
+            f"    description: Artifact produced by step {i}",
+            "    type: file_path",
+        ]
+    lines += ["workflows:", "  main:", "    summary: Main workflow", "    steps:"]
+    for i in range(STEPS_PER_JOB):
+        lines += [
+            f"      - name: step_{i}",
+            "        instructions: |",
+            f"          Produce artifact {i} from the previous artifact.",
+        ]
+        if i:
+            lines += ["        inputs:", f"          artifact_{i - 1}: {{}}"]
+        lines += ["        outputs:", f"          artifact_{i}: {{}}"]
+    return "\n".join(lines) + "\n"
+
+
+async def _make_project(root: Path) -> None:
+    jobs_dir = root / ".deepwork" / "jobs"
+    manager = StateManager(root, platform="claude")
+    for j in range(JOB_COUNT):
+        name = f"bench_job_{j}"
+        (jobs_dir / name).mkdir(parents=True)
+        (jobs_dir / name / "job.yml").write_text(_job_yml(name))
+        await manager.create_session(f"session-{j}", name, "main", "Bench", "step_0")
+
+
+def _run_get_stack(root: Path) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "deepwork.cli.main", "jobs", "get-stack", "--path", str(root)],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        asyncio.run(_make_project(root))
+        cache_dir = job_cache_dir(root)
+        assert cache_dir is not None
+
+        uncached = []
+        for _ in range(RUNS):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            uncached.append(_run_get_stack(root))
+        cached = [_run_get_stack(root) for _ in range(RUNS)]
+
+    print(f"{JOB_COUNT} jobs x {STEPS_PER_JOB} steps, {JOB_COUNT} active sessions")
+    print(f"{'cache':>8} {'median ms':>10}")
+    print(f"{'empty':>8} {statistics.median(uncached):>10.1f}")
+    print(f"{'warm':>8} {statistics.median(cached):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
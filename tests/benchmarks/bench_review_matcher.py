@@ -0,0 +1,68 @@
+"""Benchmark for review rule matching (deepwork.review.matcher).
+
+Compares the compiled ``RuleSet`` engine against the per-rule
+``match_rule`` loop as the number of ``.deepreview`` rules grows. With
+rules spread across sibling packages, ``RuleSet`` only tests each file
+against the rules whose source directory contains it, so its cost stays
+roughly flat while the naive loop grows linearly with rule count.
+
+Not collected by pytest. Run manually:
+
+    uv run python tests/benchmarks/bench_review_matcher.py
+"""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from deepwork.review.config import ReviewRule
+from deepwork.review.matcher import RuleSet, match_rule
+
+PROJECT_ROOT = Path("/bench")
+FILE_COUNT = 20_000
+RULE_COUNTS = (10, 100, 1000)
+
+
+def _make_rules(count: int) -> list[ReviewRule]:
+    return [
+        ReviewRule(
+            name=f"rule_{i}",
+            description="bench",
+            include_patterns=["**/*.py", "**/*.md"],
+            exclude_patterns=["**/generated/**"],
+            strategy="individual",
+            instructions="Review it.",
+            agent=None,
+            all_changed_filenames=False,
+            unchanged_matching_files=False,
+            precomputed_info_bash_command=None,
+            source_dir=PROJECT_ROOT / "packages" / f"pkg{i}",
+            source_file=PROJECT_ROOT / "packages" / f"pkg{i}" / ".deepreview",
+            source_line=1,
+        )
+        for i in range(count)
+    ]
+
+
+def _make_files(package_count: int) -> list[str]:
+    return [f"packages/pkg{i % package_count}/src/module_{i}.py" for i in range(FILE_COUNT)]
+
+
+def _time(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'rules':>6} {'naive (s)':>10} {'RuleSet (s)':>12} {'speedup':>8}")
+    for count in RULE_COUNTS:
+        rules = _make_rules(count)
+        files = _make_files(count)
+        naive = _time(lambda r=rules, f=files: [match_rule(f, rule, PROJECT_ROOT) for rule in r])
+        compiled = _time(lambda r=rules, f=files: RuleSet(r, PROJECT_ROOT).match(f))
+        print(f"{count:>6} {naive:>10.3f} {compiled:>12.3f} {naive / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
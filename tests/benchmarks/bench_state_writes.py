@@ -0,0 +1,99 @@
+"""Benchmark for workflow state write amplification (deepwork.jobs.mcp.state).
+
+Advances a workflow through its steps the way ``finished_step`` does, once
+with separate ``complete_step`` / ``advance_to_step`` / ``start_step`` calls
+once with a single ``StateManager.transaction``, and once with transactions
+on a journaled ``StateManager``. Unjournaled writes rewrite the whole
+``state.json``; journaled writes append a record to ``state.journal``. The
+report shows writes and bytes written per workflow step for each approach.
+
+Not collected by pytest. Run manually:
+
+    uv run python tests/benchmarks/bench_state_writes.py
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from deepwork.jobs.mcp.journal import journal_path
+from deepwork.jobs.mcp.state import StateManager
+
+SESSION_ID = "bench"
+STEP_COUNTS = (5, 20, 50)
+
+
+def _outputs(i: int) -> dict[str, str | list[str]]:
+    return {f"output_{i}": [f"reports/step_{i}/file_{j}.md" for j in range(5)]}
+
+
+async def _run_separate(manager: StateManager, steps: int) -> int:
+    state_file = manager._state_file(SESSION_ID)
+    await manager.create_session(SESSION_ID, "bench_job", "main", "Bench", "step_0")
+    await manager.start_step(SESSION_ID, "step_0")
+    written = 0
+    for i in range(steps - 1):
+        await manager.complete_step(SESSION_ID, f"step_{i}", _outputs(i))
+        written += state_file.stat().st_size
+        await manager.advance_to_step(SESSION_ID, f"step_{i + 1}", i + 1)
+        written += state_file.stat().st_size
+        await manager.start_step(SESSION_ID, f"step_{i + 1}", input_values=_outputs(i))
+        written += state_file.stat().st_size
+    return written
+
+
+def _file_sizes(manager: StateManager) -> tuple[int, int]:
+    state_file = manager._state_file(SESSION_ID)
+    try:
+        journal = journal_path(state_file).stat().st_size
+    except FileNotFoundError:
+        journal = 0
+    return state_file.stat().st_size, journal
+
+
+async def _run_transaction(manager: StateManager, steps: int) -> int:
+    async with manager.transaction(SESSION_ID) as txn:
+        txn.create_session("bench_job", "main", "Bench", "step_0")
+        txn.start_step("step_0")
+    written = 0
+    for i in range(steps - 1):
+        snapshot, journal = _file_sizes(manager)
+        async with manager.transaction(SESSION_ID) as txn:
+            txn.complete_step(f"step_{i}", _outputs(i))
+            txn.advance_to_step(f"step_{i + 1}", i + 1)
+            txn.start_step(f"step_{i + 1}", input_values=_outputs(i))
+        new_snapshot, new_journal = _file_sizes(manager)
+        # An append grows the journal; a snapshot write rewrites the state file
+        written += new_journal - journal if new_journal > journal else new_snapshot
+    return written
+
+
+async def _measure(mode: str, steps: int) -> tuple[float, float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = StateManager(Path(tmp), platform="bench", journal=mode == "journal")
+        run = _run_separate if mode == "separate" else _run_transaction
+        start = time.perf_counter()
+        written = await run(manager, steps)
+        elapsed = time.perf_counter() - start
+        # Exclude the setup writes (session creation and first start_step)
+        setup_writes = 2 if mode == "separate" else 1
+        transitions = steps - 1
+        writes = manager.stats.writes - setup_writes
+        return (
+            writes / transitions,
+            written / transitions / 1024,
+            elapsed / transitions * 1000,
+        )
+
+
+async def main() -> None:
+    print(f"{'steps':>6} {'mode':>12} {'writes/step':>12} {'KiB/step':>9} {'ms/step':>8}")
+    for steps in STEP_COUNTS:
+        for mode in ("separate", "transaction", "journal"):
+            writes, kib, ms = await _measure(mode, steps)
+            print(f"{steps:>6} {mode:>12} {writes:>12.1f} {kib:>9.1f} {ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
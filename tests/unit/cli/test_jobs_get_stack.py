@@ -305,6 +305,131 @@ class TestListSessionsSyncErrors:
         sessions = _list_sessions_sync(sessions_dir)
         assert sessions == []
 
+    def test_missing_sessions_dir(self, tmp_path: Path) -> None:
+        from deepwork.cli.jobs import _list_sessions_sync
+
+        assert _list_sessions_sync(tmp_path / "sessions") == []
+
+    def test_skips_unreadable_state_files(self, tmp_path: Path) -> None:
+        """Corrupt, invalid and unreadable state files under the sessions root are skipped."""
+        from deepwork.cli.jobs import _list_sessions_sync
+
+        sessions_base = tmp_path / ".deepwork" / "tmp" / "sessions"
+        good = _create_session_file(tmp_path / ".deepwork" / "tmp", "good")
+        platform_dir = good.parent.parent
+        for name, content in [("torn", "not valid json"), ("list", "[]")]:
+            (platform_dir / f"session-{name}").mkdir()
+            (platform_dir / f"session-{name}" / "state.json").write_text(content)
+        (platform_dir / "session-invalid").mkdir()
+        (platform_dir / "session-invalid" / "state.json").write_text(
+            json.dumps({"workflow_stack": [{"not_a_valid": "session"}]})
+        )
+        # A directory where the state file should be
+        (platform_dir / "session-dir" / "state.json").mkdir(parents=True)
+
+        sessions = _list_sessions_sync(sessions_base)
+        assert [s.session_id for s in sessions] == ["good"]
+
+
+class TestGetStackJournaledState:
+    """Tests for sessions written with the journaled state format."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.12).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_replays_journal(self, tmp_path: Path) -> None:
+        """Mutations still in the journal are reflected in the output."""
+        import asyncio
+
+        from deepwork.jobs.mcp.state import StateManager
+
+        manager = StateManager(tmp_path, platform="claude", journal=True)
+
+        async def run() -> None:
+            await manager.create_session("abc12345", "my_job", "main", "Goal", "step1")
+            await manager.advance_to_step("abc12345", "step2", 1)
+
+        asyncio.run(run())
+        state_file = manager._state_file("abc12345")
+        assert state_file.with_suffix(".journal").exists()
+        assert json.loads(state_file.read_text())["workflow_stack"][0]["current_step_id"] == "step1"
+
+        runner = CliRunner()
+        result = runner.invoke(get_stack, ["--path", str(tmp_path)])
+        assert result.exit_code == 0
+
+        data = json.loads(result.output)
+        assert len(data["active_sessions"]) == 1
+        assert data["active_sessions"][0]["current_step_id"] == "step2"
+
+
+class TestGetStackIndex:
+    """Tests for finding active sessions through the active-session index."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.17).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_reads_only_indexed_sessions(self, tmp_path: Path) -> None:
+        """Sessions missing from an existing index are not read."""
+        sessions_dir = tmp_path / ".deepwork" / "tmp"
+        _create_session_file(sessions_dir, "indexed1")
+        runner = CliRunner()
+        # First run builds the index from a full scan
+        result = runner.invoke(get_stack, ["--path", str(tmp_path)])
+        assert result.exit_code == 0
+        assert (sessions_dir / "sessions" / "active_sessions.json").exists()
+
+        _create_session_file(sessions_dir, "unindexed")
+        result = runner.invoke(get_stack, ["--path", str(tmp_path)])
+        ids = [s["session_id"] for s in json.loads(result.output)["active_sessions"]]
+        assert ids == ["indexed1"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.18).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_rebuild_index_flag(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / ".deepwork" / "tmp"
+        _create_session_file(sessions_dir, "indexed1")
+        runner = CliRunner()
+        runner.invoke(get_stack, ["--path", str(tmp_path)])
+        _create_session_file(sessions_dir, "unindexed")
+
+        result = runner.invoke(get_stack, ["--path", str(tmp_path), "--rebuild-index"])
+
+        assert result.exit_code == 0
+        ids = {s["session_id"] for s in json.loads(result.output)["active_sessions"]}
+        assert ids == {"indexed1", "unindexed"}
+
+    def test_stale_index_entry_ignored(self, tmp_path: Path) -> None:
+        """Index entries whose state file no longer has the session are skipped."""
+        sessions_dir = tmp_path / ".deepwork" / "tmp"
+        path = _create_session_file(sessions_dir, "gone")
+        runner = CliRunner()
+        runner.invoke(get_stack, ["--path", str(tmp_path)])
+        path.write_text(json.dumps({"workflow_stack": []}))
+
+        result = runner.invoke(get_stack, ["--path", str(tmp_path)])
+
+        assert json.loads(result.output) == {"active_sessions": []}
+
+
+class TestGetStackUnknownPosition:
+    """Tests for sessions whose workflow or step no longer exists in the job."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.7, DW-REQ-005.4.8).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_unknown_workflow_or_step_has_null_fields(self, tmp_path: Path) -> None:
+        sessions_dir = tmp_path / ".deepwork" / "tmp"
+        _create_minimal_job(tmp_path / ".deepwork" / "jobs", "test_job")
+        _create_session_file(sessions_dir, "wf000000", workflow_name="renamed")
+        _create_session_file(sessions_dir, "st000000", current_step_id="removed")
+
+        result = CliRunner().invoke(get_stack, ["--path", str(tmp_path)])
+        assert result.exit_code == 0, result.output
+
+        sessions = {s["session_id"]: s for s in json.loads(result.output)["active_sessions"]}
+        assert sessions["wf000000"]["common_job_info"] is None
+        assert sessions["st000000"]["common_job_info"] == "Common info for test_job"
+        assert sessions["st000000"]["current_step_instructions"] is None
+        assert "step_number" not in sessions["st000000"]
+
 
 class TestGetStackParseError:
     """Tests for ParseError handling in _get_active_sessions."""
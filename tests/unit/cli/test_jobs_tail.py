@@ -0,0 +1,46 @@
+"""Tests for the `deepwork jobs tail` CLI command -- validates DW-REQ-005.4.19."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from deepwork.cli.jobs import jobs
+from deepwork.jobs.mcp.events import EventLog, events_path
+
+
+class TestJobsTail:
+    """Tests for reading the workflow event stream from the CLI."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.19).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_prints_events_after_since(self, tmp_path: Path) -> None:
+        log = EventLog(events_path(tmp_path))
+        log.append([{"event": "workflow_started"}, {"event": "step_started"}])
+        log.append([{"event": "step_finished"}])
+
+        result = CliRunner().invoke(jobs, ["tail", "--path", str(tmp_path), "--since", "1"])
+
+        assert result.exit_code == 0, result.output
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert [(e["seq"], e["event"]) for e in events] == [
+            (2, "step_started"),
+            (3, "step_finished"),
+        ]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.19).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_limit(self, tmp_path: Path) -> None:
+        EventLog(events_path(tmp_path)).append([{"event": "step_started"}] * 5)
+
+        result = CliRunner().invoke(jobs, ["tail", "--path", str(tmp_path), "--limit", "2"])
+
+        assert [json.loads(line)["seq"] for line in result.output.splitlines()] == [1, 2]
+
+    def test_no_events(self, tmp_path: Path) -> None:
+        result = CliRunner().invoke(jobs, ["tail", "--path", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert result.output == ""
@@ -241,12 +241,13 @@ class TestFindNamedSchemasPermissionError:
 
 
 class TestWalkForAnonymousPermissionError:
-    """Tests for PermissionError handling in _walk_for_anonymous."""
+    """Tests for PermissionError handling in the anonymous schema walk."""
 
     def test_skips_directory_on_permission_error(self, tmp_path: Path) -> None:
         # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-011.4.1).
         # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-        """PermissionError during iterdir is caught and the directory is skipped."""
+        """PermissionError during scandir is caught and the directory is skipped."""
+        import os
         from unittest.mock import patch as mock_patch
 
         # Create one valid anonymous schema
@@ -257,14 +258,14 @@ class TestWalkForAnonymousPermissionError:
         bad_dir.mkdir()
         _make_anonymous_schema(bad_dir, "bad.py")
 
-        original_iterdir = Path.iterdir
+        original_scandir = os.scandir
 
-        def mock_iterdir(self: Path):  # type: ignore[no-untyped-def]
-            if self == bad_dir:
+        def mock_scandir(path):  # type: ignore[no-untyped-def]
+            if Path(path) == bad_dir:
                 raise PermissionError("Access denied")
-            return original_iterdir(self)
+            return original_scandir(path)
 
-        with mock_patch.object(Path, "iterdir", mock_iterdir):
+        with mock_patch("deepwork.utils.scanner.os.scandir", mock_scandir):
             results = find_anonymous_schemas(tmp_path)
 
         # Should find the good one at root level but not the one in restricted dir
@@ -319,3 +320,28 @@ class TestDiscoverAllSchemas:
         # The "bad" schema should produce an error; standard schemas still load
         assert len(errors) == 1
         assert "bad" in errors[0].error or str(errors[0].file_path).endswith("bad/deepschema.yml")
+
+
+class TestSharedProjectScanner:
+    """Tests for discovery through a shared ProjectScanner."""
+
+    def test_named_and_anonymous_schemas_share_one_scan(self, tmp_path: Path) -> None:
+        # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.6.3).
+        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+        """A scanner passed to discover_all_schemas is walked only once."""
+        from deepwork.utils.scanner import ProjectScanner
+
+        _make_named_schema(tmp_path, "api")
+        _make_anonymous_schema(tmp_path, "app.py")
+        scanner = ProjectScanner(tmp_path)
+
+        with (
+            patch("deepwork.deepschema.discovery._STANDARD_SCHEMAS_DIR", tmp_path / "empty"),
+            patch.object(scanner, "_scan", wraps=scanner._scan) as mock_scan,
+        ):
+            schemas, errors = discover_all_schemas(tmp_path, scanner)
+            find_named_schemas(tmp_path, scanner)
+
+        assert mock_scan.call_count == 1
+        assert errors == []
+        assert sorted(s.name for s in schemas) == ["api", "app.py"]
@@ -0,0 +1,251 @@
+"""Tests for archiving completed workflows and stale sessions.
+
+Validates requirements: JOBS-REQ-003.20, DW-REQ-005.4.14, DW-REQ-005.4.20, DW-REQ-005.4.21.
+"""
+
+import fcntl
+import json
+import os
+import tarfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from deepwork.jobs.mcp import archive as archive_module
+from deepwork.jobs.mcp.archive import (
+    archive_stale_sessions,
+    list_segments,
+    read_segment,
+    write_segment,
+)
+from deepwork.jobs.mcp.state import StateManager
+
+SESSION_ID = "archive-session"
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / ".deepwork" / "tmp").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def state_manager(project_root: Path) -> StateManager:
+    return StateManager(project_root=project_root, platform="test", hot_completed_limit=2)
+
+
+async def _run_workflows(manager: StateManager, count: int, agent_id: str | None = None) -> None:
+    for i in range(count):
+        await manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name=f"wf_{i}",
+            goal="Archive",
+            first_step_id="step1",
+            agent_id=agent_id,
+        )
+        await manager.complete_workflow(SESSION_ID, agent_id=agent_id)
+
+
+class TestCompletedWorkflowArchival:
+    """Tests for moving old completed workflows out of the state file."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.20.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_state_file_keeps_only_recent_completed(
+        self, state_manager: StateManager
+    ) -> None:
+        await _run_workflows(state_manager, 5)
+
+        state_file = state_manager._state_file(SESSION_ID)
+        hot = json.loads(state_file.read_text())["completed_workflows"]
+        assert [w["workflow_name"] for w in hot] == ["wf_3", "wf_4"]
+
+        segments = list_segments(state_file)
+        assert [p.name for p in segments] == [
+            "state-000001.jsonl.gz",
+            "state-000002.jsonl.gz",
+            "state-000003.jsonl.gz",
+        ]
+        archived = [e for p in segments for e in read_segment(p)]
+        assert [w["workflow_name"] for w in archived] == ["wf_0", "wf_1", "wf_2"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.20.4, JOBS-REQ-003.20.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_readers_merge_archive(self, state_manager: StateManager) -> None:
+        await _run_workflows(state_manager, 4)
+        await _run_workflows(state_manager, 3, agent_id="agent-a")
+
+        archived = state_manager.get_archived_workflows(SESSION_ID)
+        assert [w.workflow_name for w in archived] == ["wf_0", "wf_1"]
+
+        hot_only = state_manager.get_all_session_data(SESSION_ID)
+        assert len(hot_only[None][1]) == 2
+
+        data = state_manager.get_all_session_data(SESSION_ID, include_archived=True)
+        assert [w.workflow_name for w in data[None][1]] == ["wf_0", "wf_1", "wf_2", "wf_3"]
+        assert [w.workflow_name for w in data["agent-a"][1]] == ["wf_0", "wf_1", "wf_2"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.20.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_duplicate_after_interrupted_archival_returned_once(
+        self, state_manager: StateManager
+    ) -> None:
+        await _run_workflows(state_manager, 2)
+        state_file = state_manager._state_file(SESSION_ID)
+        # Simulate a crash after the segment write but before the state rewrite
+        hot = json.loads(state_file.read_text())["completed_workflows"]
+        write_segment(state_file, hot[:1])
+
+        data = state_manager.get_all_session_data(SESSION_ID, include_archived=True)
+        assert [w.workflow_name for w in data[None][1]] == ["wf_0", "wf_1"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.20.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_corrupt_segment_skipped(self, state_manager: StateManager) -> None:
+        await _run_workflows(state_manager, 4)
+        segments = list_segments(state_manager._state_file(SESSION_ID))
+        segments[0].write_bytes(b"not gzip")
+
+        archived = state_manager.get_archived_workflows(SESSION_ID)
+        assert [w.workflow_name for w in archived] == ["wf_1"]
+
+
+class TestArchiveStaleSessions:
+    """Tests for rotating stale sessions into the project-level archive."""
+
+    async def _make_session(
+        self, project_root: Path, session_id: str, age_days: float, *, active: bool = False
+    ) -> Path:
+        manager = StateManager(project_root=project_root, platform="test")
+        await manager.create_session(session_id, "test_job", "main", "Goal", "step1")
+        if not active:
+            await manager.complete_workflow(session_id)
+        session_dir = manager.sessions_dir / f"session-{session_id}"
+        stamp = 1_700_000_000 - age_days * DAY
+        for root, _dirs, files in os.walk(session_dir):
+            for name in files:
+                os.utime(os.path.join(root, name), (stamp, stamp))
+            os.utime(root, (stamp, stamp))
+        return session_dir
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.14).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_only_stale_sessions_archived(self, project_root: Path) -> None:
+        stale = await self._make_session(project_root, "old", age_days=10)
+        fresh = await self._make_session(project_root, "new", age_days=1)
+
+        report = archive_stale_sessions(project_root, 7 * DAY, now=1_700_000_000)
+
+        assert not stale.exists()
+        assert fresh.exists()
+        assert len(report.archived) == 1
+        archive = report.archived[0]
+        assert archive.parent == project_root / ".deepwork/tmp/archive/sessions/test"
+        assert archive.name.startswith("session-old-")
+        with tarfile.open(archive) as tar:
+            assert "session-old/state.json" in tar.getnames()
+        assert report.bytes_removed > 0
+        assert report.bytes_archived == archive.stat().st_size
+        assert report.bytes_reclaimed == report.bytes_removed - report.bytes_archived
+
+    async def test_dry_run_changes_nothing(self, project_root: Path) -> None:
+        stale = await self._make_session(project_root, "old", age_days=10)
+
+        report = archive_stale_sessions(project_root, 7 * DAY, dry_run=True, now=1_700_000_000)
+
+        assert stale.exists()
+        assert len(report.archived) == 1
+        assert not report.archived[0].exists()
+        assert report.bytes_archived == 0
+
+    async def test_failed_archive_keeps_session(
+        self, project_root: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        stale = await self._make_session(project_root, "old", age_days=10)
+        # Stray files next to the session directories are not sessions
+        (stale.parent / "session-notes").write_text("")
+
+        def disk_full(*args: object, **kwargs: object) -> None:
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(archive_module.tarfile, "open", disk_full)
+        with pytest.raises(OSError, match="No space left"):
+            archive_stale_sessions(project_root, 7 * DAY, now=1_700_000_000)
+
+        assert stale.exists()
+        archive_dir = project_root / ".deepwork/tmp/archive/sessions/test"
+        assert list(archive_dir.iterdir()) == []
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.20).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_active_sessions_kept_unless_forced(self, project_root: Path) -> None:
+        active = await self._make_session(project_root, "busy", age_days=10, active=True)
+
+        report = archive_stale_sessions(project_root, 7 * DAY, now=1_700_000_000)
+        assert active.exists()
+        assert report.archived == []
+
+        report = archive_stale_sessions(project_root, 7 * DAY, force=True, now=1_700_000_000)
+        assert not active.exists()
+        assert len(report.archived) == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.21).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_archives_under_state_file_lock(
+        self, project_root: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        stale = await self._make_session(project_root, "old", age_days=10)
+        lock_path = stale / "state.json.lock"
+        held_while_removing = []
+        real_rmtree = archive_module.shutil.rmtree
+
+        def checking_rmtree(path: Path) -> None:
+            fd = os.open(lock_path, os.O_RDWR)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                held_while_removing.append(True)
+            finally:
+                os.close(fd)
+            real_rmtree(path)
+
+        monkeypatch.setattr(archive_module.shutil, "rmtree", checking_rmtree)
+        archive_stale_sessions(project_root, 7 * DAY, now=1_700_000_000)
+
+        assert held_while_removing == [True]
+        assert not stale.exists()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.4.21).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_session_written_while_waiting_for_lock_is_kept(self, project_root: Path) -> None:
+        stale = await self._make_session(project_root, "old", age_days=10)
+        state_file = stale / "state.json"
+        fd = os.open(state_file.with_name("state.json.lock"), os.O_RDWR)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        reports = []
+        worker = threading.Thread(
+            target=lambda: reports.append(
+                archive_stale_sessions(project_root, 7 * DAY, now=1_700_000_000)
+            )
+        )
+        try:
+            worker.start()
+            # Simulate a server writing the session while gc waits for the lock
+            time.sleep(0.1)
+            os.utime(state_file, (1_700_000_000, 1_700_000_000))
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        worker.join(timeout=5)
+
+        assert reports[0].archived == []
+        assert stale.exists()
+
+    def test_no_sessions_dir(self, project_root: Path) -> None:
+        report = archive_stale_sessions(project_root, 0)
+        assert report.archived == []
+        assert report.bytes_reclaimed == 0
@@ -39,13 +39,15 @@ class TestAsyncInterfaceRegression:
             )
 
     def test_state_manager_has_lock(self, tmp_path: Path) -> None:
-        """Verify StateManager has an asyncio.Lock for thread safety."""
+        """Verify StateManager provides a per-file asyncio.Lock for async safety."""
         manager = StateManager(project_root=tmp_path, platform="test")
 
-        assert hasattr(manager, "_lock"), "StateManager must have _lock attribute"
-        assert isinstance(manager._lock, asyncio.Lock), (
-            "StateManager._lock must be an asyncio.Lock for async concurrency safety"
+        main_lock = manager._state_lock(manager._state_file(SESSION_ID))
+        assert isinstance(main_lock, asyncio.Lock), (
+            "StateManager state file locks must be asyncio.Lock for async concurrency safety"
         )
+        assert manager._state_lock(manager._state_file(SESSION_ID)) is main_lock
+        assert manager._state_lock(manager._state_file(SESSION_ID, "agent")) is not main_lock
 
     def test_workflow_tools_async_methods(self) -> None:
         """Verify WorkflowTools methods that must be async remain async."""
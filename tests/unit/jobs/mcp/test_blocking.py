@@ -0,0 +1,180 @@
+"""Tests for offloading blocking tool work and loop lag instrumentation.
+
+Validates requirements: JOBS-REQ-001.12, JOBS-REQ-001.13.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from deepwork.jobs.mcp.blocking import BlockingExecutor, LoopLagMonitor
+from deepwork.jobs.mcp.schemas import GetWorkflowsResponse
+from deepwork.jobs.mcp.server import create_server
+from deepwork.jobs.mcp.state import StateManager
+
+
+async def _count_ticks(stop: asyncio.Event, interval: float = 0.01) -> int:
+    ticks = 0
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        ticks += 1
+    return ticks
+
+
+class TestBlockingExecutor:
+    """Tests for the bounded blocking-work pool."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.12.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_runs_off_loop_thread(self) -> None:
+        executor = BlockingExecutor(max_workers=2)
+        try:
+            thread = await executor.run(threading.current_thread)
+            assert thread is not threading.current_thread()
+            assert thread.name.startswith("deepwork-blocking")
+            assert await executor.run(lambda a, *, b: a + b, 1, b=2) == 3
+        finally:
+            executor.shutdown()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.12.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_pool_is_bounded(self) -> None:
+        executor = BlockingExecutor(max_workers=2)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work() -> None:
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        try:
+            await asyncio.gather(*(executor.run(work) for _ in range(8)))
+        finally:
+            executor.shutdown()
+        assert peak == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.12.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_offloaded_reads_count_toward_call_stats(self, tmp_path: Path) -> None:
+        state_manager = StateManager(project_root=tmp_path, platform="test")
+        await state_manager.create_session("s", "job", "main", "Goal", "step1")
+        executor = BlockingExecutor(max_workers=2)
+        try:
+            with state_manager.track_stats() as stats:
+                await executor.run(state_manager.get_stack, "s")
+                await executor.run(state_manager.get_stack, "s")
+        finally:
+            executor.shutdown()
+        assert stats.hits + stats.misses == 2
+
+    async def test_shutdown_is_idempotent_and_pool_restarts(self) -> None:
+        executor = BlockingExecutor(max_workers=1)
+        executor.shutdown()
+        assert await executor.run(lambda: 1) == 1
+        executor.shutdown()
+        executor.shutdown()
+        assert await executor.run(lambda: 2) == 2
+        executor.shutdown()
+
+
+class TestLoopLagMonitor:
+    """Tests for the event loop lag probe."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.13.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_stall_logged_with_tool_name(self, caplog: pytest.LogCaptureFixture) -> None:
+        monitor = LoopLagMonitor(threshold=0.05, interval=0.01)
+        caplog.set_level(logging.WARNING, logger="deepwork.jobs.mcp.blocking")
+
+        with monitor.track("slow_tool"):
+            time.sleep(0.15)  # Deliberately block the loop
+        await asyncio.sleep(0.05)
+
+        assert monitor.stalls == 1
+        assert monitor.max_lag >= 0.1
+        assert "during tool calls: slow_tool" in caplog.text
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.13.2, JOBS-REQ-001.13.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_no_stall_when_yielding_and_probe_stops(self) -> None:
+        monitor = LoopLagMonitor(threshold=0.5, interval=0.01)
+
+        with monitor.track("fast_tool"):
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.03)
+
+        assert monitor.stalls == 0
+        assert monitor._task is not None and monitor._task.done()
+
+    async def test_concurrent_calls_share_one_probe(self) -> None:
+        monitor = LoopLagMonitor(threshold=0.5, interval=0.01)
+
+        with monitor.track("first"):
+            probe = monitor._task
+            with monitor.track("second"):
+                assert monitor._task is probe
+        await asyncio.sleep(0.03)
+        assert probe is not None and probe.done()
+
+    def test_track_outside_event_loop(self) -> None:
+        monitor = LoopLagMonitor()
+        with monitor.track("sync_tool"):
+            pass
+        assert monitor._task is None
+
+
+class TestServerOffloading:
+    """Tests that tool handlers keep the event loop responsive."""
+
+    def _make_server(self, tmp_path: Path, **kwargs: Any) -> tuple[Any, MagicMock]:
+        mock_tools = MagicMock()
+
+        def slow_get_workflows() -> GetWorkflowsResponse:
+            time.sleep(0.2)
+            return GetWorkflowsResponse(jobs=[], errors=[])
+
+        mock_tools.get_workflows.side_effect = slow_get_workflows
+        with (
+            patch("deepwork.jobs.mcp.server.WorkflowTools", return_value=mock_tools),
+            patch("deepwork.jobs.mcp.server.detect_issues", return_value=[]),
+        ):
+            mcp = create_server(project_root=tmp_path, **kwargs)
+        return mcp, mock_tools
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.12.1, JOBS-REQ-001.12.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_slow_tool_does_not_block_loop(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        mcp, _ = self._make_server(tmp_path, loop_lag_threshold=0.15)
+        caplog.set_level(logging.WARNING, logger="deepwork.jobs.mcp.blocking")
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_count_ticks(stop))
+
+        result = await mcp.call_tool("get_workflows", {})
+        stop.set()
+
+        assert result.structured_content["jobs"] == []
+        assert await ticker >= 5
+        assert "Event loop blocked" not in caplog.text
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.12.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_tools_share_server_executor(self, tmp_path: Path) -> None:
+        with patch("deepwork.jobs.mcp.server.WorkflowTools") as tools_cls:
+            create_server(project_root=tmp_path, blocking_workers=3)
+        executor = tools_cls.call_args.kwargs["blocking"]
+        assert isinstance(executor, BlockingExecutor)
+        assert executor.max_workers == 3
@@ -0,0 +1,321 @@
+"""Tests for the workflow event stream.
+
+Validates requirements: JOBS-REQ-010.15.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from starlette.testclient import TestClient
+
+from deepwork.jobs.mcp import events as events_module
+from deepwork.jobs.mcp.events import (
+    EventLog,
+    events_path,
+    format_sse,
+    last_seq,
+    log_files,
+    read_events,
+    stream_events,
+)
+from deepwork.jobs.mcp.roots import RootResolver
+from deepwork.jobs.mcp.scheduling import CallScheduler
+from deepwork.jobs.mcp.server import create_server
+from deepwork.jobs.mcp.state import StateError, StateManager
+
+SESSION_ID = "events-session"
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / ".deepwork" / "tmp").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def event_log(project_root: Path) -> EventLog:
+    return EventLog(events_path(project_root))
+
+
+@pytest.fixture
+def state_manager(project_root: Path, event_log: EventLog) -> StateManager:
+    return StateManager(project_root=project_root, platform="test", events=event_log)
+
+
+async def _start(manager: StateManager, agent_id: str | None = None) -> None:
+    await manager.create_session(
+        session_id=SESSION_ID,
+        job_name="test_job",
+        workflow_name="main",
+        goal="Stream",
+        first_step_id="step1",
+        agent_id=agent_id,
+    )
+
+
+class TestStateManagerEvents:
+    """Tests for events emitted by committed state changes."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.1, JOBS-REQ-010.15.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_workflow_lifecycle_events(
+        self, state_manager: StateManager, event_log: EventLog
+    ) -> None:
+        await _start(state_manager)
+        await state_manager.start_step(SESSION_ID, "step1")
+        await state_manager.record_quality_attempt(SESSION_ID, "step1")
+        await state_manager.complete_step(SESSION_ID, "step1", {"out": "out.md"})
+        await state_manager.complete_workflow(SESSION_ID)
+
+        events = read_events(event_log.path)
+        assert [e["event"] for e in events] == [
+            "workflow_started",
+            "step_started",
+            "quality_attempt",
+            "step_finished",
+            "workflow_completed",
+        ]
+        assert [e["seq"] for e in events] == [1, 2, 3, 4, 5]
+        started = events[0]
+        assert started["session_id"] == SESSION_ID
+        assert started["agent_id"] is None
+        assert started["job_name"] == "test_job"
+        assert started["workflow_name"] == "main"
+        assert started["step_id"] == "step1"
+        assert started["goal"] == "Stream"
+        assert {e["workflow_instance_id"] for e in events} == {started["workflow_instance_id"]}
+        assert events[2]["attempt"] == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_abort_event_carries_reason(
+        self, state_manager: StateManager, event_log: EventLog
+    ) -> None:
+        await _start(state_manager, agent_id="agent-a")
+        await state_manager.abort_workflow(SESSION_ID, "not needed", agent_id="agent-a")
+
+        aborted = read_events(event_log.path)[-1]
+        assert aborted["event"] == "workflow_aborted"
+        assert aborted["reason"] == "not needed"
+        assert aborted["agent_id"] == "agent-a"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_failed_transaction_emits_nothing(
+        self, state_manager: StateManager, event_log: EventLog
+    ) -> None:
+        await _start(state_manager)
+        with pytest.raises(StateError):
+            async with state_manager.transaction(SESSION_ID) as txn:
+                txn.start_step("step1")
+                raise StateError("rejected")
+
+        assert [e["event"] for e in read_events(event_log.path)] == ["workflow_started"]
+
+    async def test_no_event_log_by_default(self, project_root: Path) -> None:
+        await _start(StateManager(project_root=project_root, platform="test"))
+        assert not events_path(project_root).exists()
+
+
+class TestEventLog:
+    """Tests for numbering, rotation and incremental reads."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_seq_continues_across_writers(self, project_root: Path) -> None:
+        path = events_path(project_root)
+        first, second = EventLog(path), EventLog(path)
+
+        first.append([{"event": "step_started"}])
+        second.append([{"event": "step_finished"}, {"event": "step_started"}])
+        first.append([{"event": "step_finished"}])
+
+        assert [e["seq"] for e in read_events(path)] == [1, 2, 3, 4]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_rotation_keeps_seq_and_backups(self, project_root: Path) -> None:
+        path = events_path(project_root)
+        log = EventLog(path, max_bytes=200, backups=2)
+
+        for _ in range(20):
+            log.append([{"event": "step_started", "step_id": "a_fairly_long_step_name"}])
+
+        files = log_files(path)
+        assert [f.name for f in files] == ["events.jsonl.2", "events.jsonl.1", "events.jsonl"]
+        assert all(f.stat().st_size <= 200 for f in files)
+        assert last_seq(path) == 20
+        # Only the retained history can be read back; seq stays contiguous within it
+        seqs = [e["seq"] for e in read_events(path)]
+        assert seqs == list(range(seqs[0], 21))
+        assert EventLog(path).append([{"event": "step_finished"}])[0]["seq"] == 21
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_read_since_and_limit(self, project_root: Path) -> None:
+        path = events_path(project_root)
+        log = EventLog(path, max_bytes=400)
+        for _ in range(10):
+            log.append([{"event": "step_started"}])
+        assert len(log_files(path)) > 1
+
+        assert [e["seq"] for e in read_events(path, since=7)] == [8, 9, 10]
+        assert [e["seq"] for e in read_events(path, since=2, limit=3)] == [3, 4, 5]
+        assert read_events(path, since=10) == []
+
+    def test_torn_last_line_skipped(self, event_log: EventLog) -> None:
+        event_log.append([{"event": "step_started"}])
+        with open(event_log.path, "a") as f:
+            f.write('{"seq": 2, "ev')
+
+        assert [e["seq"] for e in read_events(event_log.path)] == [1]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_append_after_torn_tail_starts_a_new_line(self, event_log: EventLog) -> None:
+        event_log.append([{"event": "step_started"}])
+        # A writer that died mid-line, whether this process or another one
+        with open(event_log.path, "a") as f:
+            f.write('{"seq": 2, "ev')
+
+        event_log.append([{"event": "step_finished"}])
+        EventLog(event_log.path).append([{"event": "step_started"}])
+
+        assert [e["seq"] for e in read_events(event_log.path)] == [1, 2, 3]
+        assert event_log.path.read_bytes().endswith(b"\n")
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @pytest.mark.parametrize("complete_lines", [0, 2])
+    def test_long_torn_tail_truncated(
+        self, project_root: Path, monkeypatch: pytest.MonkeyPatch, complete_lines: int
+    ) -> None:
+        monkeypatch.setattr(events_module, "_TAIL_BYTES", 16)
+        path = events_path(project_root)
+        path.parent.mkdir(parents=True)
+        lines = "".join(f'{{"seq": {n}}}\n' for n in range(1, complete_lines + 1))
+        path.write_text(lines + '{"seq": 99, "event": "' + "x" * 100)
+
+        EventLog(path).append([{"event": "step_started"}])
+
+        assert [e["seq"] for e in read_events(path)] == [
+            *range(1, complete_lines + 1),
+            complete_lines + 1,
+        ]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_junk_lines_skipped(self, project_root: Path) -> None:
+        path = events_path(project_root)
+        path.parent.mkdir(parents=True)
+        path.with_name("events.jsonl.1").write_text('{"seq": 1}\n{"seq": 2}\n')
+        path.write_text('garbage\n[3]\n{"event": "no seq"}\n')
+
+        assert [e["seq"] for e in read_events(path)] == [1, 2]
+        # The live file holds no events, so the rotated file has the last one
+        assert last_seq(path) == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_file_rotated_away_while_reading(
+        self, project_root: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = events_path(project_root)
+        path.parent.mkdir(parents=True)
+        path.write_text('{"seq": 5}\n')
+        vanished = path.with_name("events.jsonl.1")
+        monkeypatch.setattr(events_module, "log_files", lambda p: [vanished, p])
+
+        assert [e["seq"] for e in read_events(path)] == [5]
+        path.write_text("")
+        assert last_seq(path) == 0
+
+    def test_missing_log_reads_empty(self, project_root: Path) -> None:
+        assert read_events(events_path(project_root)) == []
+        assert last_seq(events_path(project_root)) == 0
+
+
+class TestEventStreamEndpoint:
+    """Tests for the SSE endpoint of the HTTP transports."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_stream_yields_new_events(self, event_log: EventLog) -> None:
+        event_log.append([{"event": "step_started"}, {"event": "step_finished"}])
+        stream = stream_events(event_log.path, since=1, poll_interval=0.01)
+
+        message = await anext(stream)
+        assert message == format_sse(read_events(event_log.path)[1])
+        assert message.startswith("id: 2\nevent: step_finished\ndata: ")
+
+        event_log.append([{"event": "workflow_completed"}])
+        message = await anext(stream)
+        assert json.loads(message.split("data: ", 1)[1])["seq"] == 3
+        await stream.aclose()
+
+    async def test_stream_sends_keepalive(self, event_log: EventLog) -> None:
+        stream = stream_events(event_log.path, poll_interval=0.01, keepalive=0.02)
+        assert await anext(stream) == ": keepalive\n\n"
+        await stream.aclose()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_route_rejects_bad_since(self, project_root: Path) -> None:
+        app = create_server(project_root, loop_lag_threshold=None).http_app(transport="sse")
+        with TestClient(app) as client:
+            response = client.get("/events", params={"since": "latest"})
+        assert response.status_code == 400
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_route_streams_the_requested_root(self, tmp_path: Path) -> None:
+        startup, worktree = tmp_path / "main", tmp_path / "worktree"
+        for root in (startup, worktree):
+            EventLog(events_path(root)).append([{"event": "step_started", "root": root.name}])
+        mcp = create_server(startup, explicit_path=False, loop_lag_threshold=None)
+        # A call from the worktree makes it a root the server serves
+        with patch.object(RootResolver, "get_root", AsyncMock(return_value=worktree)):
+            await mcp.call_tool("get_workflows", {})
+
+        async def first_event(path: Path, since: int, **_kwargs: Any) -> AsyncIterator[str]:
+            yield format_sse(read_events(path, since)[0])
+
+        with (
+            patch("deepwork.jobs.mcp.server.stream_events", first_event),
+            TestClient(mcp.http_app(transport="http")) as client,
+        ):
+            default = client.get("/events")
+            other = client.get("/events", params={"root": str(worktree)})
+            unknown = client.get("/events", params={"root": str(tmp_path / "elsewhere")})
+
+        assert '"root": "main"' in default.text
+        assert '"root": "worktree"' in other.text
+        assert unknown.status_code == 404
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.8).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_stream_ends_when_stopped(self, event_log: EventLog) -> None:
+        event_log.append([{"event": "step_started"}])
+        stopped = False
+        stream = stream_events(event_log.path, poll_interval=0.01, stop=lambda: stopped)
+        assert (await anext(stream)).startswith("id: 1\n")
+
+        stopped = True
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.15.8).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_route_refused_while_draining(self, project_root: Path) -> None:
+        scheduler = CallScheduler()
+        mcp = create_server(project_root, loop_lag_threshold=None, scheduler=scheduler)
+        with TestClient(mcp.http_app(transport="http")) as client:
+            scheduler.draining = True
+            response = client.get("/events")
+        assert response.status_code == 503
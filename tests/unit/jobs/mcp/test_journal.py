@@ -0,0 +1,223 @@
+"""Tests for the journaled workflow session state format.
+
+Validates requirements: JOBS-REQ-003.19.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from deepwork.jobs.mcp import journal as journal_module
+from deepwork.jobs.mcp.journal import build_record, journal_path, read_state_file
+from deepwork.jobs.mcp.state import StateManager
+
+SESSION_ID = "journal-session"
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / ".deepwork" / "tmp").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def state_manager(project_root: Path) -> StateManager:
+    return StateManager(project_root=project_root, platform="test", journal=True)
+
+
+async def _start(manager: StateManager) -> None:
+    await manager.create_session(
+        session_id=SESSION_ID,
+        job_name="test_job",
+        workflow_name="main",
+        goal="Journal",
+        first_step_id="step1",
+    )
+
+
+def _journal_lines(manager: StateManager) -> list[dict]:
+    path = journal_path(manager._state_file(SESSION_ID))
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestJournaledWrites:
+    """Tests for appending mutations instead of rewriting the snapshot."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.1, JOBS-REQ-003.19.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_mutations_append_records(self, state_manager: StateManager) -> None:
+        await _start(state_manager)
+        state_file = state_manager._state_file(SESSION_ID)
+        snapshot = state_file.read_text()
+        assert isinstance(json.loads(snapshot)["journal_generation"], str)
+
+        with state_manager.track_stats() as stats:
+            await state_manager.start_step(SESSION_ID, "step1")
+            await state_manager.complete_step(SESSION_ID, "step1", {"report": "report.md"})
+
+        assert stats.writes == 2
+        assert state_file.read_text() == snapshot
+        records = _journal_lines(state_manager)
+        assert len(records) == 2
+        assert all(r["keep"] == 0 and len(r["push"]) == 1 for r in records)
+        assert state_manager.resolve_session(SESSION_ID).step_progress["step1"].outputs == {
+            "report": "report.md"
+        }
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_completed_workflows_appended_not_rewritten(
+        self, state_manager: StateManager
+    ) -> None:
+        for _ in range(3):
+            await _start(state_manager)
+            await state_manager.complete_workflow(SESSION_ID)
+
+        # Each completion record carries only the newly completed workflow
+        completions = [r for r in _journal_lines(state_manager) if "completed" in r]
+        assert [len(r["completed"]) for r in completions] == [1, 1, 1]
+        stack, completed = state_manager.get_all_session_data(SESSION_ID)[None]
+        assert stack == []
+        assert len(completed) == 3
+
+
+class TestJournalReplay:
+    """Tests for reading journaled state."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_new_instances_replay_journal(
+        self, state_manager: StateManager, project_root: Path
+    ) -> None:
+        await _start(state_manager)
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+
+        for journal in (True, False):
+            other = StateManager(project_root=project_root, platform="test", journal=journal)
+            assert other.resolve_session(SESSION_ID).current_step_id == "step2"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_torn_tail_is_discarded(
+        self, state_manager: StateManager, project_root: Path
+    ) -> None:
+        await _start(state_manager)
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+        path = journal_path(state_manager._state_file(SESSION_ID))
+        with path.open("a") as f:
+            f.write('{"gen": "torn", "keep": 0, "pu')
+
+        other = StateManager(project_root=project_root, platform="test", journal=True)
+        assert other.resolve_session(SESSION_ID).current_step_id == "step2"
+
+        # The next append overwrites the torn record
+        await other.advance_to_step(SESSION_ID, "step3", 2)
+        assert len(_journal_lines(other)) == 2
+        assert other.resolve_session(SESSION_ID).current_step_id == "step3"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_records_from_other_generation_ignored(self, state_manager: StateManager) -> None:
+        """A journal left behind by an interrupted compaction is not replayed."""
+        await _start(state_manager)
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+        state_file = state_manager._state_file(SESSION_ID)
+        data = json.loads(state_file.read_text())
+        data["journal_generation"] = "newer"
+        state_file.write_text(json.dumps(data))
+
+        state = read_state_file(state_file)
+        assert state.journal_records == 0
+        assert state.data is not None
+        assert state.data["workflow_stack"][0]["current_step_id"] == "step1"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.3, JOBS-REQ-003.19.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_replay_appends_completed_and_stops_at_corrupt_line(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "state.json"
+        state_file.write_text(
+            json.dumps({"journal_generation": "g1", "workflow_stack": [{"a": 1}]})
+        )
+        journal_path(state_file).write_text(
+            json.dumps({"gen": "g1", "keep": 0, "push": [], "completed": [{"a": 1}]})
+            + "\n{corrupt\n"
+            + json.dumps({"gen": "g1", "keep": 0, "push": [{"b": 2}]})
+            + "\n"
+        )
+
+        state = read_state_file(state_file)
+
+        assert state.journal_records == 1
+        assert state.data is not None
+        assert state.data["workflow_stack"] == []
+        assert state.data["completed_workflows"] == [{"a": 1}]
+
+
+class TestBuildRecord:
+    """Tests for describing a state change as a journal record."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_keeps_common_prefix_and_new_completions_only(self) -> None:
+        old_stack = [{"id": "parent"}, {"id": "child", "step": 1}]
+        new_stack = [{"id": "parent"}, {"id": "child", "step": 2}]
+        done = [{"id": "earlier"}]
+
+        record = build_record("g", old_stack, new_stack, done, [*done, {"id": "new"}])
+        assert record == {
+            "gen": "g",
+            "keep": 1,
+            "push": [{"id": "child", "step": 2}],
+            "completed": [{"id": "new"}],
+        }
+        # An equal copy of the completed list adds nothing
+        assert "completed" not in (build_record("g", old_stack, new_stack, done, list(done)) or {})
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_removed_or_rewritten_completions_need_a_snapshot(self) -> None:
+        done = [{"id": "earlier"}]
+        assert build_record("g", [], [], done, None) is None
+        assert build_record("g", [], [], done, []) is None
+        assert build_record("g", [], [], done, [{"id": "rewritten"}]) is None
+
+
+class TestJournalCompaction:
+    """Tests for folding the journal into a new snapshot."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_compacts_after_max_records(
+        self, state_manager: StateManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(journal_module, "JOURNAL_MAX_RECORDS", 3)
+        await _start(state_manager)
+        state_file = state_manager._state_file(SESSION_ID)
+        generation = json.loads(state_file.read_text())["journal_generation"]
+
+        for _ in range(3):
+            await state_manager.record_quality_attempt(SESSION_ID, "step1")
+        assert len(_journal_lines(state_manager)) == 3
+
+        assert await state_manager.record_quality_attempt(SESSION_ID, "step1") == 4
+        assert not journal_path(state_file).exists()
+        data = json.loads(state_file.read_text())
+        assert data["journal_generation"] != generation
+        assert data["workflow_stack"][0]["step_progress"]["step1"]["quality_attempts"] == 4
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.19.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_unjournaled_write_removes_journal(
+        self, state_manager: StateManager, project_root: Path
+    ) -> None:
+        await _start(state_manager)
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+        state_file = state_manager._state_file(SESSION_ID)
+
+        plain = StateManager(project_root=project_root, platform="test")
+        await plain.advance_to_step(SESSION_ID, "step3", 2)
+
+        assert not journal_path(state_file).exists()
+        assert "journal_generation" not in json.loads(state_file.read_text())
+        assert state_manager.resolve_session(SESSION_ID).current_step_id == "step3"
@@ -0,0 +1,214 @@
+"""Tests for per-root component bundles.
+
+Validates requirements: JOBS-REQ-011.6.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from deepwork.jobs.issues import Issue
+from deepwork.jobs.mcp.blocking import BlockingExecutor
+from deepwork.jobs.mcp.pool import RootBundle, RootPool
+from deepwork.jobs.mcp.roots import RootResolver
+from deepwork.jobs.mcp.server import create_server
+
+JOB_YAML = """\
+name: my_plan
+summary: "A test plan job"
+
+step_arguments:
+  - name: result
+    description: "The result"
+    type: string
+
+workflows:
+  main:
+    summary: "Execute the plan"
+    steps:
+      - name: do_work
+        instructions: |
+          Do the work.
+        outputs:
+          result:
+            required: true
+"""
+
+
+def _bundle(root: Path) -> RootBundle:
+    status_writer = MagicMock()
+    status_writer.flush = AsyncMock()
+    return RootBundle(root, MagicMock(), status_writer, MagicMock(), MagicMock())
+
+
+class TestRootPool:
+    """Tests for bundle creation, reuse and eviction."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.6.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_one_bundle_per_root(self) -> None:
+        factory = MagicMock(side_effect=_bundle)
+        pool = RootPool(factory)
+
+        first = pool.get(Path("/a"))
+        assert pool.get(Path("/a")) is first
+        assert pool.get(Path("/b")) is not first
+        assert factory.call_count == 2
+        assert pool.stats.created == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.6.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_evicts_least_recently_used_and_flushes(self) -> None:
+        pool = RootPool(_bundle, max_size=2, idle_timeout=None)
+        a = pool.get(Path("/a"))
+        pool.get(Path("/b"))
+        pool.get(Path("/a"))
+        pool.get(Path("/c"))
+
+        assert Path("/b") not in pool
+        assert Path("/a") in pool
+        assert pool.stats.evicted == 1
+
+        await pool.close()
+        a.status_writer.flush.assert_awaited()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.6.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_never_evicts_leased_or_pinned_bundles(self) -> None:
+        pool = RootPool(_bundle, max_size=1, idle_timeout=None, pinned=Path("/startup"))
+        pool.get(Path("/startup"))
+        async with pool.lease(Path("/a")) as held:
+            pool.get(Path("/b"))
+            assert Path("/a") in pool
+            assert Path("/startup") in pool
+        assert held.in_use == 0
+
+        # Once released, /a is the least recently used evictable bundle
+        pool.get(Path("/b"))
+        assert Path("/a") not in pool
+        assert Path("/startup") in pool
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.6.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_lease_builds_once_off_the_loop(self) -> None:
+        threads = []
+
+        def slow_bundle(root: Path) -> RootBundle:
+            threads.append(threading.current_thread())
+            time.sleep(0.05)
+            return _bundle(root)
+
+        blocking = BlockingExecutor(max_workers=2)
+        pool = RootPool(slow_bundle, blocking=blocking)
+
+        async def call() -> RootBundle:
+            async with pool.lease(Path("/a")) as bundle:
+                return bundle
+
+        try:
+            bundles = await asyncio.gather(*(call() for _ in range(5)))
+        finally:
+            blocking.shutdown()
+
+        assert len(threads) == 1
+        assert threads[0].name.startswith("deepwork-blocking")
+        assert all(bundle is bundles[0] for bundle in bundles)
+        assert pool.stats.created == 1
+        assert pool.stats.leases == 5
+
+    async def test_failed_build_is_retried(self) -> None:
+        factory = MagicMock(side_effect=[OSError("unreadable"), _bundle(Path("/a"))])
+        pool = RootPool(factory)
+
+        with pytest.raises(OSError, match="unreadable"):
+            async with pool.lease(Path("/a")):
+                pass
+        assert Path("/a") not in pool
+
+        async with pool.lease(Path("/a")) as bundle:
+            assert bundle.root == Path("/a")
+        await pool.close()
+
+    async def test_sync_get_during_lease_build_wins(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_bundle(root: Path) -> RootBundle:
+            started.set()
+            release.wait(5)
+            return _bundle(root)
+
+        pool = RootPool(slow_bundle)
+
+        async def call() -> RootBundle:
+            async with pool.lease(Path("/a")) as bundle:
+                return bundle
+
+        leased = asyncio.ensure_future(call())
+        await asyncio.to_thread(started.wait, 5)
+        pool.factory = _bundle
+        startup = pool.get(Path("/a"))
+        release.set()
+
+        assert await leased is startup
+        assert pool.stats.created == 1
+
+    def test_idle_bundles_evicted(self) -> None:
+        pool = RootPool(_bundle, idle_timeout=60)
+        pool.get(Path("/a")).last_used = time.monotonic() - 61
+        pool.get(Path("/b"))
+
+        assert Path("/a") not in pool
+        assert len(pool) == 1
+
+
+class TestServerRoutesRoots:
+    """Tests that tool calls use the components of their own root."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.6.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_session_state_follows_resolved_root(self, tmp_path: Path) -> None:
+        startup, worktree = tmp_path / "main", tmp_path / "worktree"
+        startup.mkdir()
+        worktree.mkdir()
+        mcp = create_server(startup, explicit_path=False, loop_lag_threshold=None)
+
+        with patch.object(RootResolver, "get_root", AsyncMock(return_value=worktree)):
+            await mcp.call_tool(
+                "register_session_job",
+                {"job_name": "my_plan", "job_definition_yaml": JOB_YAML, "session_id": "s1"},
+            )
+
+        relative = Path(".deepwork/tmp/sessions/claude/session-s1/jobs/my_plan/job.yml")
+        assert (worktree / relative).exists()
+        assert not (startup / relative).exists()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.6.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_issues_follow_resolved_root(self, tmp_path: Path) -> None:
+        startup, worktree = tmp_path / "main", tmp_path / "worktree"
+        startup.mkdir()
+        worktree.mkdir()
+        issue = Issue(
+            severity="error", job_name="broken", job_dir="/x", message="bad", suggestion="fix"
+        )
+
+        def detect(root: Path, _registry: object) -> list[Issue]:
+            return [issue] if root == worktree else []
+
+        with patch("deepwork.jobs.mcp.server.detect_issues", side_effect=detect):
+            mcp = create_server(startup, explicit_path=False, loop_lag_threshold=None)
+            responses = {}
+            for root in (startup, worktree):
+                with patch.object(RootResolver, "get_root", AsyncMock(return_value=root)):
+                    result = await mcp.call_tool("get_workflows", {})
+                responses[root] = result.structured_content
+
+        assert "issue_detected" not in responses[startup]
+        assert "broken" in responses[worktree]["issue_detected"]
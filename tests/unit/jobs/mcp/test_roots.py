@@ -1,17 +1,20 @@
 """Tests for JOBS-REQ-011: MCP root resolution via listRoots.
 
 Validates requirements: JOBS-REQ-011, JOBS-REQ-011.1, JOBS-REQ-011.2, JOBS-REQ-011.3,
-JOBS-REQ-011.4.
+JOBS-REQ-011.4, JOBS-REQ-011.5.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
 import pytest
+from fastmcp.server.middleware import MiddlewareContext
+from mcp.types import ClientCapabilities
 
-from deepwork.jobs.mcp.roots import RootResolver, resolve_project_root
+from deepwork.jobs.mcp.roots import ROOTS_LIST_CHANGED, RootResolver, resolve_project_root
+from deepwork.jobs.mcp.server import _RootsChangedMiddleware
 
 
 def _make_root(uri: str) -> MagicMock:
@@ -157,3 +160,185 @@ async def test_dynamic_falls_back_on_error() -> None:
     ctx = _make_ctx(RuntimeError("disconnected"))
     result = await resolver.get_root(ctx)
     assert result == FALLBACK
+
+
+# ---------------------------------------------------------------------------
+# RootResolver — per-session cache (JOBS-REQ-011.5)
+# ---------------------------------------------------------------------------
+
+
+def _make_session(list_changed: bool = True) -> MagicMock:
+    """Create a mock client session declaring (or not) roots.listChanged."""
+    session = MagicMock()
+    session.client_params.capabilities = ClientCapabilities.model_validate(
+        {"roots": {"listChanged": list_changed}}
+    )
+    return session
+
+
+def _make_session_ctx(session: MagicMock, *uris: str) -> MagicMock:
+    """Create a mock Context whose list_roots returns one root per call."""
+    ctx = MagicMock()
+    ctx.session = session
+    ctx.list_roots = AsyncMock(side_effect=[[_make_root(uri)] for uri in uris])
+    return ctx
+
+
+@pytest.mark.asyncio
+async def test_cached_until_list_changed() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.5.1, JOBS-REQ-011.5.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False)
+    session = _make_session()
+    ctx = _make_session_ctx(session, "file:///main", "file:///worktree")
+
+    assert await resolver.get_root(ctx) == Path("/main")
+    assert await resolver.get_root(ctx) == Path("/main")
+    assert ctx.list_roots.await_count == 1
+
+    # Worktree switch: the client notifies, the next call refreshes
+    resolver.invalidate(session)
+    assert await resolver.get_root(ctx) == Path("/worktree")
+    assert ctx.list_roots.await_count == 2
+
+    assert resolver.stats.lookups == 3
+    assert resolver.stats.cache_hits == 1
+    assert resolver.stats.list_roots_calls == 2
+    assert resolver.stats.invalidations == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_is_per_session() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.5.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False)
+    first = _make_session_ctx(_make_session(), "file:///first")
+    second = _make_session_ctx(_make_session(), "file:///second", "file:///second-moved")
+
+    assert await resolver.get_root(first) == Path("/first")
+    assert await resolver.get_root(second) == Path("/second")
+
+    resolver.invalidate(second.session)
+    assert await resolver.get_root(first) == Path("/first")
+    assert await resolver.get_root(second) == Path("/second-moved")
+    assert first.list_roots.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_expires_cached_root() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.5.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False, ttl=5.0)
+    ctx = _make_session_ctx(_make_session(list_changed=False), "file:///first", "file:///second")
+
+    with patch("deepwork.jobs.mcp.roots.time.monotonic", return_value=100.0):
+        assert await resolver.get_root(ctx) == Path("/first")
+    with patch("deepwork.jobs.mcp.roots.time.monotonic", return_value=104.0):
+        assert await resolver.get_root(ctx) == Path("/first")
+    with patch("deepwork.jobs.mcp.roots.time.monotonic", return_value=105.0):
+        assert await resolver.get_root(ctx) == Path("/second")
+    assert ctx.list_roots.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_no_cache_without_list_changed_or_ttl() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.1.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False)
+    ctx = _make_session_ctx(_make_session(list_changed=False), "file:///first", "file:///second")
+
+    assert await resolver.get_root(ctx) == Path("/first")
+    assert await resolver.get_root(ctx) == Path("/second")
+    assert resolver.stats.cache_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_no_cache_without_client_session() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.1.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False, ttl=60.0)
+    ctx = _make_session_ctx(MagicMock(), "file:///first", "file:///second")
+    # Outside a request the context has no session
+    type(ctx).session = PropertyMock(side_effect=RuntimeError("no request"))
+
+    assert await resolver.get_root(ctx) == Path("/first")
+    assert await resolver.get_root(ctx) == Path("/second")
+    assert resolver.stats.cache_hits == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_params", ["missing", "raises"])
+async def test_no_cache_without_client_capabilities(client_params: str) -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.1.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False)
+    session = MagicMock()
+    if client_params == "missing":
+        session.client_params = None
+    else:
+        type(session).client_params = PropertyMock(side_effect=RuntimeError("not initialized"))
+    ctx = _make_session_ctx(session, "file:///first", "file:///second")
+
+    assert await resolver.get_root(ctx) == Path("/first")
+    assert await resolver.get_root(ctx) == Path("/second")
+    assert resolver.stats.cache_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_list_roots_not_cached() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.5.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False)
+    ctx = MagicMock()
+    ctx.session = _make_session()
+    ctx.list_roots = AsyncMock(side_effect=[RuntimeError("timeout"), [_make_root("file:///ok")]])
+
+    assert await resolver.get_root(ctx) == FALLBACK
+    assert await resolver.get_root(ctx) == Path("/ok")
+
+
+@pytest.mark.asyncio
+async def test_reply_in_flight_during_invalidation_not_cached() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.5.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False)
+    session = _make_session()
+    replies = iter([[_make_root("file:///stale")], [_make_root("file:///fresh")]])
+
+    async def list_roots() -> list[MagicMock]:
+        reply = next(replies)
+        resolver.invalidate(session)  # notification arrives while the reply is in flight
+        return reply
+
+    ctx = MagicMock()
+    ctx.session = session
+    ctx.list_roots = list_roots
+
+    assert await resolver.get_root(ctx) == Path("/stale")
+    assert await resolver.get_root(ctx) == Path("/fresh")
+
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_invalidates_session() -> None:
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-011.5.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    resolver = RootResolver(fallback_root=FALLBACK, explicit=False)
+    ctx = _make_session_ctx(_make_session(), "file:///first", "file:///second")
+    await resolver.get_root(ctx)
+
+    call_next = AsyncMock(return_value=None)
+    middleware = _RootsChangedMiddleware(resolver)
+    await middleware.on_notification(
+        MiddlewareContext(
+            message=MagicMock(), fastmcp_context=ctx, method="notifications/progress"
+        ),
+        call_next,
+    )
+    assert await resolver.get_root(ctx) == Path("/first")
+
+    await middleware.on_notification(
+        MiddlewareContext(message=MagicMock(), fastmcp_context=ctx, method=ROOTS_LIST_CHANGED),
+        call_next,
+    )
+    assert await resolver.get_root(ctx) == Path("/second")
+    assert call_next.await_count == 2
@@ -0,0 +1,228 @@
+"""Tests for multi-client call scheduling, project concurrency and /health.
+
+Validates requirements: JOBS-REQ-001.14.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import signal
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastmcp.exceptions import ToolError
+from starlette.testclient import TestClient
+
+from deepwork.jobs.mcp.pool import RootBundle, RootPool
+from deepwork.jobs.mcp.scheduling import (
+    CallScheduler,
+    DrainOnSignal,
+    ServerDrainingError,
+    session_call_key,
+)
+from deepwork.jobs.mcp.server import create_server
+
+
+def _bundle(root: Path) -> RootBundle:
+    status_writer = MagicMock()
+    status_writer.flush = AsyncMock()
+    return RootBundle(root, MagicMock(), status_writer, MagicMock(), MagicMock())
+
+
+async def _record(
+    scheduler: CallScheduler, key: object, name: str, log: list[str], gate: asyncio.Event
+) -> None:
+    async with scheduler.slot(key):
+        log.append(f"start {name}")
+        await gate.wait()
+        log.append(f"end {name}")
+
+
+class TestSessionOrdering:
+    """Tests for per-session call queues."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.14.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_calls_of_one_session_run_in_arrival_order(self) -> None:
+        scheduler = CallScheduler()
+        log: list[str] = []
+        gate = asyncio.Event()
+        key = session_call_key({"session_id": "s1"})
+        tasks = [
+            asyncio.create_task(_record(scheduler, key, name, log, gate))
+            for name in ("first", "second", "third")
+        ]
+        await asyncio.sleep(0.01)
+        assert log == ["start first"]
+        assert scheduler.queued == 2
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert log == [
+            "start first",
+            "end first",
+            "start second",
+            "end second",
+            "start third",
+            "end third",
+        ]
+        assert scheduler.snapshot()["active_sessions"] == 0
+        assert scheduler.completed == 3
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.14.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_other_sessions_and_unkeyed_calls_run_concurrently(self) -> None:
+        scheduler = CallScheduler()
+        log: list[str] = []
+        gate = asyncio.Event()
+        keys = [
+            session_call_key({"session_id": "s1"}),
+            session_call_key({"session_id": "s1", "agent_id": "sub"}),
+            session_call_key({"session_id": "s2"}),
+            session_call_key({"files": ["a.py"]}),
+        ]
+        tasks = [
+            asyncio.create_task(_record(scheduler, key, str(i), log, gate))
+            for i, key in enumerate(keys)
+        ]
+        await asyncio.sleep(0.01)
+        assert sorted(log) == ["start 0", "start 1", "start 2", "start 3"]
+        assert scheduler.in_flight == 4
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert scheduler.in_flight == 0
+
+    def test_session_call_key(self) -> None:
+        assert session_call_key(None) is None
+        assert session_call_key({"session_id": ""}) is None
+        assert session_call_key({"session_id": "s", "agent_id": "a"}) == ("s", "a")
+
+    async def test_failed_calls_counted(self) -> None:
+        scheduler = CallScheduler()
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot(("s1", None)):
+                raise RuntimeError("boom")
+        assert scheduler.failed == 1
+        assert scheduler.snapshot()["active_sessions"] == 0
+
+
+class TestDraining:
+    """Tests for graceful shutdown."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.14.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_drain_waits_for_in_flight_and_rejects_new_calls(self) -> None:
+        scheduler = CallScheduler()
+        gate = asyncio.Event()
+        running = asyncio.create_task(_record(scheduler, None, "slow", [], gate))
+        await asyncio.sleep(0.01)
+
+        drain = asyncio.create_task(scheduler.drain(timeout=5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ServerDrainingError):
+            async with scheduler.slot(None):
+                pass
+        assert not drain.done()
+
+        gate.set()
+        assert await drain is True
+        await running
+        assert scheduler.rejected == 1
+
+    async def test_drain_times_out(self) -> None:
+        scheduler = CallScheduler()
+        gate = asyncio.Event()
+        running = asyncio.create_task(_record(scheduler, None, "stuck", [], gate))
+        await asyncio.sleep(0.01)
+
+        assert await scheduler.drain(timeout=0.05) is False
+        gate.set()
+        await running
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.14.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_server_refuses_calls_while_draining(self, tmp_path: Path) -> None:
+        mcp = create_server(tmp_path, loop_lag_threshold=None, drain_timeout=0)
+        # Starting and stopping the HTTP app runs the server's shutdown
+        with TestClient(mcp.http_app(transport="http")):
+            pass
+
+        with pytest.raises(ToolError, match="shutting down"):
+            await mcp.call_tool("get_workflows", {})
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.14.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_shutdown_signal_starts_draining(self, tmp_path: Path) -> None:
+        scheduler = CallScheduler()
+        mcp = create_server(tmp_path, loop_lag_threshold=None, scheduler=scheduler)
+        app = AsyncMock()
+        received: list[int] = []
+        original = signal.signal(signal.SIGTERM, lambda sig, _frame: received.append(sig))
+        try:
+            # uvicorn installs its handlers before starting the lifespan
+            await DrainOnSignal(app, scheduler)({"type": "lifespan"}, AsyncMock(), AsyncMock())
+            app.assert_awaited_once()
+            assert not scheduler.draining
+
+            handler = signal.getsignal(signal.SIGTERM)
+            assert callable(handler)
+            handler(signal.SIGTERM, None)
+        finally:
+            signal.signal(signal.SIGTERM, original)
+
+        assert scheduler.draining
+        assert received == [signal.SIGTERM]
+        with pytest.raises(ToolError, match="shutting down"):
+            await mcp.call_tool("get_workflows", {})
+
+
+class TestProjectConcurrency:
+    """Tests for the per-project bound on concurrent calls."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.14.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_calls_beyond_limit_wait_for_a_slot(self) -> None:
+        pool = RootPool(_bundle, max_concurrent=1)
+        release = asyncio.Event()
+        entered: list[Path] = []
+
+        async def call(root: Path) -> None:
+            async with pool.lease(root):
+                entered.append(root)
+                await release.wait()
+
+        tasks = [
+            asyncio.create_task(call(Path("/a"))),
+            asyncio.create_task(call(Path("/a"))),
+            asyncio.create_task(call(Path("/b"))),
+        ]
+        await asyncio.sleep(0.01)
+        # The second /a call waits; /b has its own slots
+        assert entered == [Path("/a"), Path("/b")]
+        assert pool.stats.throttled == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert entered.count(Path("/a")) == 2
+
+
+class TestHealthEndpoint:
+    """Tests for the /health route of the HTTP transports."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.14.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_reports_calls_roots_and_caches(self, tmp_path: Path) -> None:
+        app = create_server(tmp_path).http_app(transport="http")
+        with TestClient(app) as client:
+            response = client.get("/health")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ok"
+        assert body["calls"]["in_flight"] == 0
+        assert [r["root"] for r in body["roots"]] == [str(tmp_path.resolve())]
+        assert body["pool"]["created"] == 1
+        assert "cache_hits" in body["root_cache"]
+        assert body["event_loop"]["stalls"] == 0
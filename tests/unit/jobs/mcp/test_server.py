@@ -706,3 +706,25 @@ class TestReviewTools:
         data = result.structured_content["result"]
         assert "Validation error" in data
         assert "Invalid review_id" in data
+
+    async def test_mark_review_as_passed_ledger_error(self, tmp_path: Path) -> None:
+        """mark_review_as_passed reports ledger write failures instead of raising."""
+        from deepwork.review.ledger import LedgerError
+
+        mock_tools = MagicMock()
+        mock_tools._write_manifest = MagicMock()
+
+        with (
+            patch("deepwork.jobs.mcp.server.WorkflowTools", return_value=mock_tools),
+            patch("deepwork.jobs.mcp.server.detect_issues", return_value=[]),
+            patch(
+                "deepwork.review.mcp.mark_passed",
+                side_effect=LedgerError("database is locked"),
+            ),
+        ):
+            mcp = create_server(project_root=tmp_path)
+            result = await mcp.call_tool("mark_review_as_passed", {"review_id": "abc123"})
+
+        assert result.structured_content is not None
+        data = result.structured_content["result"]
+        assert "database is locked" in data
@@ -0,0 +1,172 @@
+"""Tests for the active-session index.
+
+Validates requirements: JOBS-REQ-003.21.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from deepwork.jobs.mcp.session_index import (
+    index_path,
+    read_index,
+    rebuild_index,
+    sessions_root,
+)
+from deepwork.jobs.mcp.state import StateManager
+
+SESSION_ID = "index-session"
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / ".deepwork" / "tmp").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def state_manager(project_root: Path) -> StateManager:
+    return StateManager(project_root=project_root, platform="test")
+
+
+async def _start(manager: StateManager, agent_id: str | None = None) -> None:
+    await manager.create_session(
+        session_id=SESSION_ID,
+        job_name="test_job",
+        workflow_name="main",
+        goal="Index",
+        first_step_id="step1",
+        agent_id=agent_id,
+    )
+
+
+def _entries(project_root: Path) -> list[dict]:
+    entries = read_index(index_path(project_root))
+    assert entries is not None
+    return entries
+
+
+class TestIndexMaintenance:
+    """Tests for keeping the index in sync with state writes."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.21.1, JOBS-REQ-003.21.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_push_advance_pop(self, state_manager: StateManager, project_root: Path) -> None:
+        await _start(state_manager)
+        [entry] = _entries(project_root)
+        assert entry["session_id"] == SESSION_ID
+        assert entry["agent_id"] is None
+        assert entry["platform"] == "test"
+        assert entry["job_name"] == "test_job"
+        assert entry["workflow_name"] == "main"
+        assert entry["current_step_id"] == "step1"
+        assert entry["state_file"] == f"test/session-{SESSION_ID}/state.json"
+
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+        assert [e["current_step_id"] for e in _entries(project_root)] == ["step2"]
+
+        await state_manager.complete_workflow(SESSION_ID)
+        assert _entries(project_root) == []
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.21.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_agent_stacks_indexed(
+        self, state_manager: StateManager, project_root: Path
+    ) -> None:
+        await _start(state_manager)
+        await _start(state_manager, agent_id="agent-a")
+
+        entries = _entries(project_root)
+        assert sorted((e["agent_id"] or "") for e in entries) == ["", "agent-a"]
+        agent_entry = next(e for e in entries if e["agent_id"] == "agent-a")
+        assert agent_entry["state_file"] == f"test/session-{SESSION_ID}/agent_agent-a.json"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.21.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_unchanged_stack_shape_skips_index(
+        self, state_manager: StateManager, project_root: Path
+    ) -> None:
+        await _start(state_manager)
+        before = index_path(project_root).stat()
+
+        await state_manager.start_step(SESSION_ID, "step1")
+        await state_manager.record_quality_attempt(SESSION_ID, "step1")
+        await state_manager.complete_step(SESSION_ID, "step1", {"out": "out.md"})
+
+        after = index_path(project_root).stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+
+class TestIndexRepair:
+    """Tests for rebuilding the index from a full scan."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.21.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_missing_index_rebuilt_on_next_write(
+        self, state_manager: StateManager, project_root: Path
+    ) -> None:
+        await _start(state_manager)
+        await _start(state_manager, agent_id="agent-a")
+        index_path(project_root).unlink()
+
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+
+        entries = _entries(project_root)
+        assert len(entries) == 2
+        main_entry = next(e for e in entries if e["agent_id"] is None)
+        assert main_entry["current_step_id"] == "step2"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.21.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_rebuild_repairs_stale_index(
+        self, state_manager: StateManager, project_root: Path
+    ) -> None:
+        await _start(state_manager)
+        # Simulate a crash between the state write and the index update
+        index_path(project_root).write_text(json.dumps({"version": 1, "sessions": []}))
+
+        entries = rebuild_index(project_root)
+
+        assert [e["session_id"] for e in entries] == [SESSION_ID]
+        assert _entries(project_root) == entries
+
+    def test_rebuild_without_sessions(self, project_root: Path) -> None:
+        assert rebuild_index(project_root) == []
+        assert _entries(project_root) == []
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.21.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "{not json",
+            json.dumps({"version": 99, "sessions": []}),
+            json.dumps([{"version": 1}]),
+            json.dumps({"version": 1, "sessions": "none"}),
+        ],
+    )
+    async def test_unusable_index_rebuilt_on_next_write(
+        self, state_manager: StateManager, project_root: Path, content: str
+    ) -> None:
+        await _start(state_manager)
+        index_path(project_root).write_text(content)
+        assert read_index(index_path(project_root)) is None
+
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+
+        [entry] = _entries(project_root)
+        assert entry["current_step_id"] == "step2"
+
+    def test_rebuild_skips_unusable_state_files(self, project_root: Path) -> None:
+        session_dir = sessions_root(project_root) / "test" / f"session-{SESSION_ID}"
+        session_dir.mkdir(parents=True)
+        (session_dir / "notes.json").write_text("{}")
+        (session_dir / "state.json").write_text("{torn")
+        (session_dir / "agent_a.json").write_text(json.dumps({"workflow_stack": "oops"}))
+        (session_dir / "agent_b.json").mkdir()
+        finished = {"status": "completed", "job_name": "test_job"}
+        (session_dir / "agent_c.json").write_text(json.dumps({"workflow_stack": [finished, 7]}))
+
+        assert rebuild_index(project_root) == []
+        assert read_index(index_path(project_root)) == []
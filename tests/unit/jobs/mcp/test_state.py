@@ -6,11 +6,15 @@ JOBS-REQ-003.9, JOBS-REQ-003.10, JOBS-REQ-003.11, JOBS-REQ-003.12, JOBS-REQ-003.
 JOBS-REQ-003.14, JOBS-REQ-003.15, JOBS-REQ-003.16, JOBS-REQ-003.17.
 """
 
+import asyncio
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
+from deepwork.jobs.mcp import state as state_module
 from deepwork.jobs.mcp.state import StateError, StateManager
 
 SESSION_ID = "test-session-001"
@@ -751,10 +755,10 @@ class TestCrashResilience:
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.4.6, JOBS-REQ-003.17.1).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    async def test_no_in_memory_caching(
+    async def test_cache_sees_writes_from_other_instances(
         self, state_manager: StateManager, project_root: Path
     ) -> None:
-        """Each operation reads from disk — no stale in-memory state."""
+        """Cached state is re-validated on access — no stale in-memory state."""
         await state_manager.create_session(
             session_id=SESSION_ID,
             job_name="test_job",
@@ -1222,3 +1226,257 @@ class TestSubWorkflowInstanceIds:
             child.workflow_instance_id
             in parent_data["step_history"][-1]["sub_workflow_instance_ids"]
         )
+
+
+class TestStateCache:
+    """Tests for the write-through decoded-state cache."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.4.6, JOBS-REQ-003.4.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_reads_after_write_come_from_memory(self, state_manager: StateManager) -> None:
+        """Reads of a file this manager just wrote do not touch the disk."""
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Cache",
+            first_step_id="step1",
+        )
+
+        with state_manager.track_stats() as stats:
+            state_manager.resolve_session(SESSION_ID)
+            state_manager.get_stack(SESSION_ID)
+            state_manager.get_all_outputs(SESSION_ID)
+            await state_manager.start_step(SESSION_ID, "step1")
+            state_manager.get_step_input_values(SESSION_ID, "step1")
+
+        # start_step reads the stack, then re-reads completed_workflows to preserve them
+        assert stats.misses == 0
+        assert stats.hits == 6
+        assert stats.writes == 1
+        assert state_manager.stats.writes == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.4.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_external_rewrite_invalidates_cache(self, state_manager: StateManager) -> None:
+        """An edit to the state file made outside the manager is picked up."""
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Cache",
+            first_step_id="step1",
+        )
+        state_file = state_manager._state_file(SESSION_ID)
+        data = json.loads(state_file.read_text(encoding="utf-8"))
+        data["workflow_stack"][0]["current_step_id"] = "edited_step"
+        state_file.write_text(json.dumps(data), encoding="utf-8")
+
+        with state_manager.track_stats() as stats:
+            session = state_manager.resolve_session(SESSION_ID)
+
+        assert session.current_step_id == "edited_step"
+        assert stats.misses == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.4.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_deleted_file_is_not_served_from_cache(self, state_manager: StateManager) -> None:
+        """Removing the state file drops the cached entry."""
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Cache",
+            first_step_id="step1",
+        )
+        state_manager._state_file(SESSION_ID).unlink()
+
+        with pytest.raises(StateError, match="No active workflow session"):
+            state_manager.resolve_session(SESSION_ID)
+        assert state_manager.get_stack(SESSION_ID) == []
+
+    async def test_returned_sessions_do_not_alias_cache(self, state_manager: StateManager) -> None:
+        """Mutating a returned session does not change cached state."""
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Cache",
+            first_step_id="step1",
+        )
+
+        session = state_manager.resolve_session(SESSION_ID)
+        session.current_step_id = "mutated"
+
+        assert state_manager.resolve_session(SESSION_ID).current_step_id == "step1"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.4.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_call_stats_isolated_between_tasks(self, state_manager: StateManager) -> None:
+        """Concurrent tasks each see only their own counters."""
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Cache",
+            first_step_id="step1",
+        )
+
+        async def read_n(n: int) -> int:
+            with state_manager.track_stats() as stats:
+                for _ in range(n):
+                    state_manager.get_stack(SESSION_ID)
+                    await asyncio.sleep(0)
+            return stats.hits
+
+        assert await asyncio.gather(read_n(2), read_n(5)) == [2, 5]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.15.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_concurrent_thread_reads_and_evictions(
+        self, state_manager: StateManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Reads from many threads keep the cache and counters consistent."""
+        session_ids = [f"thread-{i}" for i in range(6)]
+        for sid in session_ids:
+            await state_manager.create_session(sid, "test_job", "main", "Cache", "step1")
+        # A tiny cache makes every thread evict entries the others are using
+        monkeypatch.setattr(state_module, "_MAX_CACHED_FILES", 2)
+        reads_per_thread = 100
+        before = state_manager.stats.hits + state_manager.stats.misses
+
+        def read_all() -> None:
+            for i in range(reads_per_thread):
+                state_manager.get_stack(session_ids[i % len(session_ids)])
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for future in [pool.submit(read_all) for _ in range(8)]:
+                future.result()
+
+        after = state_manager.stats.hits + state_manager.stats.misses
+        assert after - before == 8 * reads_per_thread
+
+        # Cache and counter updates wait for the lock held by another thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with state_manager._mutex:
+                future = pool.submit(state_manager.get_stack, session_ids[0])
+                time.sleep(0.05)
+                assert not future.done()
+            assert len(future.result()) == 1
+
+
+class TestTransaction:
+    """Tests for StateManager.transaction()."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.18.2, JOBS-REQ-003.18.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_batch_committed_with_one_write(self, state_manager: StateManager) -> None:
+        """Several mutations in one transaction produce a single write."""
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Txn",
+            first_step_id="step1",
+        )
+        await state_manager.start_step(SESSION_ID, "step1")
+
+        with state_manager.track_stats() as stats:
+            async with state_manager.transaction(SESSION_ID) as txn:
+                txn.complete_step("step1", {"report": "report.md"})
+                txn.advance_to_step("step2", 1)
+                assert txn.get_all_outputs() == {"report": "report.md"}
+                txn.start_step("step2", input_values={"report": "report.md"})
+
+        assert stats.writes == 1
+        manager2 = StateManager(project_root=state_manager.project_root, platform="test")
+        session = manager2.resolve_session(SESSION_ID)
+        assert session.current_step_id == "step2"
+        assert session.current_step_index == 1
+        assert session.step_progress["step1"].completed_at is not None
+        assert session.step_progress["step2"].input_values == {"report": "report.md"}
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.18.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_exception_discards_changes(self, state_manager: StateManager) -> None:
+        """Nothing is written if the transaction block raises."""
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Txn",
+            first_step_id="step1",
+        )
+
+        with pytest.raises(RuntimeError):
+            async with state_manager.transaction(SESSION_ID) as txn:
+                txn.complete_step("step1", {"report": "report.md"})
+                txn.advance_to_step("step2", 1)
+                raise RuntimeError("crash between mutations")
+
+        session = state_manager.resolve_session(SESSION_ID)
+        assert session.current_step_id == "step1"
+        assert "step1" not in session.step_progress
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.18.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_read_only_transaction_does_not_write(self, state_manager: StateManager) -> None:
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Txn",
+            first_step_id="step1",
+        )
+
+        with state_manager.track_stats() as stats:
+            async with state_manager.transaction(SESSION_ID) as txn:
+                txn.get_all_outputs()
+
+        assert stats.writes == 0
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.13.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_step_outputs_keyed_by_step(self, state_manager: StateManager) -> None:
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Txn",
+            first_step_id="step1",
+        )
+
+        async with state_manager.transaction(SESSION_ID) as txn:
+            txn.complete_step("step1", {"report": "report.md"})
+            txn.advance_to_step("step2", 1)
+            txn.complete_step("step2", {"report": "final.md", "notes": "n.md"})
+            assert txn.get_step_outputs() == {
+                "step1": {"report": "report.md"},
+                "step2": {"report": "final.md", "notes": "n.md"},
+            }
+            txn.complete_workflow()
+            with pytest.raises(StateError, match="No active workflow session"):
+                txn.get_step_outputs()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-003.18.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_empty_stack_raises(self, state_manager: StateManager) -> None:
+        with pytest.raises(StateError, match="No active workflow session"):
+            async with state_manager.transaction(SESSION_ID) as txn:
+                txn.start_step("step1")
+
+        assert not state_manager._state_file(SESSION_ID).exists()
+
+    async def test_create_and_complete_in_one_transaction(
+        self, state_manager: StateManager
+    ) -> None:
+        """A workflow retired inside a transaction lands in completed_workflows."""
+        async with state_manager.transaction(SESSION_ID) as txn:
+            txn.create_session("test_job", "main", "Txn", "step1")
+            txn.start_step("step1")
+            txn.complete_step("step1", {"report": "report.md"})
+            assert txn.complete_workflow() is None
+
+        stack, completed = state_manager.get_all_session_data(SESSION_ID)[None]
+        assert stack == []
+        assert [s.status for s in completed] == ["completed"]
@@ -2,11 +2,13 @@
 
 Validates requirements: JOBS-REQ-010, JOBS-REQ-010.1, JOBS-REQ-010.2, JOBS-REQ-010.3,
 JOBS-REQ-010.4, JOBS-REQ-010.5, JOBS-REQ-010.6, JOBS-REQ-010.7, JOBS-REQ-010.8,
-JOBS-REQ-010.9, JOBS-REQ-010.10, JOBS-REQ-010.11, JOBS-REQ-010.12, JOBS-REQ-010.13.
+JOBS-REQ-010.9, JOBS-REQ-010.10, JOBS-REQ-010.11, JOBS-REQ-010.12, JOBS-REQ-010.13,
+JOBS-REQ-010.14.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 from collections.abc import Callable
 from pathlib import Path
@@ -276,6 +278,21 @@ class TestWriteSessionStatus:
         assert len(data["workflows"]) == 1
         assert data["workflows"][0]["status"] == "completed"
 
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.5.4, JOBS-REQ-010.11.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_archived_workflows_included(
+        self, status_writer: StatusWriter, project_root: Path
+    ) -> None:
+        state_manager = StateManager(project_root, platform="test", hot_completed_limit=1)
+        for _ in range(3):
+            await state_manager.create_session(SESSION_ID, "test_job", "main", "Goal", "step1")
+            await state_manager.complete_workflow(SESSION_ID)
+
+        status_writer.write_session_status(SESSION_ID, state_manager, self._job_loader())
+
+        data = yaml.safe_load((status_writer.sessions_dir / f"{SESSION_ID}.yml").read_text())
+        assert [wf["status"] for wf in data["workflows"]] == ["completed"] * 3
+
     # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.5.4).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
     async def test_aborted_workflow_preserved(
@@ -477,3 +494,149 @@ class TestSubWorkflowInstanceTracking:
         parent_data = data["workflow_stack"][0]
         parent_step_progress = parent_data["step_progress"]["step1"]
         assert child.workflow_instance_id in parent_step_progress["sub_workflow_instance_ids"]
+
+
+class TestBackgroundWrites:
+    """Tests for debounced, atomic, change-only status writes."""
+
+    @staticmethod
+    def _loader() -> tuple[list[JobDefinition], list[str]]:
+        return [_make_job()], []
+
+    async def _start(self, state_manager: StateManager) -> None:
+        await state_manager.create_session(
+            session_id=SESSION_ID,
+            job_name="test_job",
+            workflow_name="main",
+            goal="Background",
+            first_step_id="step1",
+        )
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.12.3, JOBS-REQ-010.14.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_schedule_does_not_write_inline(
+        self, project_root: Path, state_manager: StateManager
+    ) -> None:
+        writer = StatusWriter(project_root, debounce=0.05)
+        await self._start(state_manager)
+
+        writer.schedule_session_status(SESSION_ID, state_manager, self._loader)
+        session_file = writer.sessions_dir / f"{SESSION_ID}.yml"
+        assert not session_file.exists()
+
+        await asyncio.sleep(0.3)
+        assert session_file.exists()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.14.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_burst_coalesced_into_one_write(
+        self, project_root: Path, state_manager: StateManager
+    ) -> None:
+        writer = StatusWriter(project_root, debounce=10)
+        await self._start(state_manager)
+
+        writer.schedule_session_status(SESSION_ID, state_manager, self._loader)
+        await state_manager.start_step(SESSION_ID, "step1")
+        writer.schedule_session_status(SESSION_ID, state_manager, self._loader)
+        await state_manager.complete_step(SESSION_ID, "step1", {})
+        await state_manager.advance_to_step(SESSION_ID, "step2", 1)
+        writer.schedule_session_status(SESSION_ID, state_manager, self._loader)
+        await writer.flush()
+
+        assert writer.writes == 1
+        data = yaml.safe_load((writer.sessions_dir / f"{SESSION_ID}.yml").read_text())
+        steps = [s["step_name"] for s in data["workflows"][0]["steps"]]
+        assert steps == ["step1"]
+        assert data["workflows"][0]["steps"][0]["finished_at"] is not None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.14.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_flush_writes_pending_sessions(
+        self, project_root: Path, state_manager: StateManager
+    ) -> None:
+        writer = StatusWriter(project_root, debounce=10)
+        await self._start(state_manager)
+        await state_manager.create_session(
+            session_id="other-session",
+            job_name="test_job",
+            workflow_name="main",
+            goal="Other",
+            first_step_id="step1",
+        )
+
+        writer.schedule_session_status(SESSION_ID, state_manager, self._loader)
+        writer.schedule_session_status("other-session", state_manager, self._loader)
+        await asyncio.wait_for(writer.flush(), timeout=5)
+
+        assert sorted(p.name for p in writer.sessions_dir.iterdir()) == [
+            "other-session.yml",
+            f"{SESSION_ID}.yml",
+        ]
+        await writer.flush()  # nothing pending is a no-op
+        assert writer.writes == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.14.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_schedule_without_loop_writes_immediately(
+        self, project_root: Path, state_manager: StateManager
+    ) -> None:
+        writer = StatusWriter(project_root)
+        asyncio.run(self._start(state_manager))
+
+        writer.schedule_session_status(SESSION_ID, state_manager, self._loader)
+
+        assert (writer.sessions_dir / f"{SESSION_ID}.yml").exists()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.14.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_writes_replace_file_atomically(self, status_writer: StatusWriter) -> None:
+        status_writer.write_manifest([_make_job("alpha")])
+        before = status_writer.manifest_path.stat().st_ino
+
+        status_writer.write_manifest([_make_job("alpha"), _make_job("beta")])
+
+        assert status_writer.manifest_path.stat().st_ino != before
+        assert [p.name for p in status_writer.status_dir.iterdir() if p.is_file()] == [
+            "job_manifest.yml"
+        ]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.14.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_unchanged_manifest_not_rewritten(self, status_writer: StatusWriter) -> None:
+        assert status_writer.write_manifest([_make_job()])
+        before = status_writer.manifest_path.stat()
+
+        assert not status_writer.write_manifest([_make_job()])
+
+        after = status_writer.manifest_path.stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.14.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_unchanged_session_status_not_rewritten(
+        self, status_writer: StatusWriter, state_manager: StateManager
+    ) -> None:
+        await self._start(state_manager)
+        status_writer.write_session_status(SESSION_ID, state_manager, self._loader)
+        status_writer.write_session_status(SESSION_ID, state_manager, self._loader)
+        assert status_writer.writes == 1
+
+        await state_manager.start_step(SESSION_ID, "step1")
+        status_writer.write_session_status(SESSION_ID, state_manager, self._loader)
+        assert status_writer.writes == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-010.12.1, JOBS-REQ-010.12.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_background_failure_logged(
+        self, project_root: Path, state_manager: StateManager, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        writer = StatusWriter(project_root, debounce=10)
+        await self._start(state_manager)
+
+        def failing_loader() -> tuple[list[JobDefinition], list[str]]:
+            raise RuntimeError("boom")
+
+        writer.schedule_session_status(SESSION_ID, state_manager, failing_loader)
+        await writer.flush()
+
+        assert "Failed to write session status" in caplog.text
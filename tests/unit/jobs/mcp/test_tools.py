@@ -637,6 +637,29 @@ class TestFinishedStep:
         )
         assert resp.status == StepStatus.NEXT_STEP
 
+    @pytest.mark.asyncio
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-001.4.15, JOBS-REQ-003.18.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    async def test_step_transitions_write_state_once(
+        self, tools: WorkflowTools, state_manager: StateManager, project_root: Path
+    ) -> None:
+        """Each finished_step call persists the session state with one write."""
+        with state_manager.track_stats() as stats:
+            await _start_main_workflow(tools)
+        assert stats.writes == 1
+
+        (project_root / "out1.md").write_text("step1 output")
+        with state_manager.track_stats() as stats:
+            resp = await _finish_step(tools, outputs={"output1": "out1.md"}, override="skip")
+        assert resp.status == StepStatus.NEXT_STEP
+        assert stats.writes == 1
+
+        (project_root / "out2.md").write_text("step2 output")
+        with state_manager.track_stats() as stats:
+            resp = await _finish_step(tools, outputs={"output2": "out2.md"}, override="skip")
+        assert resp.status == StepStatus.WORKFLOW_COMPLETE
+        assert stats.writes == 1
+
 
 # =========================================================================
 # TestAbortWorkflow
@@ -0,0 +1,179 @@
+"""Tests for the on-disk job definition cache (deepwork.jobs.cache).
+
+Validates requirements: JOBS-REQ-002.16.
+"""
+
+import datetime
+import os
+from pathlib import Path
+
+import pytest
+
+from deepwork.jobs import cache
+from deepwork.jobs.cache import (
+    job_cache_dir,
+    read_cached_job,
+    write_cached_job,
+)
+from deepwork.jobs.discovery import load_all_jobs
+from deepwork.jobs.parser import ParseError, parse_job_definition
+
+JOB_YML = """
+name: cached_job
+summary: Cached job
+step_arguments:
+  - name: report
+    description: Report file
+    type: file_path
+workflows:
+  main:
+    summary: Main workflow
+    steps:
+      - name: write
+        instructions: Write the report.
+        outputs:
+          report: {}
+"""
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / ".deepwork" / "jobs").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def job_dir(project_root: Path) -> Path:
+    job_dir = project_root / ".deepwork" / "jobs" / "cached_job"
+    job_dir.mkdir()
+    (job_dir / "job.yml").write_text(JOB_YML)
+    return job_dir
+
+
+@pytest.fixture
+def cache_dir(project_root: Path) -> Path:
+    result = job_cache_dir(project_root)
+    assert result is not None
+    return result
+
+
+def _fail_validation(*args: object, **kwargs: object) -> None:
+    raise AssertionError("schema validation should have been skipped")
+
+
+class TestJobCache:
+    """Tests for caching validated job definitions."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.1, JOBS-REQ-002.16.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_hit_skips_yaml_and_schema(
+        self, job_dir: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        first = parse_job_definition(job_dir, cache_dir=cache_dir)
+        assert len(list(cache_dir.glob("*.marshal"))) == 1
+
+        monkeypatch.setattr("deepwork.utils.validation.validate_against_schema", _fail_validation)
+        monkeypatch.setattr("deepwork.utils.yaml_utils.parse_yaml", _fail_validation)
+        second = parse_job_definition(job_dir, cache_dir=cache_dir)
+
+        assert second == first
+        assert second is not first
+        plan = second.get_step_plan(second.workflows["main"], "write")
+        assert plan is not None and plan.outputs[0].name == "report"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_key_covers_content_and_version(
+        self, job_dir: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        content = (job_dir / "job.yml").read_bytes()
+        parse_job_definition(job_dir, cache_dir=cache_dir)
+        assert read_cached_job(cache_dir, content) is not None
+        assert read_cached_job(cache_dir, content + b"\n# edited\n") is None
+
+        monkeypatch.setattr(cache, "__version__", "0.0.0-other")
+        assert read_cached_job(cache_dir, content) is None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_invalid_job_not_cached(self, job_dir: Path, cache_dir: Path) -> None:
+        (job_dir / "job.yml").write_text("name: cached_job\n")
+
+        with pytest.raises(ParseError):
+            parse_job_definition(job_dir, cache_dir=cache_dir)
+        assert not cache_dir.exists() or not list(cache_dir.iterdir())
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_corrupt_entry_is_a_miss(self, job_dir: Path, cache_dir: Path) -> None:
+        parse_job_definition(job_dir, cache_dir=cache_dir)
+        [entry] = cache_dir.glob("*.marshal")
+        entry.write_bytes(b"garbage")
+
+        job = parse_job_definition(job_dir, cache_dir=cache_dir)
+
+        assert job.name == "cached_job"
+        assert read_cached_job(cache_dir, (job_dir / "job.yml").read_bytes()) is not None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_load_all_jobs_uses_project_cache(
+        self, project_root: Path, job_dir: Path, cache_dir: Path
+    ) -> None:
+        jobs, _ = load_all_jobs(project_root)
+
+        assert "cached_job" in {job.name for job in jobs}
+        assert read_cached_job(cache_dir, (job_dir / "job.yml").read_bytes()) is not None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_no_cache_without_deepwork_dir(self, tmp_path: Path) -> None:
+        assert job_cache_dir(tmp_path) is None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_oldest_entries_pruned(self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(cache, "MAX_CACHE_ENTRIES", 3)
+        for i in range(5):
+            content = f"job {i}".encode()
+            write_cached_job(cache_dir, content, {"name": f"job_{i}"})
+            entry = cache_dir / f"{cache.cache_key(content)}.marshal"
+            os.utime(entry, (1_000_000 + i, 1_000_000 + i))
+
+        assert len(list(cache_dir.glob("*.marshal"))) == 3
+        assert read_cached_job(cache_dir, b"job 4") == {"name": "job_4"}
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_failed_writes_are_ignored(self, tmp_path: Path) -> None:
+        # YAML timestamps are not plain data
+        write_cached_job(tmp_path, b"dated", {"created": datetime.date(2024, 1, 1)})
+        assert not list(tmp_path.iterdir())
+
+        not_a_dir = tmp_path / "cache"
+        not_a_dir.write_text("")
+        write_cached_job(not_a_dir, b"job", {"name": "job"})
+        assert read_cached_job(not_a_dir, b"job") is None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.16.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_prune_tolerates_concurrent_removal(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(cache, "MAX_CACHE_ENTRIES", 1)
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "notes.txt").write_text("not an entry")
+        # An entry removed by another process between listing and stat
+        (cache_dir / "gone.marshal").symlink_to(cache_dir / "missing")
+        write_cached_job(cache_dir, b"old", {"name": "old"})
+        os.utime(cache_dir / f"{cache.cache_key(b'old')}.marshal", (1_000_000, 1_000_000))
+
+        # ...and an entry removed between stat and unlink
+        def already_removed(path: str) -> None:
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr(cache.os, "unlink", already_removed)
+        write_cached_job(cache_dir, b"new", {"name": "new"})
+
+        assert read_cached_job(cache_dir, b"new") == {"name": "new"}
+        assert (cache_dir / "notes.txt").exists()
@@ -3,7 +3,7 @@
 Validates requirements: JOBS-REQ-002, JOBS-REQ-002.1, JOBS-REQ-002.2, JOBS-REQ-002.3,
 JOBS-REQ-002.4, JOBS-REQ-002.5, JOBS-REQ-002.6, JOBS-REQ-002.7, JOBS-REQ-002.8,
 JOBS-REQ-002.9, JOBS-REQ-002.10, JOBS-REQ-002.11, JOBS-REQ-002.12, JOBS-REQ-002.13,
-JOBS-REQ-002.14.
+JOBS-REQ-002.14, JOBS-REQ-002.15.
 """
 
 from pathlib import Path
@@ -828,3 +828,110 @@ class TestRealJobDefinitions:
             pytest.skip(f"No job.yml in {job_dir.name}")
         job = parse_job_definition(job_dir)
         assert job.name == job_dir.name
+
+
+class TestStepPlans:
+    """Tests for compiled workflow step plans."""
+
+    @pytest.fixture
+    def job(self, temp_dir: Path) -> JobDefinition:
+        return JobDefinition.from_dict(
+            {
+                "name": "planned",
+                "summary": "Planned job",
+                "step_arguments": [
+                    {"name": "topic", "description": "Topic", "type": "string"},
+                    {"name": "draft", "description": "Draft file", "type": "file_path"},
+                    {"name": "final", "description": "Final text", "type": "string"},
+                ],
+                "workflows": {
+                    "main": {
+                        "summary": "Main",
+                        "steps": [
+                            {
+                                "name": "write",
+                                "instructions": "Write it.",
+                                "inputs": {"topic": {}},
+                                "outputs": {"draft": {}},
+                            },
+                            {
+                                "name": "polish",
+                                "instructions": "Polish it.",
+                                "inputs": {"draft": {}, "topic": {"required": False}},
+                                "outputs": {"final": {"required": False}},
+                            },
+                            {"name": "delegate", "sub_workflow": {"workflow_name": "other"}},
+                        ],
+                    },
+                    "other": {
+                        "summary": "Other",
+                        "steps": [{"name": "only", "instructions": "Only."}],
+                    },
+                },
+            },
+            temp_dir,
+        )
+
+    def test_plans_compiled_lazily(self, job: JobDefinition) -> None:
+        # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.15.1, JOBS-REQ-002.15.2).
+        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+        main = job.workflows["main"]
+        plan = job.get_step_plan(main, "polish")
+        assert plan is not None
+        assert plan.step is main.steps[1]
+        assert plan.index == 1
+        assert job.get_step_plan(main, "only") is None
+        assert job.get_step_plan(main, "nonexistent") is None
+
+    def test_inputs_and_outputs_resolved(self, job: JobDefinition) -> None:
+        # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.15.3, JOBS-REQ-002.15.4).
+        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+        main = job.workflows["main"]
+        write = job.get_step_plan(main, "write")
+        polish = job.get_step_plan(main, "polish")
+        assert write is not None and polish is not None
+
+        assert [(i.name, i.source_step) for i in write.inputs] == [("topic", None)]
+        assert [(i.name, i.source_step, i.required) for i in polish.inputs] == [
+            ("draft", "write", True),
+            ("topic", None, False),
+        ]
+        assert polish.inputs[0].argument is job.get_argument("draft")
+        assert polish.inputs[1].heading == "- **topic** (optional)"
+        assert write.outputs[0].syntax == "filepath or list of filepaths"
+        assert (polish.outputs[0].syntax, polish.outputs[0].required) == ("string value", False)
+
+    def test_body(self, job: JobDefinition) -> None:
+        # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.15.5).
+        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+        main = job.workflows["main"]
+        write = job.get_step_plan(main, "write")
+        delegate = job.get_step_plan(main, "delegate")
+        assert write is not None and delegate is not None
+        assert write.body == "Write it."
+        assert 'job_name="planned"' in delegate.body
+        assert 'workflow_name="other"' in delegate.body
+
+    def test_parse_compiles_plans(self, fixtures_dir: Path) -> None:
+        # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.15.1).
+        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+        job = parse_job_definition(fixtures_dir / "jobs" / "complex_job")
+        assert job._plans is not None
+        for workflow in job.workflows.values():
+            for step in workflow.steps:
+                assert job.get_step_plan(workflow, step.name) is not None
+
+    def test_duplicate_names_first_wins(self) -> None:
+        # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-002.13.4).
+        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+        wf = Workflow(
+            name="main",
+            summary="Main",
+            steps=[
+                WorkflowStep(name="dup", instructions="First"),
+                WorkflowStep(name="dup", instructions="Second"),
+            ],
+        )
+        step = wf.get_step("dup")
+        assert step is not None and step.instructions == "First"
+        assert wf.get_step_index("dup") == 0
@@ -0,0 +1,175 @@
+"""Tests for the parsed job definition cache (deepwork.jobs.registry).
+
+Validates requirements: JOBS-REQ-008.6.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from deepwork.jobs.discovery import ENV_ADDITIONAL_JOBS_FOLDERS, load_all_jobs
+from deepwork.jobs.issues import detect_issues
+from deepwork.jobs.parser import ParseError
+from deepwork.jobs.registry import JobRegistry
+
+
+def _create_minimal_job(parent: Path, job_name: str, summary: str = "Test job") -> Path:
+    """Create a minimal valid job directory for testing."""
+    job_dir = parent / job_name
+    job_dir.mkdir(parents=True, exist_ok=True)
+    (job_dir / "job.yml").write_text(
+        f"""
+name: {job_name}
+summary: {summary}
+step_arguments: []
+
+workflows:
+  main:
+    summary: Main workflow
+    steps:
+      - name: step1
+        instructions: |
+          Do step 1.
+"""
+    )
+    return job_dir
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / ".deepwork" / "jobs").mkdir(parents=True)
+    return tmp_path
+
+
+def _jobs_dir(project_root: Path) -> Path:
+    return project_root / ".deepwork" / "jobs"
+
+
+class TestJobRegistry:
+    """Tests for JobRegistry caching and change detection."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.1, JOBS-REQ-008.6.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_reparses_only_changed_job(self, project_root: Path) -> None:
+        job_dir = _create_minimal_job(_jobs_dir(project_root), "my_job")
+        registry = JobRegistry()
+
+        first = registry.parse(job_dir)
+        assert registry.parse(job_dir) is first
+        assert registry.parses == 1
+
+        _create_minimal_job(_jobs_dir(project_root), "my_job", summary="Changed summary")
+        assert registry.parse(job_dir).summary == "Changed summary"
+        assert registry.parses == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_errors_cached(self, project_root: Path) -> None:
+        job_dir = _jobs_dir(project_root) / "bad_job"
+        job_dir.mkdir()
+        (job_dir / "job.yml").write_text("name: bad_job\n")
+        registry = JobRegistry()
+
+        for _ in range(2):
+            with pytest.raises(ParseError):
+                registry.parse(job_dir)
+        assert registry.parses == 1
+
+        registry.invalidate(job_dir)
+        with pytest.raises(ParseError):
+            registry.parse(job_dir)
+        assert registry.parses == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_invalidate_everything(self, project_root: Path) -> None:
+        job_dir = _create_minimal_job(_jobs_dir(project_root), "my_job")
+        registry = JobRegistry()
+        registry.load_all(project_root)
+        parses = registry.parses
+
+        registry.invalidate()
+        registry.parse(job_dir)
+        assert registry.parses == parses + 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_missing_job_yml_not_cached(self, project_root: Path) -> None:
+        job_dir = _jobs_dir(project_root) / "later"
+        job_dir.mkdir()
+        registry = JobRegistry()
+
+        with pytest.raises(ParseError):
+            registry.parse(job_dir)
+        _create_minimal_job(_jobs_dir(project_root), "later")
+        assert registry.parse(job_dir).name == "later"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_job_folder_that_is_a_file_is_skipped(
+        self, project_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        not_a_folder = tmp_path / "jobs.txt"
+        not_a_folder.write_text("")
+        monkeypatch.setenv(ENV_ADDITIONAL_JOBS_FOLDERS, str(not_a_folder))
+
+        jobs, errors = JobRegistry().load_all(project_root)
+        expected_jobs, expected_errors = load_all_jobs(project_root)
+        assert [j.name for j in jobs] == [j.name for j in expected_jobs]
+        assert errors == expected_errors
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_load_all_matches_discovery(
+        self, project_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        extra = tmp_path / "extra"
+        _create_minimal_job(_jobs_dir(project_root), "shared", summary="Project copy")
+        _create_minimal_job(extra, "shared", summary="Extra copy")
+        _create_minimal_job(extra, "extra_only")
+        # An invalid project-local job falls through to a valid later copy
+        bad = _jobs_dir(project_root) / "fallback"
+        bad.mkdir()
+        (bad / "job.yml").write_text("name: fallback\n")
+        _create_minimal_job(extra, "fallback", summary="Valid fallback")
+        monkeypatch.setenv(ENV_ADDITIONAL_JOBS_FOLDERS, str(extra))
+
+        registry = JobRegistry()
+        for _ in range(2):
+            jobs, errors = registry.load_all(project_root)
+            expected_jobs, expected_errors = load_all_jobs(project_root)
+            assert [(j.name, j.summary) for j in jobs] == [
+                (j.name, j.summary) for j in expected_jobs
+            ]
+            assert errors == expected_errors
+        assert ("shared", "Project copy") in [(j.name, j.summary) for j in jobs]
+        assert ("fallback", "Valid fallback") in [(j.name, j.summary) for j in jobs]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_load_all_sees_added_and_removed_jobs(self, project_root: Path) -> None:
+        registry = JobRegistry()
+        _create_minimal_job(_jobs_dir(project_root), "first")
+        names = {j.name for j in registry.load_all(project_root)[0]}
+        assert "first" in names
+
+        _create_minimal_job(_jobs_dir(project_root), "second")
+        (_jobs_dir(project_root) / "first" / "job.yml").unlink()
+        names = {j.name for j in registry.load_all(project_root)[0]}
+        assert "second" in names
+        assert "first" not in names
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (JOBS-REQ-008.6.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_detect_issues_uses_cached_errors(self, project_root: Path) -> None:
+        bad = _jobs_dir(project_root) / "bad_job"
+        bad.mkdir()
+        (bad / "job.yml").write_text("name: bad_job\n")
+        registry = JobRegistry()
+        registry.load_all(project_root)
+        parses = registry.parses
+
+        issues = detect_issues(project_root, registry)
+
+        assert [i.job_name for i in issues] == ["bad_job"]
+        assert registry.parses == parses
@@ -519,6 +519,69 @@ my_rule:
         )
         rules = parse_deepreview_file(filepath)
         assert rules[0].precomputed_info_bash_command is None
+        assert rules[0].precompute_timeout_seconds is None
+        assert rules[0].precompute_cache_ttl_seconds is None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.4, REVIEW-REQ-001.9.9).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_parses_timeout_and_cache_ttl(self, tmp_path: Path) -> None:
+        filepath = _write_deepreview(
+            tmp_path,
+            """
+my_rule:
+  description: "Test rule."
+  match:
+    include: ["**/*.py"]
+  review:
+    strategy: individual
+    precomputed_info_for_reviewer_bash_command: info.sh
+    precomputed_info_timeout_seconds: 300
+    precomputed_info_cache_ttl_seconds: 0
+    instructions: "Review."
+""",
+        )
+        rules = parse_deepreview_file(filepath)
+        assert rules[0].precompute_timeout_seconds == 300
+        assert rules[0].precompute_cache_ttl_seconds == 0
+
+
+class TestTaskBudget:
+    """Tests for task_budget_bytes / task_budget_tokens parsing — validates REVIEW-REQ-004.11."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.11.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_parses_smaller_of_byte_and_token_budgets(self, tmp_path: Path) -> None:
+        filepath = _write_deepreview(
+            tmp_path,
+            """
+my_rule:
+  description: "Test rule."
+  match:
+    include: ["**/*.py"]
+  review:
+    strategy: individual
+    task_budget_bytes: 50000
+    task_budget_tokens: 8000
+    instructions: "Review."
+""",
+        )
+        rules = parse_deepreview_file(filepath)
+        assert rules[0].task_budget_bytes == 32000
+
+    def test_budget_defaults_to_none(self, tmp_path: Path) -> None:
+        filepath = _write_deepreview(
+            tmp_path,
+            """
+my_rule:
+  description: "Test rule."
+  match:
+    include: ["**/*.py"]
+  review:
+    strategy: individual
+    instructions: "Review."
+""",
+        )
+        assert parse_deepreview_file(filepath)[0].task_budget_bytes is None
 
 
 class TestReferenceFiles:
@@ -0,0 +1,193 @@
+"""Tests for per-file review digests (deepwork.review.digests) — validates REVIEW-REQ-009.7."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from deepwork.review.config import ReviewTask
+from deepwork.review.digests import DIGEST_CACHE_FILENAME, MISSING, FileDigests
+from deepwork.review.instructions import compute_review_id
+from deepwork.review.rule_cache import CACHE_DIR
+
+_OLD_NS = 1_600_000_000 * 10**9
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def _write(path: Path, content: str | bytes, old: bool = True) -> Path:
+    """Write a file, backdating its mtime out of the racy window by default."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    path.write_bytes(content)
+    if old:
+        os.utime(path, ns=(_OLD_NS, _OLD_NS))
+    return path
+
+
+def _make_task(files: list[str], rule_name: str = "rule") -> ReviewTask:
+    return ReviewTask(
+        rule_name=rule_name,
+        files_to_review=files,
+        instructions="Review it.",
+        agent_name=None,
+    )
+
+
+class TestFileDigests:
+    """Tests for FileDigests."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.7.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_digest_is_git_blob_id(self, tmp_path: Path) -> None:
+        path = _write(tmp_path / "a.bin", b"\x00\xffbinary\ncontent")
+        expected = _git(tmp_path, "hash-object", "--no-filters", str(path))
+        assert FileDigests(tmp_path).digest("a.bin") == expected
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.7.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_large_files_are_hashed_in_chunks(self, tmp_path: Path) -> None:
+        path = _write(tmp_path / "big.txt", "0123456789" * 1000)
+        expected = _git(tmp_path, "hash-object", "--no-filters", str(path))
+        with patch("deepwork.review.digests._CHUNK_SIZE", 64):
+            assert FileDigests(tmp_path).digest("big.txt") == expected
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.7.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_each_file_hashed_once_per_run(self, tmp_path: Path) -> None:
+        _write(tmp_path / "a.py", "a")
+        _write(tmp_path / "b.py", "b")
+        digests = FileDigests(tmp_path)
+        tasks = [_make_task(["a.py", "b.py"], "r1"), _make_task(["a.py"], "r2")]
+        digests.prime(f for task in tasks for f in task.files_to_review)
+        for task in tasks * 3:
+            compute_review_id(task, tmp_path, digests)
+        digests.prime(["a.py", "a.py"])
+        assert digests.hashed == 2
+
+    def test_unreadable_paths_are_missing(self, tmp_path: Path) -> None:
+        (tmp_path / "subdir").mkdir()
+        digests = FileDigests(tmp_path)
+        assert digests.digest("nope.py") == MISSING
+        assert digests.digest("subdir") == MISSING
+        assert digests.hashed == 0
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.7.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_persisted_digest_reused_when_stat_unchanged(self, tmp_path: Path) -> None:
+        _write(tmp_path / "a.py", "content")
+        first = FileDigests(tmp_path)
+        digest = first.digest("a.py")
+        first.save()
+
+        second = FileDigests(tmp_path)
+        with patch("deepwork.review.digests._hash_file") as mock_hash:
+            assert second.digest("a.py") == digest
+        mock_hash.assert_not_called()
+        assert second.from_cache == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.7.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_stat_change_invalidates_persisted_digest(self, tmp_path: Path) -> None:
+        _write(tmp_path / "a.py", "version 1")
+        first = FileDigests(tmp_path)
+        old_digest = first.digest("a.py")
+        first.save()
+
+        path = _write(tmp_path / "a.py", "version 2")
+        os.utime(path, ns=(_OLD_NS + 10**9, _OLD_NS + 10**9))
+        second = FileDigests(tmp_path)
+        assert second.digest("a.py") != old_digest
+        assert second.hashed == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.7.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_recently_modified_files_are_not_persisted(self, tmp_path: Path) -> None:
+        _write(tmp_path / "fresh.py", "just written", old=False)
+        digests = FileDigests(tmp_path)
+        digests.digest("fresh.py")
+        digests.save()
+        assert not (tmp_path / CACHE_DIR / DIGEST_CACHE_FILENAME).exists()
+
+    def test_corrupt_or_foreign_cache_is_ignored(self, tmp_path: Path) -> None:
+        _write(tmp_path / "a.py", "content")
+        cache_file = tmp_path / CACHE_DIR / DIGEST_CACHE_FILENAME
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text("{not json", encoding="utf-8")
+        assert FileDigests(tmp_path).digest("a.py") != MISSING
+
+        st = os.stat(tmp_path / "a.py")
+        entry = [st.st_size, st.st_mtime_ns, st.st_ino, "f" * 40]
+        cache_file.write_text(json.dumps({"format": 0, "entries": {"a.py": entry}}))
+        assert FileDigests(tmp_path).digest("a.py") != "f" * 40
+
+    def test_save_failure_is_ignored(self, tmp_path: Path) -> None:
+        _write(tmp_path / "a.py", "content")
+        digests = FileDigests(tmp_path)
+        digests.digest("a.py")
+        with patch("deepwork.review.digests.atomic_write", side_effect=OSError("disk full")):
+            digests.save()
+        assert not (tmp_path / CACHE_DIR / DIGEST_CACHE_FILENAME).exists()
+
+    def test_oversized_cache_keeps_only_this_runs_files(self, tmp_path: Path) -> None:
+        _write(tmp_path / "a.py", "content")
+        stale = {f"gone_{i}.py": [1, 1, 1, "0" * 40] for i in range(5)}
+        cache_file = tmp_path / CACHE_DIR / DIGEST_CACHE_FILENAME
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text(json.dumps({"format": 1, "entries": stale}), encoding="utf-8")
+
+        digests = FileDigests(tmp_path)
+        digests.digest("a.py")
+        with patch("deepwork.review.digests._MAX_CACHE_ENTRIES", 3):
+            digests.save()
+
+        entries = json.loads(cache_file.read_text(encoding="utf-8"))["entries"]
+        assert list(entries) == ["a.py"]
+
+
+class TestGitIndexDigests:
+    """Tests for reusing blob IDs from the git index."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path) -> Path:
+        _git(tmp_path, "init", "-q")
+        _write(tmp_path / "src" / "clean.py", "clean\n")
+        _write(tmp_path / "src" / "dirty.py", "committed\n")
+        _git(tmp_path, "add", ".")
+        _git(tmp_path, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "init")
+        _write(tmp_path / "src" / "dirty.py", "edited after commit\n")
+        _write(tmp_path / "src" / "untracked.py", "new\n")
+        return tmp_path
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.7.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_clean_tracked_files_use_index_blob_ids(self, repo: Path) -> None:
+        digests = FileDigests(repo)
+        digests.prime(["src/clean.py", "src/dirty.py", "src/untracked.py"])
+        assert digests.from_index == 1
+        assert digests.hashed == 2
+        for name in ("clean", "dirty", "untracked"):
+            expected = _git(repo, "hash-object", f"src/{name}.py")
+            assert digests.digest(f"src/{name}.py") == expected
+
+    def test_index_paths_relative_to_subdirectory_root(self, repo: Path) -> None:
+        digests = FileDigests(repo / "src")
+        assert digests.digest("clean.py") == _git(repo, "hash-object", "src/clean.py")
+        assert digests.digest("dirty.py") == _git(repo, "hash-object", "src/dirty.py")
+        assert digests.from_index == 1
+
+    def test_review_id_unchanged_by_committing(self, repo: Path) -> None:
+        task = _make_task(["src/dirty.py"])
+        before = compute_review_id(task, repo)
+        _git(repo, "add", ".")
+        _git(repo, "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-qm", "edit")
+        digests = FileDigests(repo)
+        assert compute_review_id(task, repo, digests) == before
+        assert digests.from_index == 1
@@ -14,13 +14,13 @@ from deepwork.review.config import ReferenceFile, ReviewTask
 from deepwork.review.instructions import (
     MAX_INLINE_FILES,
     MAX_INLINE_TOTAL_BYTES,
-    _run_precompute_command,
-    _run_precompute_commands,
     _sanitize_for_id,
     build_instruction_file,
     compute_review_id,
     write_instruction_files,
 )
+from deepwork.review.ledger import LedgerError, ReviewLedger
+from deepwork.review.mcp import mark_passed
 
 
 @pytest.fixture
@@ -138,6 +138,14 @@ class TestBuildInstructionFile:
         content = build_instruction_file(task)
         assert "3 files" in content.split("\n")[0]
 
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.11.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_shard_label_in_scope_description(self) -> None:
+        task = _make_task(files=["a.py", "b.py"])
+        task.shard_label = "part 2 of 3"
+        content = build_instruction_file(task)
+        assert content.split("\n")[0].endswith("— 2 files (part 2 of 3)")
+
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.6.1, REVIEW-REQ-005.6.2).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
     def test_includes_traceability_blurb(self) -> None:
@@ -300,30 +308,45 @@ class TestWriteInstructionFiles:
         results = write_instruction_files([task], tmp_path)
         assert results == []
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.5.1, REVIEW-REQ-009.5.2).
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.5.2, REVIEW-REQ-009.8.5).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_preserves_passed_files_on_cleanup(
+    def test_imports_legacy_passed_markers_on_cleanup(
         self, tmp_path: Path, instructions_dir: Path
     ) -> None:
         passed_file = instructions_dir / "some_review.passed"
         passed_file.write_bytes(b"")
 
+        write_instruction_files([_make_task()], tmp_path)
         write_instruction_files([_make_task()], tmp_path)
 
-        assert passed_file.exists()
+        assert not passed_file.exists()
+        with ReviewLedger(instructions_dir) as ledger:
+            assert ledger.is_passed("some_review")
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.5.1, REVIEW-REQ-009.5.3).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_preserves_md_files_with_passed_marker(
+    def test_preserves_md_files_of_passed_reviews(
         self, tmp_path: Path, instructions_dir: Path
     ) -> None:
         (instructions_dir / "old_review.md").write_text("passed content")
-        (instructions_dir / "old_review.passed").write_bytes(b"")
+        (instructions_dir / "stale_review.md").write_text("never passed")
+        mark_passed(tmp_path, "old_review")
 
         write_instruction_files([_make_task()], tmp_path)
 
         assert (instructions_dir / "old_review.md").exists()
-        assert (instructions_dir / "old_review.passed").exists()
+        assert not (instructions_dir / "stale_review.md").exists()
+
+    def test_ledger_write_failure_does_not_fail(
+        self, tmp_path: Path, instructions_dir: Path
+    ) -> None:
+        with patch(
+            "deepwork.review.instructions.ReviewLedger.record_issued",
+            side_effect=LedgerError("database is locked"),
+        ):
+            results = write_instruction_files([_make_task()], tmp_path)
+        assert len(results) == 1
+        assert results[0][1].exists()
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.3.3).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
@@ -541,59 +564,6 @@ class TestInlineContent:
 class TestPrecomputedContext:
     """Tests for precomputed info command execution — validates REVIEW-REQ-001.9, REVIEW-REQ-005.7."""
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.1, REVIEW-REQ-005.7.3).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_run_precompute_command_captures_stdout(self, tmp_path: Path) -> None:
-        script = tmp_path / "info.sh"
-        script.write_text("#!/usr/bin/env bash\necho 'hello world'")
-        script.chmod(0o755)
-        result = _run_precompute_command(str(script), tmp_path)
-        assert "hello world" in result
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.5).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_run_precompute_command_failure_returns_error(self, tmp_path: Path) -> None:
-        script = tmp_path / "fail.sh"
-        script.write_text("#!/usr/bin/env bash\necho 'oops' >&2\nexit 1")
-        script.chmod(0o755)
-        result = _run_precompute_command(str(script), tmp_path)
-        assert "Precompute command failed" in result
-        assert "exit code 1" in result
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.4, REVIEW-REQ-001.9.5).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_run_precompute_command_timeout(self, tmp_path: Path) -> None:
-        script = tmp_path / "slow.sh"
-        script.write_text("#!/usr/bin/env bash\nsleep 120")
-        script.chmod(0o755)
-        with patch("deepwork.review.instructions.PRECOMPUTE_TIMEOUT_SECONDS", 1):
-            result = _run_precompute_command(str(script), tmp_path)
-        assert "timed out" in result
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.3).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_run_precompute_command_uses_project_root_as_cwd(self, tmp_path: Path) -> None:
-        script = tmp_path / "cwd.sh"
-        script.write_text("#!/usr/bin/env bash\npwd")
-        script.chmod(0o755)
-        result = _run_precompute_command(str(script), tmp_path)
-        assert str(tmp_path) in result
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.6, REVIEW-REQ-001.9.7).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_run_precompute_commands_deduplicates_and_parallelizes(self, tmp_path: Path) -> None:
-        script = tmp_path / "echo.sh"
-        script.write_text("#!/usr/bin/env bash\necho 'output'")
-        script.chmod(0o755)
-        commands = {str(script)}
-        results = _run_precompute_commands(commands, tmp_path)
-        assert str(script) in results
-        assert "output" in results[str(script)]
-
-    def test_run_precompute_commands_empty_set(self, tmp_path: Path) -> None:
-        results = _run_precompute_commands(set(), tmp_path)
-        assert results == {}
-
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.7.1, REVIEW-REQ-005.7.2).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
     def test_build_instruction_file_includes_precomputed_section(self) -> None:
@@ -634,6 +604,21 @@ class TestPrecomputedContext:
         assert "## Precomputed Context" in content
         assert "precomputed data" in content
 
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.8).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_precompute_skipped_for_passed_reviews(self, tmp_path: Path) -> None:
+        counter = tmp_path / "runs.txt"
+        script = tmp_path / "info.sh"
+        script.write_text(f"#!/usr/bin/env bash\necho run >> {counter}\necho data")
+        script.chmod(0o755)
+        task = _make_task(precomputed_info_bash_command=str(script))
+        task.precompute_cache_ttl_seconds = 0
+        review_id = compute_review_id(task, tmp_path)
+        mark_passed(tmp_path, review_id)
+
+        assert write_instruction_files([task], tmp_path) == []
+        assert not counter.exists()
+
 
 class TestReferenceFileInlining:
     """Tests for reference_files inlining in build_instruction_file."""
@@ -0,0 +1,168 @@
+"""Tests for the per-run project file inventory (deepwork.review.inventory).
+
+Validates requirements: REVIEW-REQ-004.4.5, REVIEW-REQ-004.4.6, REVIEW-REQ-004.4.7.
+"""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+from deepwork.review.config import ReviewRule
+from deepwork.review.inventory import FileInventory
+from deepwork.review.matcher import match_files_to_rules
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, capture_output=True, check=True)
+
+
+def _make_rule(name: str, source_dir: Path, include: list[str]) -> ReviewRule:
+    return ReviewRule(
+        name=name,
+        description="Test rule description.",
+        include_patterns=include,
+        exclude_patterns=[],
+        strategy="matches_together",
+        instructions="Review it.",
+        agent=None,
+        all_changed_filenames=False,
+        unchanged_matching_files=True,
+        precomputed_info_bash_command=None,
+        source_dir=source_dir,
+        source_file=source_dir / ".deepreview",
+        source_line=1,
+    )
+
+
+class TestFileInventoryLoad:
+    """Tests for FileInventory.load."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.4.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_git_repo_lists_tracked_and_untracked_but_not_ignored(self, tmp_path: Path) -> None:
+        _git(tmp_path, "init", "-q")
+        (tmp_path / ".gitignore").write_text("node_modules/\n")
+        (tmp_path / "tracked.py").write_text("x\n")
+        _git(tmp_path, "add", ".")
+        (tmp_path / "untracked.py").write_text("x\n")
+        (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+        (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x\n")
+
+        inventory = FileInventory.load(tmp_path)
+
+        assert inventory.paths == [".gitignore", "tracked.py", "untracked.py"]
+
+    def test_non_git_directory_falls_back_to_walk(self, tmp_path: Path) -> None:
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "a" / "b" / "c.py").write_text("x\n")
+        (tmp_path / "top.py").write_text("x\n")
+
+        with patch(
+            "deepwork.review.inventory.subprocess.run",
+            side_effect=subprocess.CalledProcessError(128, "git"),
+        ):
+            inventory = FileInventory.load(tmp_path)
+
+        assert inventory.paths == ["a/b/c.py", "top.py"]
+        assert len(inventory) == 2
+
+
+class TestSymlinkedTrees:
+    """Tests that symlinked source trees are part of the inventory."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.4.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_tracked_directory_symlink_is_expanded(self, tmp_path: Path) -> None:
+        shared = tmp_path / "shared"
+        (shared / "pkg").mkdir(parents=True)
+        (shared / "pkg" / "util.py").write_text("x\n")
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        _git(repo, "init", "-q")
+        (repo / "src").mkdir()
+        (repo / "src" / "changed.py").write_text("x\n")
+        (repo / "src" / "vendor").symlink_to(shared)
+        _git(repo, "add", ".")
+
+        inventory = FileInventory.load(repo)
+        assert inventory.paths == ["src/changed.py", "src/vendor/pkg/util.py"]
+
+        rule = _make_rule("a", repo / "src", ["**/*.py"])
+        [task] = match_files_to_rules(["src/changed.py"], [rule], repo)
+        assert task.additional_files == ["src/vendor/pkg/util.py"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.4.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_link_cycles_are_not_followed(self, tmp_path: Path) -> None:
+        (tmp_path / "a").mkdir()
+        (tmp_path / "a" / "f.py").write_text("x\n")
+        (tmp_path / "a" / "loop").symlink_to(tmp_path)
+        (tmp_path / "alias").symlink_to(tmp_path / "a")
+
+        with patch(
+            "deepwork.review.inventory.subprocess.run",
+            side_effect=subprocess.CalledProcessError(128, "git"),
+        ):
+            inventory = FileInventory.load(tmp_path)
+
+        assert inventory.paths == ["a/f.py", "alias/f.py"]
+
+
+class TestFileInventoryUnder:
+    """Tests for FileInventory.under directory lookups."""
+
+    def test_returns_only_paths_below_directory(self, tmp_path: Path) -> None:
+        inventory = FileInventory(
+            tmp_path, ["src/a.py", "src/lib/b.py", "src-other/c.py", "src0.py", "srcx/d.py", "z"]
+        )
+        assert inventory.under("src") == ["src/a.py", "src/lib/b.py"]
+        assert inventory.under("src/") == ["src/a.py", "src/lib/b.py"]
+        assert inventory.under("src/lib") == ["src/lib/b.py"]
+        assert inventory.under("missing") == []
+        # Second lookup is served from the memoized directory range
+        assert inventory.under("src/lib") == ["src/lib/b.py"]
+
+    def test_root_returns_everything(self, tmp_path: Path) -> None:
+        inventory = FileInventory(tmp_path, ["b", "a", "a"])
+        assert inventory.under("") == ["a", "b"]
+        assert inventory.under(".") == ["a", "b"]
+
+    def test_is_file_rejects_deleted_and_directories(self, tmp_path: Path) -> None:
+        (tmp_path / "present.py").write_text("x\n")
+        (tmp_path / "dir.py").mkdir()
+        inventory = FileInventory(tmp_path, ["present.py", "dir.py", "deleted.py"])
+        assert [p for p in inventory.paths if inventory.is_file(p)] == ["present.py"]
+
+
+class TestSharedInventory:
+    """Tests that match_files_to_rules shares one inventory per call."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.4.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_inventory_loaded_once_for_many_rules(self, tmp_path: Path) -> None:
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "changed.py").write_text("x\n")
+            (tmp_path / name / "other.py").write_text("x\n")
+        rules = [_make_rule(name, tmp_path / name, ["*.py"]) for name in ("a", "b", "c")]
+        changed = ["a/changed.py", "b/changed.py", "c/changed.py"]
+
+        with patch(
+            "deepwork.review.matcher.FileInventory.load",
+            side_effect=FileInventory.load,
+        ) as mock_load:
+            tasks = match_files_to_rules(changed, rules, tmp_path)
+
+        assert mock_load.call_count == 1
+        assert [t.additional_files for t in tasks] == [
+            ["a/other.py"],
+            ["b/other.py"],
+            ["c/other.py"],
+        ]
+
+    def test_no_inventory_when_no_rule_needs_it(self, tmp_path: Path) -> None:
+        rule = _make_rule("a", tmp_path, ["*.py"])
+        rule.unchanged_matching_files = False
+        with patch("deepwork.review.matcher.FileInventory.load") as mock_load:
+            match_files_to_rules(["x.py"], [rule], tmp_path)
+        mock_load.assert_not_called()
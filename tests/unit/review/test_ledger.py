@@ -0,0 +1,194 @@
+"""Tests for the review ledger (deepwork.review.ledger) — validates REVIEW-REQ-009.8."""
+
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from deepwork.review.ledger import (
+    LEDGER_FILENAME,
+    IssuedReview,
+    LedgerError,
+    ReviewLedger,
+)
+
+
+@pytest.fixture
+def instructions_dir(tmp_path: Path) -> Path:
+    return tmp_path / ".deepwork" / "tmp" / "review_instructions"
+
+
+def _issued(review_id: str) -> IssuedReview:
+    return IssuedReview(
+        review_id=review_id,
+        rule_name=review_id.split("--")[0],
+        file_digests={"src/app.py": "a" * 40},
+        instruction_hash="b" * 64,
+    )
+
+
+def _rows(instructions_dir: Path) -> dict[str, sqlite3.Row]:
+    conn = sqlite3.connect(instructions_dir / LEDGER_FILENAME)
+    conn.row_factory = sqlite3.Row
+    try:
+        return {row["review_id"]: row for row in conn.execute("SELECT * FROM reviews")}
+    finally:
+        conn.close()
+
+
+class TestReviewLedger:
+    """Tests for ReviewLedger lookups and writes."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.8.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_records_issue_metadata_and_pass_time(self, instructions_dir: Path) -> None:
+        with ReviewLedger(instructions_dir) as ledger:
+            ledger.record_issued([_issued("rule--src-app.py--123456789abc")])
+            assert not ledger.is_passed("rule--src-app.py--123456789abc")
+            ledger.record_pass("rule--src-app.py--123456789abc")
+            assert ledger.is_passed("rule--src-app.py--123456789abc")
+
+        row = _rows(instructions_dir)["rule--src-app.py--123456789abc"]
+        assert row["rule_name"] == "rule"
+        assert json.loads(row["file_digests"]) == {"src/app.py": "a" * 40}
+        assert row["instruction_hash"] == "b" * 64
+        assert row["passed_at"] >= row["issued_at"]
+
+    def test_reissue_keeps_pass_time(self, instructions_dir: Path) -> None:
+        with ReviewLedger(instructions_dir) as ledger:
+            ledger.record_pass("rule--x--1")
+            ledger.record_issued([_issued("rule--x--1")])
+            assert ledger.is_passed("rule--x--1")
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.8.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_bulk_lookup_returns_passed_subset(self, instructions_dir: Path) -> None:
+        ids = [f"rule--f{i}--{i:012d}" for i in range(1200)]
+        with ReviewLedger(instructions_dir) as ledger:
+            for review_id in ids[::3]:
+                ledger.record_pass(review_id)
+            assert ledger.passed_ids(ids) == set(ids[::3])
+            assert ledger.passed_ids([]) == set()
+
+    def test_read_without_ledger_does_not_create_it(self, instructions_dir: Path) -> None:
+        with ReviewLedger(instructions_dir) as ledger:
+            assert ledger.passed_ids(["rule--x--1"]) == set()
+            ledger.record_issued([])
+        assert not instructions_dir.exists()
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.8.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_prune_by_age(self, instructions_dir: Path) -> None:
+        with ReviewLedger(instructions_dir) as ledger:
+            ledger.record_pass("rule--old--1")
+            ledger.record_issued([_issued("rule--old-pending--1")])
+            ledger.record_pass("rule--new--1")
+        conn = sqlite3.connect(instructions_dir / LEDGER_FILENAME)
+        old = time.time() - 100 * 86400
+        conn.execute("UPDATE reviews SET passed_at = ? WHERE review_id = 'rule--old--1'", (old,))
+        conn.execute(
+            "UPDATE reviews SET issued_at = ? WHERE review_id = 'rule--old-pending--1'", (old,)
+        )
+        conn.commit()
+        conn.close()
+
+        with ReviewLedger(instructions_dir) as ledger:
+            assert ledger.prune(retention_days=90) == 2
+        assert set(_rows(instructions_dir)) == {"rule--new--1"}
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.8.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_prune_by_count_keeps_most_recent(self, instructions_dir: Path) -> None:
+        with ReviewLedger(instructions_dir) as ledger:
+            for i in range(5):
+                with patch("deepwork.review.ledger.time.time", return_value=1_000_000.0 + i):
+                    ledger.record_pass(f"rule--passed--{i}")
+                    ledger.record_issued([_issued(f"rule--pending--{i}")])
+            with patch("deepwork.review.ledger.time.time", return_value=1_000_010.0):
+                assert ledger.prune(max_reviews=2) == 6
+        assert set(_rows(instructions_dir)) == {
+            "rule--passed--3",
+            "rule--passed--4",
+            "rule--pending--3",
+            "rule--pending--4",
+        }
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.8.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_concurrent_writers(self, instructions_dir: Path) -> None:
+        def mark(i: int) -> None:
+            with ReviewLedger(instructions_dir) as ledger:
+                ledger.record_issued([_issued(f"rule--f{i}--1")])
+                ledger.record_pass(f"rule--f{i}--1")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(mark, range(40)))
+
+        ids = {f"rule--f{i}--1" for i in range(40)}
+        with ReviewLedger(instructions_dir) as ledger:
+            assert ledger.passed_ids(ids) == ids
+
+    def test_failed_transaction_is_rolled_back(self, instructions_dir: Path) -> None:
+        with ReviewLedger(instructions_dir) as ledger:
+            with pytest.raises(ValueError), ledger._transaction() as conn:
+                conn.execute(
+                    "INSERT INTO reviews (review_id, rule_name, issued_at, passed_at) "
+                    "VALUES ('rule--x--1', 'rule', 0, 0)"
+                )
+                raise ValueError("boom")
+            assert not ledger.is_passed("rule--x--1")
+
+    def test_corrupt_ledger(self, instructions_dir: Path) -> None:
+        instructions_dir.mkdir(parents=True)
+        (instructions_dir / LEDGER_FILENAME).write_bytes(b"this is not a database" * 100)
+        with ReviewLedger(instructions_dir) as ledger:
+            # Reads degrade to "not passed" so reviews run again
+            assert ledger.passed_ids(["rule--x--1"]) == set()
+            with pytest.raises(LedgerError):
+                ledger.record_pass("rule--x--1")
+
+
+class TestMarkerImport:
+    """Tests for importing legacy .passed marker files."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.8.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_markers_imported_and_removed(self, instructions_dir: Path) -> None:
+        instructions_dir.mkdir(parents=True)
+        (instructions_dir / "rule_a--src-a.py--111111111111.passed").write_bytes(b"")
+        (instructions_dir / "rule_b--src-b.py--222222222222.passed").write_bytes(b"")
+
+        with ReviewLedger(instructions_dir) as ledger:
+            assert ledger.passed_ids(
+                ["rule_a--src-a.py--111111111111", "rule_b--src-b.py--222222222222"]
+            ) == {"rule_a--src-a.py--111111111111", "rule_b--src-b.py--222222222222"}
+
+        assert list(instructions_dir.glob("*.passed")) == []
+        assert _rows(instructions_dir)["rule_b--src-b.py--222222222222"]["rule_name"] == "rule_b"
+
+    def test_marker_vanishing_during_import_is_skipped(self, instructions_dir: Path) -> None:
+        instructions_dir.mkdir(parents=True)
+        (instructions_dir / "rule--gone--1.passed").write_bytes(b"")
+        original_stat = Path.stat
+
+        def flaky_stat(self: Path, **kwargs):  # type: ignore[no-untyped-def]
+            if self.name == "rule--gone--1.passed":
+                raise FileNotFoundError(self)
+            return original_stat(self, **kwargs)
+
+        with patch.object(Path, "stat", flaky_stat), ReviewLedger(instructions_dir) as ledger:
+            assert ledger.passed_ids(["rule--gone--1"]) == set()
+
+    def test_existing_pass_time_is_kept(self, instructions_dir: Path) -> None:
+        with ReviewLedger(instructions_dir) as ledger:
+            ledger.record_pass("rule--x--1")
+        before = _rows(instructions_dir)["rule--x--1"]["passed_at"]
+        (instructions_dir / "rule--x--1.passed").write_bytes(b"")
+
+        with ReviewLedger(instructions_dir) as ledger:
+            assert ledger.is_passed("rule--x--1")
+        assert _rows(instructions_dir)["rule--x--1"]["passed_at"] == before
@@ -3,7 +3,7 @@
 Validates requirements: REVIEW-REQ-003, REVIEW-REQ-003.1, REVIEW-REQ-003.2,
 REVIEW-REQ-003.3, REVIEW-REQ-003.4, REVIEW-REQ-004, REVIEW-REQ-004.1, REVIEW-REQ-004.2,
 REVIEW-REQ-004.3, REVIEW-REQ-004.4, REVIEW-REQ-004.5, REVIEW-REQ-004.6, REVIEW-REQ-004.7,
-REVIEW-REQ-004.8, REVIEW-REQ-004.9.
+REVIEW-REQ-004.8, REVIEW-REQ-004.9, REVIEW-REQ-004.11.
 """
 
 import inspect
@@ -11,18 +11,24 @@ import os
 import subprocess
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import patch
 
 import pytest
 
-from deepwork.review.config import ReviewRule
+from deepwork.review.config import ReferenceFile, ReviewRule
+from deepwork.review.instructions import MAX_INLINE_FILES, build_instruction_file
 from deepwork.review.matcher import (
+    _MERGE_BASE_CACHE,
     GitDiffError,
+    RuleSet,
+    _cached_merge_base,
     _detect_base_ref,
     _get_merge_base,
-    _git_untracked_files,
+    _git_diff_name_status,
     _glob_match,
+    _parse_porcelain_v2,
     _relative_to_dir,
+    get_change_set,
     get_changed_files,
     match_files_to_rules,
     match_rule,
@@ -42,6 +48,7 @@ def _make_rule(
     source_dir: Path = Path("/project"),
     source_file: Path | None = None,
     source_line: int = 1,
+    task_budget_bytes: int | None = None,
 ) -> ReviewRule:
     """Create a ReviewRule with sensible defaults for testing."""
     return ReviewRule(
@@ -58,6 +65,7 @@ def _make_rule(
         source_dir=source_dir,
         source_file=source_file or source_dir / ".deepreview",
         source_line=source_line,
+        task_budget_bytes=task_budget_bytes,
     )
 
 
@@ -361,169 +369,97 @@ class TestMatchFilesToRules:
         assert "unchanged.py" in tasks[0].additional_files
 
 
+def _git(repo: Path, *args: str) -> str:
+    """Run a git command in ``repo`` and return stdout."""
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout
+
+
+@pytest.fixture
+def feature_repo(tmp_path: Path) -> Path:
+    """A repo on ``feature`` with one commit ahead of ``main``."""
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "base.py").write_text("base\n")
+    (tmp_path / "old_name.py").write_text("rename me\n" * 5)
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "initial")
+    _git(tmp_path, "checkout", "-q", "-b", "feature")
+    (tmp_path / "committed.py").write_text("committed\n")
+    _git(tmp_path, "add", "committed.py")
+    _git(tmp_path, "commit", "-q", "-m", "feature work")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def _clear_merge_base_cache() -> None:
+    _MERGE_BASE_CACHE.clear()
+
+
 class TestGetChangedFiles:
     """Tests for get_changed_files."""
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.6).
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.8, REVIEW-REQ-003.4.1).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
     def test_raises_on_non_git_repo(self, tmp_path: Path) -> None:
         with pytest.raises(GitDiffError):
             get_changed_files(tmp_path)
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.2, REVIEW-REQ-003.1.5).
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.4, REVIEW-REQ-003.1.7).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    def test_returns_sorted_deduplicated_files(
-        self, mock_merge_base: Any, mock_detect: Any, mock_run: Any, tmp_path: Path
-    ) -> None:
-        mock_run.return_value.stdout = "b.py\na.py\n"
-        mock_run.return_value.returncode = 0
-        files = get_changed_files(tmp_path)
-        assert files == ["a.py", "b.py"]
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.6).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher._git_untracked_files", return_value=[])
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    def test_uses_explicit_base_ref(
-        self, mock_merge_base: Any, mock_diff: Any, mock_untracked: Any, tmp_path: Path
-    ) -> None:
-        mock_diff.return_value = ["app.py"]
-        get_changed_files(tmp_path, base_ref="develop")
-        mock_merge_base.assert_called_once_with(tmp_path, "develop")
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.1).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher._git_untracked_files", return_value=[])
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    def test_returns_list_of_relative_paths(
-        self,
-        mock_merge_base: Any,
-        mock_detect: Any,
-        mock_diff: Any,
-        mock_untracked: Any,
-        tmp_path: Path,
-    ) -> None:
-        mock_diff.return_value = ["src/app.py", "tests/test_app.py"]
-        result = get_changed_files(tmp_path)
-        assert isinstance(result, list)
-        assert all(isinstance(p, str) for p in result)
-        # Paths should be relative (no leading /)
-        assert all(not p.startswith("/") for p in result)
+    def test_combines_committed_staged_unstaged_and_untracked(self, feature_repo: Path) -> None:
+        (feature_repo / "base.py").write_text("unstaged edit\n")
+        (feature_repo / "staged.py").write_text("staged\n")
+        _git(feature_repo, "add", "staged.py")
+        (feature_repo / "plugins" / "new").mkdir(parents=True)
+        (feature_repo / "plugins" / "new" / ".deepreview").write_text("{}\n")
+
+        result = get_changed_files(feature_repo)
+
+        assert result == [
+            "base.py",
+            "committed.py",
+            "plugins/new/.deepreview",
+            "staged.py",
+        ]
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.3).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    def test_uses_diff_filter_acmr(
-        self, mock_merge_base: Any, mock_detect: Any, mock_run: Any, tmp_path: Path
-    ) -> None:
-        mock_run.return_value.stdout = ""
-        mock_run.return_value.returncode = 0
-        get_changed_files(tmp_path)
-        # Every git diff call must include --diff-filter=ACMR
-        for c in mock_run.call_args_list:
-            cmd = c[0][0] if c[0] else c[1].get("args", [])
-            if "diff" in cmd:
-                assert "--diff-filter=ACMR" in cmd, (
-                    f"Expected --diff-filter=ACMR in git diff command: {cmd}"
-                )
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.4).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher._git_untracked_files", return_value=[])
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    def test_combines_unstaged_and_staged_changes(
-        self,
-        mock_diff: Any,
-        mock_merge_base: Any,
-        mock_detect: Any,
-        mock_untracked: Any,
-        tmp_path: Path,
-    ) -> None:
-        # First call is for diff against merge-base (unstaged/committed),
-        # second call is for staged changes
-        mock_diff.side_effect = [["src/app.py"], ["src/new.py"]]
-        result = get_changed_files(tmp_path)
-        assert "src/app.py" in result
-        assert "src/new.py" in result
-        # Verify two calls were made: one with merge_base ref, one with None+staged
-        assert mock_diff.call_count == 2
-        first_call = mock_diff.call_args_list[0]
-        second_call = mock_diff.call_args_list[1]
-        # First call: diff against merge-base
-        assert first_call == call(tmp_path, "abc123")
-        # Second call: staged changes (ref=None, staged=True)
-        assert second_call == call(tmp_path, None, staged=True)
+    def test_excludes_deleted_files(self, feature_repo: Path) -> None:
+        (feature_repo / "base.py").unlink()
+        _git(feature_repo, "rm", "-q", "old_name.py")
+        assert "base.py" not in get_changed_files(feature_repo)
+        assert "old_name.py" not in get_changed_files(feature_repo)
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.4).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher._git_untracked_files")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    def test_includes_untracked_files(
-        self,
-        mock_diff: Any,
-        mock_merge_base: Any,
-        mock_detect: Any,
-        mock_untracked: Any,
-        tmp_path: Path,
-    ) -> None:
-        mock_diff.side_effect = [["src/app.py"], []]
-        mock_untracked.return_value = ["plugins/new/.deepreview"]
-        result = get_changed_files(tmp_path)
-        assert "src/app.py" in result
-        assert "plugins/new/.deepreview" in result
-        mock_untracked.assert_called_once_with(tmp_path)
-
-    @patch("deepwork.review.matcher._git_untracked_files")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.4).
+    def test_respects_gitignore_for_untracked(self, feature_repo: Path) -> None:
+        (feature_repo / ".gitignore").write_text("build/\n")
+        (feature_repo / "build").mkdir()
+        (feature_repo / "build" / "out.py").write_text("x\n")
+        result = get_changed_files(feature_repo)
+        assert ".gitignore" in result
+        assert "build/out.py" not in result
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.2).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_deduplicates_untracked_with_diff(
-        self,
-        mock_diff: Any,
-        mock_merge_base: Any,
-        mock_detect: Any,
-        mock_untracked: Any,
-        tmp_path: Path,
-    ) -> None:
-        mock_diff.side_effect = [["src/app.py"], ["src/app.py"]]
-        mock_untracked.return_value = ["src/app.py"]
-        result = get_changed_files(tmp_path)
-        assert result == ["src/app.py"]
+    def test_paths_with_newlines_survive(self, feature_repo: Path) -> None:
+        (feature_repo / "odd\nname.py").write_text("x\n")
+        assert "odd\nname.py" in get_changed_files(feature_repo)
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.6).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher._git_untracked_files", return_value=[])
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    def test_paths_relative_to_repo_root(
-        self,
-        mock_merge_base: Any,
-        mock_detect: Any,
-        mock_diff: Any,
-        mock_untracked: Any,
-        tmp_path: Path,
-    ) -> None:
-        mock_diff.return_value = ["src/lib/utils.py", "README.md"]
-        result = get_changed_files(tmp_path)
-        # All paths must be relative (no absolute paths)
+    def test_paths_relative_to_repo_root(self, feature_repo: Path) -> None:
+        sub = feature_repo / "src" / "lib"
+        sub.mkdir(parents=True)
+        (sub / "utils.py").write_text("x\n")
+        result = get_changed_files(sub)
+        assert "src/lib/utils.py" in result
+        assert "committed.py" in result
         for path in result:
             assert not Path(path).is_absolute(), f"Path should be relative: {path}"
-            assert not path.startswith("/"), f"Path should not start with /: {path}"
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.1).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
@@ -532,144 +468,206 @@ class TestGetChangedFiles:
         base_ref_param = sig.parameters["base_ref"]
         assert base_ref_param.default is None
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.2).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher._git_untracked_files", return_value=[])
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    def test_auto_detects_merge_base_when_base_ref_none(
-        self,
-        mock_detect: Any,
-        mock_merge_base: Any,
-        mock_diff: Any,
-        mock_untracked: Any,
-        tmp_path: Path,
-    ) -> None:
-        mock_diff.return_value = []
-        get_changed_files(tmp_path, base_ref=None)
-        mock_detect.assert_called_once_with(tmp_path)
-        mock_merge_base.assert_called_once_with(tmp_path, "main")
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.2, REVIEW-REQ-003.2.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_auto_detects_merge_base_when_base_ref_none(self, feature_repo: Path) -> None:
+        change_set = get_change_set(feature_repo)
+        assert change_set.base_ref == "main"
+        assert change_set.merge_base == _git(feature_repo, "rev-parse", "main").strip()
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.3).
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.6).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_detect_base_ref_uses_symbolic_ref(self, mock_run: Any, tmp_path: Path) -> None:
-        def side_effect(cmd: Any, **kwargs: Any) -> Any:
-            result = MagicMock()
-            result.returncode = 0
-            if "symbolic-ref" in cmd:
-                result.stdout = "refs/remotes/origin/main\n"
-            else:
-                result.stdout = ""
-            return result
-
-        mock_run.side_effect = side_effect
-        result = _detect_base_ref(tmp_path)
-        assert result == "origin/main"
-        # First call should be the symbolic-ref query
-        first_call_cmd = mock_run.call_args_list[0][0][0]
-        assert "symbolic-ref" in first_call_cmd
+    def test_uses_explicit_base_ref(self, feature_repo: Path) -> None:
+        assert "committed.py" in get_changed_files(feature_repo, base_ref="main")
+        assert "committed.py" not in get_changed_files(feature_repo, base_ref="HEAD")
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.3).
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.4.2).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_detect_base_ref_symbolic_ref_works_for_non_standard_names(
-        self, mock_run: Any, tmp_path: Path
-    ) -> None:
-        def side_effect(cmd: Any, **kwargs: Any) -> Any:
-            result = MagicMock()
-            result.returncode = 0
-            if "symbolic-ref" in cmd:
-                result.stdout = "refs/remotes/origin/develop\n"
-            else:
-                result.stdout = ""
-            return result
-
-        mock_run.side_effect = side_effect
-        result = _detect_base_ref(tmp_path)
-        assert result == "origin/develop"
+    def test_invalid_explicit_base_ref_raises(self, feature_repo: Path) -> None:
+        with pytest.raises(GitDiffError, match="nonexistent_branch"):
+            get_changed_files(feature_repo, base_ref="nonexistent_branch")
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.3).
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.3, REVIEW-REQ-003.3.1).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_detect_base_ref_falls_back_when_symbolic_ref_not_set(
-        self, mock_run: Any, tmp_path: Path
-    ) -> None:
-        def side_effect(cmd: Any, **kwargs: Any) -> Any:
-            # symbolic-ref fails, but origin/main exists
-            if "symbolic-ref" in cmd:
-                raise subprocess.CalledProcessError(128, cmd)
-            result = MagicMock()
-            result.returncode = 0
-            return result
-
-        mock_run.side_effect = side_effect
-        result = _detect_base_ref(tmp_path)
-        assert result == "origin/main"
+    def test_git_commands_use_cwd_and_diff_filter(self, feature_repo: Path) -> None:
+        real_run = subprocess.run
+        with patch("deepwork.review.matcher.subprocess.run", side_effect=real_run) as mock_run:
+            get_changed_files(feature_repo)
+        for c in mock_run.call_args_list:
+            cmd = c[0][0]
+            assert c[1].get("cwd") == feature_repo
+            if "diff" in cmd:
+                assert "--diff-filter=ACMR" in cmd
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.3).
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.9).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_detect_base_ref_falls_back_to_origin_master(
-        self, mock_run: Any, tmp_path: Path
-    ) -> None:
-        def side_effect(cmd: Any, **kwargs: Any) -> Any:
-            if "symbolic-ref" in cmd or "origin/main" in cmd:
-                raise subprocess.CalledProcessError(128, cmd)
-            result = MagicMock()
-            result.returncode = 0
-            return result
+    def test_at_most_one_status_and_one_diff(self, feature_repo: Path) -> None:
+        real_run = subprocess.run
+        with patch("deepwork.review.matcher.subprocess.run", side_effect=real_run) as mock_run:
+            get_changed_files(feature_repo)
+            first_commands = [c[0][0][1:] for c in mock_run.call_args_list]
+            mock_run.reset_mock()
+            get_changed_files(feature_repo)
+            second_commands = [c[0][0][1:] for c in mock_run.call_args_list]
+
+        assert sum("status" in cmd for cmd in first_commands) == 1
+        assert sum("diff" in cmd for cmd in first_commands) == 1
+        assert any("merge-base" in cmd for cmd in first_commands)
+        # Second call reuses the cached merge-base for the same HEAD/base pair
+        assert not any("merge-base" in cmd for cmd in second_commands)
+        assert len(second_commands) == 3
 
-        mock_run.side_effect = side_effect
-        result = _detect_base_ref(tmp_path)
-        assert result == "origin/master"
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.3.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_does_not_change_process_working_directory(self, feature_repo: Path) -> None:
+        cwd_before = os.getcwd()
+        get_changed_files(feature_repo)
+        assert os.getcwd() == cwd_before
+
+    def test_merge_base_cache_invalidated_by_new_head(self, feature_repo: Path) -> None:
+        get_changed_files(feature_repo)
+        (feature_repo / "later.py").write_text("x\n")
+        _git(feature_repo, "add", "later.py")
+        _git(feature_repo, "commit", "-q", "-m", "more")
+        assert "later.py" in get_changed_files(feature_repo)
+        assert len(_MERGE_BASE_CACHE) == 2
+
+    def test_merge_base_cache_is_bounded(self, feature_repo: Path) -> None:
+        with patch("deepwork.review.matcher._MERGE_BASE_CACHE_MAX", 1):
+            _cached_merge_base(feature_repo, "HEAD", "main", "main")
+            _cached_merge_base(feature_repo, "HEAD", "feature", "feature")
+        assert list(_MERGE_BASE_CACHE) == [(str(feature_repo), "HEAD", "feature")]
+
+    def test_base_at_head_skips_diff(self, feature_repo: Path) -> None:
+        real_run = subprocess.run
+        with patch("deepwork.review.matcher.subprocess.run", side_effect=real_run) as mock_run:
+            result = get_changed_files(feature_repo, base_ref="feature")
+        assert result == []
+        assert not any("diff" in c[0][0] for c in mock_run.call_args_list)
+
+    def test_repo_without_commits(self, tmp_path: Path) -> None:
+        _git(tmp_path, "init", "-q")
+        (tmp_path / "first.py").write_text("x\n")
+        change_set = get_change_set(tmp_path)
+        assert change_set.head is None
+        assert change_set.paths == ["first.py"]
+
+
+class TestChangeSet:
+    """Tests for ChangeSet status codes and rename reporting."""
+
+    def test_reports_status_codes(self, feature_repo: Path) -> None:
+        (feature_repo / "base.py").write_text("edit\n")
+        (feature_repo / "untracked.py").write_text("x\n")
+        statuses = {f.path: f.status for f in get_change_set(feature_repo).files}
+        assert statuses == {"base.py": "M", "committed.py": "A", "untracked.py": "?"}
+
+    def test_reports_staged_rename_pairs(self, feature_repo: Path) -> None:
+        _git(feature_repo, "mv", "old_name.py", "new_name.py")
+        change_set = get_change_set(feature_repo, base_ref="HEAD")
+        assert change_set.renames == [("old_name.py", "new_name.py")]
+        assert change_set.paths == ["new_name.py"]
+
+    def test_reports_committed_rename_pairs(self, feature_repo: Path) -> None:
+        _git(feature_repo, "mv", "old_name.py", "new_name.py")
+        _git(feature_repo, "commit", "-q", "-m", "rename")
+        assert get_change_set(feature_repo).renames == [("old_name.py", "new_name.py")]
+
+    def test_parse_porcelain_skips_unmerged_and_ignored(self) -> None:
+        output = "\0".join(
+            [
+                "# branch.oid (initial)",
+                "# branch.head main",
+                "u UU N... 100644 100644 100644 100644 a b c conflict.py",
+                "! ignored.py",
+                "1 .D N... 100644 100644 000000 a b gone.py",
+                "1 A. N... 000000 100644 100644 a b has space.py",
+                "",
+            ]
+        )
+        head, files = _parse_porcelain_v2(output)
+        assert head is None
+        assert [f.path for f in files] == ["has space.py"]
+
+    def test_git_diff_error_wraps_stderr(self, tmp_path: Path) -> None:
+        with pytest.raises(GitDiffError, match="git diff failed"):
+            _git_diff_name_status(tmp_path, "HEAD")
+
+
+class TestDetectBaseRef:
+    """Tests for _detect_base_ref."""
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.3).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_detect_base_ref_falls_back_to_local_main(self, mock_run: Any, tmp_path: Path) -> None:
-        def side_effect(cmd: Any, **kwargs: Any) -> Any:
-            if "symbolic-ref" in cmd or "origin/main" in cmd or "origin/master" in cmd:
-                raise subprocess.CalledProcessError(128, cmd)
-            result = MagicMock()
-            result.returncode = 0
-            return result
-
-        mock_run.side_effect = side_effect
-        result = _detect_base_ref(tmp_path)
-        assert result == "main"
+    def test_uses_origin_head_symbolic_ref(self, feature_repo: Path) -> None:
+        main_sha = _git(feature_repo, "rev-parse", "main").strip()
+        _git(feature_repo, "update-ref", "refs/remotes/origin/develop", main_sha)
+        _git(
+            feature_repo,
+            "symbolic-ref",
+            "refs/remotes/origin/HEAD",
+            "refs/remotes/origin/develop",
+        )
+        _git(feature_repo, "update-ref", "refs/remotes/origin/main", main_sha)
+        assert _detect_base_ref(feature_repo) == ("origin/develop", main_sha)
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.3).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_detect_base_ref_falls_back_to_local_master(
-        self, mock_run: Any, tmp_path: Path
-    ) -> None:
-        def side_effect(cmd: Any, **kwargs: Any) -> Any:
-            if (
-                "symbolic-ref" in cmd
-                or "origin/main" in cmd
-                or "origin/master" in cmd
-                or cmd[-1] == "main"
-            ):
-                raise subprocess.CalledProcessError(128, cmd)
-            result = MagicMock()
-            result.returncode = 0
-            return result
-
-        mock_run.side_effect = side_effect
-        result = _detect_base_ref(tmp_path)
-        assert result == "master"
+    def test_dangling_origin_head_falls_back(self, feature_repo: Path) -> None:
+        _git(feature_repo, "symbolic-ref", "refs/remotes/origin/HEAD", "refs/remotes/origin/gone")
+        assert _detect_base_ref(feature_repo)[0] == "main"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @pytest.mark.parametrize(
+        ("present", "expected"),
+        [
+            (["refs/remotes/origin/main", "refs/remotes/origin/master"], "origin/main"),
+            (["refs/remotes/origin/master", "refs/heads/main"], "origin/master"),
+            (["refs/heads/main", "refs/heads/master"], "main"),
+            (["refs/heads/master"], "master"),
+        ],
+    )
+    def test_fallback_order(self, tmp_path: Path, present: list[str], expected: str) -> None:
+        stdout = "".join(f"{ref}\0sha-{ref}\0\n" for ref in present)
+        with patch("deepwork.review.matcher.subprocess.run") as mock_run:
+            mock_run.return_value.stdout = stdout
+            assert _detect_base_ref(tmp_path) == (expected, f"sha-{present[0]}")
+        cmd = mock_run.call_args[0][0]
+        assert cmd[1] == "for-each-ref"
+        assert "refs/remotes/origin/HEAD" in cmd
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.4).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_detect_base_ref_falls_back_to_head(self, mock_run: Any, tmp_path: Path) -> None:
-        # Nothing works — symbolic-ref fails, no known branches exist
-        mock_run.side_effect = subprocess.CalledProcessError(128, "git")
-        result = _detect_base_ref(tmp_path)
-        assert result == "HEAD"
+    def test_falls_back_to_head(self, tmp_path: Path) -> None:
+        with patch("deepwork.review.matcher.subprocess.run") as mock_run:
+            mock_run.return_value.stdout = ""
+            assert _detect_base_ref(tmp_path) == ("HEAD", None)
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_falls_back_to_head_on_git_error(self, tmp_path: Path) -> None:
+        with patch(
+            "deepwork.review.matcher.subprocess.run",
+            side_effect=subprocess.CalledProcessError(128, "git"),
+        ):
+            assert _detect_base_ref(tmp_path) == ("HEAD", None)
+
+    def test_head_base_skips_diff(self, tmp_path: Path) -> None:
+        _git(tmp_path, "init", "-q", "-b", "trunk")
+        _git(tmp_path, "config", "user.email", "test@example.com")
+        _git(tmp_path, "config", "user.name", "Test")
+        (tmp_path / "a.py").write_text("a\n")
+        _git(tmp_path, "add", ".")
+        _git(tmp_path, "commit", "-q", "-m", "initial")
+        (tmp_path / "a.py").write_text("b\n")
+        change_set = get_change_set(tmp_path)
+        assert (change_set.base_ref, change_set.merge_base) == ("HEAD", "HEAD")
+        assert change_set.paths == ["a.py"]
+
+
+class TestGetMergeBase:
+    """Tests for _get_merge_base."""
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.2.7).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
@@ -684,42 +682,8 @@ class TestGetChangedFiles:
         assert "main" in cmd
         assert result == "deadbeef"
 
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.3.1).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher.subprocess.run")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    def test_git_commands_use_cwd_project_root(
-        self, mock_merge_base: Any, mock_detect: Any, mock_run: Any, tmp_path: Path
-    ) -> None:
-        mock_run.return_value.stdout = "app.py\n"
-        mock_run.return_value.returncode = 0
-        get_changed_files(tmp_path)
-        for c in mock_run.call_args_list:
-            kwargs = c[1] if c[1] else {}
-            assert kwargs.get("cwd") == tmp_path, (
-                f"Expected cwd={tmp_path}, got cwd={kwargs.get('cwd')} for command {c}"
-            )
-
-    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.3.2).
-    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    @patch("deepwork.review.matcher._git_untracked_files", return_value=[])
-    @patch("deepwork.review.matcher._git_diff_name_only")
-    @patch("deepwork.review.matcher._detect_base_ref", return_value="main")
-    @patch("deepwork.review.matcher._get_merge_base", return_value="abc123")
-    def test_does_not_change_process_working_directory(
-        self,
-        mock_merge_base: Any,
-        mock_detect: Any,
-        mock_diff: Any,
-        mock_untracked: Any,
-        tmp_path: Path,
-    ) -> None:
-        mock_diff.return_value = ["app.py"]
-        cwd_before = os.getcwd()
-        get_changed_files(tmp_path)
-        cwd_after = os.getcwd()
-        assert cwd_before == cwd_after
+    def test_head_short_circuits(self, tmp_path: Path) -> None:
+        assert _get_merge_base(tmp_path, "HEAD") == "HEAD"
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.4.2).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
@@ -741,42 +705,6 @@ class TestGetChangedFiles:
             _get_merge_base(tmp_path, "bad_ref")
 
 
-class TestGitUntrackedFiles:
-    """Tests for _git_untracked_files."""
-
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_returns_untracked_files(self, mock_run: Any, tmp_path: Path) -> None:
-        # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.4).
-        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-        mock_run.return_value.stdout = "new_file.py\nplugins/claude/.deepreview\n"
-        mock_run.return_value.returncode = 0
-        result = _git_untracked_files(tmp_path)
-        assert result == ["new_file.py", "plugins/claude/.deepreview"]
-        cmd = mock_run.call_args[0][0]
-        assert "ls-files" in cmd
-        assert "--others" in cmd
-        assert "--exclude-standard" in cmd
-
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_returns_empty_list_when_no_untracked(self, mock_run: Any, tmp_path: Path) -> None:
-        # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.1.4).
-        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-        mock_run.return_value.stdout = ""
-        mock_run.return_value.returncode = 0
-        result = _git_untracked_files(tmp_path)
-        assert result == []
-
-    @patch("deepwork.review.matcher.subprocess.run")
-    def test_raises_git_diff_error_on_failure(self, mock_run: Any, tmp_path: Path) -> None:
-        # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-003.4.3).
-        # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-        mock_run.side_effect = subprocess.CalledProcessError(
-            128, "git", stderr="fatal: not a git repository"
-        )
-        with pytest.raises(GitDiffError, match="git ls-files failed"):
-            _git_untracked_files(tmp_path)
-
-
 class TestMatchRuleSourceDirOutsideProject:
     """Tests for match_rule when source_dir is not under project_root."""
 
@@ -964,3 +892,171 @@ class TestPrecomputedInfoThreading:
         rule = _make_rule(strategy="individual", source_dir=tmp_path)
         tasks = match_files_to_rules(["app.py"], [rule], tmp_path)
         assert tasks[0].precomputed_info_bash_command is None
+
+
+class TestTaskBudgetPacking:
+    """Tests for size-budgeted batching and sharding — validates REVIEW-REQ-004.11."""
+
+    @pytest.fixture
+    def project(self, tmp_path: Path) -> Path:
+        for name, size in [
+            ("a/one.py", 30),
+            ("a/two.py", 30),
+            ("b/three.py", 50),
+            ("c/big.py", 200),
+        ]:
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x" * size)
+        return tmp_path
+
+    _FILES = ["c/big.py", "b/three.py", "a/two.py", "a/one.py"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.11.3, REVIEW-REQ-004.11.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_individual_files_are_batched(self, project: Path) -> None:
+        rule = _make_rule(strategy="individual", source_dir=project, task_budget_bytes=120)
+        tasks = match_files_to_rules(self._FILES, [rule], project)
+        assert [t.files_to_review for t in tasks] == [
+            ["a/one.py", "a/two.py", "b/three.py"],
+            ["c/big.py"],
+        ]
+        assert [r.relative_label for r in tasks[0].reference_files] == [
+            "a/one.py",
+            "a/two.py",
+            "b/three.py",
+        ]
+        assert all(t.shard_label is None for t in tasks)
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.11.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_no_budget_keeps_one_task_per_file(self, project: Path) -> None:
+        rule = _make_rule(strategy="individual", source_dir=project)
+        tasks = match_files_to_rules(self._FILES, [rule], project)
+        assert len(tasks) == 4
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.11.3, REVIEW-REQ-004.11.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_matches_together_is_sharded(self, project: Path) -> None:
+        rule = _make_rule(
+            strategy="matches_together",
+            source_dir=project,
+            all_changed_filenames=True,
+            task_budget_bytes=100,
+        )
+        tasks = match_files_to_rules(self._FILES, [rule], project)
+        assert [t.files_to_review for t in tasks] == [
+            ["a/one.py", "a/two.py"],
+            ["b/three.py"],
+            ["c/big.py"],
+        ]
+        assert [t.shard_label for t in tasks] == ["part 1 of 3", "part 2 of 3", "part 3 of 3"]
+        assert all(t.all_changed_filenames == self._FILES for t in tasks)
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.11.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_all_changed_files_is_sharded(self, project: Path) -> None:
+        rule = _make_rule(
+            strategy="all_changed_files",
+            include=["b/*.py"],
+            source_dir=project,
+            task_budget_bytes=250,
+        )
+        tasks = match_files_to_rules(self._FILES, [rule], project)
+        assert [t.files_to_review for t in tasks] == [
+            ["a/one.py", "a/two.py", "b/three.py"],
+            ["c/big.py"],
+        ]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-004.11.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_batches_leave_room_for_rule_references(self, tmp_path: Path) -> None:
+        files = [f"src/f{i:02}.py" for i in range(25)]
+        for filepath in files:
+            (tmp_path / filepath).parent.mkdir(exist_ok=True)
+            (tmp_path / filepath).write_text("x = 1\n")
+        guide = tmp_path / "STYLE.md"
+        guide.write_text("Use snake_case.\n")
+        rule = _make_rule(strategy="individual", source_dir=tmp_path, task_budget_bytes=100_000)
+        rule.reference_files = [ReferenceFile(path=guide, relative_label="STYLE.md")]
+
+        tasks = match_files_to_rules(files, [rule], tmp_path)
+
+        assert [len(t.files_to_review) for t in tasks] == [MAX_INLINE_FILES - 1, 6]
+        for task in tasks:
+            content = build_instruction_file(task)
+            assert "Use snake_case." in content
+            assert "omitted" not in content
+            assert all(f"### {filepath}" in content for filepath in task.files_to_review)
+
+    def test_file_set_within_budget_is_not_sharded(self, project: Path) -> None:
+        rule = _make_rule(strategy="matches_together", source_dir=project, task_budget_bytes=1000)
+        tasks = match_files_to_rules(self._FILES, [rule], project)
+        assert len(tasks) == 1
+        assert tasks[0].files_to_review == self._FILES
+        assert tasks[0].shard_label is None
+
+
+class TestRuleSet:
+    """Tests for the compiled RuleSet matching engine."""
+
+    def test_match_equals_match_rule_for_every_rule(self, tmp_path: Path) -> None:
+        rules = [
+            _make_rule(name="root_py", include=["**/*.py"], source_dir=tmp_path),
+            _make_rule(
+                name="src_py",
+                include=["*.py", "lib/**/*.py"],
+                exclude=["lib/vendor/**"],
+                source_dir=tmp_path / "src",
+            ),
+            _make_rule(name="deep_md", include=["**/*.md"], source_dir=tmp_path / "src" / "lib"),
+            _make_rule(name="docs", include=["**/*"], source_dir=tmp_path / "docs"),
+            _make_rule(name="outside", include=["**/*"], source_dir=Path("/elsewhere")),
+        ]
+        changed = [
+            "app.py",
+            "src/main.py",
+            "src/lib/util.py",
+            "src/lib/vendor/dep.py",
+            "src/lib/README.md",
+            "docs/index.md",
+            "docsx/other.md",
+            "src",
+        ]
+
+        rule_set = RuleSet(rules, tmp_path)
+
+        assert rule_set.match(changed) == [match_rule(changed, r, tmp_path) for r in rules]
+
+    def test_candidates_only_include_containing_source_dirs(self, tmp_path: Path) -> None:
+        rules = [
+            _make_rule(name="root", source_dir=tmp_path),
+            _make_rule(name="a", source_dir=tmp_path / "a"),
+            _make_rule(name="ab", source_dir=tmp_path / "a" / "b"),
+            _make_rule(name="c", source_dir=tmp_path / "c"),
+        ]
+        rule_set = RuleSet(rules, tmp_path)
+
+        assert rule_set.candidates("a/b/x.py") == [(0, "a/b/x.py"), (1, "b/x.py"), (2, "x.py")]
+        assert rule_set.candidates("c/x.py") == [(0, "c/x.py"), (3, "x.py")]
+        assert rule_set.candidates("a") == [(0, "a")]
+
+    def test_unrelated_rules_are_never_candidates(self, tmp_path: Path) -> None:
+        rules = [_make_rule(name=f"r{i}", source_dir=tmp_path / f"pkg{i}") for i in range(500)]
+        rule_set = RuleSet(rules, tmp_path)
+
+        assert rule_set.candidates("pkg7/mod.py") == [(7, "mod.py")]
+        assert rule_set.candidates("other/mod.py") == []
+
+    def test_rule_without_include_patterns_matches_nothing(self, tmp_path: Path) -> None:
+        rule = _make_rule(source_dir=tmp_path)
+        rule.include_patterns = []
+        assert RuleSet([rule], tmp_path).match(["app.py"]) == [[]]
+
+    def test_match_files_to_rules_preserves_rule_order(self, tmp_path: Path) -> None:
+        rules = [
+            _make_rule(name="deep", source_dir=tmp_path / "src"),
+            _make_rule(name="shallow", source_dir=tmp_path),
+        ]
+        tasks = match_files_to_rules(["src/app.py"], rules, tmp_path)
+        assert [t.rule_name for t in tasks] == ["deep", "shallow"]
@@ -12,6 +12,7 @@ from unittest.mock import patch
 import pytest
 
 from deepwork.review.config import ReviewRule, ReviewTask
+from deepwork.review.ledger import ReviewLedger
 from deepwork.review.mcp import (
     ReviewToolError,
     all_reviews_passed_for_files,
@@ -580,29 +581,19 @@ class TestMarkPassed:
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.2.3).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_creates_passed_file(self, tmp_path: Path) -> None:
+    def test_records_pass_in_ledger(self, tmp_path: Path) -> None:
         mark_passed(tmp_path, "rule--file--abc123def456")
-        passed_file = (
-            tmp_path
-            / ".deepwork"
-            / "tmp"
-            / "review_instructions"
-            / "rule--file--abc123def456.passed"
-        )
-        assert passed_file.exists()
+        instructions_dir = tmp_path / ".deepwork" / "tmp" / "review_instructions"
+        with ReviewLedger(instructions_dir) as ledger:
+            assert ledger.is_passed("rule--file--abc123def456")
+            assert not ledger.is_passed("rule--file--000000000000")
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.2.3).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
-    def test_passed_file_is_empty(self, tmp_path: Path) -> None:
+    def test_does_not_create_passed_marker_file(self, tmp_path: Path) -> None:
         mark_passed(tmp_path, "rule--file--abc123def456")
-        passed_file = (
-            tmp_path
-            / ".deepwork"
-            / "tmp"
-            / "review_instructions"
-            / "rule--file--abc123def456.passed"
-        )
-        assert passed_file.read_bytes() == b""
+        instructions_dir = tmp_path / ".deepwork" / "tmp" / "review_instructions"
+        assert list(instructions_dir.glob("*.passed")) == []
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-009.2.4).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
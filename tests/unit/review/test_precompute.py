@@ -0,0 +1,279 @@
+"""Tests for precompute command execution and caching (deepwork.review.precompute).
+
+Validates requirements: REVIEW-REQ-001.9.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from deepwork.review.config import ReviewTask
+from deepwork.review.digests import FileDigests
+from deepwork.review.precompute import (
+    PRECOMPUTE_CACHE_FILENAME,
+    PrecomputeCache,
+    _run_command,
+    resolve_precomputed_info,
+    run_precompute_commands,
+)
+from deepwork.review.rule_cache import CACHE_DIR
+
+
+def _script(tmp_path: Path, name: str, body: str) -> str:
+    script = tmp_path / name
+    script.write_text(f"#!/usr/bin/env bash\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+def _counting_script(tmp_path: Path, name: str = "info.sh", output: str = "data") -> str:
+    """A script that appends a line to ``<name>.runs`` each time it runs."""
+    return _script(tmp_path, name, f"echo run >> {tmp_path / name}.runs\necho '{output}'")
+
+
+def _runs(tmp_path: Path, name: str = "info.sh") -> int:
+    runs_file = tmp_path / f"{name}.runs"
+    return len(runs_file.read_text().splitlines()) if runs_file.exists() else 0
+
+
+def _task(
+    command: str | None,
+    files: list[str] | None = None,
+    rule_name: str = "rule",
+    ttl: int | None = None,
+    timeout: int | None = None,
+) -> ReviewTask:
+    return ReviewTask(
+        rule_name=rule_name,
+        files_to_review=files or ["src/app.py"],
+        instructions="Review it.",
+        agent_name=None,
+        precomputed_info_bash_command=command,
+        precompute_cache_ttl_seconds=ttl,
+        precompute_timeout_seconds=timeout,
+    )
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('hi')\n")
+    return tmp_path
+
+
+def _resolve(tasks: list[ReviewTask], project_root: Path) -> list[str | None]:
+    return resolve_precomputed_info(tasks, project_root, FileDigests(project_root))
+
+
+class TestRunCommand:
+    """Tests for running a single precompute command."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.1, REVIEW-REQ-005.7.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_captures_stdout(self, tmp_path: Path) -> None:
+        command = _script(tmp_path, "info.sh", "echo 'hello world'")
+        result = asyncio.run(_run_command(command, tmp_path, 60))
+        assert result.succeeded
+        assert "hello world" in result.output
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_failure_returns_error(self, tmp_path: Path) -> None:
+        command = _script(tmp_path, "fail.sh", "echo 'oops' >&2\nexit 1")
+        result = asyncio.run(_run_command(command, tmp_path, 60))
+        assert not result.succeeded
+        assert "Precompute command failed" in result.output
+        assert "exit code 1" in result.output
+        assert "oops" in result.output
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.4, REVIEW-REQ-001.9.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_timeout_kills_command(self, tmp_path: Path) -> None:
+        command = _script(tmp_path, "slow.sh", "sleep 120")
+        start = time.monotonic()
+        result = asyncio.run(_run_command(command, tmp_path, 1))
+        assert time.monotonic() - start < 30
+        assert not result.succeeded
+        assert "timed out" in result.output
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_uses_project_root_as_cwd(self, tmp_path: Path) -> None:
+        command = _script(tmp_path, "cwd.sh", "pwd")
+        result = asyncio.run(_run_command(command, tmp_path, 60))
+        assert str(tmp_path) in result.output
+
+    def test_spawn_error_returns_error(self, tmp_path: Path) -> None:
+        with patch(
+            "deepwork.review.precompute.asyncio.create_subprocess_shell",
+            side_effect=OSError("no shell"),
+        ):
+            result = asyncio.run(_run_command("true", tmp_path, 60))
+        assert not result.succeeded
+        assert "Precompute command error" in result.output
+
+
+class TestRunPrecomputeCommands:
+    """Tests for the concurrent command pool."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_runs_commands_concurrently(self, tmp_path: Path) -> None:
+        commands = {_script(tmp_path, f"s{i}.sh", f"sleep 1\necho {i}"): 60 for i in range(4)}
+        start = time.monotonic()
+        results = run_precompute_commands(commands, tmp_path)
+        assert time.monotonic() - start < 3.5
+        assert {r.output.strip() for r in results.values()} == {"0", "1", "2", "3"}
+
+    def test_empty(self, tmp_path: Path) -> None:
+        assert run_precompute_commands({}, tmp_path) == {}
+
+    def test_works_inside_running_event_loop(self, tmp_path: Path) -> None:
+        command = _script(tmp_path, "info.sh", "echo inside")
+
+        async def caller() -> str:
+            return run_precompute_commands({command: 60}, tmp_path)[command].output
+
+        assert "inside" in asyncio.run(caller())
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_global_concurrency_limit(self, tmp_path: Path) -> None:
+        commands = {_script(tmp_path, f"s{i}.sh", "sleep 0.5"): 60 for i in range(4)}
+        with patch("deepwork.review.precompute._SLOTS", threading.BoundedSemaphore(1)):
+            start = time.monotonic()
+            run_precompute_commands(commands, tmp_path)
+        assert time.monotonic() - start >= 2.0
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_cancelled_waiter_does_not_leak_a_slot(self, tmp_path: Path) -> None:
+        slots = threading.BoundedSemaphore(1)
+        command = _script(tmp_path, "info.sh", "echo done")
+
+        async def cancel_while_waiting() -> str:
+            slots.acquire()
+            waiter = asyncio.create_task(_run_command(command, tmp_path, 60))
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            slots.release()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            return (await _run_command(command, tmp_path, 60)).output
+
+        with patch("deepwork.review.precompute._SLOTS", slots):
+            assert asyncio.run(cancel_while_waiting()).strip() == "done"
+        # The slot is free again: a leaked acquire would make this fail
+        assert slots.acquire(blocking=False)
+
+
+class TestResolvePrecomputedInfo:
+    """Tests for cached, per-task precompute resolution."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_command_runs_once_per_run(self, project: Path) -> None:
+        command = _counting_script(project)
+        tasks = [_task(command, rule_name="a"), _task(command, rule_name="b"), _task(None)]
+        outputs = _resolve(tasks, project)
+        assert outputs[0] is not None and "data" in outputs[0]
+        assert outputs[1] == outputs[0]
+        assert outputs[2] is None
+        assert _runs(project) == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.9).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_cached_output_reused_across_runs(self, project: Path) -> None:
+        command = _counting_script(project)
+        first = _resolve([_task(command)], project)
+        second = _resolve([_task(command)], project)
+        assert second == first
+        assert _runs(project) == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.9).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_file_change_invalidates_cache(self, project: Path) -> None:
+        command = _counting_script(project)
+        _resolve([_task(command)], project)
+        (project / "src" / "app.py").write_text("print('changed')\n")
+        _resolve([_task(command)], project)
+        assert _runs(project) == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.9).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_expired_entry_reruns(self, project: Path) -> None:
+        command = _counting_script(project)
+        _resolve([_task(command, ttl=60)], project)
+        with patch("deepwork.review.precompute.time.time", return_value=time.time() + 61):
+            _resolve([_task(command, ttl=60)], project)
+        assert _runs(project) == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.9).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_zero_ttl_disables_cache(self, project: Path) -> None:
+        command = _counting_script(project)
+        _resolve([_task(command, ttl=0)], project)
+        _resolve([_task(command, ttl=0)], project)
+        assert _runs(project) == 2
+        assert not (project / CACHE_DIR / PRECOMPUTE_CACHE_FILENAME).exists()
+
+    def test_failures_are_not_cached(self, project: Path) -> None:
+        command = _script(project, "fail.sh", f"echo run >> {project}/fail.sh.runs\nexit 2")
+        _resolve([_task(command)], project)
+        outputs = _resolve([_task(command)], project)
+        assert outputs[0] is not None and "exit code 2" in outputs[0]
+        assert _runs(project, "fail.sh") == 2
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-001.9.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_per_rule_timeout(self, project: Path) -> None:
+        command = _script(project, "slow.sh", "sleep 120")
+        outputs = _resolve([_task(command, timeout=1)], project)
+        assert outputs[0] is not None and "after 1s" in outputs[0]
+
+    def test_shared_command_uses_longest_timeout(self, project: Path) -> None:
+        command = _script(project, "info.sh", "echo ok")
+        with (
+            patch(
+                "deepwork.review.precompute.run_precompute_commands", return_value={}
+            ) as mock_run,
+            pytest.raises(KeyError),
+        ):
+            _resolve([_task(command, timeout=5), _task(command, timeout=30)], project)
+        assert mock_run.call_args.args[0] == {command: 30}
+
+
+class TestPrecomputeCache:
+    """Tests for the persisted precompute cache."""
+
+    def test_corrupt_cache_is_ignored(self, tmp_path: Path) -> None:
+        cache_file = tmp_path / CACHE_DIR / PRECOMPUTE_CACHE_FILENAME
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text("{not json", encoding="utf-8")
+        assert PrecomputeCache(tmp_path).get("key", 300) is None
+
+    def test_save_drops_expired_and_oldest_entries(self, tmp_path: Path) -> None:
+        cache = PrecomputeCache(tmp_path)
+        now = time.time()
+        with patch("deepwork.review.precompute.time.time", return_value=now - 1000):
+            cache.put("expired", "old", 60)
+        for i in range(3):
+            with patch("deepwork.review.precompute.time.time", return_value=now + i):
+                cache.put(f"k{i}", f"out{i}", 300)
+        with patch("deepwork.review.precompute._MAX_CACHE_ENTRIES", 2):
+            cache.save()
+
+        data = json.loads((tmp_path / CACHE_DIR / PRECOMPUTE_CACHE_FILENAME).read_text())
+        assert list(data["entries"]) == ["k1", "k2"]
+
+    def test_save_failure_is_ignored(self, tmp_path: Path) -> None:
+        cache = PrecomputeCache(tmp_path)
+        cache.put("key", "out", 300)
+        with patch("deepwork.review.precompute.atomic_write", side_effect=OSError("disk full")):
+            cache.save()
+        assert not (tmp_path / CACHE_DIR / PRECOMPUTE_CACHE_FILENAME).exists()
@@ -0,0 +1,141 @@
+"""Tests for the persistent parsed-rule cache (deepwork.review.rule_cache) — validates REVIEW-REQ-002.5."""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from deepwork.review.config import ConfigError
+from deepwork.review.discovery import load_all_rules
+from deepwork.review.rule_cache import CACHE_DIR, RULE_CACHE_FILENAME, RuleCache
+
+CONFIG = """
+py_rule:
+  description: "Python files."
+  match:
+    include: ["**/*.py"]
+    exclude: ["vendor/**"]
+  review:
+    strategy: individual
+    instructions:
+      file: instructions.md
+    agent:
+      claude: reviewer
+    additional_context:
+      all_changed_filenames: true
+    precomputed_info_for_reviewer_bash_command: ./info.sh
+    reference_files:
+      - path: docs/guide.md
+        description: "Style guide"
+"""
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / ".deepreview").write_text(CONFIG, encoding="utf-8")
+    (tmp_path / "instructions.md").write_text("Check style.", encoding="utf-8")
+    return tmp_path
+
+
+def _cache_file(project_root: Path) -> Path:
+    return project_root / CACHE_DIR / RULE_CACHE_FILENAME
+
+
+class TestRuleCache:
+    """Tests for RuleCache hit/miss behavior."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_second_load_skips_parsing_and_matches_first(self, project: Path) -> None:
+        first = RuleCache(project)
+        parsed = first.load_rules(project / ".deepreview")
+        first.save()
+        assert (first.hits, first.misses) == (0, 1)
+
+        second = RuleCache(project)
+        with patch("deepwork.review.rule_cache.parse_deepreview_file_with_dependencies") as parse:
+            cached = second.load_rules(project / ".deepreview")
+        parse.assert_not_called()
+        assert (second.hits, second.misses) == (1, 0)
+        assert cached == parsed
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_modified_deepreview_is_reparsed(self, project: Path) -> None:
+        load_all_rules(project)
+        (project / ".deepreview").write_text(CONFIG.replace("py_rule", "renamed_rule"))
+        rules, _ = load_all_rules(project)
+        assert [r.name for r in rules] == ["renamed_rule"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_modified_instruction_file_is_reparsed(self, project: Path) -> None:
+        load_all_rules(project)
+        instructions = project / "instructions.md"
+        instructions.write_text("Check everything, carefully.", encoding="utf-8")
+        rules, _ = load_all_rules(project)
+        assert rules[0].instructions == "Check everything, carefully."
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_same_size_rewrite_with_new_mtime_is_reparsed(self, project: Path) -> None:
+        load_all_rules(project)
+        instructions = project / "instructions.md"
+        instructions.write_text("Check STYLE.", encoding="utf-8")
+        st = instructions.stat()
+        os.utime(instructions, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        rules, _ = load_all_rules(project)
+        assert rules[0].instructions == "Check STYLE."
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_errors_are_not_cached(self, project: Path) -> None:
+        (project / "instructions.md").unlink()
+        rules, errors = load_all_rules(project)
+        assert rules == [] and len(errors) == 1
+
+        (project / "instructions.md").write_text("Now present.", encoding="utf-8")
+        rules, errors = load_all_rules(project)
+        assert errors == []
+        assert rules[0].instructions == "Now present."
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "not json",
+            json.dumps({"format": 999, "version": "0", "entries": {}}),
+            json.dumps(["wrong", "shape"]),
+        ],
+    )
+    def test_unusable_cache_file_is_ignored(self, project: Path, content: str) -> None:
+        _cache_file(project).parent.mkdir(parents=True)
+        _cache_file(project).write_text(content, encoding="utf-8")
+        cache = RuleCache(project)
+        assert cache.load_rules(project / ".deepreview")[0].name == "py_rule"
+        assert cache.misses == 1
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.5).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_write_failure_does_not_fail_loading(self, project: Path) -> None:
+        with patch("deepwork.review.rule_cache.atomic_write", side_effect=OSError("read-only")):
+            rules, errors = load_all_rules(project)
+        assert [r.name for r in rules] == ["py_rule"]
+        assert errors == []
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.5.6).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_cache_dir_is_gitignored(self, project: Path) -> None:
+        load_all_rules(project)
+        assert (project / CACHE_DIR / ".gitignore").read_text() == "*\n"
+
+    def test_save_without_changes_does_not_write(self, project: Path) -> None:
+        RuleCache(project).save()
+        assert not _cache_file(project).exists()
+
+    def test_missing_file_raises_config_error(self, project: Path) -> None:
+        with pytest.raises(ConfigError, match="File not found"):
+            RuleCache(project).load_rules(project / "missing" / ".deepreview")
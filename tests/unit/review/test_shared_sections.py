@@ -0,0 +1,197 @@
+"""Tests for shared instruction sections (deepwork.review.shared_sections).
+
+Validates requirements: REVIEW-REQ-005.9.
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from deepwork.review.config import ReferenceFile, ReviewTask
+from deepwork.review.instructions import INSTRUCTIONS_DIR, write_instruction_files
+from deepwork.review.shared_sections import (
+    MIN_SHARED_BYTES,
+    SHARED_DIR,
+    SHARED_RETENTION_SECONDS,
+    ReferenceReader,
+    SharedSections,
+)
+
+
+def _individual_tasks(tmp_path: Path, count: int, guide: Path) -> list[ReviewTask]:
+    """Tasks shaped like an ``individual`` rule: own file first, then the rule's refs."""
+    tasks = []
+    for i in range(count):
+        filepath = f"src/f{i}.py"
+        (tmp_path / filepath).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / filepath).write_text(f"x = {i}\n")
+        tasks.append(
+            ReviewTask(
+                rule_name="style",
+                files_to_review=[filepath],
+                instructions="Review it.",
+                agent_name=None,
+                all_changed_filenames=[f"src/f{j}.py" for j in range(count)]
+                + [f"docs/page{j}.md" for j in range(100)],
+                reference_files=[
+                    ReferenceFile(
+                        path=tmp_path / filepath,
+                        relative_label=filepath,
+                        description="File under review",
+                    ),
+                    ReferenceFile(path=guide, relative_label="docs/guide.md"),
+                ],
+            )
+        )
+    return tasks
+
+
+def _guide(tmp_path: Path) -> Path:
+    guide = tmp_path / "docs" / "guide.md"
+    guide.parent.mkdir(parents=True, exist_ok=True)
+    guide.write_text("GUIDE LINE\n" * 400)
+    return guide
+
+
+class TestSharedSectionsInInstructionFiles:
+    """Tests for shared sections written by write_instruction_files."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.9.1, REVIEW-REQ-005.9.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_repeated_sections_written_once(self, tmp_path: Path) -> None:
+        tasks = _individual_tasks(tmp_path, 5, _guide(tmp_path))
+        results = write_instruction_files(tasks, tmp_path)
+
+        shared = sorted((tmp_path / INSTRUCTIONS_DIR / SHARED_DIR).iterdir())
+        assert [p.name.split("-")[0] for p in shared] == ["changed", "references"]
+        references = next(p for p in shared if p.name.startswith("references"))
+        assert "GUIDE LINE" in references.read_text()
+
+        for task, path in results:
+            content = path.read_text()
+            assert "GUIDE LINE" not in content
+            assert f".deepwork/tmp/review_instructions/shared/{references.name}" in content
+            # The file under review stays inline
+            assert f"### {task.files_to_review[0]}" in content
+            assert "docs/page99.md" not in content
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.9.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_each_reference_file_read_once_per_run(self, tmp_path: Path) -> None:
+        tasks = _individual_tasks(tmp_path, 4, _guide(tmp_path))
+        original = Path.read_text
+        reads: list[Path] = []
+
+        def counting_read_text(self: Path, *args, **kwargs):  # type: ignore[no-untyped-def]
+            if self.suffix in (".py", ".md") and tmp_path in self.parents:
+                reads.append(self)
+            return original(self, *args, **kwargs)
+
+        with patch.object(Path, "read_text", counting_read_text):
+            write_instruction_files(tasks, tmp_path)
+        references = [p for p in reads if INSTRUCTIONS_DIR not in p.as_posix()]
+        assert sorted(references) == sorted(
+            {t.reference_files[0].path for t in tasks} | {tmp_path / "docs" / "guide.md"}
+        )
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.9.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_unrepeated_sections_stay_inline(self, tmp_path: Path) -> None:
+        tasks = _individual_tasks(tmp_path, 1, _guide(tmp_path))
+        [(_, path)] = write_instruction_files(tasks, tmp_path)
+        content = path.read_text()
+        assert "GUIDE LINE" in content
+        assert "docs/page99.md" in content
+        assert not (tmp_path / INSTRUCTIONS_DIR / SHARED_DIR).exists()
+
+
+class TestSharedSections:
+    """Unit tests for SharedSections."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.9.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_small_sections_stay_inline(self, tmp_path: Path) -> None:
+        sections = SharedSections(tmp_path, tmp_path / SHARED_DIR)
+        small = "x" * (MIN_SHARED_BYTES - 1)
+        sections.count(small)
+        sections.count(small)
+        assert sections.pointer("references", small) is None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.9.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_existing_shared_file_is_not_rewritten(self, tmp_path: Path) -> None:
+        content = "y" * MIN_SHARED_BYTES
+        first = SharedSections(tmp_path, tmp_path / SHARED_DIR)
+        first.count(content)
+        first.count(content)
+        pointer = first.pointer("references", content)
+        assert pointer is not None
+        assert first.pointer("references", content) == pointer
+        assert first.written == 1
+
+        second = SharedSections(tmp_path, tmp_path / SHARED_DIR)
+        second.count(content)
+        second.count(content)
+        assert second.pointer("references", content) == pointer
+        assert second.written == 0
+
+    def test_write_failure_falls_back_to_inline(self, tmp_path: Path) -> None:
+        content = "z" * MIN_SHARED_BYTES
+        sections = SharedSections(tmp_path, tmp_path / SHARED_DIR)
+        sections.count(content)
+        sections.count(content)
+        with patch(
+            "deepwork.review.shared_sections.atomic_write", side_effect=OSError("read-only")
+        ):
+            assert sections.pointer("references", content) is None
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-005.9.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_prune_removes_old_unused_files(self, tmp_path: Path) -> None:
+        shared_dir = tmp_path / SHARED_DIR
+        shared_dir.mkdir()
+        old = time.time() - SHARED_RETENTION_SECONDS - 60
+        stale = shared_dir / "references-stale.md"
+        recent = shared_dir / "references-recent.md"
+        stale.write_text("stale")
+        recent.write_text("recent")
+        os.utime(stale, (old, old))
+
+        content = "w" * MIN_SHARED_BYTES
+        sections = SharedSections(tmp_path, shared_dir)
+        sections.count(content)
+        sections.count(content)
+        pointer = sections.pointer("references", content)
+        assert pointer is not None
+        in_use = tmp_path / pointer
+        os.utime(in_use, (old, old))
+
+        sections.prune()
+        assert not stale.exists()
+        assert recent.exists()
+        assert in_use.exists()
+
+    def test_prune_without_directory(self, tmp_path: Path) -> None:
+        SharedSections(tmp_path, tmp_path / SHARED_DIR).prune()
+
+
+class TestReferenceReader:
+    """Tests for ReferenceReader."""
+
+    def test_caches_content_and_errors(self, tmp_path: Path) -> None:
+        good = tmp_path / "good.txt"
+        good.write_text("hello")
+        bad = tmp_path / "bad.bin"
+        bad.write_bytes(b"\xff\xfe\xfd")
+        reader = ReferenceReader()
+        for _ in range(3):
+            assert reader.read(good) == "hello"
+            for path in (bad, tmp_path / "missing.txt"):
+                try:
+                    reader.read(path)
+                except (OSError, UnicodeDecodeError):
+                    pass
+                else:  # pragma: no cover
+                    raise AssertionError("expected a read error")
+        assert reader.reads == 3
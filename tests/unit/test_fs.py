@@ -2,14 +2,22 @@
 
 Validates requirements: DW-REQ-010, DW-REQ-010.1, DW-REQ-010.2, DW-REQ-010.3,
 DW-REQ-010.4, DW-REQ-010.5, DW-REQ-010.6, DW-REQ-010.7, DW-REQ-010.8, DW-REQ-010.9,
-DW-REQ-010.10.
+DW-REQ-010.10, DW-REQ-010.11.
 """
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from deepwork.utils.fs import copy_dir, ensure_dir, find_files, safe_read, safe_write
+from deepwork.utils.fs import (
+    atomic_write,
+    copy_dir,
+    ensure_dir,
+    find_files,
+    safe_read,
+    safe_write,
+)
 
 
 class TestEnsureDir:
@@ -306,3 +314,50 @@ class TestFindFiles:
 
         with pytest.raises(NotADirectoryError, match="Path is not a directory"):
             find_files(file_path, "*.txt")
+
+
+class TestAtomicWrite:
+    """Tests for atomic_write function."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-010.11.1, DW-REQ-010.11.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_writes_str_and_bytes_creating_parents(self, temp_dir: Path) -> None:
+        """Test that atomic_write handles str/bytes and creates parent dirs."""
+        text_file = temp_dir / "a" / "b" / "text.txt"
+        atomic_write(text_file, "héllo")
+        assert text_file.read_text(encoding="utf-8") == "héllo"
+
+        bin_file = temp_dir / "bin.dat"
+        atomic_write(bin_file, b"\x00\x01")
+        assert bin_file.read_bytes() == b"\x00\x01"
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-010.11.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_replaces_existing_file_without_leftovers(self, temp_dir: Path) -> None:
+        """Test that atomic_write replaces the file and leaves no temp files."""
+        file_path = temp_dir / "state.json"
+        file_path.write_text("old")
+        atomic_write(file_path, "new")
+        assert file_path.read_text() == "new"
+        assert sorted(p.name for p in temp_dir.iterdir()) == ["state.json"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-010.11.4).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_cleans_up_temp_file_on_failure(self, temp_dir: Path) -> None:
+        """Test that a failed replace removes the temp file and re-raises."""
+        file_path = temp_dir / "state.json"
+        with (
+            patch("deepwork.utils.fs.os.replace", side_effect=OSError("boom")),
+            pytest.raises(OSError, match="boom"),
+        ):
+            atomic_write(file_path, "new")
+        assert list(temp_dir.iterdir()) == []
+
+    def test_cleanup_tolerates_missing_temp_file(self, temp_dir: Path) -> None:
+        """Test that cleanup ignores a temp file that already vanished."""
+        with (
+            patch("deepwork.utils.fs.os.replace", side_effect=OSError("boom")),
+            patch("deepwork.utils.fs.os.unlink", side_effect=OSError("gone")),
+            pytest.raises(OSError, match="boom"),
+        ):
+            atomic_write(temp_dir / "x", "new")
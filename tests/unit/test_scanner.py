@@ -0,0 +1,180 @@
+"""Tests for the single-pass project scanner (deepwork.utils.scanner).
+
+Validates requirements: REVIEW-REQ-002.1, REVIEW-REQ-002.4, REVIEW-REQ-002.6,
+DW-REQ-011.4.
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from deepwork.utils.scanner import ProjectScanner, is_anonymous_schema_name
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, capture_output=True, check=True)
+
+
+def _touch(path: Path, content: str = "x: 1\n") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """A project with one of each kind of configuration file."""
+    _touch(tmp_path / ".deepreview")
+    _touch(tmp_path / "src" / ".deepreview")
+    _touch(tmp_path / "src" / ".deepschema.app.py.yml")
+    _touch(tmp_path / ".deepwork" / "schemas" / "api" / "deepschema.yml")
+    _touch(tmp_path / "src" / "app.py")
+    return tmp_path
+
+
+class TestProjectScanner:
+    """Tests for ProjectScanner.scan."""
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.6.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_collects_all_kinds_in_one_pass(self, project: Path) -> None:
+        result = ProjectScanner(project).scan()
+        assert sorted(result.deepreview_files) == [
+            project / ".deepreview",
+            project / "src" / ".deepreview",
+        ]
+        assert result.anonymous_schemas == [project / "src" / ".deepschema.app.py.yml"]
+        assert result.named_schema_manifests == [
+            project / ".deepwork" / "schemas" / "api" / "deepschema.yml"
+        ]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.6.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_result_is_memoized(self, project: Path) -> None:
+        scanner = ProjectScanner(project)
+        first = scanner.scan()
+        with patch("deepwork.utils.scanner.os.scandir") as mock_scandir:
+            second = scanner.scan()
+        mock_scandir.assert_not_called()
+        assert second is first
+
+    def test_manifest_outside_named_folder_is_ignored(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "docs" / "api" / "deepschema.yml")
+        _touch(tmp_path / ".deepwork" / "schemas" / "deepschema.yml")
+        assert ProjectScanner(tmp_path).scan().named_schema_manifests == []
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.1.4, DW-REQ-011.4.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_skips_standard_directories(self, tmp_path: Path) -> None:
+        _touch(tmp_path / "node_modules" / "pkg" / ".deepreview")
+        _touch(tmp_path / "pkg.egg-info" / ".deepschema.x.yml")
+        result = ProjectScanner(tmp_path).scan()
+        assert result.deepreview_files == []
+        assert result.anonymous_schemas == []
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.4.1).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_does_not_follow_directory_symlinks(self, tmp_path: Path) -> None:
+        target = tmp_path / "real"
+        _touch(target / ".deepreview")
+        (tmp_path / "link").symlink_to(target, target_is_directory=True)
+        result = ProjectScanner(tmp_path).scan()
+        assert result.deepreview_files == [target / ".deepreview"]
+
+    def test_follows_symlinked_named_schema_folders(self, tmp_path: Path) -> None:
+        shared = tmp_path / "shared_schema"
+        _touch(shared / "deepschema.yml")
+        schemas_dir = tmp_path / ".deepwork" / "schemas"
+        schemas_dir.mkdir(parents=True)
+        (schemas_dir / "shared").symlink_to(shared, target_is_directory=True)
+        result = ProjectScanner(tmp_path).scan()
+        assert result.named_schema_manifests == [schemas_dir / "shared" / "deepschema.yml"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.4.2).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_skips_unreadable_entries(self, project: Path) -> None:
+        original_scandir = os.scandir
+
+        def flaky_scandir(path):  # type: ignore[no-untyped-def]
+            if Path(path) != project / "src":
+                return original_scandir(path)
+            with original_scandir(path) as it:
+                return _Entries(_BrokenEntry(entry) for entry in it)
+
+        with patch("deepwork.utils.scanner.os.scandir", flaky_scandir):
+            result = ProjectScanner(project).scan()
+        assert result.deepreview_files == [project / ".deepreview"]
+        assert result.anonymous_schemas == []
+
+    def test_is_anonymous_schema_name(self) -> None:
+        assert is_anonymous_schema_name(".deepschema.app.py.yml")
+        assert not is_anonymous_schema_name(".deepschema..yml")
+        assert not is_anonymous_schema_name("deepschema.yml")
+
+
+class _BrokenEntry:
+    """A directory entry whose type cannot be read."""
+
+    def __init__(self, entry: os.DirEntry[str]) -> None:
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        raise PermissionError("denied")
+
+
+class _Entries(list):  # type: ignore[type-arg]
+    """Minimal stand-in for the context manager returned by os.scandir."""
+
+    def __enter__(self) -> "_Entries":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+class TestProjectScannerGitIgnore:
+    """Tests for .gitignore handling."""
+
+    @pytest.fixture
+    def repo(self, project: Path) -> Path:
+        _git(project, "init", "-q")
+        _touch(project / ".gitignore", "build/\n*.generated.yml\n.deepwork/\n")
+        _touch(project / "build" / ".deepreview")
+        _touch(project / "src" / ".deepschema.gen.generated.yml")
+        _touch(project / ".deepwork" / "tmp" / ".deepreview")
+        return project
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.1.7, DW-REQ-011.4.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_skips_git_ignored_paths(self, repo: Path) -> None:
+        result = ProjectScanner(repo).scan()
+        assert sorted(result.deepreview_files) == [
+            repo / ".deepreview",
+            repo / "src" / ".deepreview",
+        ]
+        assert result.anonymous_schemas == [repo / "src" / ".deepschema.app.py.yml"]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-011.4.3).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_named_schemas_found_when_deepwork_is_ignored(self, repo: Path) -> None:
+        result = ProjectScanner(repo).scan()
+        assert result.named_schema_manifests == [
+            repo / ".deepwork" / "schemas" / "api" / "deepschema.yml"
+        ]
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (REVIEW-REQ-002.1.7).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    def test_tracked_files_in_ignored_directories_are_found(self, repo: Path) -> None:
+        _git(repo, "add", "-f", "build/.deepreview")
+        result = ProjectScanner(repo).scan()
+        assert repo / "build" / ".deepreview" in result.deepreview_files
+
+    def test_no_filtering_when_git_unavailable(self, project: Path) -> None:
+        _touch(project / ".gitignore", "src/\n")
+        with patch("deepwork.utils.scanner.subprocess.run", side_effect=OSError("no git")):
+            result = ProjectScanner(project).scan()
+        assert project / "src" / ".deepreview" in result.deepreview_files
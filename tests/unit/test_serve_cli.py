@@ -4,11 +4,20 @@ Validates requirements: DW-REQ-005, DW-REQ-005.1, DW-REQ-005.2.
 """
 
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 from click.testing import CliRunner
 
 from deepwork.cli.serve import ServeError, _serve_mcp, serve
+from deepwork.jobs.mcp.pool import DEFAULT_PROJECT_CONCURRENCY
+from deepwork.jobs.mcp.scheduling import DEFAULT_DRAIN_TIMEOUT, CallScheduler, DrainOnSignal
+
+
+def _assert_drains_on_signal(mock_create: MagicMock, mock_server: MagicMock) -> None:
+    """The server runs with DrainOnSignal bound to create_server's scheduler."""
+    [middleware] = mock_server.run.call_args.kwargs["middleware"]
+    assert middleware.cls is DrainOnSignal
+    assert middleware.kwargs["scheduler"] is mock_create.call_args.kwargs["scheduler"]
 
 
 class TestServeCLI:
@@ -95,6 +104,55 @@ class TestServeCLI:
         mock_serve.assert_called_once()
         assert mock_serve.call_args[1]["explicit_path"] is True
 
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.2.13).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @patch("deepwork.cli.serve._serve_mcp")
+    def test_state_journal_flag(self, mock_serve: MagicMock, tmp_path: str) -> None:
+        """--state-journal is passed to _serve_mcp (default off)."""
+        runner = CliRunner()
+        with runner.isolated_filesystem(temp_dir=tmp_path) as td:
+            result = runner.invoke(serve, ["--path", td])
+            assert result.exit_code == 0
+            result = runner.invoke(serve, ["--path", td, "--state-journal"])
+            assert result.exit_code == 0
+
+        assert mock_serve.call_args_list[0][1]["state_journal"] is False
+        assert mock_serve.call_args_list[1][1]["state_journal"] is True
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.2.14).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @patch("deepwork.cli.serve._serve_mcp")
+    def test_roots_ttl_option(self, mock_serve: MagicMock, tmp_path: str) -> None:
+        """--roots-ttl is passed to _serve_mcp (default None)."""
+        runner = CliRunner()
+        with runner.isolated_filesystem(temp_dir=tmp_path) as td:
+            result = runner.invoke(serve, ["--path", td])
+            assert result.exit_code == 0
+            result = runner.invoke(serve, ["--path", td, "--roots-ttl", "2.5"])
+            assert result.exit_code == 0
+
+        assert mock_serve.call_args_list[0][1]["roots_ttl"] is None
+        assert mock_serve.call_args_list[1][1]["roots_ttl"] == 2.5
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.2.16).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @patch("deepwork.cli.serve._serve_mcp")
+    def test_project_concurrency_option(self, mock_serve: MagicMock, tmp_path: str) -> None:
+        """--project-concurrency is passed to _serve_mcp and must be positive."""
+        runner = CliRunner()
+        with runner.isolated_filesystem(temp_dir=tmp_path) as td:
+            result = runner.invoke(serve, ["--path", td])
+            assert result.exit_code == 0
+            result = runner.invoke(serve, ["--path", td, "--project-concurrency", "2"])
+            assert result.exit_code == 0
+            result = runner.invoke(serve, ["--path", td, "--project-concurrency", "0"])
+            assert result.exit_code != 0
+
+        assert mock_serve.call_args_list[0][1]["project_concurrency"] == (
+            DEFAULT_PROJECT_CONCURRENCY
+        )
+        assert mock_serve.call_args_list[1][1]["project_concurrency"] == 2
+
     def test_help_shows_options(self) -> None:
         # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.2.1).
         # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
@@ -204,7 +262,26 @@ class TestServeMCP:
 
         _serve_mcp(tmp_path, "sse", 9000)
 
-        mock_server.run.assert_called_once_with(transport="sse", port=9000)
+        mock_server.run.assert_called_once_with(transport="sse", port=9000, middleware=ANY)
+        _assert_drains_on_signal(mock_create, mock_server)
+
+    # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.2.15).
+    # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
+    @patch(PATCH_TARGET)
+    def test_http_transport(self, mock_create: MagicMock, tmp_path: Path) -> None:
+        """http transport runs streamable HTTP with a graceful shutdown timeout."""
+        mock_server = MagicMock()
+        mock_create.return_value = mock_server
+
+        _serve_mcp(tmp_path, "http", 9000)
+
+        mock_server.run.assert_called_once_with(
+            transport="http",
+            port=9000,
+            middleware=ANY,
+            uvicorn_config={"timeout_graceful_shutdown": DEFAULT_DRAIN_TIMEOUT},
+        )
+        _assert_drains_on_signal(mock_create, mock_server)
 
     # THIS TEST VALIDATES A HARD REQUIREMENT (DW-REQ-005.2.8).
     # YOU MUST NOT MODIFY THIS TEST UNLESS THE REQUIREMENT CHANGES
@@ -220,4 +297,9 @@ class TestServeMCP:
             project_root=tmp_path,
             platform="claude",
             explicit_path=True,
+            state_journal=False,
+            roots_ttl=None,
+            project_concurrency=DEFAULT_PROJECT_CONCURRENCY,
+            scheduler=ANY,
         )
+        assert isinstance(mock_create.call_args.kwargs["scheduler"], CallScheduler)